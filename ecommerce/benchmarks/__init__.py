@@ -0,0 +1,10 @@
+"""
+Load benchmarks of the basket, calculate, voucher, coupon, payment return and orders endpoints.
+
+Run the benchmarks against a development server whose database can be seeded, and which enables
+auto_auth and PerformanceMiddleware:
+
+    python manage.py run_benchmarks --url http://localhost:8002 --site-domain localhost:8002 --output results.json
+
+Run the same command on two commits to compare their results.
+"""
@@ -0,0 +1,230 @@
+"""
+Drive the hot endpoints of a running ecommerce server concurrently, and report their latency and throughput.
+
+Each scenario is run by several workers, each with its own session. Latency percentiles, requests per
+second, errors and SQL queries per request are reported for each scenario. Queries are read from the
+Server-Timing header added by PerformanceMiddleware, and are only reported if the server enables
+PERFORMANCE_INSTRUMENTATION_ENABLED.
+"""
+from __future__ import unicode_literals
+
+import itertools
+import math
+import re
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+
+SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+def percentile(values, percent):
+    """ Returns the given percentile of the values, using the nearest-rank method. """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = int(math.ceil(percent / 100.0 * len(ordered)))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+class ScenarioResult(object):
+    """ Latencies, errors and queries of the requests made by a scenario. """
+
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []
+        self.queries = []
+        self.errors = 0
+        self.duration = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency, response):
+        with self._lock:
+            self.latencies.append(latency)
+            if response is None or response.status_code >= 400:
+                self.errors += 1
+            if response is not None:
+                match = SERVER_TIMING_QUERIES.search(response.headers.get('Server-Timing', ''))
+                if match:
+                    self.queries.append(int(match.group(1)))
+
+    def summary(self):
+        """ Returns the statistics of the scenario, with latencies in milliseconds. """
+        def milliseconds(value):
+            return round(value * 1000, 2) if value is not None else None
+
+        count = len(self.latencies)
+        return OrderedDict([
+            ('requests', count),
+            ('errors', self.errors),
+            ('requests_per_second', round(count / self.duration, 2) if self.duration else None),
+            ('p50', milliseconds(percentile(self.latencies, 50))),
+            ('p95', milliseconds(percentile(self.latencies, 95))),
+            ('p99', milliseconds(percentile(self.latencies, 99))),
+            ('queries_per_request', round(float(sum(self.queries)) / len(self.queries), 2) if self.queries else None),
+        ])
+
+
+class BenchmarkClient(object):
+    """ Session of a benchmark worker, authenticated with the auto_auth view of the server. """
+
+    def __init__(self, base_url, manifest):
+        self.base_url = base_url.rstrip('/')
+        self.manifest = manifest
+        self.session = requests.Session()
+
+    def url(self, path):
+        return self.base_url + path
+
+    def login(self):
+        self.session.get(self.url('/auto_auth/'), allow_redirects=False)
+        # Render a page with a form, so that the server sets the CSRF cookie.
+        self.session.get(self.url('/basket/'))
+
+    def get(self, path, **params):
+        return self.session.get(self.url(path), params=params, allow_redirects=False)
+
+    def post(self, path, data):
+        headers = {'X-CSRFToken': self.session.cookies.get('csrftoken', ''), 'Referer': self.url('/basket/')}
+        return self.session.post(self.url(path), data=data, headers=headers, allow_redirects=False)
+
+
+def _sku(client, iteration):
+    skus = client.manifest['skus']
+    return skus[iteration % len(skus)]
+
+
+def add_items(client, iteration):
+    return client.get('/basket/add/', sku=_sku(client, iteration))
+
+
+def basket_summary(client, iteration):  # pylint: disable=unused-argument
+    return client.get('/basket/')
+
+
+def basket_calculate(client, iteration):
+    return client.get('/api/v2/baskets/calculate/', sku=_sku(client, iteration), code=client.manifest['voucher_code'])
+
+
+def add_voucher(client, iteration):
+    add_items(client, iteration)
+    return client.post('/basket/vouchers/add/', {'code': client.manifest['voucher_code']})
+
+
+def redeem_coupon(client, iteration):
+    return client.get('/coupons/redeem/', sku=_sku(client, iteration), code=client.manifest['voucher_code'])
+
+
+def payment_return(client, iteration):  # pylint: disable=unused-argument
+    notification = next(client.manifest['notification_iterator'], None)
+    if notification is None:
+        return None
+    return client.post('/payment/cybersource/redirect/', notification)
+
+
+def list_orders(client, iteration):  # pylint: disable=unused-argument
+    return client.get('/api/v2/orders/')
+
+
+SCENARIOS = OrderedDict([
+    ('basket_add_items', add_items),
+    ('basket_summary', basket_summary),
+    ('basket_calculate', basket_calculate),
+    ('voucher_add', add_voucher),
+    ('coupon_redeem', redeem_coupon),
+    ('payment_return', payment_return),
+    ('orders_api', list_orders),
+])
+
+
+def run_scenario(name, base_url, manifest, concurrency=4, requests_count=100):
+    """
+    Run a scenario with the given number of concurrent workers, until the given number of requests has been made.
+
+    Returns:
+        ScenarioResult
+    """
+    scenario = SCENARIOS[name]
+    result = ScenarioResult(name)
+    iterations = itertools.count()
+    iterations_lock = threading.Lock()
+
+    clients = [BenchmarkClient(base_url, manifest) for __ in range(concurrency)]
+    for client in clients:
+        client.login()
+
+    def work(client):
+        while True:
+            with iterations_lock:
+                iteration = next(iterations)
+            if iteration >= requests_count:
+                return
+
+            started = time.time()
+            try:
+                response = scenario(client, iteration)
+            except requests.RequestException:
+                response = None
+            else:
+                if response is None:
+                    # The scenario has run out of seeded data.
+                    return
+            result.record(time.time() - started, response)
+
+    started = time.time()
+    threads = [threading.Thread(target=work, args=(client,)) for client in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    result.duration = time.time() - started
+    return result
+
+
+def is_server_running(base_url):
+    """ Returns True if the server at the URL responds. """
+    try:
+        requests.get(base_url, allow_redirects=False, timeout=5)
+    except requests.RequestException:
+        return False
+    return True
+
+
+def wait_for_server(base_url, timeout=300, interval=1):
+    """
+    Wait for the server at the URL to respond.
+
+    Returns:
+        bool: True if the server responded before the timeout.
+    """
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if is_server_running(base_url):
+            return True
+        time.sleep(interval)
+    return False
+
+
+def run_benchmarks(base_url, manifest, scenarios=None, concurrency=4, requests_count=100):
+    """
+    Run the given scenarios, or all scenarios, one after the other.
+
+    Returns:
+        OrderedDict: Summaries of the scenarios keyed by name.
+    """
+    manifest = dict(manifest, notification_iterator=iter(manifest.get('notifications', [])))
+    return OrderedDict(
+        (name, run_scenario(name, base_url, manifest, concurrency, requests_count).summary())
+        for name in (scenarios or SCENARIOS.keys())
+    )
+
+
+def get_git_commit():
+    """ Returns the commit being benchmarked, so that results can be compared across commits. """
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD']).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
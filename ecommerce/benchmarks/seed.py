@@ -0,0 +1,232 @@
+"""
+Seed the catalog, coupons, programs, orders and pending payments exercised by the benchmarks.
+
+Data is created with the factories used by the test suite. It should only be seeded in
+development databases! The seeded data is identified by fixed course IDs, usernames, codes and names,
+and the data seeded by an earlier run is deleted before seeding, so that each run starts from the same data.
+"""
+from __future__ import unicode_literals
+
+import uuid
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from oscar.core.loading import get_class, get_model
+
+from ecommerce.courses.models import Course
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.payment.helpers import sign
+from ecommerce.extensions.payment.processors.cybersource import Cybersource
+from ecommerce.extensions.test import factories
+
+Basket = get_model('basket', 'Basket')
+Benefit = get_model('offer', 'Benefit')
+Condition = get_model('offer', 'Condition')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+Country = get_model('address', 'Country')
+Default = get_class('partner.strategy', 'Default')
+Order = get_model('order', 'Order')
+Product = get_model('catalogue', 'Product')
+Range = get_model('offer', 'Range')
+User = get_user_model()
+Voucher = get_model('voucher', 'Voucher')
+
+BENCHMARK_PREFIX = 'BENCH'
+BENCHMARK_COURSE_PREFIX = 'course-v1:{}+'.format(BENCHMARK_PREFIX)
+BENCHMARK_PROGRAM_UUID = uuid.UUID('6e9e5e3c-6a4f-4bd6-9c43-6f2b3c6d1e7a')
+BENCHMARK_RANGE_NAME = 'Benchmark seats'
+BENCHMARK_VOUCHER_CODE = '{}COUPON'.format(BENCHMARK_PREFIX)
+ORDERS_USERNAME = 'benchmark_orders'
+PAYMENTS_USERNAME = 'benchmark_payments'
+BILLING_COUNTRY = 'US'
+
+# Fields of the site configuration which are pointed at the stub services.
+STUBBED_SITE_CONFIGURATION_FIELDS = ('lms_url_root', 'discovery_api_url')
+
+
+@contextmanager
+def configure_site(site_configuration, stubs):
+    """ Point the site at the stub services, and restore its configuration on exit. """
+    original = {field: getattr(site_configuration, field) for field in STUBBED_SITE_CONFIGURATION_FIELDS}
+    site_configuration.lms_url_root = stubs['lms'].url
+    site_configuration.discovery_api_url = '{}/api/v1/'.format(stubs['discovery'].url)
+    site_configuration.save()
+    try:
+        yield site_configuration
+    finally:
+        for field, value in original.items():
+            setattr(site_configuration, field, value)
+        site_configuration.save(update_fields=STUBBED_SITE_CONFIGURATION_FIELDS)
+
+
+def _get_user(username):
+    user, __ = User.objects.get_or_create(username=username, defaults={'email': '{}@example.com'.format(username)})
+    return user
+
+
+def wipe_benchmark_data():
+    """ Delete the data seeded by earlier runs, along with the orders and baskets of the seeded products. """
+    courses = Course.objects.filter(id__startswith=BENCHMARK_COURSE_PREFIX)
+    products = Product.objects.filter(Q(course__in=courses) | Q(parent__course__in=courses))
+    users = User.objects.filter(username__in=(ORDERS_USERNAME, PAYMENTS_USERNAME))
+
+    order_ids = list(
+        Order.objects.filter(Q(user__in=users) | Q(lines__product__in=products)).values_list('id', flat=True)
+    )
+    Order.objects.filter(id__in=order_ids).delete()
+    basket_ids = list(
+        Basket.objects.filter(Q(owner__in=users) | Q(lines__product__in=products)).values_list('id', flat=True)
+    )
+    Basket.objects.filter(id__in=basket_ids).delete()
+
+    # Deleting the benefits also deletes the offers using them.
+    program_offers = ConditionalOffer.objects.filter(condition__program_uuid=BENCHMARK_PROGRAM_UUID)
+    Benefit.objects.filter(id__in=list(program_offers.values_list('benefit_id', flat=True))).delete()
+    Condition.objects.filter(program_uuid=BENCHMARK_PROGRAM_UUID).delete()
+    Voucher.objects.filter(code=BENCHMARK_VOUCHER_CODE).delete()
+    Range.objects.filter(name=BENCHMARK_RANGE_NAME).delete()
+
+    courses.delete()
+
+
+def seed_catalog(site, courses=10):
+    """
+    Create courses with verified seats.
+
+    Returns:
+        list: The verified seats.
+    """
+    partner = site.siteconfiguration.partner
+    seats = []
+    for index in range(courses):
+        course = CourseFactory(
+            id='{}Course{}+Run'.format(BENCHMARK_COURSE_PREFIX, index),
+            name='Benchmark Course {}'.format(index),
+            partner=partner,
+            site=site,
+        )
+        seats.append(course.create_or_update_seat('verified', True, 100))
+    return seats
+
+
+def seed_coupon(site, seats):
+    """ Create a multi-use voucher discounting the seats, and return its code. """
+    code = BENCHMARK_VOUCHER_CODE
+    factories.prepare_voucher(
+        code=code,
+        _range=factories.RangeFactory(name=BENCHMARK_RANGE_NAME, products=seats),
+        benefit_value=10,
+        usage=Voucher.MULTI_USE,
+        site=site,
+    )
+    return code
+
+
+def seed_program(site, seats):
+    """
+    Create a site offer for a program of the seats.
+
+    Returns:
+        dict: The program, as served by the Discovery Service.
+    """
+    offer = factories.ProgramOfferFactory(
+        partner=site.siteconfiguration.partner, site=site, condition__program_uuid=BENCHMARK_PROGRAM_UUID
+    )
+    return {
+        'uuid': str(offer.condition.program_uuid),
+        'title': 'Benchmark Program',
+        'type': 'MicroMasters',
+        'courses': [
+            {
+                'key': seat.attr.course_key,
+                'course_runs': [{
+                    'key': seat.attr.course_key,
+                    'seats': [{'type': 'verified', 'sku': seat.stockrecords.first().partner_sku}],
+                }],
+            }
+            for seat in seats
+        ],
+    }
+
+
+def seed_orders(site, seats, orders=50):
+    """ Create completed orders of the seats. """
+    user = _get_user(ORDERS_USERNAME)
+    for index in range(orders):
+        basket = factories.BasketFactory(owner=user, site=site)
+        basket.add_product(seats[index % len(seats)])
+        factories.create_order(basket=basket, user=user, site=site)
+
+
+def seed_payment_notifications(site, seats, payments=100):
+    """
+    Create frozen baskets awaiting payment, and the CyberSource notifications accepting their payment.
+
+    Each notification can be posted once to the CyberSource payment return view.
+
+    Returns:
+        list
+    """
+    Country.objects.get_or_create(
+        iso_3166_1_a2=BILLING_COUNTRY, defaults={'printable_name': 'United States', 'name': 'United States'}
+    )
+    processor = Cybersource(site)
+    user = _get_user(PAYMENTS_USERNAME)
+    notifications = []
+
+    for index in range(payments):
+        basket = Basket.objects.create(owner=user, site=site)
+        basket.strategy = Default()
+        basket.add_product(seats[index % len(seats)])
+        basket.freeze()
+
+        total = unicode(basket.total_incl_tax)
+        notification = {
+            'decision': 'ACCEPT',
+            'reason_code': '100',
+            'req_reference_number': basket.order_number,
+            'transaction_id': '{}{}'.format(BENCHMARK_PREFIX, basket.id),
+            'auth_amount': total,
+            'req_amount': total,
+            'req_tax_amount': '0.00',
+            'req_currency': basket.currency,
+            'req_card_number': 'xxxxxxxxxxxx1111',
+            'req_card_type': '001',
+            'req_profile_id': processor.profile_id,
+            'req_bill_to_forename': 'Bench',
+            'req_bill_to_surname': 'Mark',
+            'req_bill_to_address_line1': '141 Portland Ave.',
+            'req_bill_to_address_city': 'Cambridge',
+            'req_bill_to_address_postal_code': '02139',
+            'req_bill_to_address_country': BILLING_COUNTRY,
+        }
+        notification['signed_field_names'] = ','.join(sorted(notification))
+        message = ','.join(
+            '{}={}'.format(key, notification[key]) for key in notification['signed_field_names'].split(',')
+        )
+        notification['signature'] = sign(message, processor.secret_key)
+        notifications.append(notification)
+
+    return notifications
+
+
+def seed_benchmark_data(site, courses=10, orders=50, payments=100):
+    """
+    Seed the data exercised by the benchmarks, replacing the data seeded by earlier runs.
+
+    Returns:
+        dict: Manifest of the seeded data, used to drive the benchmarks and configure the stub services.
+    """
+    with transaction.atomic():
+        wipe_benchmark_data()
+        seats = seed_catalog(site, courses)
+        seed_orders(site, seats, orders)
+        return {
+            'skus': [seat.stockrecords.first().partner_sku for seat in seats],
+            'course_runs': [{'key': seat.attr.course_key, 'title': seat.title, 'image': None} for seat in seats],
+            'voucher_code': seed_coupon(site, seats),
+            'program': seed_program(site, seats),
+            'notifications': seed_payment_notifications(site, seats, payments),
+        }
@@ -0,0 +1,147 @@
+"""
+Local stand-ins for the services called by ecommerce while it handles benchmarked requests.
+
+Each stub serves canned JSON responses from its own port, after waiting for a configurable latency,
+so that benchmarks measure ecommerce itself rather than the availability of remote services.
+"""
+from __future__ import unicode_literals
+
+import json
+import re
+import threading
+import time
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+
+EMPTY_PAGE = {'count': 0, 'next': None, 'previous': None, 'results': []}
+
+
+class StubRoute(object):
+    def __init__(self, method, pattern, body, status=200):
+        self.method = method
+        self.pattern = re.compile(pattern)
+        self.body = body
+        self.status = status
+
+    def matches(self, method, path):
+        return self.method == method and self.pattern.match(path)
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _StubRequestHandler(BaseHTTPRequestHandler):
+    def _respond(self, method):
+        stub = self.server.stub
+        length = int(self.headers.getheader('content-length') or 0)
+        if length:
+            self.rfile.read(length)
+
+        time.sleep(stub.latency)
+        status, body = stub.resolve(method, self.path.split('?')[0])
+        content = json.dumps(body)
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self._respond('GET')
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self._respond('POST')
+
+    def do_PUT(self):  # pylint: disable=invalid-name
+        self._respond('PUT')
+
+    def do_PATCH(self):  # pylint: disable=invalid-name
+        self._respond('PATCH')
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class StubService(object):
+    """
+    HTTP server answering the requests made to a service with canned JSON responses.
+
+    Requests not matched by a route are answered with the default body of their method.
+
+    Example:
+        stub = StubService('lms', latency=0.05, routes=[StubRoute('GET', r'^/api/user/', {})])
+        stub.start()
+        ...
+        stub.stop()
+    """
+
+    def __init__(self, name, port=0, latency=0.0, routes=None, default_bodies=None):
+        self.name = name
+        self.port = port
+        self.latency = latency
+        self.routes = list(routes or [])
+        self.default_bodies = default_bodies or {'GET': EMPTY_PAGE}
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}'.format(self._server.server_address[1])
+
+    def resolve(self, method, path):
+        for route in self.routes:
+            if route.matches(method, path):
+                return route.status, route.body
+        return 200, self.default_bodies.get(method, {})
+
+    def start(self):
+        self._server = _ThreadingHTTPServer(('127.0.0.1', self.port), _StubRequestHandler)
+        self._server.stub = self  # pylint: disable=attribute-defined-outside-init
+        self._thread = threading.Thread(target=self._server.serve_forever, name='stub-{}'.format(self.name))
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def build_stub_services(base_port=0, latency=0.0, course_runs=(), program=None):
+    """
+    Returns the stubs of the LMS, Discovery and Enterprise services.
+
+    Arguments:
+        base_port (int): Port of the LMS stub. The other stubs use the following ports. Use 0 for random ports.
+        latency (float): Seconds each stub waits before responding.
+        course_runs (list): Course runs served by the Discovery stub.
+        program (dict): Program served by the Discovery stub.
+
+    Returns:
+        dict: Stubs keyed by service name.
+    """
+    def port(offset):
+        return base_port + offset if base_port else 0
+
+    lms = StubService('lms', port(0), latency, routes=[
+        StubRoute('POST', r'^/oauth2/access_token/?$', {'access_token': 'benchmark-token', 'expires_in': 3600}),
+        StubRoute('GET', r'^/api/enrollment/v1/', []),
+        StubRoute('GET', r'^/api/credit/v1/', []),
+    ])
+
+    discovery_routes = [
+        StubRoute('GET', r'^/api/v1/course_runs/{}/?$'.format(re.escape(run['key'])), run) for run in course_runs
+    ]
+    if program:
+        discovery_routes.append(StubRoute('GET', r'^/api/v1/programs/{}/?$'.format(program['uuid']), program))
+    discovery = StubService('discovery', port(1), latency, routes=discovery_routes)
+
+    enterprise = StubService('enterprise', port(2), latency, routes=[
+        StubRoute('GET', r'^/api/v1/enterprise-learner/', EMPTY_PAGE),
+    ])
+
+    return {stub.name: stub for stub in (lms, discovery, enterprise)}
@@ -0,0 +1,107 @@
+import json
+import time
+
+import requests
+from django.urls import reverse
+from oscar.core.loading import get_model
+
+from ecommerce.benchmarks.harness import ScenarioResult, percentile, run_benchmarks, wait_for_server
+from ecommerce.benchmarks.seed import configure_site, seed_benchmark_data
+from ecommerce.benchmarks.stubs import StubRoute, StubService, build_stub_services
+from ecommerce.courses.models import Course
+from ecommerce.tests.testcases import TestCase
+
+Basket = get_model('basket', 'Basket')
+Order = get_model('order', 'Order')
+
+
+class StubServiceTests(TestCase):
+    def setUp(self):
+        super(StubServiceTests, self).setUp()
+        self.stub = StubService('lms', latency=0.05, routes=[StubRoute('GET', r'^/api/user/', {'username': 'a'})])
+        self.stub.start()
+        self.addCleanup(self.stub.stop)
+
+    def test_routes(self):
+        """ Verify stubs serve their routes, or the default body of the method, after their latency. """
+        started = time.time()
+        self.assertEqual(requests.get(self.stub.url + '/api/user/v1/').json(), {'username': 'a'})
+        self.assertGreaterEqual(time.time() - started, 0.05)
+
+        self.assertEqual(requests.get(self.stub.url + '/other/').json()['results'], [])
+        self.assertEqual(requests.post(self.stub.url + '/other/', data='{}').json(), {})
+
+    def test_run_benchmarks(self):
+        """ Verify scenarios make the requested number of requests, and summarize them. """
+        results = run_benchmarks(self.stub.url, {}, scenarios=['orders_api'], concurrency=2, requests_count=6)
+        summary = results['orders_api']
+        self.assertEqual(summary['requests'], 6)
+        self.assertEqual(summary['errors'], 0)
+        self.assertGreaterEqual(summary['p50'], 50)
+        self.assertIsNone(summary['queries_per_request'])
+
+    def test_wait_for_server(self):
+        """ Verify waiting for a server succeeds once it responds, and times out otherwise. """
+        self.assertTrue(wait_for_server(self.stub.url, timeout=1))
+        url = self.stub.url
+        self.stub.stop()
+        self.assertFalse(wait_for_server(url, timeout=0.2, interval=0.1))
+
+
+class HarnessTests(TestCase):
+    def test_percentile(self):
+        values = range(1, 101)
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertIsNone(percentile([], 50))
+
+    def test_queries_from_server_timing(self):
+        """ Verify the queries reported by PerformanceMiddleware are read from the Server-Timing header. """
+        result = ScenarioResult('test')
+        response = requests.Response()
+        response.status_code = 200
+        response.headers['Server-Timing'] = 'db;dur=1.5;desc="12 queries", total;dur=20'
+        result.record(0.02, response)
+        result.record(0.02, None)
+        self.assertEqual(result.queries, [12])
+        self.assertEqual(result.errors, 1)
+
+
+class SeedTests(TestCase):
+    def test_seed_benchmark_data(self):
+        """ Verify the seeded payment notifications are accepted by the payment return view. """
+        manifest = seed_benchmark_data(self.site, courses=2, orders=2, payments=1)
+        self.assertEqual(len(manifest['skus']), 2)
+        self.assertEqual(len(manifest['program']['courses']), 2)
+        json.dumps(manifest)
+
+        notification = manifest['notifications'][0]
+        self.client.post(reverse('cybersource:redirect'), notification)
+        self.assertTrue(Order.objects.filter(number=notification['req_reference_number']).exists())
+
+    def test_seed_benchmark_data_replaces_earlier_runs(self):
+        """ Verify seeding replaces the data seeded by an earlier run, rather than adding to it. """
+        seed_benchmark_data(self.site, courses=2, orders=2, payments=1)
+        counts = (Course.objects.count(), Order.objects.count(), Basket.objects.count())
+
+        manifest = seed_benchmark_data(self.site, courses=2, orders=2, payments=1)
+        self.assertEqual((Course.objects.count(), Order.objects.count(), Basket.objects.count()), counts)
+        self.assertEqual(len(manifest['skus']), 2)
+
+    def test_configure_site(self):
+        """ Verify the site is pointed at the stubs, and restored on exit. """
+        site_configuration = self.site.siteconfiguration
+        lms_url_root = site_configuration.lms_url_root
+        stubs = build_stub_services()
+        for stub in stubs.values():
+            stub.start()
+            self.addCleanup(stub.stop)
+
+        with self.assertRaises(ValueError):
+            with configure_site(site_configuration, stubs):
+                site_configuration.refresh_from_db()
+                self.assertEqual(site_configuration.lms_url_root, stubs['lms'].url)
+                raise ValueError
+
+        site_configuration.refresh_from_db()
+        self.assertEqual(site_configuration.lms_url_root, lms_url_root)
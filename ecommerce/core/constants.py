@@ -13,6 +13,9 @@ SEAT_PRODUCT_CLASS_NAME = 'Seat'
 # switch is used to disable/enable USER table list/change view in django admin
 USER_LIST_VIEW_SWITCH = 'enable_user_list_view'
 
+# switch is used to run views using ShortTransactionMixin outside of the request transaction
+SHORT_TRANSACTIONS_SWITCH = 'enable_short_transactions'
+
 # Coupon constant
 COUPON_PRODUCT_CLASS_NAME = 'Coupon'
 
@@ -0,0 +1,85 @@
+"""
+Database router sending the reads of opted-in views to the read replica.
+
+Reads are only sent to the replica inside the read_replica() context, which is entered by ReadReplicaMixin
+for safe requests. Reads fall back to the primary database once the request has written, and while the client
+is pinned to the primary by ReadReplicaMiddleware after a recent write, so that clients read their own writes
+despite replication lag.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+READ_REPLICA = 'read_replica'
+
+# Writes to these apps do not pin clients to the primary database.
+UNTRACKED_WRITE_APPS = ('sessions',)
+
+_state = threading.local()
+
+
+def is_read_replica_configured():
+    return READ_REPLICA in settings.DATABASES
+
+
+@contextmanager
+def read_replica():
+    """ Send the reads made in the block to the read replica, if it is configured and the client is not pinned. """
+    previous = getattr(_state, 'use_replica', False)
+    _state.use_replica = True
+    try:
+        yield
+    finally:
+        _state.use_replica = previous
+
+
+def pin_to_primary(pinned=True):
+    """ Send all of the reads of the current request to the primary database. """
+    _state.pinned = pinned
+
+
+def has_written():
+    """ Returns True if the current request has written to the database. """
+    return getattr(_state, 'written', False)
+
+
+def reset():
+    """ Clear the routing state of the current thread. """
+    _state.__dict__.clear()
+
+
+def should_use_replica():
+    return (
+        getattr(_state, 'use_replica', False) and
+        not getattr(_state, 'pinned', False) and
+        not has_written() and
+        is_read_replica_configured()
+    )
+
+
+class ReadReplicaRouter(object):
+    """ Routes reads to the read replica while should_use_replica() holds, and all writes to the primary. """
+
+    def db_for_read(self, model, **hints):  # pylint: disable=unused-argument
+        return READ_REPLICA if should_use_replica() else None
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label not in UNTRACKED_WRITE_APPS:  # pylint: disable=protected-access
+            _state.written = True
+
+        # Objects read from the replica are written to the primary, rather than to the database they came from.
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db == READ_REPLICA:  # pylint: disable=protected-access
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):  # pylint: disable=unused-argument
+        databases = {DEFAULT_DB_ALIAS, READ_REPLICA}
+        if obj1._state.db in databases and obj2._state.db in databases:  # pylint: disable=protected-access
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):  # pylint: disable=unused-argument
+        return False if db == READ_REPLICA else None
@@ -0,0 +1,172 @@
+"""
+Concurrent eligibility checks.
+
+Redeeming a coupon, or adding products to a basket, requires several independent calls to remote
+services. The eligibility gate runs these calls concurrently, so that a request waits for the slowest
+check rather than for the sum of all checks.
+
+Checks run on greenlets. The workers serving requests are gevent workers, so the checks yield to each other
+while waiting for the remote services. Where the standard library is not patched by gevent, the checks run
+one after another on the request thread.
+"""
+from __future__ import unicode_literals
+
+import logging
+import sys
+import time
+from collections import OrderedDict
+
+import gevent
+import six
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from edx_django_utils.cache import RequestCache
+
+from ecommerce.core import performance
+
+logger = logging.getLogger(__name__)
+
+# Names of the checks whose results are shared by the views and utilities handling a request.
+EMBARGO_CHECK = 'embargo'
+ENTERPRISE_CONSENT_CHECK = 'enterprise_consent'
+ENTERPRISE_CUSTOMER_CHECK = 'enterprise_customer'
+ENTERPRISE_LEARNER_DATA_CHECK = 'enterprise_learner_data'
+
+
+class _EligibilityCheck(object):
+    def __init__(self, name, func, args, kwargs, fallback, timeout):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.fallback = fallback
+        self.timeout = timeout
+        self.result = None
+        self.exc_info = None
+        self.greenlet = None
+        self.timed_out = False
+        self.recorder = None
+        self.request_connection = None
+        self.request_cache_data = None
+
+    def __call__(self):
+        # Record the calls made by the check with the recorder of the request running it, and share the
+        # request cache of the request, whose thread-local data is not visible to a patched greenlet.
+        performance.activate(self.recorder)
+        request_cache = RequestCache()
+        request_cache.data.update(self.request_cache_data)
+        try:
+            self.result = self.func(*self.args, **self.kwargs)
+        except Exception:  # pylint: disable=broad-except
+            self.exc_info = sys.exc_info()
+        finally:
+            # The values cached by the check are copied to the request cache of the request once it completes.
+            self.request_cache_data = dict(request_cache.data)
+            # Checks running on their own greenlet must not leak database connections.
+            if connections[DEFAULT_DB_ALIAS] is not self.request_connection:
+                connections[DEFAULT_DB_ALIAS].close()
+
+
+class EligibilityGate(object):
+    """
+    Runs the eligibility checks of a request concurrently.
+
+    Checks are declared with add_check, and run together by run. Each check has a timeout,
+    after which its fallback value is used as its result. Checks should only call remote services:
+    any data they need from the database should be loaded before the gate is run.
+
+    Example:
+        gate = EligibilityGate()
+        gate.add_check(EMBARGO_CHECK, check_course_access, args=(user, site, course_ids), fallback=True)
+        gate.run()
+        is_allowed = gate.result(EMBARGO_CHECK)
+    """
+
+    def __init__(self):
+        self._checks = OrderedDict()
+
+    def add_check(self, name, func, args=(), kwargs=None, fallback=None, timeout=None):
+        """
+        Declare a check.
+
+        Arguments:
+            name (str): Name of the check, used to retrieve its result.
+            func (callable): Function performing the check.
+            args (tuple): Positional arguments of the function.
+            kwargs (dict): Keyword arguments of the function.
+            fallback: Result of the check if it does not complete within its timeout.
+            timeout (float): Seconds to wait for the check. Defaults to ELIGIBILITY_CHECK_TIMEOUT.
+        """
+        if timeout is None:
+            timeout = settings.ELIGIBILITY_CHECK_TIMEOUT
+        self._checks[name] = _EligibilityCheck(name, func, args, kwargs or {}, fallback, timeout)
+
+    def run(self):
+        """ Run the declared checks concurrently, and wait until each has completed or timed out. """
+        started = time.time()
+        recorder = performance.get_recorder()
+        request_cache = RequestCache()
+        for check in self._checks.values():
+            check.recorder = recorder
+            check.request_connection = connections[DEFAULT_DB_ALIAS]
+            check.request_cache_data = dict(request_cache.data)
+            check.greenlet = gevent.spawn(check)
+
+        for check in self._checks.values():
+            check.greenlet.join(max(check.timeout - (time.time() - started), 0))
+            if check.greenlet.ready():
+                request_cache.data.update(check.request_cache_data)
+            else:
+                logger.warning(
+                    'Eligibility check [%s] did not complete within [%s] seconds. Using its fallback [%s].',
+                    check.name, check.timeout, check.fallback
+                )
+                check.timed_out = True
+                check.greenlet.kill(block=False)
+
+    def has_result(self, name):
+        """ Returns True if a check with the given name has been run. """
+        check = self._checks.get(name)
+        return check is not None and check.greenlet is not None
+
+    def timed_out(self, name):
+        """
+        Returns True if a check did not complete within its timeout, and was given its fallback result.
+
+        Raises:
+            KeyError: If no check with the given name has been run.
+        """
+        if not self.has_result(name):
+            raise KeyError(name)
+        return self._checks[name].timed_out
+
+    def result(self, name):
+        """
+        Returns the result of a check.
+
+        Exceptions raised by the check are raised again, so that they can be handled as if the
+        check had been called directly.
+
+        Raises:
+            KeyError: If no check with the given name has been run.
+        """
+        if not self.has_result(name):
+            raise KeyError(name)
+
+        check = self._checks[name]
+        if check.timed_out:
+            return check.fallback
+        if check.exc_info:
+            six.reraise(*check.exc_info)
+        return check.result
+
+
+def get_eligibility_result(request, name, func, *args):
+    """
+    Returns the result of a check run by the eligibility gate of the request, or runs the check
+    directly if the gate of the request did not run it.
+    """
+    gate = getattr(request, 'eligibility_gate', None)
+    if gate is not None and gate.has_result(name):
+        return gate.result(name)
+    return func(*args)
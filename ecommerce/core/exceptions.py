@@ -6,3 +6,8 @@ class MissingRequestError(Exception):
 class SiteConfigurationError(Exception):
     """ Raised when SiteConfiguration is invalid. """
     pass
+
+
+class OutboundCallInTransactionError(Exception):
+    """ Raised when an outbound HTTP call is made while the request holds a database transaction open. """
+    pass
@@ -0,0 +1,185 @@
+import json
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ecommerce.benchmarks.harness import SCENARIOS, get_git_commit, is_server_running, run_benchmarks, wait_for_server
+from ecommerce.benchmarks.seed import configure_site, seed_benchmark_data
+from ecommerce.benchmarks.stubs import build_stub_services
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the basket, calculate, voucher, coupon, payment return and orders endpoints of a server. '
+        'Seeds data in the database used by the server, replacing the data seeded by earlier runs, and stubs the '
+        'LMS, Discovery and Enterprise services. The site is pointed at the stubs while the benchmarks run, and '
+        'restored afterwards. The server must not be running when the command starts: start it once the command '
+        'reports the stubs are running, with ENTERPRISE_API_URL set to the URL of the Enterprise stub. '
+        'This should only be run in development environments!'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            action='store',
+            dest='url',
+            type=str,
+            required=True,
+            help='Root URL of the server to benchmark, e.g. http://localhost:8002. The server must enable auto_auth.'
+        )
+        parser.add_argument(
+            '--site-domain',
+            action='store',
+            dest='site_domain',
+            type=str,
+            required=True,
+            help='Domain of the site served at the URL.'
+        )
+        parser.add_argument(
+            '--stub-port',
+            action='store',
+            dest='stub_port',
+            type=int,
+            default=18100,
+            help='Port of the LMS stub. The Discovery and Enterprise stubs use the next two ports. Defaults to 18100.'
+        )
+        parser.add_argument(
+            '--server-timeout',
+            action='store',
+            dest='server_timeout',
+            type=int,
+            default=300,
+            help='Seconds to wait for the server to be started once the stubs are running. Defaults to 300.'
+        )
+        parser.add_argument(
+            '--stub-latency',
+            action='store',
+            dest='stub_latency',
+            type=int,
+            default=50,
+            help='Milliseconds the stub services wait before responding. Defaults to 50.'
+        )
+        parser.add_argument(
+            '--concurrency',
+            action='store',
+            dest='concurrency',
+            type=int,
+            default=4,
+            help='Number of concurrent workers of each scenario. Defaults to 4.'
+        )
+        parser.add_argument(
+            '--requests',
+            action='store',
+            dest='requests',
+            type=int,
+            default=100,
+            help='Number of requests made by each scenario. Defaults to 100.'
+        )
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            dest='scenarios',
+            choices=SCENARIOS.keys(),
+            help='Scenario to run. May be repeated. Defaults to all scenarios.'
+        )
+        parser.add_argument(
+            '--courses',
+            action='store',
+            dest='courses',
+            type=int,
+            default=10,
+            help='Number of courses to seed. Defaults to 10.'
+        )
+        parser.add_argument(
+            '--orders',
+            action='store',
+            dest='orders',
+            type=int,
+            default=50,
+            help='Number of orders to seed. Defaults to 50.'
+        )
+        parser.add_argument(
+            '--output',
+            action='store',
+            dest='output',
+            type=str,
+            default=None,
+            help='Path of the JSON file the results are written to.'
+        )
+
+    def handle(self, *args, **options):
+        if not options['stub_port']:
+            raise CommandError('The stubs must use a fixed port, since the server is configured with their URLs.')
+
+        # The Enterprise service URL is a setting rather than part of the site configuration, so the server
+        # can only use the stub if it is started with the setting below.
+        enterprise_api_url = 'http://127.0.0.1:{}/api/v1/'.format(options['stub_port'] + 2)
+        if settings.ENTERPRISE_API_URL != enterprise_api_url:
+            raise CommandError(
+                'ENTERPRISE_API_URL must be set to [{}], both here and in the server, to use the Enterprise stub. '
+                'It is set to [{}].'.format(enterprise_api_url, settings.ENTERPRISE_API_URL)
+            )
+
+        # The server caches the site configuration, so it must be started after the site is pointed at the stubs.
+        if is_server_running(options['url']):
+            raise CommandError(
+                'The server at [{}] is already running. Stop it, and start it once the stubs are running.'.format(
+                    options['url']
+                )
+            )
+
+        site = Site.objects.get(domain=options['site_domain'])
+        manifest = seed_benchmark_data(
+            site, courses=options['courses'], orders=options['orders'], payments=options['requests']
+        )
+
+        stubs = build_stub_services(
+            base_port=options['stub_port'],
+            latency=options['stub_latency'] / 1000.0,
+            course_runs=manifest['course_runs'],
+            program=manifest['program'],
+        )
+        for stub in stubs.values():
+            stub.start()
+
+        try:
+            with configure_site(site.siteconfiguration, stubs):
+                self.stdout.write(
+                    'Stub services are running. Start the server at [{}] now.'.format(options['url'])
+                )
+                if not wait_for_server(options['url'], timeout=options['server_timeout']):
+                    raise CommandError('The server at [{}] was not started.'.format(options['url']))
+
+                results = run_benchmarks(
+                    options['url'],
+                    manifest,
+                    scenarios=options['scenarios'],
+                    concurrency=options['concurrency'],
+                    requests_count=options['requests'],
+                )
+        finally:
+            for stub in stubs.values():
+                stub.stop()
+
+        report = {
+            'commit': get_git_commit(),
+            'date': timezone.now().isoformat(),
+            'options': {
+                key: options[key] for key in ('concurrency', 'requests', 'stub_latency', 'courses', 'orders')
+            },
+            'results': results,
+        }
+
+        row = '{:<20}{:>10}{:>8}{:>10}{:>10}{:>10}{:>10}{:>10}'
+        self.stdout.write(row.format('scenario', 'requests', 'errors', 'rps', 'p50', 'p95', 'p99', 'queries'))
+        for name, summary in results.items():
+            self.stdout.write(row.format(name, *[
+                '-' if value is None else value for value in summary.values()
+            ]))
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS('Wrote results to [{}].'.format(options['output'])))
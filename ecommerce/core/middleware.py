@@ -0,0 +1,119 @@
+"""
+Middleware for the core app.
+"""
+import json
+import logging
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from ecommerce.core import db_routers, performance, transaction_guard
+
+logger = logging.getLogger(__name__)
+
+
+class PerformanceMiddleware(object):
+    """
+    Middleware that records the SQL queries, cache lookups and outbound HTTP calls of each request.
+
+    The counters are returned in a Server-Timing header, logged, and added to the aggregates of the view.
+    A warning is logged when a request exceeds the budget of its view, as configured by PERFORMANCE_BUDGETS.
+    This middleware should be added first, so that the work of the other middleware is recorded as well.
+    """
+
+    def __init__(self):
+        if not settings.PERFORMANCE_INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed
+
+        performance.install()
+
+    def process_request(self, request):
+        request.performance_recorder = performance.RequestRecorder()
+        performance.activate(request.performance_recorder)
+
+        # Queries are only logged by connections using a debug cursor. The queries of every database are
+        # recorded, since reads may be routed to the read replica.
+        request.performance_connections = []
+        for db_connection in connections.all():
+            request.performance_connections.append(
+                (db_connection, db_connection.force_debug_cursor, len(db_connection.queries_log))
+            )
+            db_connection.force_debug_cursor = True
+
+    def process_response(self, request, response):
+        recorder = getattr(request, 'performance_recorder', None)
+        if recorder is None:
+            return response
+
+        performance.activate(None)
+        # The query log is a bounded deque: requests running more queries than it holds are under-counted.
+        for db_connection, force_debug_cursor, queries_logged in request.performance_connections:
+            recorder.record_queries(list(db_connection.queries_log)[queries_logged:])
+            db_connection.force_debug_cursor = force_debug_cursor
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        view_name = resolver_match.view_name if resolver_match else 'unresolved'
+        summary = recorder.summary()
+
+        response['Server-Timing'] = performance.format_server_timing(summary)
+        logger.info('Performance of view [%s]: %s', view_name, json.dumps(summary, sort_keys=True))
+        performance.record_aggregate(view_name, summary)
+
+        exceeded = performance.get_exceeded_budget(view_name, summary)
+        if exceeded:
+            logger.warning(
+                'View [%s] exceeded its performance budget for [%s] %s: %s',
+                view_name,
+                request.path,
+                ', '.join(sorted(exceeded)),
+                json.dumps(exceeded, sort_keys=True)
+            )
+
+        return response
+
+
+class ReadReplicaMiddleware(object):
+    """
+    Pins the reads of a client to the primary database for READ_REPLICA_MAX_LAG seconds after it writes.
+
+    Pages read right after a write, such as the receipt page shown after order placement, would otherwise
+    miss the write while it is replicated.
+    """
+    PIN_COOKIE_NAME = 'ecommerce_read_primary'
+
+    def __init__(self):
+        if not db_routers.is_read_replica_configured():
+            raise MiddlewareNotUsed
+
+    def process_request(self, request):
+        db_routers.reset()
+        db_routers.pin_to_primary(self.PIN_COOKIE_NAME in request.COOKIES)
+
+    def process_response(self, request, response):  # pylint: disable=unused-argument
+        if db_routers.has_written():
+            response.set_cookie(self.PIN_COOKIE_NAME, '1', max_age=settings.READ_REPLICA_MAX_LAG, httponly=True)
+
+        db_routers.reset()
+        return response
+
+
+class TransactionGuardMiddleware(object):
+    """
+    Flags the outbound HTTP calls made while the request holds a database transaction open.
+
+    See ecommerce.core.transaction_guard.
+    """
+
+    def __init__(self):
+        if not settings.OUTBOUND_CALL_IN_TRANSACTION_GUARD:
+            raise MiddlewareNotUsed
+
+        transaction_guard.install()
+
+    def process_request(self, request):
+        transaction_guard.activate(request.path)
+
+    def process_response(self, request, response):  # pylint: disable=unused-argument
+        transaction_guard.deactivate()
+        return response
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from ecommerce.core.constants import SHORT_TRANSACTIONS_SWITCH
+
+
+def create_switch(apps, schema_editor):
+    """Create a switch for running views using ShortTransactionMixin outside of the request transaction."""
+    Switch = apps.get_model('waffle', 'Switch')
+    Switch.objects.get_or_create(name=SHORT_TRANSACTIONS_SWITCH, defaults={'active': False})
+
+
+def remove_switch(apps, schema_editor):
+    """Remove the short transactions switch."""
+    Switch = apps.get_model('waffle', 'Switch')
+    Switch.objects.filter(name=SHORT_TRANSACTIONS_SWITCH).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0048_siteconfiguration_edly_client_theme_branding_settings'),
+        ('waffle', '0001_initial'),
+    ]
+    operations = [
+        migrations.RunPython(create_switch, remove_switch)
+    ]
@@ -1,8 +1,8 @@
-import datetime
 import hashlib
 import logging
 from urlparse import urljoin, urlsplit, urlunsplit
 
+from analytics import Client as SegmentClient
 from dateutil.parser import parse
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
@@ -13,12 +13,12 @@ from django.utils.functional import cached_property
 from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
 from edx_django_utils.cache import TieredCache
-from edx_rest_api_client.client import EdxRestApiClient
 from jsonfield.fields import JSONField
 from requests.exceptions import ConnectionError, Timeout
 from slumber.exceptions import HttpNotFoundError, SlumberBaseException
 
-from analytics import Client as SegmentClient
+from ecommerce.core.service_clients import get_service_client, get_user_service_client
+from ecommerce.core.service_tokens import get_access_token
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.core.utils import log_message_and_raise_validation_error
 from ecommerce.extensions.payment.exceptions import ProcessorNotFoundError
@@ -372,29 +372,13 @@ class SiteConfiguration(models.Model):
     def access_token(self):
         """ Returns an access token for this site's service user.
 
-        The access token is retrieved using the current site's OAuth credentials and the client credentials grant.
-        The token is cached for the lifetime of the token, as specified by the OAuth provider's response. The token
-        type is JWT.
+        The token is cached, and renewed before it expires, as described in ecommerce.core.service_tokens.
+        The token type is JWT.
 
         Returns:
             str: JWT access token
         """
-        key = 'siteconfiguration_access_token_{}'.format(self.id)
-        access_token_cached_response = TieredCache.get_cached_response(key)
-        if access_token_cached_response.is_found:
-            return access_token_cached_response.value
-
-        url = '{root}/access_token'.format(root=self.oauth2_provider_url)
-        access_token, expiration_datetime = EdxRestApiClient.get_oauth_access_token(
-            url,
-            self.oauth_settings['SOCIAL_AUTH_EDX_OIDC_KEY'],  # pylint: disable=unsubscriptable-object
-            self.oauth_settings['SOCIAL_AUTH_EDX_OIDC_SECRET'],  # pylint: disable=unsubscriptable-object
-            token_type='jwt'
-        )
-
-        expires = (expiration_datetime - datetime.datetime.utcnow()).seconds
-        TieredCache.set_all_tiers(key, access_token, expires)
-        return access_token
+        return get_access_token(self)
 
     @cached_property
     def discovery_api_client(self):
@@ -405,7 +389,7 @@ class SiteConfiguration(models.Model):
             EdxRestApiClient: The client to access the Discovery service.
         """
 
-        return EdxRestApiClient(self.discovery_api_url, jwt=self.access_token)
+        return get_service_client(self, 'discovery', self.discovery_api_url)
 
     # TODO: journals dependency
     @cached_property
@@ -425,12 +409,12 @@ class SiteConfiguration(models.Model):
             split_url.fragment
         ])
 
-        return EdxRestApiClient(journal_discovery_url, jwt=self.access_token)
+        return get_service_client(self, 'discovery', journal_discovery_url)
 
     @cached_property
     def embargo_api_client(self):
         """ Returns the URL for the embargo API """
-        return EdxRestApiClient(self.build_lms_url('/api/embargo/v1'), jwt=self.access_token)
+        return get_service_client(self, 'lms', self.build_lms_url('/api/embargo/v1'))
 
     @cached_property
     def enterprise_api_client(self):
@@ -444,11 +428,11 @@ class SiteConfiguration(models.Model):
             EdxRestApiClient: The client to access the Enterprise service.
 
         """
-        return EdxRestApiClient(self.enterprise_api_url, jwt=self.access_token)
+        return get_service_client(self, 'enterprise', self.enterprise_api_url)
 
     @cached_property
     def consent_api_client(self):
-        return EdxRestApiClient(self.build_lms_url('/consent/api/v1/'), jwt=self.access_token, append_slash=False)
+        return get_service_client(self, 'lms', self.build_lms_url('/consent/api/v1/'), append_slash=False)
 
     @cached_property
     def user_api_client(self):
@@ -458,23 +442,23 @@ class SiteConfiguration(models.Model):
         Returns:
             EdxRestApiClient: The client to access the LMS user API service.
         """
-        return EdxRestApiClient(self.build_lms_url('/api/user/v1/'), jwt=self.access_token)
+        return get_service_client(self, 'lms', self.build_lms_url('/api/user/v1/'))
 
     @cached_property
     def commerce_api_client(self):
-        return EdxRestApiClient(self.build_lms_url('/api/commerce/v1/'), jwt=self.access_token)
+        return get_service_client(self, 'lms', self.build_lms_url('/api/commerce/v1/'))
 
     @cached_property
     def credit_api_client(self):
-        return EdxRestApiClient(self.build_lms_url('/api/credit/v1/'), jwt=self.access_token)
+        return get_service_client(self, 'lms', self.build_lms_url('/api/credit/v1/'))
 
     @cached_property
     def enrollment_api_client(self):
-        return EdxRestApiClient(self.build_lms_url('/api/enrollment/v1/'), jwt=self.access_token, append_slash=False)
+        return get_service_client(self, 'lms', self.build_lms_url('/api/enrollment/v1/'), append_slash=False)
 
     @cached_property
     def entitlement_api_client(self):
-        return EdxRestApiClient(self.build_lms_url('/api/entitlements/v1/'), jwt=self.access_token)
+        return get_service_client(self, 'lms', self.build_lms_url('/api/entitlements/v1/'))
 
 
 class User(AbstractUser):
@@ -495,6 +479,34 @@ class User(AbstractUser):
         get_latest_by = 'date_joined'
         db_table = 'ecommerce_user'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super(User, cls).from_db(db, field_names, values)
+        # The values in the database let post_save receivers tell which fields were changed, see has_changed().
+        user._loaded_values = dict(zip(field_names, values))  # pylint: disable=protected-access
+        return user
+
+    def save(self, *args, **kwargs):
+        super(User, self).save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        loaded_values = getattr(self, '_loaded_values', {}) if update_fields is not None else {}
+        loaded_values.update({
+            field.attname: getattr(self, field.attname) for field in self._meta.concrete_fields
+            if update_fields is None or field.name in update_fields
+        })
+        self._loaded_values = loaded_values  # pylint: disable=attribute-defined-outside-init
+
+    def has_changed(self, *field_names):
+        """
+        Returns True if any of the given fields differs from the value last loaded from, or saved to,
+        the database. Fields of users which were neither loaded nor saved are considered changed.
+        """
+        loaded_values = getattr(self, '_loaded_values', {})
+        return any(
+            field_name not in loaded_values or loaded_values[field_name] != getattr(self, field_name)
+            for field_name in field_names
+        )
+
     def get_full_name(self):
         return self.full_name or super(User, self).get_full_name()
 
@@ -512,10 +524,9 @@ class User(AbstractUser):
             connection with the LMS account API endpoint.
         """
         try:
-            api = EdxRestApiClient(
-                request.site.siteconfiguration.build_lms_url('/api/user/v1'),
-                append_slash=False,
-                jwt=request.site.siteconfiguration.access_token
+            site_configuration = request.site.siteconfiguration
+            api = get_service_client(
+                site_configuration, 'lms', site_configuration.build_lms_url('/api/user/v1'), append_slash=False
             )
             response = api.accounts(self.username).get()
             return response
@@ -547,10 +558,7 @@ class User(AbstractUser):
             'course_key': course_key
         }
         try:
-            api = EdxRestApiClient(
-                get_lms_url('api/credit/v1/'),
-                oauth_access_token=self.access_token
-            )
+            api = get_user_service_client('lms', get_lms_url('api/credit/v1/'), self.access_token)
             response = api.eligibility().get(**query_strings)
         except (ConnectionError, SlumberBaseException, Timeout):  # pragma: no cover
             log.exception(
@@ -580,9 +588,8 @@ class User(AbstractUser):
             if verification_cached_response.is_found:
                 return verification_cached_response.value
 
-            api = EdxRestApiClient(
-                site.siteconfiguration.build_lms_url('api/user/v1/'),
-                oauth_access_token=self.access_token
+            api = get_user_service_client(
+                'lms', site.siteconfiguration.build_lms_url('api/user/v1/'), self.access_token
             )
             response = api.accounts(self.username).verification_status().get()
 
@@ -0,0 +1,179 @@
+"""
+Per-request performance instrumentation.
+
+While a request is handled, a recorder counts the SQL queries it runs, its TieredCache hits and misses,
+and the outbound HTTP calls it makes to other services, along with the time spent on each.
+The PerformanceMiddleware reports these counters in a Server-Timing header and a log line, adds them to
+the aggregates served by the performance metrics view, and warns when a view exceeds its budget.
+"""
+from __future__ import unicode_literals
+
+import threading
+import time
+from collections import defaultdict
+from urlparse import urlparse
+
+import requests
+from django.conf import settings
+from edx_django_utils.cache import TieredCache
+
+# Counters compared against the budgets of PERFORMANCE_BUDGETS.
+BUDGETED_COUNTERS = ('queries', 'cache_misses', 'outbound_calls', 'duration')
+DEFAULT_BUDGET = 'default'
+
+_local = threading.local()
+_install_lock = threading.Lock()
+_installed = []
+_aggregates_lock = threading.Lock()
+_aggregates = {}
+
+
+class RequestRecorder(object):
+    """ Counters of a single request. Counters may be updated by the threads the request starts. """
+
+    def __init__(self):
+        self.started = time.time()
+        self.queries = 0
+        self.query_duration = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.outbound = defaultdict(lambda: [0, 0.0])
+        self._lock = threading.Lock()
+
+    def record_cache_lookup(self, hit):
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def record_outbound_call(self, host, duration):
+        with self._lock:
+            calls = self.outbound[host]
+            calls[0] += 1
+            calls[1] += duration
+
+    def record_queries(self, queries):
+        """ Record the queries logged by a database connection, as found in connection.queries_log. """
+        for query in queries:
+            self.queries += 1
+            self.query_duration += float(query.get('time') or 0)
+
+    def summary(self):
+        """ Returns the counters of the request, with durations in milliseconds. """
+        with self._lock:
+            outbound = {host: {'calls': calls, 'duration': round(duration * 1000, 2)}
+                        for host, (calls, duration) in self.outbound.items()}
+            return {
+                'duration': round((time.time() - self.started) * 1000, 2),
+                'queries': self.queries,
+                'query_duration': round(self.query_duration * 1000, 2),
+                'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses,
+                'outbound_calls': sum(calls['calls'] for calls in outbound.values()),
+                'outbound_duration': round(sum(calls['duration'] for calls in outbound.values()), 2),
+                'outbound': outbound,
+            }
+
+
+def get_recorder():
+    """ Returns the recorder of the request handled by the current thread, or None. """
+    return getattr(_local, 'recorder', None)
+
+
+def activate(recorder):
+    """ Record the work of the current thread with the given recorder. Pass None to stop recording. """
+    _local.recorder = recorder
+
+
+def format_server_timing(summary):
+    """ Returns the value of the Server-Timing header describing the summary of a request. """
+    metrics = [
+        'db;dur={query_duration};desc="{queries} queries"'.format(**summary),
+        'cache;desc="{cache_hits} hits, {cache_misses} misses"'.format(**summary),
+        'http;dur={outbound_duration};desc="{outbound_calls} calls"'.format(**summary),
+        'total;dur={duration}'.format(**summary),
+    ]
+    return ', '.join(metrics)
+
+
+def get_budget(view_name):
+    """ Returns the budget of a view, falling back to the default budget. """
+    budgets = settings.PERFORMANCE_BUDGETS
+    budget = dict(budgets.get(DEFAULT_BUDGET, {}))
+    budget.update(budgets.get(view_name, {}))
+    return budget
+
+
+def get_exceeded_budget(view_name, summary):
+    """ Returns the counters of a request which exceeded the budget of its view, with their limit. """
+    budget = get_budget(view_name)
+    return {
+        counter: (summary[counter], budget[counter])
+        for counter in BUDGETED_COUNTERS
+        if budget.get(counter) is not None and summary[counter] > budget[counter]
+    }
+
+
+def record_aggregate(view_name, summary):
+    """ Add the summary of a request to the aggregates of its view. """
+    with _aggregates_lock:
+        aggregate = _aggregates.setdefault(view_name, defaultdict(float))
+        aggregate['requests'] += 1
+        for counter in ('duration', 'queries', 'query_duration', 'cache_hits', 'cache_misses',
+                        'outbound_calls', 'outbound_duration'):
+            aggregate[counter] += summary[counter]
+            aggregate['max_' + counter] = max(aggregate['max_' + counter], summary[counter])
+
+
+def get_aggregates():
+    """ Returns the totals, averages and maximums of the counters of each view since the process started. """
+    with _aggregates_lock:
+        aggregates = {}
+        for view_name, aggregate in _aggregates.items():
+            requests_count = aggregate['requests']
+            aggregates[view_name] = dict(aggregate)
+            for counter in ('duration', 'queries', 'cache_misses', 'outbound_calls'):
+                aggregates[view_name]['avg_' + counter] = round(aggregate[counter] / requests_count, 2)
+        return aggregates
+
+
+def reset_aggregates():
+    with _aggregates_lock:
+        _aggregates.clear()
+
+
+def install():
+    """
+    Instrument TieredCache lookups and outbound HTTP calls made with requests, so that they are
+    counted by the recorder of the current request. Instrumentation is installed once per process.
+    """
+    with _install_lock:
+        if _installed:
+            return
+
+        get_cached_response = TieredCache.get_cached_response.__func__
+
+        def instrumented_get_cached_response(cls, key):
+            response = get_cached_response(cls, key)
+            recorder = get_recorder()
+            if recorder is not None:
+                recorder.record_cache_lookup(response.is_found)
+            return response
+
+        send = requests.adapters.HTTPAdapter.send
+
+        def instrumented_send(self, request, *args, **kwargs):
+            recorder = get_recorder()
+            if recorder is None:
+                return send(self, request, *args, **kwargs)
+
+            started = time.time()
+            try:
+                return send(self, request, *args, **kwargs)
+            finally:
+                recorder.record_outbound_call(urlparse(request.url).netloc, time.time() - started)
+
+        TieredCache.get_cached_response = classmethod(instrumented_get_cached_response)
+        requests.adapters.HTTPAdapter.send = instrumented_send
+        _installed.append(True)
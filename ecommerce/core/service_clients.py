@@ -0,0 +1,153 @@
+"""
+Pooled clients for the services ecommerce calls: the LMS, Discovery, Enterprise and Journals services.
+
+Clients are kept for the lifetime of the process, so that connections to each service are kept alive
+and reused across requests, instead of being opened for every call. The pool size and timeout of each
+service are configured by the SERVICE_CLIENTS setting.
+"""
+from __future__ import unicode_literals
+
+import threading
+
+import requests
+from django.conf import settings
+from edx_rest_api_client.auth import SuppliedJwtAuth
+from edx_rest_api_client.client import EdxRestApiClient
+
+from ecommerce.core.eligibility import EligibilityGate
+
+DEFAULT_SERVICE = 'default'
+
+_lock = threading.RLock()
+_adapters = {}
+_site_clients = {}
+
+
+class SiteJwtAuth(SuppliedJwtAuth):
+    """
+    Attaches the access token of a site's service user to requests.
+
+    The token is read when each request is made, so that long-lived clients use the token
+    refreshed by SiteConfiguration.access_token once the previous one expires.
+    """
+
+    def __init__(self, site_configuration):  # pylint: disable=super-init-not-called
+        self.site_configuration = site_configuration
+
+    @property
+    def token(self):
+        return self.site_configuration.access_token
+
+
+class PooledSession(requests.Session):
+    """ Session which sends its requests through the connection pool of a service, with the service's timeout. """
+
+    def __init__(self, service):
+        super(PooledSession, self).__init__()
+        adapter = get_service_adapter(service)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+        self.timeout = get_service_config(service)['TIMEOUT']
+
+    def request(self, method, url, **kwargs):  # pylint: disable=arguments-differ
+        kwargs.setdefault('timeout', self.timeout)
+        return super(PooledSession, self).request(method, url, **kwargs)
+
+
+def get_service_config(service):
+    """ Returns the pool size and timeout of a service, falling back to the default configuration. """
+    config = dict(settings.SERVICE_CLIENTS[DEFAULT_SERVICE])
+    config.update(settings.SERVICE_CLIENTS.get(service, {}))
+    return config
+
+
+def get_service_adapter(service):
+    """ Returns the transport adapter holding the connection pool of a service. """
+    adapter = _adapters.get(service)
+    if adapter is None:
+        with _lock:
+            adapter = _adapters.get(service)
+            if adapter is None:
+                pool_size = get_service_config(service)['POOL_SIZE']
+                adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+                _adapters[service] = adapter
+    return adapter
+
+
+def get_service_client(site_configuration, service, url, append_slash=True):
+    """
+    Returns the client of a service, authenticated as the site's service user.
+
+    Clients are shared by all requests of the process.
+
+    Arguments:
+        site_configuration (SiteConfiguration): Configuration of the site calling the service.
+        service (str): Name of the service, used to look up its configuration in SERVICE_CLIENTS.
+        url (str): Root URL of the service API.
+        append_slash (bool): Whether to append a slash to the URLs of resources.
+
+    Returns:
+        EdxRestApiClient
+    """
+    key = (site_configuration.id, service, url, append_slash)
+    client = _site_clients.get(key)
+    if client is None:
+        with _lock:
+            client = _site_clients.get(key)
+            if client is None:
+                client = _site_clients[key] = _build_client(service, url, append_slash=append_slash)
+                client._store['session'].auth = SiteJwtAuth(site_configuration)  # pylint: disable=protected-access
+
+    # Use the latest configuration of the site to retrieve access tokens.
+    client._store['session'].auth.site_configuration = site_configuration  # pylint: disable=protected-access
+    return client
+
+
+def get_user_service_client(service, url, oauth_access_token, append_slash=True):
+    """
+    Returns a client of a service, authenticated with a user's OAuth access token.
+
+    The client shares the connection pool of the service with the other clients of the service.
+    """
+    return _build_client(service, url, oauth_access_token=oauth_access_token, append_slash=append_slash)
+
+
+def _build_client(service, url, **kwargs):
+    session = PooledSession(service)
+    return EdxRestApiClient(url, session=session, timeout=session.timeout, **kwargs)
+
+
+def call_concurrently(calls, timeout=None):
+    """
+    Make several service calls concurrently.
+
+    Example:
+        results = call_concurrently({
+            'seat': lambda: client.courses(course_id).get(),
+            'entitlement': lambda: client.entitlements(uuid).get(),
+        })
+
+    Arguments:
+        calls (dict): Functions making the calls, keyed by name.
+        timeout (float): Seconds to wait for the calls. Defaults to ELIGIBILITY_CHECK_TIMEOUT.
+
+    Returns:
+        dict: Results of the calls keyed by name. The result of calls which did not complete in time is None.
+
+    Raises:
+        Exception: The first exception raised by one of the calls.
+    """
+    gate = EligibilityGate()
+    for name, call in calls.items():
+        gate.add_check(name, call, timeout=timeout)
+    gate.run()
+    return {name: gate.result(name) for name in calls}
+
+
+def clear_service_clients():
+    """ Close the connection pools, and discard the clients, of all services. """
+    with _lock:
+        for adapter in _adapters.values():
+            adapter.close()
+        _adapters.clear()
+        _site_clients.clear()
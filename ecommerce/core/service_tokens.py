@@ -0,0 +1,132 @@
+"""
+Access tokens of the sites' service users.
+
+Tokens are cached along with the time at which they expire, and renewed once they enter the refresh window
+configured by SERVICE_TOKEN_REFRESH_WINDOW. Only one worker renews the token of a site at a time: it holds
+a lock in the cache while the other workers keep using the current token. Tokens are renewed by the
+refresh_service_access_tokens task, or in a background thread by the first request made in the refresh
+window, so that requests only wait for a token when none is cached.
+"""
+from __future__ import unicode_literals
+
+import datetime
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from edx_django_utils.cache import TieredCache
+from edx_rest_api_client.client import EdxRestApiClient
+
+logger = logging.getLogger(__name__)
+
+
+def _get_cache_key(site_configuration):
+    return 'service_access_token_{}'.format(site_configuration.id)
+
+
+def _get_lock_key(site_configuration):
+    return 'service_access_token_lock_{}'.format(site_configuration.id)
+
+
+def cache_access_token(site_configuration, access_token, lifetime):
+    """ Cache the access token of a site for its lifetime, in seconds. """
+    TieredCache.set_all_tiers(
+        _get_cache_key(site_configuration), (access_token, time.time() + lifetime), lifetime
+    )
+
+
+def get_cached_access_token(site_configuration):
+    """ Returns the cached access token of a site and the time at which it expires, or (None, None). """
+    cached_response = TieredCache.get_cached_response(_get_cache_key(site_configuration))
+    if cached_response.is_found:
+        return cached_response.value
+    return None, None
+
+
+def needs_refresh(expires_at):
+    """ Returns True if a token expiring at the given time should be renewed. """
+    return expires_at is None or expires_at - time.time() < settings.SERVICE_TOKEN_REFRESH_WINDOW
+
+
+def get_access_token(site_configuration):
+    """
+    Returns an access token for the site's service user.
+
+    A token is only fetched by the calling thread if none is cached. Tokens in the refresh window are
+    returned while they are renewed in the background.
+    """
+    access_token, expires_at = get_cached_access_token(site_configuration)
+    if access_token is None or expires_at <= time.time():
+        return fetch_access_token(site_configuration)
+
+    if needs_refresh(expires_at):
+        refresh_access_token_in_background(site_configuration)
+    return access_token
+
+
+def fetch_access_token(site_configuration):
+    """
+    Fetch a new access token from the OAuth provider, using the site's OAuth credentials and the client
+    credentials grant, and cache it for its lifetime. The token type is JWT.
+
+    Returns:
+        str: JWT access token
+    """
+    url = '{root}/access_token'.format(root=site_configuration.oauth2_provider_url)
+    access_token, expiration_datetime = EdxRestApiClient.get_oauth_access_token(
+        url,
+        site_configuration.oauth_settings['SOCIAL_AUTH_EDX_OIDC_KEY'],  # pylint: disable=unsubscriptable-object
+        site_configuration.oauth_settings['SOCIAL_AUTH_EDX_OIDC_SECRET'],  # pylint: disable=unsubscriptable-object
+        token_type='jwt'
+    )
+
+    lifetime = int((expiration_datetime - datetime.datetime.utcnow()).total_seconds())
+    cache_access_token(site_configuration, access_token, lifetime)
+    return access_token
+
+
+def refresh_access_token(site_configuration):
+    """
+    Renew the access token of a site, unless another worker is renewing it.
+
+    Returns:
+        bool: True if this worker renewed the token.
+    """
+    if not cache.add(_get_lock_key(site_configuration), True, settings.SERVICE_TOKEN_LOCK_TIMEOUT):
+        return False
+
+    return _renew_access_token(site_configuration)
+
+
+def refresh_access_token_in_background(site_configuration):
+    """
+    Renew the access token of a site in a background thread, unless another worker is renewing it.
+
+    Returns:
+        Thread: The thread renewing the token, or None.
+    """
+    if not cache.add(_get_lock_key(site_configuration), True, settings.SERVICE_TOKEN_LOCK_TIMEOUT):
+        return None
+
+    thread = threading.Thread(
+        target=_renew_access_token,
+        args=(site_configuration,),
+        name='service-access-token-{}'.format(site_configuration.id)
+    )
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
+def _renew_access_token(site_configuration):
+    try:
+        fetch_access_token(site_configuration)
+        return True
+    except Exception:  # pylint: disable=broad-except
+        # The current token is used until it expires, or until it is renewed.
+        logger.exception('Failed to renew the access token of site configuration [%d].', site_configuration.id)
+        return False
+    finally:
+        cache.delete(_get_lock_key(site_configuration))
@@ -0,0 +1,19 @@
+""" Celery tasks which renew the access tokens of the sites' service users. """
+from __future__ import unicode_literals
+
+from celery import shared_task
+
+from ecommerce.core.models import SiteConfiguration
+from ecommerce.core.service_tokens import get_cached_access_token, needs_refresh, refresh_access_token
+
+
+@shared_task(ignore_result=True)
+def refresh_service_access_tokens():
+    """ Renew the access tokens which are about to expire, of the sites having OAuth credentials. """
+    for site_configuration in SiteConfiguration.objects.order_by('id'):
+        if not (site_configuration.oauth_settings or {}).get('SOCIAL_AUTH_EDX_OIDC_KEY'):
+            continue
+
+        __, expires_at = get_cached_access_token(site_configuration)
+        if needs_refresh(expires_at):
+            refresh_access_token(site_configuration)
@@ -0,0 +1,108 @@
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.views.generic import View
+from oscar.core.loading import get_model
+
+from ecommerce.core import db_routers
+from ecommerce.core.middleware import ReadReplicaMiddleware
+from ecommerce.core.views import ReadReplicaMixin
+from ecommerce.tests.testcases import TestCase
+
+Order = get_model('order', 'Order')
+
+REPLICA_DATABASES = dict(settings.DATABASES, read_replica=settings.DATABASES['default'])
+
+
+class RoutedView(ReadReplicaMixin, View):
+    def get(self, request):  # pylint: disable=unused-argument
+        return HttpResponse(db_routers.should_use_replica())
+
+    def post(self, request):  # pylint: disable=unused-argument
+        return HttpResponse(db_routers.should_use_replica())
+
+
+@override_settings(DATABASES=REPLICA_DATABASES)
+class ReadReplicaRouterTests(TestCase):
+    def setUp(self):
+        super(ReadReplicaRouterTests, self).setUp()
+        self.router = db_routers.ReadReplicaRouter()
+        db_routers.reset()
+        self.addCleanup(db_routers.reset)
+
+    def test_db_for_read(self):
+        """ Verify reads are only sent to the replica inside the read_replica() context. """
+        self.assertIsNone(self.router.db_for_read(Order))
+        with db_routers.read_replica():
+            self.assertEqual(self.router.db_for_read(Order), db_routers.READ_REPLICA)
+        self.assertIsNone(self.router.db_for_read(Order))
+
+    @override_settings(DATABASES={'default': settings.DATABASES['default']})
+    def test_db_for_read_without_replica(self):
+        """ Verify reads use the primary database if no replica is configured. """
+        with db_routers.read_replica():
+            self.assertIsNone(self.router.db_for_read(Order))
+
+    def test_db_for_read_after_write(self):
+        """ Verify reads use the primary database once the request has written, except to sessions. """
+        with db_routers.read_replica():
+            self.router.db_for_write(Session)
+            self.assertEqual(self.router.db_for_read(Order), db_routers.READ_REPLICA)
+
+            self.router.db_for_write(Order)
+            self.assertIsNone(self.router.db_for_read(Order))
+
+    def test_db_for_read_pinned(self):
+        """ Verify reads use the primary database while the client is pinned to it. """
+        db_routers.pin_to_primary()
+        with db_routers.read_replica():
+            self.assertIsNone(self.router.db_for_read(Order))
+
+    def test_db_for_write(self):
+        """ Verify objects read from the replica are written to the primary database. """
+        order = Order()
+        self.assertIsNone(self.router.db_for_write(Order, instance=order))
+
+        order._state.db = db_routers.READ_REPLICA  # pylint: disable=protected-access
+        self.assertEqual(self.router.db_for_write(Order, instance=order), 'default')
+
+    def test_allow_migrate(self):
+        self.assertFalse(self.router.allow_migrate(db_routers.READ_REPLICA, 'order'))
+        self.assertIsNone(self.router.allow_migrate('default', 'order'))
+
+    def test_mixin(self):
+        """ Verify only the safe requests of views using ReadReplicaMixin read from the replica. """
+        view = RoutedView.as_view()
+        self.assertEqual(view._non_atomic_requests, {'default'})  # pylint: disable=protected-access
+
+        factory = RequestFactory()
+        self.assertEqual(view(factory.get('/')).content, 'True')
+        self.assertEqual(view(factory.post('/')).content, 'False')
+
+    def test_middleware(self):
+        """ Verify clients are pinned to the primary database after they write. """
+        middleware = ReadReplicaMiddleware()
+        request = RequestFactory().get('/')
+
+        middleware.process_request(request)
+        response = middleware.process_response(request, HttpResponse())
+        self.assertNotIn(ReadReplicaMiddleware.PIN_COOKIE_NAME, response.cookies)
+
+        middleware.process_request(request)
+        self.router.db_for_write(Order)
+        response = middleware.process_response(request, HttpResponse())
+        cookie = response.cookies[ReadReplicaMiddleware.PIN_COOKIE_NAME]
+        self.assertEqual(cookie['max-age'], settings.READ_REPLICA_MAX_LAG)
+        self.assertFalse(db_routers.has_written())
+
+        request.COOKIES[ReadReplicaMiddleware.PIN_COOKIE_NAME] = cookie.value
+        middleware.process_request(request)
+        with db_routers.read_replica():
+            self.assertIsNone(self.router.db_for_read(Order))
+
+    @override_settings(DATABASES={'default': settings.DATABASES['default']})
+    def test_middleware_without_replica(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ReadReplicaMiddleware()
@@ -0,0 +1,93 @@
+import time
+
+import mock
+from django.test import override_settings
+from edx_django_utils.cache import RequestCache, TieredCache
+from gevent import sleep
+from gevent.event import Event
+
+from ecommerce.core.eligibility import EligibilityGate, get_eligibility_result
+from ecommerce.tests.testcases import TestCase
+
+
+class EligibilityGateTests(TestCase):
+    def test_checks_run_concurrently(self):
+        """ Verify the checks run at the same time, so that the gate waits for the slowest check only. """
+        barrier = Event()
+
+        def first():
+            barrier.set()
+            return 'first'
+
+        def second():
+            # Only completes if the first check runs concurrently.
+            return barrier.wait(5) and 'second'
+
+        gate = EligibilityGate()
+        gate.add_check('second', second)
+        gate.add_check('first', first)
+        gate.run()
+
+        self.assertEqual(gate.result('first'), 'first')
+        self.assertEqual(gate.result('second'), 'second')
+
+    @override_settings(ELIGIBILITY_CHECK_TIMEOUT=0.05)
+    def test_timeout_fallback(self):
+        """ Verify checks which do not complete in time are given their fallback result. """
+        gate = EligibilityGate()
+        gate.add_check('slow', sleep, args=(5,), fallback='fallback')
+        gate.add_check('fast', lambda: 'fast', timeout=5)
+
+        with mock.patch('ecommerce.core.eligibility.logger.warning') as mock_warning:
+            started = time.time()
+            gate.run()
+            self.assertLess(time.time() - started, 5)
+            self.assertTrue(mock_warning.called)
+
+        self.assertTrue(gate.timed_out('slow'))
+        self.assertFalse(gate.timed_out('fast'))
+        self.assertEqual(gate.result('slow'), 'fallback')
+        self.assertEqual(gate.result('fast'), 'fast')
+
+    def test_request_cache_shared(self):
+        """ Verify checks read the request cache of the request, and that the values they cache are kept. """
+        RequestCache().set('cached', 'request')
+
+        def cache_value():
+            TieredCache.set_all_tiers('check', 'value')
+            return TieredCache.get_cached_response('cached').value
+
+        gate = EligibilityGate()
+        gate.add_check('cache', cache_value)
+        gate.run()
+
+        self.assertEqual(gate.result('cache'), 'request')
+        self.assertEqual(RequestCache().get_cached_response('check').value, 'value')
+
+    def test_exception_raised_on_result(self):
+        """ Verify exceptions raised by a check are raised when its result is retrieved. """
+        def failing():
+            raise ValueError('failed')
+
+        gate = EligibilityGate()
+        gate.add_check('failing', failing)
+        gate.run()
+
+        with self.assertRaisesRegexp(ValueError, 'failed'):
+            gate.result('failing')
+
+        with self.assertRaises(KeyError):
+            gate.result('unknown')
+
+    def test_get_eligibility_result(self):
+        """ Verify results of the request's gate are used, and that other checks are run directly. """
+        gate = EligibilityGate()
+        gate.add_check('gated', lambda: 'gated')
+        gate.run()
+        request = mock.Mock(eligibility_gate=gate)
+        func = mock.Mock(return_value='direct')
+
+        self.assertEqual(get_eligibility_result(request, 'gated', func, 'arg'), 'gated')
+        self.assertFalse(func.called)
+        self.assertEqual(get_eligibility_result(request, 'other', func, 'arg'), 'direct')
+        func.assert_called_once_with('arg')
@@ -0,0 +1,111 @@
+import json
+from collections import deque
+
+import httpretty
+import mock
+import requests
+from django.db import connection
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+from edx_django_utils.cache import TieredCache
+
+from ecommerce.core import performance
+from ecommerce.core.eligibility import EligibilityGate
+from ecommerce.core.middleware import PerformanceMiddleware
+from ecommerce.core.views import performance_metrics
+from ecommerce.tests.testcases import TestCase
+
+API_URL = 'http://service.example.com/api/v1/resource/'
+
+
+@override_settings(PERFORMANCE_INSTRUMENTATION_ENABLED=True)
+class PerformanceMiddlewareTests(TestCase):
+    def setUp(self):
+        super(PerformanceMiddlewareTests, self).setUp()
+        performance.reset_aggregates()
+        self.addCleanup(performance.reset_aggregates)
+
+    def test_server_timing(self):
+        """ Verify the counters of a request are returned in its Server-Timing header, and logged. """
+        with mock.patch('ecommerce.core.middleware.logger.info') as mock_info:
+            response = self.client.get(reverse('health'))
+
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('total;dur=', response['Server-Timing'])
+        view_name, summary = mock_info.call_args[0][1:]
+        self.assertEqual(view_name, 'health')
+        self.assertGreaterEqual(json.loads(summary)['queries'], 1)
+
+    @httpretty.activate
+    def test_recorder(self):
+        """ Verify cache lookups and outbound calls are recorded, including those of eligibility checks. """
+        httpretty.register_uri(httpretty.GET, API_URL, body='{}')
+        performance.install()
+        recorder = performance.RequestRecorder()
+        performance.activate(recorder)
+        self.addCleanup(performance.activate, None)
+
+        TieredCache.set_all_tiers('key', 'value', 60)
+        TieredCache.get_cached_response('key')
+        TieredCache.get_cached_response('missing')
+        requests.get(API_URL)
+
+        gate = EligibilityGate()
+        gate.add_check('call', requests.get, args=(API_URL,))
+        gate.run()
+        gate.result('call')
+
+        summary = recorder.summary()
+        self.assertEqual((summary['cache_hits'], summary['cache_misses']), (1, 1))
+        self.assertEqual(summary['outbound_calls'], 2)
+        self.assertEqual(summary['outbound']['service.example.com']['calls'], 2)
+
+    def test_queries_of_every_database(self):
+        """ Verify the queries run on every database are recorded, such as those routed to the read replica. """
+        replica = mock.Mock(force_debug_cursor=False, queries_log=deque())
+        middleware = PerformanceMiddleware()
+        request = RequestFactory().get('/')
+
+        with mock.patch('ecommerce.core.middleware.connections.all', return_value=[connection, replica]):
+            middleware.process_request(request)
+        self.assertTrue(replica.force_debug_cursor)
+
+        replica.queries_log.append({'sql': 'SELECT 1', 'time': '0.010'})
+        response = middleware.process_response(request, HttpResponse())
+        self.assertIn('db;dur=10.0;desc="1 queries"', response['Server-Timing'])
+        self.assertFalse(replica.force_debug_cursor)
+
+    @override_settings(PERFORMANCE_BUDGETS={'default': {'queries': 100}, 'health': {'queries': 0}})
+    def test_budget_exceeded(self):
+        """ Verify a warning is logged when a request exceeds the budget of its view. """
+        with mock.patch('ecommerce.core.middleware.logger.warning') as mock_warning:
+            self.client.get(reverse('health'))
+            self.assertTrue(mock_warning.called)
+            self.assertEqual(mock_warning.call_args[0][1], 'health')
+
+        with mock.patch('ecommerce.core.middleware.logger.warning') as mock_warning:
+            self.client.get(reverse('robots'))
+            self.assertFalse(mock_warning.called)
+
+    def test_metrics(self):
+        """ Verify the aggregated counters of each view are only available to staff users. """
+        self.client.get(reverse('health'))
+        self.client.get(reverse('health'))
+
+        self.request.user = self.create_user()
+        with self.assertRaises(Http404):
+            performance_metrics(self.request)
+
+        user = self.create_user(is_staff=True)
+        self.client.login(username=user.username, password=self.password)
+        metrics = self.client.get(reverse('performance_metrics')).json()
+        self.assertEqual(metrics['health']['requests'], 2)
+        self.assertIn('avg_queries', metrics['health'])
+
+    @override_settings(PERFORMANCE_INSTRUMENTATION_ENABLED=False)
+    def test_disabled(self):
+        """ Verify nothing is recorded while instrumentation is disabled. """
+        response = self.client.get(reverse('health'))
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(performance.get_aggregates(), {})
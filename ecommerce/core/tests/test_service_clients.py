@@ -0,0 +1,74 @@
+import httpretty
+from django.test import override_settings
+
+from ecommerce.core.service_clients import (
+    SiteJwtAuth,
+    call_concurrently,
+    get_service_adapter,
+    get_service_client,
+    get_user_service_client
+)
+from ecommerce.core.service_tokens import cache_access_token
+from ecommerce.tests.factories import SiteConfigurationFactory
+from ecommerce.tests.testcases import TestCase
+
+API_URL = 'http://service.example.com/api/v1/'
+
+
+class ServiceClientTests(TestCase):
+    def set_access_token(self, token):
+        cache_access_token(self.site_configuration, token, 3600)
+
+    def test_clients_are_shared(self):
+        """ Verify a single client is kept for each site and service. """
+        client = get_service_client(self.site_configuration, 'lms', API_URL)
+        self.assertIs(get_service_client(self.site_configuration, 'lms', API_URL), client)
+        self.assertIsNot(get_service_client(self.site_configuration, 'lms', API_URL, append_slash=False), client)
+
+        other_site_configuration = SiteConfigurationFactory(partner__short_code='other')
+        other_client = get_service_client(other_site_configuration, 'lms', API_URL)
+        self.assertIsNot(other_client, client)
+
+        # The clients of a service share its connection pool.
+        adapter = get_service_adapter('lms')
+        self.assertIs(client._store['session'].get_adapter(API_URL), adapter)  # pylint: disable=protected-access
+        self.assertIs(other_client._store['session'].get_adapter(API_URL), adapter)  # pylint: disable=protected-access
+
+    @httpretty.activate
+    def test_access_token_refresh(self):
+        """ Verify requests are made with the current access token of the site. """
+        httpretty.register_uri(httpretty.GET, API_URL + 'resource/', body='{}', content_type='application/json')
+        client = get_service_client(self.site_configuration, 'lms', API_URL)
+        self.assertIsInstance(client._store['session'].auth, SiteJwtAuth)  # pylint: disable=protected-access
+
+        self.set_access_token('first-token')
+        client.resource.get()
+        self.assertEqual(httpretty.last_request().headers['Authorization'], 'JWT first-token')
+
+        self.set_access_token('second-token')
+        client.resource.get()
+        self.assertEqual(httpretty.last_request().headers['Authorization'], 'JWT second-token')
+
+    @override_settings(SERVICE_CLIENTS={
+        'default': {'POOL_SIZE': 10, 'TIMEOUT': 5},
+        'journals': {'TIMEOUT': 2},
+    })
+    def test_service_configuration(self):
+        """ Verify the pool size and timeout of a service fall back to the default configuration. """
+        client = get_service_client(self.site_configuration, 'journals', API_URL)
+        session = client._store['session']  # pylint: disable=protected-access
+        self.assertEqual(session.timeout, 2)
+        self.assertEqual(session.get_adapter(API_URL)._pool_maxsize, 10)  # pylint: disable=protected-access
+
+    def test_user_service_client(self):
+        """ Verify clients authenticated as a user use their own session, and the connection pool of the service. """
+        client = get_user_service_client('lms', API_URL, 'user-token')
+        session = client._store['session']  # pylint: disable=protected-access
+        self.assertEqual(session.auth.token, 'user-token')
+        self.assertIs(session.get_adapter(API_URL), get_service_adapter('lms'))
+
+        other_client = get_user_service_client('lms', API_URL, 'other-token')
+        self.assertIsNot(other_client._store['session'], session)  # pylint: disable=protected-access
+
+    def test_call_concurrently(self):
+        self.assertEqual(call_concurrently({'a': lambda: 1, 'b': lambda: 2}), {'a': 1, 'b': 2})
@@ -0,0 +1,77 @@
+import httpretty
+import mock
+from django.core.cache import cache
+from django.test import override_settings
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
+
+from ecommerce.core import service_tokens
+from ecommerce.core.tasks import refresh_service_access_tokens
+from ecommerce.tests.factories import SiteConfigurationFactory
+from ecommerce.tests.testcases import TestCase
+
+
+@override_settings(SERVICE_TOKEN_REFRESH_WINDOW=300)
+class ServiceTokenTests(TestCase):
+    def setUp(self):
+        super(ServiceTokenTests, self).setUp()
+        httpretty.enable()
+        self.addCleanup(httpretty.reset)
+        self.addCleanup(httpretty.disable)
+        self.token = self.mock_access_token_response(access_token='new-token')
+
+    def test_get_access_token(self):
+        """ Verify a token is fetched, and cached, if none is cached. """
+        self.assertEqual(service_tokens.get_access_token(self.site_configuration), 'new-token')
+        access_token, expires_at = service_tokens.get_cached_access_token(self.site_configuration)
+        self.assertEqual(access_token, 'new-token')
+        self.assertFalse(service_tokens.needs_refresh(expires_at))
+
+        httpretty.reset()
+        self.assertEqual(service_tokens.get_access_token(self.site_configuration), 'new-token')
+        self.assertFalse(httpretty.has_request())
+
+    def test_get_access_token_in_refresh_window(self):
+        """ Verify tokens in the refresh window are returned while they are renewed in the background. """
+        service_tokens.cache_access_token(self.site_configuration, 'current-token', 60)
+
+        thread = service_tokens.refresh_access_token_in_background(self.site_configuration)
+        self.assertIsNone(service_tokens.refresh_access_token_in_background(self.site_configuration))
+        thread.join()
+
+        # The renewed token is cached by the thread, for the following requests.
+        DEFAULT_REQUEST_CACHE.clear()
+        self.assertEqual(service_tokens.get_access_token(self.site_configuration), 'new-token')
+
+    def test_refresh_access_token_locked(self):
+        """ Verify a token is only renewed by one worker at a time. """
+        cache.add(service_tokens._get_lock_key(self.site_configuration), True)  # pylint: disable=protected-access
+        with mock.patch.object(service_tokens, 'fetch_access_token') as mock_fetch:
+            self.assertFalse(service_tokens.refresh_access_token(self.site_configuration))
+            self.assertFalse(mock_fetch.called)
+
+            cache.clear()
+            self.assertTrue(service_tokens.refresh_access_token(self.site_configuration))
+            self.assertTrue(service_tokens.refresh_access_token(self.site_configuration))
+            self.assertEqual(mock_fetch.call_count, 2)
+
+    def test_refresh_access_token_failure(self):
+        """ Verify the current token is kept if it cannot be renewed. """
+        service_tokens.cache_access_token(self.site_configuration, 'current-token', 60)
+        with mock.patch.object(service_tokens, 'fetch_access_token', side_effect=Exception):
+            self.assertFalse(service_tokens.refresh_access_token(self.site_configuration))
+
+        self.assertEqual(service_tokens.get_cached_access_token(self.site_configuration)[0], 'current-token')
+
+    def test_refresh_service_access_tokens(self):
+        """ Verify the task only renews the tokens about to expire, of the sites having OAuth credentials. """
+        other_site_configuration = SiteConfigurationFactory(
+            partner__short_code='other', oauth_settings={'SOCIAL_AUTH_EDX_OIDC_KEY': 'key'}
+        )
+        service_tokens.cache_access_token(self.site_configuration, 'current-token', 60)
+        service_tokens.cache_access_token(other_site_configuration, 'other-token', 3600)
+        SiteConfigurationFactory(partner__short_code='anonymous', oauth_settings={})
+
+        refresh_service_access_tokens()
+
+        self.assertEqual(service_tokens.get_cached_access_token(self.site_configuration)[0], 'new-token')
+        self.assertEqual(service_tokens.get_cached_access_token(other_site_configuration)[0], 'other-token')
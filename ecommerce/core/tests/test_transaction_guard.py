@@ -0,0 +1,87 @@
+import httpretty
+import requests
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.views.generic import View
+from testfixtures import LogCapture
+
+from ecommerce.core import transaction_guard
+from ecommerce.core.constants import SHORT_TRANSACTIONS_SWITCH
+from ecommerce.core.exceptions import OutboundCallInTransactionError
+from ecommerce.core.middleware import TransactionGuardMiddleware
+from ecommerce.core.tests import toggle_switch
+from ecommerce.core.views import ShortTransactionMixin
+from ecommerce.tests.testcases import TestCase
+
+LOGGER_NAME = 'ecommerce.core.transaction_guard'
+URL = 'http://remote.example.com/api/'
+
+
+class TransactionDepthView(ShortTransactionMixin, View):
+    def get(self, request):  # pylint: disable=unused-argument
+        return HttpResponse(transaction_guard.is_in_request_transaction())
+
+
+@override_settings(OUTBOUND_CALL_IN_TRANSACTION_GUARD=transaction_guard.LOG)
+class TransactionGuardTests(TestCase):
+    def setUp(self):
+        super(TransactionGuardTests, self).setUp()
+        httpretty.enable()
+        self.addCleanup(httpretty.reset)
+        self.addCleanup(httpretty.disable)
+        httpretty.register_uri(httpretty.GET, URL, body='{}')
+        self.middleware = TransactionGuardMiddleware()
+        self.request = RequestFactory().get('/basket/add/')
+        self.middleware.process_request(self.request)
+        self.addCleanup(transaction_guard.deactivate)
+
+    def test_call_outside_of_transaction(self):
+        """ Verify calls made before the request opens a transaction are not flagged. """
+        with LogCapture(LOGGER_NAME) as logger:
+            requests.get(URL)
+            logger.check()
+
+    def test_call_in_transaction(self):
+        """ Verify calls made in a transaction opened by the request are logged. """
+        with LogCapture(LOGGER_NAME) as logger:
+            with transaction.atomic():
+                self.assertTrue(transaction_guard.is_in_request_transaction())
+                requests.get(URL)
+            logger.check((
+                LOGGER_NAME,
+                'WARNING',
+                'Outbound call to [remote.example.com] made in an open database transaction while handling '
+                '[/basket/add/].'
+            ))
+
+    @override_settings(OUTBOUND_CALL_IN_TRANSACTION_GUARD=transaction_guard.RAISE)
+    def test_call_in_transaction_rejected(self):
+        with transaction.atomic():
+            with self.assertRaises(OutboundCallInTransactionError):
+                requests.get(URL)
+
+    def test_call_after_request(self):
+        """ Verify calls are not flagged once the request has been handled. """
+        self.middleware.process_response(self.request, HttpResponse())
+        with LogCapture(LOGGER_NAME) as logger:
+            with transaction.atomic():
+                requests.get(URL)
+            logger.check()
+
+    @override_settings(OUTBOUND_CALL_IN_TRANSACTION_GUARD=None)
+    def test_middleware_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            TransactionGuardMiddleware()
+
+    def test_short_transaction_mixin(self):
+        """ Verify views using ShortTransactionMixin only run in a transaction if the switch is inactive. """
+        view = TransactionDepthView.as_view()
+        self.assertEqual(view._non_atomic_requests, {'default'})  # pylint: disable=protected-access
+
+        toggle_switch(SHORT_TRANSACTIONS_SWITCH, False)
+        self.assertEqual(view(self.request).content, 'True')
+
+        toggle_switch(SHORT_TRANSACTIONS_SWITCH, True)
+        self.assertEqual(view(self.request).content, 'False')
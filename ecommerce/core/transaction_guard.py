@@ -0,0 +1,88 @@
+"""
+Guard against outbound HTTP calls made while a database transaction is open.
+
+A transaction held open while a remote service responds keeps its row locks, and its pooled connection,
+for as long as the service takes. TransactionGuardMiddleware records the transaction depth of the default
+database when a request starts. Calls made with requests while the request holds a deeper transaction are
+logged, or rejected, as configured by OUTBOUND_CALL_IN_TRANSACTION_GUARD.
+"""
+from __future__ import unicode_literals
+
+import logging
+import threading
+from urlparse import urlparse
+
+import requests
+from django.conf import settings
+from django.db import connection
+
+from ecommerce.core.exceptions import OutboundCallInTransactionError
+
+logger = logging.getLogger(__name__)
+
+# Values of OUTBOUND_CALL_IN_TRANSACTION_GUARD.
+LOG = 'log'
+RAISE = 'raise'
+
+_local = threading.local()
+_install_lock = threading.Lock()
+_installed = []
+
+
+def get_transaction_depth():
+    """ Returns the number of atomic blocks open on the default database connection of the current thread. """
+    if not connection.in_atomic_block:
+        return 0
+    return 1 + len(connection.savepoint_ids)
+
+
+def activate(path):
+    """ Guard the outbound calls made by the current thread while it handles the request with the given path. """
+    _local.path = path
+    _local.depth = get_transaction_depth()
+
+
+def deactivate():
+    _local.__dict__.clear()
+
+
+def is_in_request_transaction():
+    """ Returns True if the request handled by the current thread has opened a transaction which is still open. """
+    depth = getattr(_local, 'depth', None)
+    return depth is not None and get_transaction_depth() > depth
+
+
+def check_outbound_call(url):
+    """
+    Flag a call to the given URL if it is made while the current request holds a transaction open.
+
+    Raises:
+        OutboundCallInTransactionError: If the guard is configured to reject such calls.
+    """
+    if not is_in_request_transaction():
+        return
+
+    host = urlparse(url).netloc
+    logger.warning(
+        'Outbound call to [%s] made in an open database transaction while handling [%s].', host, _local.path
+    )
+    if settings.OUTBOUND_CALL_IN_TRANSACTION_GUARD == RAISE:
+        raise OutboundCallInTransactionError(
+            'Outbound call to [{host}] made in an open database transaction.'.format(host=host)
+        )
+
+
+def install():
+    """ Check the outbound HTTP calls made with requests. The check is installed once per process. """
+    with _install_lock:
+        if _installed:
+            return
+
+        send = requests.adapters.HTTPAdapter.send
+
+        def guarded_send(self, request, *args, **kwargs):
+            check_outbound_call(request.url)
+            return send(self, request, *args, **kwargs)
+
+        requests.adapters.HTTPAdapter.send = guarded_send
+        _installed.append(True)
@@ -6,9 +6,10 @@ from urlparse import parse_qs, urlparse
 
 import six
 import waffle
-from django.conf import settings
 from django.core.exceptions import ValidationError
 
+from ecommerce.core.db_routers import READ_REPLICA, is_read_replica_configured
+
 logger = logging.getLogger(__name__)
 
 
@@ -91,4 +92,4 @@ def use_read_replica_if_available(queryset):
     """
     If there is a database called 'read_replica', use that database for the queryset.
     """
-    return queryset.using("read_replica") if "read_replica" in settings.DATABASES else queryset
+    return queryset.using(READ_REPLICA) if is_read_replica_configured() else queryset
@@ -2,6 +2,7 @@
 import logging
 import uuid
 
+import waffle
 from auth_backends.views import EdxOpenIdConnectLogoutView
 from django.conf import settings
 from django.contrib.auth import authenticate, get_user_model, login
@@ -9,10 +10,13 @@ from django.contrib.auth.decorators import login_required
 from django.db import DatabaseError, connection, transaction
 from django.http import Http404, JsonResponse
 from django.shortcuts import redirect
+from django.template.response import SimpleTemplateResponse
 from django.utils.decorators import method_decorator
 from django.views.generic import View
 
-from ecommerce.core.constants import Status
+from ecommerce.core import performance
+from ecommerce.core.constants import SHORT_TRANSACTIONS_SWITCH, Status
+from ecommerce.core.db_routers import read_replica
 
 try:
     import newrelic.agent
@@ -71,6 +75,18 @@ def health(_):
         return JsonResponse(data, status=503)
 
 
+def performance_metrics(request):
+    """Returns the performance counters of each view, aggregated since the process started.
+
+    Only available to staff users, while PERFORMANCE_INSTRUMENTATION_ENABLED is True.
+    Counters are kept per process: each worker process reports the requests it handled.
+    """
+    if not (settings.PERFORMANCE_INSTRUMENTATION_ENABLED and request.user.is_staff):
+        raise Http404
+
+    return JsonResponse(performance.get_aggregates())
+
+
 class AutoAuth(View):
     """Creates and authenticates a new User with superuser permissions.
 
@@ -105,6 +121,59 @@ class StaffOnlyMixin(object):
         return super(StaffOnlyMixin, self).dispatch(request, *args, **kwargs)
 
 
+class ReadReplicaMixin(object):
+    """
+    Serves the safe requests of the view from the read replica, outside of the transaction opened by ATOMIC_REQUESTS.
+
+    Unsafe requests are handled by the primary database in a transaction, as they would be without this mixin.
+    Reads fall back to the primary database as described in ecommerce.core.db_routers.
+    """
+    replica_safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    @classmethod
+    def as_view(cls, *args, **kwargs):
+        return transaction.non_atomic_requests(super(ReadReplicaMixin, cls).as_view(*args, **kwargs))
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in self.replica_safe_methods or connection.in_atomic_block:
+            # Requests made within a transaction, e.g. by tests, get a savepoint, as they would with ATOMIC_REQUESTS.
+            with transaction.atomic():
+                return self._dispatch_safe_request(request, *args, **kwargs)
+
+        return self._dispatch_safe_request(request, *args, **kwargs)
+
+    def _dispatch_safe_request(self, request, *args, **kwargs):
+        if request.method not in self.replica_safe_methods:
+            return super(ReadReplicaMixin, self).dispatch(request, *args, **kwargs)
+
+        with read_replica():
+            response = super(ReadReplicaMixin, self).dispatch(request, *args, **kwargs)
+            # Templates are rendered after the view returns. Render them here, so that their reads use the replica.
+            if isinstance(response, SimpleTemplateResponse) and not response.is_rendered:
+                response.render()
+            return response
+
+
+class ShortTransactionMixin(object):
+    """
+    Runs the view outside of the transaction opened by ATOMIC_REQUESTS while the short transactions switch is active.
+
+    The view can then call remote services with no transaction open, and wraps its mutations in
+    transaction.atomic() itself. While the switch is inactive, the view runs in a single transaction.
+    """
+
+    @classmethod
+    def as_view(cls, *args, **kwargs):
+        return transaction.non_atomic_requests(super(ShortTransactionMixin, cls).as_view(*args, **kwargs))
+
+    def dispatch(self, request, *args, **kwargs):
+        if waffle.switch_is_active(SHORT_TRANSACTIONS_SWITCH):
+            return super(ShortTransactionMixin, self).dispatch(request, *args, **kwargs)
+
+        with transaction.atomic():
+            return super(ShortTransactionMixin, self).dispatch(request, *args, **kwargs)
+
+
 class LogoutView(EdxOpenIdConnectLogoutView):
     """ Logout view that redirects the user to the LMS logout page. """
 
@@ -3,17 +3,19 @@ import datetime
 import urllib
 
 import ddt
+import gevent
 import httpretty
 import mock
 import pytz
 from django.conf import settings
+from django.test import override_settings
 from django.urls import reverse
 from django.utils.timezone import now
 from factory.fuzzy import FuzzyText
 from oscar.core.loading import get_class, get_model
 from oscar.test.factories import OrderFactory, OrderLineFactory, ProductFactory, RangeFactory, VoucherFactory
 
-from ecommerce.core.url_utils import get_lms_url
+from ecommerce.core.url_utils import get_ecommerce_url, get_lms_url
 from ecommerce.coupons.tests.mixins import CouponMixin, DiscoveryMockMixin
 from ecommerce.coupons.views import voucher_is_valid
 from ecommerce.enterprise.tests.mixins import EnterpriseServiceMockMixin
@@ -26,6 +28,7 @@ from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
 from ecommerce.extensions.order.utils import UserAlreadyPlacedOrder
 from ecommerce.extensions.test.factories import prepare_voucher
+from ecommerce.extensions.voucher.utils import get_cached_voucher
 from ecommerce.tests.mixins import ApiMockMixin, LmsApiMockMixin
 from ecommerce.tests.testcases import TestCase
 
@@ -145,6 +148,23 @@ class VoucherIsValidTests(DiscoveryTestMixin, TestCase):
         error_msg = 'This coupon code is no longer available.'
         self.assert_error_messages(voucher, product, user, error_msg)
 
+    def test_sold_out_shared_offer(self):
+        """ Verify a voucher is refused once another voucher has used up the offer they share. """
+        voucher, product = prepare_voucher(max_usage=1)
+        other_voucher = VoucherFactory(code='OTHERCODE')
+        other_voucher.offers.add(voucher.best_offer)
+        self.request.user = self.create_user()
+        valid, __ = voucher_is_valid(get_cached_voucher('OTHERCODE'), [product], self.request)
+        self.assertTrue(valid)
+
+        order = OrderFactory(user=self.create_user())
+        voucher.best_offer.record_usage(discount={'freq': 1, 'discount': 1})
+        voucher.record_usage(order, order.user)
+
+        valid, msg = voucher_is_valid(get_cached_voucher('OTHERCODE'), [product], self.request)
+        self.assertFalse(valid)
+        self.assertEqual(msg, 'This coupon code is no longer available.')
+
     def test_used_voucher(self):
         """Used voucher should not be available."""
         voucher, product = prepare_voucher()
@@ -527,6 +547,44 @@ class CouponRedeemViewTests(CouponMixin, DiscoveryTestMixin, LmsApiMockMixin, En
         response = self.client.get(self.redeem_url_with_params(code=code))
         self.assertEqual(response.context['error'], 'Couldn\'t find a matching Enterprise Customer for this coupon.')
 
+    @httpretty.activate
+    @override_settings(ELIGIBILITY_CHECK_TIMEOUT=0.5)
+    def test_enterprise_customer_timeout(self):
+        """ Verify that an error is rendered when the Enterprise service does not respond in time. """
+        code = self.prepare_enterprise_data(catalog=self.catalog)
+        with mock.patch('ecommerce.coupons.views.get_enterprise_customer', side_effect=lambda *args: gevent.sleep(5)):
+            response = self.client.get(self.redeem_url_with_params(code=code))
+        self.assertEqual(
+            response.context['error'], 'The Enterprise service is not responding. Please try again later.'
+        )
+
+    @httpretty.activate
+    @override_settings(ELIGIBILITY_CHECK_TIMEOUT=0.5)
+    def test_enterprise_consent_timeout(self):
+        """ Verify that the learner is asked for consent when the consent check does not complete in time. """
+        code = self.prepare_enterprise_data(catalog=self.catalog)
+        consent_token = get_enterprise_customer_data_sharing_consent_token(
+            self.request.user.access_token,
+            self.course.id,
+            ENTERPRISE_CUSTOMER
+        )
+        expected_url = get_enterprise_course_consent_url(
+            self.site,
+            code,
+            self.stock_record.partner_sku,
+            consent_token,
+            self.course.id,
+            ENTERPRISE_CUSTOMER
+        )
+
+        with mock.patch(
+            'ecommerce.coupons.views.enterprise_customer_user_needs_consent',
+            side_effect=lambda *args: gevent.sleep(5)
+        ):
+            response = self.client.get(self.redeem_url_with_params(code=code))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.url, expected_url)
+
     @httpretty.activate
     def test_enterprise_customer_successful_redemption(self):
         """ Verify the view redirects to LMS when valid consent is provided. """
@@ -708,3 +766,26 @@ class EnrollmentCodeCsvViewTests(TestCase):
         response = self.client.get(reverse(self.path, args=[order.number]))
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response['content-type'], 'text/csv')
+
+    def test_streamed_in_chunks(self):
+        """ Verify the codes are streamed, and read with a query per chunk of vouchers rather than per voucher. """
+        order = OrderFactory(user=self.user)
+        line = OrderLineFactory(order=order, product=ProductFactory(title='Seat', categories=[]))
+        order_line_vouchers = OrderLineVouchers.objects.create(line=line)
+        vouchers = [VoucherFactory(code='CODE{}'.format(index)) for index in range(5)]
+        order_line_vouchers.vouchers.add(*vouchers)
+
+        with mock.patch('ecommerce.coupons.views.EnrollmentCodeCsvView.chunk_size', 2):
+            response = self.client.get(reverse(self.path, args=[order.number]))
+            self.assertEqual(response.status_code, 200)
+            # One query for the lines, and three for the chunks of vouchers.
+            with self.assertNumQueries(4):
+                rows = b''.join(response.streaming_content).decode('utf-8').splitlines()
+
+        redeem_url = get_ecommerce_url(reverse('coupons:offer'))
+        self.assertEqual(rows[0], 'Order Number:,{}'.format(order.number))
+        self.assertEqual(rows[2], 'Seat')
+        self.assertEqual(rows[3], 'Code,Redemption URL,Name Of Employee,Date Of Distribution,Employee Email')
+        self.assertEqual(rows[4:9], [
+            '{code},{url}?code={code},,,'.format(code=voucher.code, url=redeem_url) for voucher in vouchers
+        ])
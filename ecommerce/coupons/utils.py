@@ -8,6 +8,7 @@ from oscar.core.loading import get_model
 from slumber.exceptions import HttpNotFoundError
 
 from ecommerce.core.utils import get_cache_key
+from ecommerce.discovery_mirror.utils import get_mirrored_catalog, get_mirrored_catalog_course_runs
 
 Product = get_model('catalogue', 'Product')
 
@@ -54,6 +55,10 @@ def get_catalog_course_runs(site, query, limit=None, offset=None):
         Timeout: requests exception "Timeout"
 
     """
+    mirrored_response = get_mirrored_catalog_course_runs(site, query, limit=limit, offset=offset)
+    if mirrored_response is not None:
+        return mirrored_response
+
     api_resource_name = 'course_runs'
     partner_code = site.siteconfiguration.partner.short_code
     cache_key = '{site_domain}_{partner_code}_{resource}_{query}_{limit}_{offset}'.format(
@@ -129,6 +134,10 @@ def fetch_course_catalog(site, catalog_id):
             a response. This exception is raised for both connection timeout and read timeout.
 
     """
+    mirrored_catalog = get_mirrored_catalog(site.siteconfiguration.partner, catalog_id)
+    if mirrored_catalog is not None:
+        return mirrored_catalog
+
     api_resource = 'catalogs'
 
     cache_key = get_cache_key(
@@ -6,7 +6,8 @@ import unicodecsv as csv
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
-from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.db import transaction
+from django.http import Http404, HttpResponseRedirect, StreamingHttpResponse
 from django.shortcuts import render
 from django.urls import reverse
 from django.utils import timezone
@@ -16,18 +17,26 @@ from django.utils.translation import ugettext as _
 from django.views.generic import TemplateView, View
 from oscar.core.loading import get_class, get_model
 
+from ecommerce.core.eligibility import (
+    EMBARGO_CHECK,
+    ENTERPRISE_CONSENT_CHECK,
+    ENTERPRISE_CUSTOMER_CHECK,
+    ENTERPRISE_LEARNER_DATA_CHECK,
+    EligibilityGate
+)
 from ecommerce.core.url_utils import get_ecommerce_url
-from ecommerce.core.views import StaffOnlyMixin
+from ecommerce.core.views import ShortTransactionMixin, StaffOnlyMixin
 from ecommerce.coupons.decorators import login_required_for_credit
 from ecommerce.coupons.utils import is_voucher_applied
+from ecommerce.enterprise.api import fetch_enterprise_learner_data
 from ecommerce.enterprise.decorators import set_enterprise_cookie
-from ecommerce.enterprise.exceptions import EnterpriseDoesNotExist
 from ecommerce.enterprise.utils import (
     enterprise_customer_user_needs_consent,
     get_enterprise_course_consent_url,
+    get_enterprise_customer,
     get_enterprise_customer_consent_failed_context_data,
     get_enterprise_customer_data_sharing_consent_token,
-    get_enterprise_customer_from_voucher
+    get_enterprise_customer_uuid_from_voucher
 )
 from ecommerce.extensions.api import exceptions
 from ecommerce.extensions.basket.utils import prepare_basket
@@ -35,6 +44,7 @@ from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
 from ecommerce.extensions.offer.utils import render_email_confirmation_if_required
 from ecommerce.extensions.order.exceptions import AlreadyPlacedOrderException
+from ecommerce.extensions.payment.utils import check_course_access, get_embargo_course_ids
 from ecommerce.extensions.voucher.utils import get_voucher_and_products_from_code
 
 Applicator = get_class('offer.applicator', 'Applicator')
@@ -140,11 +150,11 @@ class CouponOfferView(TemplateView):
         return super(CouponOfferView, self).get(request, *args, **kwargs)
 
 
-class CouponRedeemView(EdxOrderPlacementMixin, View):
+class CouponRedeemView(ShortTransactionMixin, EdxOrderPlacementMixin, View):
 
     @method_decorator(set_enterprise_cookie)
     @method_decorator(login_required)
-    def get(self, request):
+    def get(self, request):  # pylint: disable=too-many-statements
         """
         Looks up the passed code and adds the matching product to a basket,
         then applies the voucher and if the basket total is FREE places the order and
@@ -184,24 +194,33 @@ class CouponRedeemView(EdxOrderPlacementMixin, View):
         if email_confirmation_response:
             return email_confirmation_response
 
-        try:
-            enterprise_customer = get_enterprise_customer_from_voucher(request.site, voucher)
-        except EnterpriseDoesNotExist as e:
-            # If an EnterpriseException is caught while pulling the EnterpriseCustomer, that means there's no
-            # corresponding EnterpriseCustomer in the Enterprise service (which should never happen).
-            logger.exception(e.message)
-            return render(
-                request,
-                template_name,
-                {'error': _('Couldn\'t find a matching Enterprise Customer for this coupon.')}
-            )
+        enterprise_customer_uuid = get_enterprise_customer_uuid_from_voucher(voucher)
+        request.eligibility_gate = self.run_eligibility_checks(request, product, offer, enterprise_customer_uuid)
 
-        if enterprise_customer is not None and enterprise_customer_user_needs_consent(
-                request.site,
-                enterprise_customer['id'],
-                product.course.id,
-                request.user.username,
-        ):
+        enterprise_customer = None
+        if enterprise_customer_uuid:
+            if request.eligibility_gate.timed_out(ENTERPRISE_CUSTOMER_CHECK):
+                return render(
+                    request,
+                    template_name,
+                    {'error': _('The Enterprise service is not responding. Please try again later.')}
+                )
+
+            enterprise_customer = request.eligibility_gate.result(ENTERPRISE_CUSTOMER_CHECK)
+            if enterprise_customer is None:
+                # If the EnterpriseCustomer could not be retrieved, that means there's no corresponding
+                # EnterpriseCustomer in the Enterprise service (which should never happen).
+                logger.error(
+                    'Enterprise customer with UUID %s does not exist in the Enterprise service.',
+                    enterprise_customer_uuid
+                )
+                return render(
+                    request,
+                    template_name,
+                    {'error': _('Couldn\'t find a matching Enterprise Customer for this coupon.')}
+                )
+
+        if enterprise_customer is not None and request.eligibility_gate.result(ENTERPRISE_CONSENT_CHECK):
             consent_token = get_enterprise_customer_data_sharing_consent_token(
                 request.user.access_token,
                 product.course.id,
@@ -231,11 +250,12 @@ class CouponRedeemView(EdxOrderPlacementMixin, View):
                 )
                 return HttpResponseRedirect(redirect_url)
 
-        try:
-            basket = prepare_basket(request, [product], voucher)
-        except AlreadyPlacedOrderException:
-            msg = _('You have already purchased {course} seat.').format(course=product.course.name)
-            return render(request, template_name, {'error': msg})
+        with transaction.atomic():
+            try:
+                basket = prepare_basket(request, [product], voucher)
+            except AlreadyPlacedOrderException:
+                msg = _('You have already purchased {course} seat.').format(course=product.course.name)
+                return render(request, template_name, {'error': msg})
 
         if basket.total_excl_tax == 0:
             try:
@@ -260,9 +280,59 @@ class CouponRedeemView(EdxOrderPlacementMixin, View):
 
         return HttpResponseRedirect(reverse('basket:summary'))
 
+    def run_eligibility_checks(self, request, product, offer, enterprise_customer_uuid):
+        """
+        Run the remote eligibility checks of the redemption concurrently.
+
+        The results of the checks are used by this view, and by prepare_basket.
+
+        Returns:
+            EligibilityGate
+        """
+        site = request.site
+        # Load the data needed by the checks before they leave the request thread.
+        site.siteconfiguration.partner  # pylint: disable=pointless-statement
+        course_id = product.course.id if product.course else None
+
+        gate = EligibilityGate()
+        if site.siteconfiguration.enable_embargo_check:
+            gate.add_check(
+                EMBARGO_CHECK,
+                check_course_access,
+                args=(request.user, site, get_embargo_course_ids([product])),
+                # Purchases are allowed if the embargo API is unavailable.
+                fallback=True
+            )
+
+        if enterprise_customer_uuid:
+            gate.add_check(ENTERPRISE_CUSTOMER_CHECK, get_enterprise_customer, args=(site, enterprise_customer_uuid))
+            gate.add_check(
+                ENTERPRISE_CONSENT_CHECK,
+                enterprise_customer_user_needs_consent,
+                args=(site, enterprise_customer_uuid, course_id, request.user.username),
+                # The consent service makes the final decision if consent is assumed to be required.
+                fallback=True
+            )
+
+        if offer.condition.enterprise_customer_uuid:
+            # The learner's data is cached, and used when the enterprise offer condition is checked.
+            gate.add_check(ENTERPRISE_LEARNER_DATA_CHECK, fetch_enterprise_learner_data, args=(site, request.user))
+
+        gate.run()
+        return gate
+
+
+class _EchoBuffer(object):
+    """ File-like object returning, instead of buffering, what is written to it by a CSV writer. """
+
+    def write(self, value):
+        return value
+
 
 class EnrollmentCodeCsvView(View):
     """ Download enrollment code CSV file view. """
+    chunk_size = 1000
+    voucher_field_names = ('Code', 'Redemption URL', 'Name Of Employee', 'Date Of Distribution', 'Employee Email')
 
     @method_decorator(login_required)
     def dispatch(self, *args, **kwargs):
@@ -288,7 +358,7 @@ class EnrollmentCodeCsvView(View):
             number (str): Number of the order
 
         Returns:
-            HttpResponse
+            StreamingHttpResponse
 
         Raises:
             Http404: When an order number for a non-existing order is passed.
@@ -306,26 +376,39 @@ class EnrollmentCodeCsvView(View):
         file_name = 'Enrollment code CSV order num {}'.format(order.number)
         file_name = '{filename}.csv'.format(filename=slugify(file_name))
 
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename={filename}'.format(filename=file_name)
-
         redeem_url = get_ecommerce_url(reverse('coupons:offer'))
-        voucher_field_names = ('Code', 'Redemption URL', 'Name Of Employee', 'Date Of Distribution', 'Employee Email')
-        voucher_writer = csv.DictWriter(response, fieldnames=voucher_field_names)
-
-        writer = csv.writer(response)
-        writer.writerow(('Order Number:', order.number))
-        writer.writerow([])
-
-        order_line_vouchers = OrderLineVouchers.objects.filter(line__order=order)
-        for order_line_voucher in order_line_vouchers:
-            writer.writerow([order_line_voucher.line.product.title])
-            voucher_writer.writeheader()
-
-            for voucher in order_line_voucher.vouchers.all():
-                voucher_writer.writerow({
-                    voucher_field_names[0]: voucher.code,
-                    voucher_field_names[1]: '{url}?code={code}'.format(url=redeem_url, code=voucher.code)
-                })
-            writer.writerow([])
+        response = StreamingHttpResponse(self._generate_rows(order, redeem_url), content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename={filename}'.format(filename=file_name)
         return response
+
+    def _generate_rows(self, order, redeem_url):
+        """
+        Yields the rows of the CSV, reading the codes of each line in chunks of `chunk_size` vouchers.
+
+        The CSV is streamed as it is generated, so that orders with many codes are neither held in memory,
+        nor read with a query per voucher.
+        """
+        writer = csv.writer(_EchoBuffer())
+
+        yield writer.writerow(('Order Number:', order.number))
+        yield writer.writerow([])
+
+        order_line_vouchers = OrderLineVouchers.objects.filter(line__order=order).select_related('line__product')
+        for order_line_voucher in order_line_vouchers.order_by('id'):
+            yield writer.writerow([order_line_voucher.line.product.title])
+            yield writer.writerow(self.voucher_field_names)
+
+            vouchers = order_line_voucher.vouchers.order_by('id')
+            last_id = 0
+            while True:
+                chunk = list(vouchers.filter(id__gt=last_id).values_list('id', 'code')[:self.chunk_size])
+                if not chunk:
+                    break
+                last_id = chunk[-1][0]
+                yield b''.join(
+                    writer.writerow((code, '{url}?code={code}'.format(url=redeem_url, code=code), '', '', ''))
+                    for __, code in chunk
+                )
+                if len(chunk) < self.chunk_size:
+                    break
+            yield writer.writerow([])
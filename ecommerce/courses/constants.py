@@ -0,0 +1,8 @@
+class CoursePublicationStatus(object):
+    PENDING = 'Pending'
+    PUBLISHED = 'Published'
+    FAILED = 'Failed'
+
+
+# switch is used to publish courses to the LMS in the background, once their products have been saved
+ASYNC_COURSE_PUBLICATION_SWITCH = 'enable_async_course_publication'
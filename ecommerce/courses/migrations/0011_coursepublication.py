@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-19 13:48
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django_extensions.db.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0010_migrate_partner_data_to_courses'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CoursePublication',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('status', models.CharField(choices=[(b'Pending', b'Pending'), (b'Published', b'Published'), (b'Failed', b'Failed')], default=b'Pending', max_length=16)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('message', models.TextField(blank=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='publications', to='courses.Course')),
+            ],
+            options={
+                'ordering': ('-created',),
+            },
+        ),
+    ]
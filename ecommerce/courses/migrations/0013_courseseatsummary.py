@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-19 13:58
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0012_create_async_course_publication_switch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseSeatSummary',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='seat_summary', serialize=False, to='courses.Course')),
+                ('course_type', models.CharField(max_length=32)),
+                ('seat_types', jsonfield.fields.JSONField(default=list)),
+                ('min_price', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('max_price', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('has_enrollment_code', models.BooleanField(default=False)),
+                ('enrollment_code_expires', models.DateTimeField(blank=True, null=True)),
+                ('modified', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
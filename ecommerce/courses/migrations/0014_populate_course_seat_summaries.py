@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME, SEAT_PRODUCT_CLASS_NAME
+
+
+def get_course_type(seat_types):
+    if 'credit' in seat_types:
+        return 'credit'
+    elif 'professional' in seat_types or 'no-id-professional' in seat_types:
+        return 'professional'
+    elif 'verified' in seat_types:
+        return 'verified'
+    return 'audit'
+
+
+def populate_course_seat_summaries(apps, schema_editor):  # pylint: disable=unused-argument
+    """ Create the seat summaries of existing courses. """
+    Course = apps.get_model('courses', 'Course')
+    CourseSeatSummary = apps.get_model('courses', 'CourseSeatSummary')
+    Product = apps.get_model('catalogue', 'Product')
+    ProductDescriptor = apps.get_model('catalogue', 'ProductDescriptor')
+    StockRecord = apps.get_model('partner', 'StockRecord')
+
+    for course in Course.objects.order_by('id').iterator():
+        seats = Product.objects.filter(course=course, parent__product_class__name=SEAT_PRODUCT_CLASS_NAME)
+        seat_types = set(
+            (certificate_type or '').lower()
+            for certificate_type in ProductDescriptor.objects.filter(product__in=seats).values_list(
+                'certificate_type', flat=True
+            )
+        )
+        prices = list(StockRecord.objects.filter(product__in=seats).values_list('price_excl_tax', flat=True))
+
+        enrollment_code = Product.objects.filter(
+            course=course, product_class__name=ENROLLMENT_CODE_PRODUCT_CLASS_NAME
+        ).first()
+
+        CourseSeatSummary.objects.update_or_create(course=course, defaults={
+            'course_type': get_course_type(seat_types),
+            'seat_types': sorted(seat_types),
+            'min_price': min(prices) if prices else None,
+            'max_price': max(prices) if prices else None,
+            'has_enrollment_code': bool(
+                enrollment_code and StockRecord.objects.filter(product=enrollment_code).exists()
+            ),
+            'enrollment_code_expires': enrollment_code.expires if enrollment_code else None,
+        })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0038_populate_product_descriptors'),
+        ('courses', '0013_courseseatsummary'),
+        ('partner', '0013_partner_default_site'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_course_seat_summaries, migrations.RunPython.noop),
+    ]
@@ -5,8 +5,12 @@ import logging
 from django.conf import settings
 from django.db import models, transaction
 from django.db.models import Count, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.timezone import now, timedelta
 from django.utils.translation import ugettext_lazy as _
+from django_extensions.db.models import TimeStampedModel
+from jsonfield import JSONField
 from oscar.core.loading import get_class, get_model
 
 from ecommerce.core.constants import (
@@ -14,13 +18,16 @@ from ecommerce.core.constants import (
     ENROLLMENT_CODE_SEAT_TYPES,
     SEAT_PRODUCT_CLASS_NAME
 )
+from ecommerce.courses.constants import CoursePublicationStatus
 from ecommerce.courses.publishers import LMSPublisher
+from ecommerce.extensions.catalogue.signals import descriptor_refreshed
 from ecommerce.extensions.catalogue.utils import generate_sku
 
 logger = logging.getLogger(__name__)
 Category = get_model('catalogue', 'Category')
 Partner = get_model('partner', 'Partner')
 Product = get_model('catalogue', 'Product')
+ProductDescriptor = get_model('catalogue', 'ProductDescriptor')
 ProductCategory = get_model('catalogue', 'ProductCategory')
 ProductClass = get_model('catalogue', 'ProductClass')
 Selector = get_class('partner.strategy', 'Selector')
@@ -91,7 +98,13 @@ class Course(models.Model):
     @property
     def type(self):
         """ Returns the type of the course (based on the available seat types). """
-        seat_types = [getattr(seat.attr, 'certificate_type', '').lower() for seat in self.seat_products]
+        return self.get_type_for_seat_types(
+            [getattr(seat.attr, 'certificate_type', '').lower() for seat in self.seat_products]
+        )
+
+    @classmethod
+    def get_type_for_seat_types(cls, seat_types):
+        """ Returns the type of a course with seats of the given certificate types. """
         if 'credit' in seat_types:
             return 'credit'
         elif 'professional' in seat_types or 'no-id-professional' in seat_types:
@@ -357,3 +370,154 @@ class Course(models.Model):
             else:
                 enrollment_code.expires = now() - timedelta(days=365)
             enrollment_code.save()
+
+
+class CoursePublication(TimeStampedModel):
+    """ Publication of a course to the LMS, made in the background once the products of the course are saved. """
+    STATUS_CHOICES = (
+        (CoursePublicationStatus.PENDING, CoursePublicationStatus.PENDING),
+        (CoursePublicationStatus.PUBLISHED, CoursePublicationStatus.PUBLISHED),
+        (CoursePublicationStatus.FAILED, CoursePublicationStatus.FAILED),
+    )
+
+    course = models.ForeignKey(Course, related_name='publications', on_delete=models.CASCADE)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=CoursePublicationStatus.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    message = models.TextField(blank=True)
+
+    class Meta(object):
+        ordering = ('-created',)
+
+    def __unicode__(self):
+        return 'Publication [{id}] of [{course_id}]'.format(id=self.id, course_id=self.course_id)
+
+
+class CourseSeatSummary(models.Model):
+    """
+    Facts about the seats of a course, served by the course API without loading the seats.
+
+    Summaries are refreshed once the transaction saving a product of the course, or one of their stock records,
+    commits.
+    """
+    course = models.OneToOneField(Course, primary_key=True, related_name='seat_summary', on_delete=models.CASCADE)
+    course_type = models.CharField(max_length=32)
+    seat_types = JSONField(default=list)
+    min_price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    max_price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    has_enrollment_code = models.BooleanField(default=False)
+    enrollment_code_expires = models.DateTimeField(null=True, blank=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    @property
+    def has_active_enrollment_code(self):
+        """ Mirrors the availability of the enrollment code, as checked by Course.enrollment_code_product. """
+        return self.has_enrollment_code and (
+            self.enrollment_code_expires is None or self.enrollment_code_expires >= now()
+        )
+
+    @classmethod
+    def refresh(cls, course, create=True):
+        """
+        Compute the summary of the seats of a course, and save it.
+
+        Arguments:
+            course (Course): The course to summarize.
+            create (bool): Whether the summary is created if the course does not have one yet.
+
+        Returns:
+            CourseSeatSummary
+        """
+        try:
+            seats = list(course.seat_products)
+        except Product.DoesNotExist:
+            seats = []
+
+        descriptors = ProductDescriptor.load(seats)
+        seat_types = set()
+        for seat in seats:
+            descriptor = descriptors.get(seat.id)
+            certificate_type = descriptor.certificate_type if descriptor else getattr(seat.attr, 'certificate_type', '')
+            seat_types.add((certificate_type or '').lower())
+        prices = [stock_record.price_excl_tax for seat in seats for stock_record in seat.stockrecords.all()]
+
+        enrollment_code = course.get_enrollment_code()
+        values = {
+            'course_type': course.get_type_for_seat_types(seat_types),
+            'seat_types': sorted(seat_types),
+            'min_price': min(prices) if prices else None,
+            'max_price': max(prices) if prices else None,
+            'has_enrollment_code': bool(enrollment_code and enrollment_code.stockrecords.exists()),
+            'enrollment_code_expires': enrollment_code.expires if enrollment_code else None,
+        }
+
+        if not create:
+            cls.objects.filter(course=course).update(modified=now(), **values)
+            return cls(course=course, **values)
+
+        summary, __ = cls.objects.update_or_create(course=course, defaults=values)
+        course.seat_summary = summary
+        return summary
+
+    @classmethod
+    def refresh_for_course_id(cls, course_id, create=True):
+        """ Refresh the summary of the course with the given ID, if it exists. """
+        course = Course.objects.filter(id=course_id).first()
+        if course:
+            cls.refresh(course, create=create)
+
+
+class _SeatSummaryRefreshes(object):
+    """ Courses whose seat summaries are refreshed once the current transaction commits. """
+
+    def __init__(self):
+        self.course_ids = {}
+
+    def add(self, course_id, create):
+        self.course_ids[course_id] = self.course_ids.get(course_id, False) or create
+
+    def __call__(self):
+        for course_id, create in self.course_ids.items():
+            CourseSeatSummary.refresh_for_course_id(course_id, create=create)
+
+
+def refresh_seat_summary_on_commit(course_id, create=True):
+    """
+    Refresh the summary of a course once the current transaction commits.
+
+    The summary of a course is refreshed once per transaction, however many of its seats are saved, as they are
+    by bulk imports and by stock allocation during checkout.
+    """
+    connection = transaction.get_connection()
+    refreshes = getattr(connection, 'seat_summary_refreshes', None)
+    # The refreshes of a transaction which was rolled back are discarded along with its commit callbacks.
+    if refreshes is not None and any(callback is refreshes for __, callback in connection.run_on_commit):
+        refreshes.add(course_id, create)
+        return
+
+    refreshes = _SeatSummaryRefreshes()
+    refreshes.add(course_id, create)
+    connection.seat_summary_refreshes = refreshes
+    transaction.on_commit(refreshes)
+
+
+@receiver(descriptor_refreshed)
+def refresh_seat_summary_for_product(sender, product, created, **kwargs):  # pylint: disable=unused-argument
+    # Summaries read the descriptors of the seats, so they are refreshed once the descriptor of the product is.
+    # New products are summarized once their stock record is saved.
+    if product.course_id and not created:
+        refresh_seat_summary_on_commit(product.course_id)
+
+
+@receiver(post_save, sender='partner.StockRecord')
+def refresh_seat_summary_for_stock_record(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    if instance.product.course_id:
+        refresh_seat_summary_on_commit(instance.product.course_id)
+
+
+@receiver(post_delete, sender='catalogue.Product')
+@receiver(post_delete, sender='partner.StockRecord')
+def refresh_seat_summary_for_deletion(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    # Deletions do not create summaries, since they may be part of the deletion of the course itself.
+    product = instance if sender is Product else Product.objects.filter(id=instance.product_id).first()
+    if product and product.course_id:
+        refresh_seat_summary_on_commit(product.course_id, create=False)
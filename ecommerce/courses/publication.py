@@ -0,0 +1,120 @@
+""" Incremental publication of courses and their seats.
+
+Saving a seat takes several queries and writes to the product, attribute value and stock record tables, even
+when nothing changed. Seats are compared to the published data first, and only those which differ are saved.
+The course is then published to the LMS by a task once the transaction saving it has committed, and the task
+retries failed publications with an exponential backoff.
+"""
+from __future__ import unicode_literals
+
+import logging
+
+from django.conf import settings
+from oscar.core.loading import get_model
+
+from ecommerce.core.constants import ENROLLMENT_CODE_SEAT_TYPES
+from ecommerce.courses.constants import CoursePublicationStatus
+from ecommerce.courses.models import CoursePublication
+
+logger = logging.getLogger(__name__)
+ProductDescriptor = get_model('catalogue', 'ProductDescriptor')
+
+MAX_ATTEMPTS = 5
+# Seconds to wait before the first retry of a failed publication. The delay doubles with each attempt.
+RETRY_DELAY = 60
+
+
+def _get_seat_key(certificate_type, id_verification_required, credit_provider):
+    return certificate_type or '', bool(id_verification_required), credit_provider or None
+
+
+def get_seats(course):
+    """
+    Returns the seats of a course, keyed by certificate type, verification requirement and credit provider.
+
+    The stock records of the seats are prefetched, and their attributes read from their descriptors.
+    """
+    seats = list(course.seat_products)
+    descriptors = ProductDescriptor.load(seats)
+
+    seats_by_key = {}
+    for seat in seats:
+        # Seats without a descriptor are never considered current, and are saved as usual.
+        descriptor = descriptors.get(seat.id)
+        if descriptor:
+            key = _get_seat_key(
+                descriptor.certificate_type, descriptor.id_verification_required, descriptor.credit_provider
+            )
+            seats_by_key[key] = seat
+    return seats_by_key
+
+
+def is_seat_current(course, seats, certificate_type, id_verification_required, price, expires=None,
+                    credit_provider=None, credit_hours=None, create_enrollment_code=False):
+    """
+    Returns True if saving a seat with the given data would not change it.
+
+    Arguments:
+        course (Course): Course of the seat.
+        seats (dict): Seats of the course, as returned by get_seats.
+
+    The other arguments are those of Course.create_or_update_seat.
+    """
+    certificate_type = certificate_type.lower()
+    seat = seats.get(_get_seat_key(certificate_type, id_verification_required, credit_provider))
+    if seat is None:
+        return False
+
+    if seat.title != course.get_course_seat_name(certificate_type, id_verification_required) or \
+            seat.expires != expires:
+        return False
+
+    stock_records = list(seat.stockrecords.all())
+    if len(stock_records) != 1 or stock_records[0].partner_id != course.partner_id or \
+            stock_records[0].price_excl_tax != price or \
+            stock_records[0].price_currency != settings.OSCAR_DEFAULT_CURRENCY:
+        return False
+
+    if credit_hours and getattr(seat.attr, 'credit_hours', None) != credit_hours:
+        return False
+
+    if create_enrollment_code and certificate_type in ENROLLMENT_CODE_SEAT_TYPES:
+        return course.get_enrollment_code() is not None
+
+    return True
+
+
+def publish_course(publication_id, final_attempt=True):
+    """
+    Publish the course of a publication to the LMS, and record the outcome.
+
+    Arguments:
+        publication_id (int): ID of the CoursePublication.
+        final_attempt (bool): Whether the publication fails if this attempt does.
+
+    Returns:
+        bool: True if the course was published.
+    """
+    publication = CoursePublication.objects.select_related('course__partner').get(id=publication_id)
+    publication.attempts += 1
+
+    try:
+        error_message = publication.course.publish_to_lms()
+    except Exception as exception:  # pylint: disable=broad-except
+        logger.exception('Failed to publish [%s] to LMS.', publication.course_id)
+        error_message = repr(exception)
+
+    if error_message:
+        publication.message = error_message
+        if final_attempt:
+            publication.status = CoursePublicationStatus.FAILED
+            logger.error(
+                'Giving up on publication [%d] of [%s] after [%d] attempts.',
+                publication.id, publication.course_id, publication.attempts
+            )
+    else:
+        publication.message = ''
+        publication.status = CoursePublicationStatus.PUBLISHED
+
+    publication.save()
+    return publication.status == CoursePublicationStatus.PUBLISHED
@@ -0,0 +1,15 @@
+""" Celery tasks which publish courses to the LMS. """
+from __future__ import unicode_literals
+
+from celery import shared_task
+
+from ecommerce.courses.publication import MAX_ATTEMPTS, RETRY_DELAY, publish_course
+
+
+@shared_task(bind=True, ignore_result=True, max_retries=MAX_ATTEMPTS - 1)
+def publish_course_to_lms(self, publication_id):
+    """ Publish the course of a publication to the LMS, retrying with an exponential backoff if it fails. """
+    retries = self.request.retries
+    if not publish_course(publication_id, final_attempt=retries >= self.max_retries):
+        if retries < self.max_retries:
+            raise self.retry(countdown=RETRY_DELAY * 2 ** retries)
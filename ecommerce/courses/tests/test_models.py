@@ -1,13 +1,14 @@
 import ddt
 import mock
 from django.conf import settings
+from django.db import transaction
 from django.utils.timezone import now, timedelta
 from freezegun import freeze_time
 from oscar.core.loading import get_model
 from oscar.test.factories import BasketFactory
 
 from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME
-from ecommerce.courses.models import Course
+from ecommerce.courses.models import Course, CourseSeatSummary
 from ecommerce.courses.publishers import LMSPublisher
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
@@ -363,3 +364,91 @@ class CourseTests(DiscoveryTestMixin, TestCase):
         ec_expires = now() - timedelta(days=365)
         self.assertEqual(course.get_enrollment_code().expires, ec_expires)
         self.assertIsNone(course.enrollment_code_product)
+
+
+class CourseSeatSummaryTests(DiscoveryTestMixin, TestCase):
+    def assert_summary(self, course, course_type, seat_types, min_price, max_price, has_active_enrollment_code):
+        self.run_commit_callbacks()
+        summary = CourseSeatSummary.objects.get(course=course)
+        self.assertEqual(summary.course_type, course_type)
+        self.assertEqual(summary.seat_types, seat_types)
+        self.assertEqual(summary.min_price, min_price)
+        self.assertEqual(summary.max_price, max_price)
+        self.assertEqual(summary.has_active_enrollment_code, has_active_enrollment_code)
+
+    def test_refreshed_with_seats(self):
+        """ Verify the summary is kept up to date as the seats and enrollment code of the course change. """
+        course = CourseFactory(partner=self.partner)
+        self.assert_summary(course, 'audit', [], None, None, False)
+
+        course.create_or_update_seat('honor', False, 0)
+        self.assert_summary(course, 'audit', ['honor'], 0, 0, False)
+
+        seat = course.create_or_update_seat('verified', True, 50, create_enrollment_code=True)
+        self.assert_summary(course, 'verified', ['honor', 'verified'], 0, 50, True)
+
+        course.toggle_enrollment_code_status(is_active=False)
+        self.assert_summary(course, 'verified', ['honor', 'verified'], 0, 50, False)
+
+        course.create_or_update_seat('credit', True, 200, credit_provider='MIT')
+        self.assert_summary(course, 'credit', ['credit', 'honor', 'verified'], 0, 200, False)
+
+        stock_record = seat.stockrecords.get()
+        stock_record.price_excl_tax = 75
+        stock_record.save()
+        self.assert_summary(course, 'credit', ['credit', 'honor', 'verified'], 0, 200, False)
+
+        course.seat_products.filter(title__contains='credit').delete()
+        self.assert_summary(course, 'verified', ['honor', 'verified'], 0, 75, False)
+
+    def test_refreshed_with_seat_attributes(self):
+        """ Verify the summary reads the attributes of a seat once its descriptor is refreshed. """
+        course = CourseFactory(partner=self.partner)
+        seat = course.create_or_update_seat('verified', True, 50)
+        self.assert_summary(course, 'verified', ['verified'], 50, 50, False)
+
+        seat.attr.certificate_type = 'professional'
+        seat.save()
+        self.assert_summary(course, 'professional', ['professional'], 50, 50, False)
+
+    def test_refreshed_once_per_transaction(self):
+        """ Verify the summary of a course is refreshed once its transaction commits, however many seats change. """
+        course = CourseFactory(partner=self.partner)
+        seat = course.create_or_update_seat('verified', True, 50)
+        self.run_commit_callbacks()
+
+        with mock.patch.object(CourseSeatSummary, 'refresh', wraps=CourseSeatSummary.refresh) as mock_refresh:
+            for price in (60, 70):
+                stock_record = seat.stockrecords.get()
+                stock_record.price_excl_tax = price
+                stock_record.save()
+            course.create_or_update_seat('honor', False, 0)
+            self.assertFalse(mock_refresh.called)
+
+            self.assert_summary(course, 'verified', ['honor', 'verified'], 0, 70, False)
+            self.assertEqual(mock_refresh.call_count, 1)
+
+    def test_refreshed_after_rollback(self):
+        """ Verify changes made after a rolled back change still refresh the summary. """
+        course = CourseFactory(partner=self.partner)
+        seat = course.create_or_update_seat('verified', True, 50)
+        stock_record = seat.stockrecords.get()
+        self.run_commit_callbacks()
+
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                stock_record.price_excl_tax = 60
+                stock_record.save()
+                raise ValueError
+
+        stock_record.price_excl_tax = 70
+        stock_record.save()
+        self.assert_summary(course, 'verified', ['verified'], 70, 70, False)
+
+    def test_course_deletion(self):
+        """ Verify courses with seats, and their summaries, can be deleted. """
+        course = CourseFactory(partner=self.partner)
+        course.create_or_update_seat('verified', True, 50, create_enrollment_code=True)
+
+        course.delete()
+        self.assertFalse(CourseSeatSummary.objects.exists())
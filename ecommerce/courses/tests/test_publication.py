@@ -0,0 +1,79 @@
+from __future__ import unicode_literals
+
+import mock
+from celery.exceptions import Retry
+
+from ecommerce.courses.constants import CoursePublicationStatus
+from ecommerce.courses.models import CoursePublication
+from ecommerce.courses.publication import MAX_ATTEMPTS, get_seats, is_seat_current, publish_course
+from ecommerce.courses.publishers import LMSPublisher
+from ecommerce.courses.tasks import publish_course_to_lms
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.tests.testcases import TestCase
+
+
+class IsSeatCurrentTests(TestCase):
+    def setUp(self):
+        super(IsSeatCurrentTests, self).setUp()
+        self.course = CourseFactory(partner=self.partner)
+        self.course.create_or_update_seat('verified', True, 100, create_enrollment_code=True)
+        self.course.create_or_update_seat('credit', True, 200, credit_provider='MIT', credit_hours=2)
+        self.seats = get_seats(self.course)
+
+    def test_unchanged_seats(self):
+        """ Verify seats saved with the same data are current. """
+        self.assertTrue(is_seat_current(self.course, self.seats, 'verified', True, 100, create_enrollment_code=True))
+        self.assertTrue(
+            is_seat_current(self.course, self.seats, 'credit', True, 200, credit_provider='MIT', credit_hours=2)
+        )
+
+    def test_changed_seats(self):
+        """ Verify seats whose data changed, and seats which do not exist, are not current. """
+        self.assertFalse(is_seat_current(self.course, self.seats, 'verified', True, 90))
+        self.assertFalse(is_seat_current(self.course, self.seats, 'verified', False, 100))
+        self.assertFalse(
+            is_seat_current(self.course, self.seats, 'credit', True, 200, credit_provider='MIT', credit_hours=3)
+        )
+        self.assertFalse(is_seat_current(self.course, self.seats, 'credit', True, 200, credit_provider='ASU'))
+        self.assertFalse(is_seat_current(self.course, self.seats, 'professional', True, 100))
+
+
+class PublishCourseTests(TestCase):
+    def setUp(self):
+        super(PublishCourseTests, self).setUp()
+        self.publication = CoursePublication.objects.create(course=CourseFactory(partner=self.partner))
+
+    def assert_publication(self, status, attempts, message=''):
+        publication = CoursePublication.objects.get(id=self.publication.id)
+        self.assertEqual(publication.status, status)
+        self.assertEqual(publication.attempts, attempts)
+        self.assertEqual(publication.message, message)
+
+    def test_success(self):
+        with mock.patch.object(LMSPublisher, 'publish', return_value=None):
+            self.assertTrue(publish_course(self.publication.id))
+        self.assert_publication(CoursePublicationStatus.PUBLISHED, 1)
+
+    def test_failure(self):
+        """ Verify failed attempts are recorded, and the publication only fails on the final attempt. """
+        with mock.patch.object(LMSPublisher, 'publish', return_value='Failed.'):
+            self.assertFalse(publish_course(self.publication.id, final_attempt=False))
+            self.assert_publication(CoursePublicationStatus.PENDING, 1, 'Failed.')
+
+            self.assertFalse(publish_course(self.publication.id))
+            self.assert_publication(CoursePublicationStatus.FAILED, 2, 'Failed.')
+
+    def test_task_retries(self):
+        """ Verify the task retries failed publications until the maximum number of attempts is reached. """
+        # Eager retries are run before the Retry exception is raised.
+        exception = Exception('Timeout.')
+        with mock.patch.object(LMSPublisher, 'publish', side_effect=exception):
+            with self.assertRaises(Retry):
+                publish_course_to_lms.apply(args=(self.publication.id,))
+        self.assert_publication(CoursePublicationStatus.FAILED, MAX_ATTEMPTS, repr(exception))
+
+        self.publication = CoursePublication.objects.create(course=self.publication.course)
+        with mock.patch.object(LMSPublisher, 'publish', side_effect=['Failed.', None]):
+            with self.assertRaises(Retry):
+                publish_course_to_lms.apply(args=(self.publication.id,))
+        self.assert_publication(CoursePublicationStatus.PUBLISHED, 2)
@@ -6,6 +6,7 @@ from edx_django_utils.cache import TieredCache
 from opaque_keys.edx.keys import CourseKey
 
 from ecommerce.core.utils import deprecated_traverse_pagination
+from ecommerce.discovery_mirror.utils import get_mirrored_course_data, get_mirrored_course_run_data
 
 
 def mode_for_product(product):
@@ -30,8 +31,16 @@ def get_course_info_from_catalog(site, product):
     else:
         key = CourseKey.from_string(product.attr.course_key)
 
+    partner = site.siteconfiguration.partner
+    if product.is_course_entitlement_product:
+        mirrored_course = get_mirrored_course_data(partner, key)
+    else:
+        mirrored_course = get_mirrored_course_run_data(partner, unicode(key))
+    if mirrored_course is not None:
+        return mirrored_course
+
     api = site.siteconfiguration.discovery_api_client
-    partner_short_code = site.siteconfiguration.partner.short_code
+    partner_short_code = partner.short_code
 
     cache_key = 'courses_api_detail_{}{}'.format(key, partner_short_code)
     cache_key = hashlib.md5(cache_key).hexdigest()
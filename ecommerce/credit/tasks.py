@@ -0,0 +1,17 @@
+""" Celery tasks which keep the credit provider directories up to date. """
+from __future__ import unicode_literals
+
+from celery import shared_task
+
+from ecommerce.core.models import SiteConfiguration
+from ecommerce.credit.utils import refresh_credit_provider_directory
+
+
+@shared_task(ignore_result=True)
+def refresh_credit_provider_directories():
+    """ Refresh the credit provider directory of each LMS, using one of the sites it serves. """
+    lms_url_roots = set()
+    for site_configuration in SiteConfiguration.objects.select_related('site').order_by('id'):
+        if site_configuration.lms_url_root and site_configuration.lms_url_root not in lms_url_roots:
+            lms_url_roots.add(site_configuration.lms_url_root)
+            refresh_credit_provider_directory(site_configuration)
@@ -0,0 +1,94 @@
+from __future__ import unicode_literals
+
+import json
+
+import httpretty
+from dateutil.parser import parse
+
+from ecommerce.credit.tasks import refresh_credit_provider_directories
+from ecommerce.credit.utils import (
+    get_credit_eligibility_deadline,
+    get_credit_provider,
+    get_credit_providers,
+    invalidate_credit_eligibility
+)
+from ecommerce.tests.testcases import TestCase
+
+JSON = 'application/json'
+
+
+class CreditProviderDirectoryTests(TestCase):
+    def setUp(self):
+        super(CreditProviderDirectoryTests, self).setUp()
+        self.providers_url = self.site_configuration.build_lms_url('api/credit/v1/providers/')
+        self.eligibility_url = self.site_configuration.build_lms_url('api/credit/v1/eligibility/')
+        self.user = self.create_user()
+        self.create_access_token(self.user)
+
+    def mock_providers_api(self, providers, status=200):
+        self.mock_access_token_response()
+        httpretty.register_uri(
+            httpretty.GET, self.providers_url, body=json.dumps(providers), content_type=JSON, status=status
+        )
+
+    def count_requests(self, url):
+        paths = [request.path.split('?')[0] for request in httpretty.httpretty.latest_requests]
+        return len([path for path in paths if url.endswith(path)])
+
+    @httpretty.activate
+    def test_directory_lookups(self):
+        """ Verify providers are looked up in the cached directory, which is refreshed once for unknown providers. """
+        self.mock_providers_api([{'id': 'ASU', 'display_name': 'Arizona State University'}])
+        refresh_credit_provider_directories()
+        self.assertEqual(self.count_requests(self.providers_url), 1)
+
+        provider = get_credit_provider(self.site_configuration, 'ASU')
+        self.assertEqual(provider['display_name'], 'Arizona State University')
+        self.assertEqual(get_credit_providers(self.site_configuration, ['ASU']), [{
+            'id': 'ASU', 'display_name': 'Arizona State University'
+        }])
+        self.assertEqual(self.count_requests(self.providers_url), 1)
+
+        self.mock_providers_api([{'id': 'ASU', 'display_name': 'ASU'}, {'id': 'MIT', 'display_name': 'MIT'}])
+        providers = get_credit_providers(self.site_configuration, ['ASU', 'MIT', 'unknown'])
+        self.assertEqual([provider['display_name'] for provider in providers], ['ASU', 'MIT'])
+        self.assertEqual(self.count_requests(self.providers_url), 2)
+
+        # Unknown providers do not cause another refresh, until the directory is next refreshed.
+        self.assertIsNone(get_credit_provider(self.site_configuration, 'unknown'))
+        self.assertEqual(self.count_requests(self.providers_url), 2)
+
+        refresh_credit_provider_directories()
+        self.assertIsNone(get_credit_provider(self.site_configuration, 'unknown'))
+        self.assertEqual(self.count_requests(self.providers_url), 4)
+
+    @httpretty.activate
+    def test_refresh_failure(self):
+        """ Verify the cached directory is kept if the LMS is unavailable. """
+        self.mock_providers_api([{'id': 'ASU', 'display_name': 'ASU'}])
+        refresh_credit_provider_directories()
+
+        self.mock_providers_api({}, status=500)
+        refresh_credit_provider_directories()
+        self.assertIsNotNone(get_credit_provider(self.site_configuration, 'ASU'))
+        self.assertIsNone(get_credit_provider(self.site_configuration, 'MIT'))
+
+    @httpretty.activate
+    def test_eligibility_cache(self):
+        """ Verify eligibilities are cached until they are invalidated, and that ineligible learners are not cached. """
+        course_key = 'course-v1:edX+DemoX+Demo_Course'
+        deadline = '2016-10-28T09:56:44Z'
+        httpretty.register_uri(httpretty.GET, self.eligibility_url, body='[]', content_type=JSON)
+        self.assertIsNone(get_credit_eligibility_deadline(self.site_configuration, self.user, course_key))
+
+        httpretty.register_uri(
+            httpretty.GET, self.eligibility_url, body=json.dumps([{'deadline': deadline}]), content_type=JSON
+        )
+        for __ in range(2):
+            self.assertEqual(get_credit_eligibility_deadline(self.site_configuration, self.user, course_key),
+                             parse(deadline))
+        self.assertEqual(self.count_requests(self.eligibility_url), 2)
+
+        invalidate_credit_eligibility(self.user.username, course_key)
+        get_credit_eligibility_deadline(self.site_configuration, self.user, course_key)
+        self.assertEqual(self.count_requests(self.eligibility_url), 3)
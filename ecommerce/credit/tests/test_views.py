@@ -81,7 +81,8 @@ class CheckoutPageTest(DiscoveryTestMixin, TestCase, JwtMixin):
 
     def _mock_providers_api(self, body, status=200):
         """ Mock GET requests to the Credit API's provider endpoint. """
-
+        # The provider directory is fetched with a JWT of the site.
+        self.mock_access_token_response()
         httpretty.register_uri(
             method=httpretty.GET,
             uri=self.provider_url,
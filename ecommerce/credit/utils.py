@@ -0,0 +1,135 @@
+"""
+Local directory of the credit providers offered by the LMS, and cache of the credit eligibility of learners.
+
+Provider metadata rarely changes. The directory of each site is fetched from the LMS Credit API in a
+single request, refreshed periodically by the refresh_credit_provider_directories task, and looked up
+from the cache by the credit checkout page and post-checkout receipts.
+"""
+from __future__ import unicode_literals
+
+import hashlib
+import logging
+
+from dateutil.parser import parse
+from django.conf import settings
+from edx_django_utils.cache import TieredCache
+from requests.exceptions import ConnectionError, Timeout
+from slumber.exceptions import SlumberHttpBaseException
+
+from ecommerce.core.service_clients import get_service_client, get_user_service_client
+
+logger = logging.getLogger(__name__)
+
+CREDIT_API_PATH = 'api/credit/v1/'
+
+
+def _get_credit_api_url(site_configuration):
+    return site_configuration.build_lms_url(CREDIT_API_PATH)
+
+
+def _get_directory_cache_key(site_configuration):
+    # Sites using the same LMS share its directory.
+    return 'credit_provider_directory_{}'.format(
+        hashlib.md5(_get_credit_api_url(site_configuration).encode('utf-8')).hexdigest()
+    )
+
+
+def _get_eligibility_cache_key(username, course_key):
+    key = '{}:{}'.format(username, course_key)
+    return 'credit_eligibility_{}'.format(hashlib.md5(key.encode('utf-8')).hexdigest())
+
+
+def refresh_credit_provider_directory(site_configuration):
+    """
+    Fetch all credit providers from the LMS, and replace the cached directory of the site.
+
+    Returns:
+        dict: Provider details keyed by provider ID, or None if the providers could not be retrieved.
+    """
+    client = get_service_client(site_configuration, 'lms', _get_credit_api_url(site_configuration))
+    try:
+        providers = client.providers.get()
+    except (ConnectionError, SlumberHttpBaseException, Timeout):
+        logger.exception(
+            'Failed to refresh the credit provider directory of site [%s].', site_configuration.site.domain
+        )
+        return None
+
+    directory = {provider['id']: provider for provider in providers}
+    TieredCache.set_all_tiers(
+        _get_directory_cache_key(site_configuration), directory, settings.CREDIT_PROVIDER_DIRECTORY_TIMEOUT
+    )
+    return directory
+
+
+def get_credit_providers(site_configuration, provider_ids):
+    """
+    Returns the details of the given credit providers, skipping those unknown to the LMS.
+
+    Providers are looked up in the cached directory of the site. The directory is refreshed, at most once,
+    if it is not cached or if some of the providers are missing from it, since they may have been added
+    since it was last refreshed. Providers which are still missing are recorded as unknown in the directory,
+    so that they do not cause a refresh on every lookup until the directory is next refreshed.
+
+    Returns:
+        list
+    """
+    cache_key = _get_directory_cache_key(site_configuration)
+    cached_response = TieredCache.get_cached_response(cache_key)
+    directory = cached_response.value if cached_response.is_found else None
+    if directory is None or any(provider_id not in directory for provider_id in provider_ids):
+        refreshed_directory = refresh_credit_provider_directory(site_configuration)
+        if refreshed_directory is None:
+            directory = directory or {}
+        else:
+            directory = refreshed_directory
+            unknown_provider_ids = [provider_id for provider_id in provider_ids if provider_id not in directory]
+            if unknown_provider_ids:
+                directory.update(dict.fromkeys(unknown_provider_ids))
+                TieredCache.set_all_tiers(cache_key, directory, settings.CREDIT_PROVIDER_DIRECTORY_TIMEOUT)
+    return [directory[provider_id] for provider_id in provider_ids if directory.get(provider_id)]
+
+
+def get_credit_provider(site_configuration, provider_id):
+    """ Returns the details of a credit provider, or None if the LMS does not know the provider. """
+    providers = get_credit_providers(site_configuration, [provider_id])
+    return providers[0] if providers else None
+
+
+def get_credit_eligibility_deadline(site_configuration, user, course_key):
+    """
+    Returns the deadline before which the user may purchase credit for the course, or None if the user
+    is not eligible for credit.
+
+    Eligibilities are cached until the learner purchases credit for the course, or
+    CREDIT_ELIGIBILITY_CACHE_TIMEOUT expires. Learners who are not eligible are not cached,
+    so that they may purchase credit as soon as they become eligible.
+    """
+    cache_key = _get_eligibility_cache_key(user.username, course_key)
+    cached_response = TieredCache.get_cached_response(cache_key)
+    if cached_response.is_found:
+        return parse(cached_response.value)
+
+    client = get_user_service_client('lms', _get_credit_api_url(site_configuration), user.access_token)
+    try:
+        eligibilities = client.eligibility.get(username=user.username, course_key=course_key)
+    except SlumberHttpBaseException:
+        logger.exception(
+            'Credit API request failed to get eligibility for user [%s] for course [%s].',
+            user.username,
+            course_key
+        )
+        return None
+
+    if not eligibilities:
+        return None
+
+    # currently we have only one eligibility for all providers
+    deadline = eligibilities[0].get('deadline')
+    TieredCache.set_all_tiers(cache_key, deadline, settings.CREDIT_ELIGIBILITY_CACHE_TIMEOUT)
+    return parse(deadline)
+
+
+def invalidate_credit_eligibility(username, course_key):
+    """ Discard the cached credit eligibility of a learner, e.g. once credit has been purchased. """
+    TieredCache.delete_all_tiers(_get_eligibility_cache_key(username, course_key))
@@ -2,20 +2,16 @@ from __future__ import unicode_literals
 
 import logging
 
-from dateutil.parser import parse
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
-from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import TemplateView
-from edx_rest_api_client.client import EdxRestApiClient
 from oscar.core.loading import get_model
-from slumber.exceptions import SlumberHttpBaseException
 
-from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.models import Course
+from ecommerce.credit.utils import get_credit_eligibility_deadline, get_credit_providers
 from ecommerce.extensions.analytics.utils import prepare_analytics_data
 from ecommerce.extensions.offer.utils import format_benefit_value
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
@@ -107,21 +103,7 @@ class Checkout(TemplateView):
         Returns:
             Eligibility deadline date or None if user is not eligible.
         """
-        try:
-            eligibilities = self.credit_api_client.eligibility.get(username=user.username, course_key=course_key)
-            if not eligibilities:
-                return None
-
-            # currently we have only one eligibility for all providers
-            return parse(eligibilities[0].get('deadline'))
-
-        except SlumberHttpBaseException:
-            logging.exception(
-                'Credit API request failed to get eligibility for user [%s] for course [%s].',
-                user.username,
-                course_key
-            )
-            return None
+        return get_credit_eligibility_deadline(self.request.site.siteconfiguration, user, course_key)
 
     def _get_providers_detail(self, credit_seats):
         """ Get details for the credit providers for the given credit seats.
@@ -169,28 +151,13 @@ class Checkout(TemplateView):
         return providers_dict.values()
 
     def _get_providers_from_lms(self, credit_seats):
-        """ Helper method for getting provider info from LMS.
+        """ Helper method for getting provider info from the credit provider directory of the LMS.
 
         Arguments:
             credit_seats (Products): List of credit_seats objects.
 
         Returns:
-            Response from LMS as json, containing list of providers.
+            List of providers.
         """
-
-        provider_ids = ",".join([seat.attr.credit_provider for seat in credit_seats if seat.attr.credit_provider])
-
-        try:
-            return self.credit_api_client.providers.get(provider_ids=provider_ids)
-        except SlumberHttpBaseException:
-            logger.exception('An error occurred while retrieving credit provider details.')
-            return None
-
-    @cached_property
-    def credit_api_client(self):
-        """ Returns an instance of the Credit API client. """
-
-        return EdxRestApiClient(
-            get_lms_url('api/credit/v1/'),
-            oauth_access_token=self.request.user.access_token
-        )
+        provider_ids = [seat.attr.credit_provider for seat in credit_seats if seat.attr.credit_provider]
+        return get_credit_providers(self.request.site.siteconfiguration, provider_ids)
@@ -0,0 +1,33 @@
+from django.contrib import admin
+
+from ecommerce.discovery_mirror.models import MirroredCatalog, MirroredCourse, MirroredCourseRun, MirrorSyncCursor
+
+
+@admin.register(MirroredCourse)
+class MirroredCourseAdmin(admin.ModelAdmin):
+    list_display = ('key', 'uuid', 'partner', 'modified_in_discovery', 'modified')
+    list_filter = ('partner',)
+    search_fields = ('key', 'uuid', 'title')
+    readonly_fields = ('data',)
+
+
+@admin.register(MirroredCourseRun)
+class MirroredCourseRunAdmin(admin.ModelAdmin):
+    list_display = ('key', 'partner', 'modified_in_discovery', 'modified')
+    list_filter = ('partner',)
+    search_fields = ('key', 'title')
+    raw_id_fields = ('course',)
+    readonly_fields = ('data',)
+
+
+@admin.register(MirroredCatalog)
+class MirroredCatalogAdmin(admin.ModelAdmin):
+    list_display = ('catalog_id', 'name', 'partner', 'last_synced')
+    list_filter = ('partner',)
+    search_fields = ('name', 'query')
+    exclude = ('course_runs', 'courses')
+
+
+@admin.register(MirrorSyncCursor)
+class MirrorSyncCursorAdmin(admin.ModelAdmin):
+    list_display = ('partner', 'resource', 'modified_since', 'last_run')
@@ -0,0 +1,10 @@
+# Waffle switch used to read Discovery data from the local mirror before calling the Discovery Service.
+DISCOVERY_MIRROR_SWITCH = 'use_discovery_mirror'
+
+# Query string parameter used to ask the Discovery Service for objects modified after a cursor.
+MODIFIED_SINCE_PARAM = 'timestamp'
+
+# Resources whose synchronization progress is tracked with a cursor.
+COURSES_RESOURCE = 'courses'
+COURSE_RUNS_RESOURCE = 'course_runs'
+CATALOGS_RESOURCE = 'catalogs'
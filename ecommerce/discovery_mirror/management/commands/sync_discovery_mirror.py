@@ -0,0 +1,46 @@
+"""
+Management command that synchronizes the local mirror of Discovery Service data.
+
+By default only courses and course runs modified since the previous run are requested.
+"""
+from __future__ import unicode_literals
+
+import logging
+
+from django.core.management import BaseCommand, CommandError
+
+from ecommerce.discovery_mirror.sync import DiscoveryMirrorSynchronizer
+from ecommerce.discovery_mirror.tasks import get_site_configurations_to_sync
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Synchronize courses, course runs, seats and catalog memberships from the Discovery Service.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--site-domain',
+                            action='store',
+                            dest='site_domain',
+                            default=None,
+                            help='Only synchronize the partner of the site with this domain.')
+        parser.add_argument('--full',
+                            action='store_true',
+                            dest='full',
+                            default=False,
+                            help='Ignore the modified-since cursors and synchronize everything.')
+        parser.add_argument('--page-size',
+                            action='store',
+                            dest='page_size',
+                            default=100,
+                            type=int,
+                            help='Number of objects requested from the Discovery Service per page.')
+
+    def handle(self, *args, **options):
+        site_configurations = list(get_site_configurations_to_sync(options['site_domain']))
+        if not site_configurations:
+            raise CommandError('No site with a Discovery Service URL was found.')
+
+        for site_configuration in site_configurations:
+            logger.info('Synchronizing the Discovery mirror for partner [%s].', site_configuration.partner.short_code)
+            DiscoveryMirrorSynchronizer(site_configuration, page_size=options['page_size']).sync(full=options['full'])
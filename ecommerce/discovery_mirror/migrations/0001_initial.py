@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-19 09:46
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+import django_extensions.db.fields
+import jsonfield.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('partner', '0013_partner_default_site'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MirroredCatalog',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('catalog_id', models.PositiveIntegerField(blank=True, db_index=True, null=True)),
+                ('name', models.CharField(blank=True, default='', max_length=255)),
+                ('query', models.TextField()),
+                ('query_hash', models.CharField(db_index=True, editable=False, max_length=32)),
+                ('last_synced', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MirroredCourse',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('uuid', models.UUIDField(verbose_name='UUID')),
+                ('key', models.CharField(db_index=True, max_length=255)),
+                ('title', models.CharField(blank=True, default='', max_length=255)),
+                ('modified_in_discovery', models.DateTimeField(blank=True, null=True)),
+                ('data', jsonfield.fields.JSONField(help_text='Course payload, as returned by the Discovery Service.')),
+                ('partner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='partner.Partner')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MirroredCourseRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('key', models.CharField(max_length=255)),
+                ('title', models.CharField(blank=True, default='', max_length=255)),
+                ('start', models.DateTimeField(blank=True, null=True)),
+                ('end', models.DateTimeField(blank=True, null=True)),
+                ('enrollment_start', models.DateTimeField(blank=True, null=True)),
+                ('enrollment_end', models.DateTimeField(blank=True, null=True)),
+                ('modified_in_discovery', models.DateTimeField(blank=True, null=True)),
+                ('data', jsonfield.fields.JSONField(help_text='Course run payload, as returned by the Discovery Service.')),
+                ('course', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='course_runs', to='discovery_mirror.MirroredCourse')),
+                ('partner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='partner.Partner')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MirroredSeat',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(max_length=63)),
+                ('price', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('currency', models.CharField(blank=True, default='', max_length=12)),
+                ('sku', models.CharField(blank=True, db_index=True, default='', max_length=128)),
+                ('credit_provider', models.CharField(blank=True, default='', max_length=255)),
+                ('upgrade_deadline', models.DateTimeField(blank=True, null=True)),
+                ('course_run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seats', to='discovery_mirror.MirroredCourseRun')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MirrorSyncCursor',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(choices=[(b'courses', 'Courses'), (b'course_runs', 'Course runs'), (b'catalogs', 'Catalogs')], max_length=32)),
+                ('modified_since', models.DateTimeField(blank=True, help_text='Objects modified after this time are requested on the next sync.', null=True)),
+                ('last_run', models.DateTimeField(blank=True, null=True)),
+                ('partner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='partner.Partner')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='mirroredcatalog',
+            name='course_runs',
+            field=models.ManyToManyField(blank=True, related_name='catalogs', to='discovery_mirror.MirroredCourseRun'),
+        ),
+        migrations.AddField(
+            model_name='mirroredcatalog',
+            name='courses',
+            field=models.ManyToManyField(blank=True, related_name='catalogs', to='discovery_mirror.MirroredCourse'),
+        ),
+        migrations.AddField(
+            model_name='mirroredcatalog',
+            name='partner',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='partner.Partner'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='mirrorsynccursor',
+            unique_together=set([('partner', 'resource')]),
+        ),
+        migrations.AlterUniqueTogether(
+            name='mirroredcourserun',
+            unique_together=set([('partner', 'key')]),
+        ),
+        migrations.AlterUniqueTogether(
+            name='mirroredcourse',
+            unique_together=set([('partner', 'uuid')]),
+        ),
+        migrations.AlterUniqueTogether(
+            name='mirroredcatalog',
+            unique_together=set([('partner', 'catalog_id', 'query_hash')]),
+        ),
+    ]
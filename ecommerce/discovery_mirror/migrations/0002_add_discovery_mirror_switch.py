@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from ecommerce.discovery_mirror.constants import DISCOVERY_MIRROR_SWITCH
+
+
+def create_switch(apps, schema_editor):
+    """Create the `use_discovery_mirror` switch if it does not already exist."""
+    Switch = apps.get_model('waffle', 'Switch')
+    Switch.objects.update_or_create(name=DISCOVERY_MIRROR_SWITCH, defaults={'active': False})
+
+
+def delete_switch(apps, schema_editor):
+    """Delete the `use_discovery_mirror` switch."""
+    Switch = apps.get_model('waffle', 'Switch')
+    Switch.objects.filter(name=DISCOVERY_MIRROR_SWITCH).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('discovery_mirror', '0001_initial'),
+        ('waffle', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_switch, delete_switch)
+    ]
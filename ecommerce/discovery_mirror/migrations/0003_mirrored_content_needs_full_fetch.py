@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-19 16:11
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discovery_mirror', '0002_add_discovery_mirror_switch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mirroredcourse',
+            name='needs_full_fetch',
+            field=models.BooleanField(default=False, help_text='Whether the payload is a partial search result.'),
+        ),
+        migrations.AddField(
+            model_name='mirroredcourserun',
+            name='needs_full_fetch',
+            field=models.BooleanField(default=False, help_text='Whether the payload is a partial search result.'),
+        ),
+    ]
@@ -0,0 +1,120 @@
+from __future__ import unicode_literals
+
+import hashlib
+
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+from django_extensions.db.models import TimeStampedModel
+from jsonfield import JSONField
+
+from ecommerce.discovery_mirror.constants import CATALOGS_RESOURCE, COURSE_RUNS_RESOURCE, COURSES_RESOURCE
+
+
+class MirroredCourse(TimeStampedModel):
+    """ Local copy of a course published by the Discovery Service. """
+    partner = models.ForeignKey('partner.Partner', on_delete=models.CASCADE)
+    uuid = models.UUIDField(verbose_name=_('UUID'))
+    key = models.CharField(max_length=255, db_index=True)
+    title = models.CharField(max_length=255, blank=True, default='')
+    modified_in_discovery = models.DateTimeField(null=True, blank=True)
+    data = JSONField(help_text=_('Course payload, as returned by the Discovery Service.'))
+    needs_full_fetch = models.BooleanField(
+        default=False, help_text=_('Whether the payload is a partial search result.')
+    )
+
+    class Meta(object):
+        unique_together = ('partner', 'uuid')
+
+    def __unicode__(self):
+        return self.key
+
+
+class MirroredCourseRun(TimeStampedModel):
+    """ Local copy of a course run published by the Discovery Service. """
+    partner = models.ForeignKey('partner.Partner', on_delete=models.CASCADE)
+    course = models.ForeignKey(
+        MirroredCourse, null=True, blank=True, related_name='course_runs', on_delete=models.SET_NULL
+    )
+    key = models.CharField(max_length=255)
+    title = models.CharField(max_length=255, blank=True, default='')
+    start = models.DateTimeField(null=True, blank=True)
+    end = models.DateTimeField(null=True, blank=True)
+    enrollment_start = models.DateTimeField(null=True, blank=True)
+    enrollment_end = models.DateTimeField(null=True, blank=True)
+    modified_in_discovery = models.DateTimeField(null=True, blank=True)
+    data = JSONField(help_text=_('Course run payload, as returned by the Discovery Service.'))
+    needs_full_fetch = models.BooleanField(
+        default=False, help_text=_('Whether the payload is a partial search result.')
+    )
+
+    class Meta(object):
+        unique_together = ('partner', 'key')
+
+    def __unicode__(self):
+        return self.key
+
+
+class MirroredSeat(models.Model):
+    """ Seat offered for a mirrored course run. """
+    course_run = models.ForeignKey(MirroredCourseRun, related_name='seats', on_delete=models.CASCADE)
+    type = models.CharField(max_length=63)
+    price = models.DecimalField(decimal_places=2, max_digits=12, null=True, blank=True)
+    currency = models.CharField(max_length=12, blank=True, default='')
+    sku = models.CharField(max_length=128, blank=True, default='', db_index=True)
+    credit_provider = models.CharField(max_length=255, blank=True, default='')
+    upgrade_deadline = models.DateTimeField(null=True, blank=True)
+
+    def __unicode__(self):
+        return '{key} [{type}]'.format(key=self.course_run.key, type=self.type)
+
+
+class MirroredCatalog(TimeStampedModel):
+    """ Membership of course runs and courses in a Discovery catalog or catalog query.
+
+    Catalogs defined in the Discovery Service carry their ID. Catalog queries which are only
+    stored on offer ranges are mirrored without an ID.
+    """
+    partner = models.ForeignKey('partner.Partner', on_delete=models.CASCADE)
+    catalog_id = models.PositiveIntegerField(null=True, blank=True, db_index=True)
+    name = models.CharField(max_length=255, blank=True, default='')
+    query = models.TextField()
+    query_hash = models.CharField(max_length=32, db_index=True, editable=False)
+    course_runs = models.ManyToManyField(MirroredCourseRun, related_name='catalogs', blank=True)
+    courses = models.ManyToManyField(MirroredCourse, related_name='catalogs', blank=True)
+    last_synced = models.DateTimeField(null=True, blank=True)
+
+    class Meta(object):
+        unique_together = ('partner', 'catalog_id', 'query_hash')
+
+    def __unicode__(self):
+        return self.name or self.query
+
+    @staticmethod
+    def hash_query(query):
+        return hashlib.md5(query.encode('utf-8')).hexdigest()
+
+    def save(self, *args, **kwargs):
+        self.query_hash = self.hash_query(self.query)
+        super(MirroredCatalog, self).save(*args, **kwargs)
+
+
+class MirrorSyncCursor(models.Model):
+    """ Tracks how far the mirror of a partner's Discovery resource has been synchronized. """
+    RESOURCE_CHOICES = (
+        (COURSES_RESOURCE, _('Courses')),
+        (COURSE_RUNS_RESOURCE, _('Course runs')),
+        (CATALOGS_RESOURCE, _('Catalogs')),
+    )
+
+    partner = models.ForeignKey('partner.Partner', on_delete=models.CASCADE)
+    resource = models.CharField(max_length=32, choices=RESOURCE_CHOICES)
+    modified_since = models.DateTimeField(
+        null=True, blank=True, help_text=_('Objects modified after this time are requested on the next sync.')
+    )
+    last_run = models.DateTimeField(null=True, blank=True)
+
+    class Meta(object):
+        unique_together = ('partner', 'resource')
+
+    def __unicode__(self):
+        return '{partner}: {resource}'.format(partner=self.partner.short_code, resource=self.resource)
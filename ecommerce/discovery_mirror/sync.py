@@ -0,0 +1,317 @@
+""" Incremental synchronization of the local Discovery mirror.
+
+Courses and course runs are requested with a modified-since cursor, so each sync only transfers what
+changed in the Discovery Service since the previous one. Catalog queries cannot be evaluated locally,
+so catalog memberships are re-evaluated whenever mirrored content changed or a catalog is new. The search
+results of catalog queries are partial payloads, which only resolve the mirrored content of a catalog.
+Content missing from the mirror is created from them, and fetched in full at the end of the sync.
+"""
+from __future__ import unicode_literals
+
+import logging
+from urlparse import parse_qs, urlparse
+
+from dateutil.parser import parse
+from django.db import transaction
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+from requests.exceptions import ConnectionError, Timeout
+from slumber.exceptions import SlumberBaseException
+
+from ecommerce.discovery_mirror.constants import (
+    CATALOGS_RESOURCE,
+    COURSE_RUNS_RESOURCE,
+    COURSES_RESOURCE,
+    MODIFIED_SINCE_PARAM
+)
+from ecommerce.discovery_mirror.models import (
+    MirroredCatalog,
+    MirroredCourse,
+    MirroredCourseRun,
+    MirroredSeat,
+    MirrorSyncCursor
+)
+
+logger = logging.getLogger(__name__)
+Range = get_model('offer', 'Range')
+
+PAGE_SIZE = 100
+
+
+def _parse_datetime(value):
+    return parse(value) if value else None
+
+
+def iterate_results(endpoint, **params):
+    """
+    Yield the results of a paginated Discovery endpoint, one page at a time.
+
+    Unlike `deprecated_traverse_pagination`, pages are not accumulated in memory.
+    """
+    response = endpoint.get(**params)
+    while True:
+        for result in response.get('results', []):
+            yield result
+
+        next_page = response.get('next')
+        if not next_page:
+            return
+        response = endpoint.get(**parse_qs(urlparse(next_page).query, keep_blank_values=True))
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def upsert_courses(partner, payloads, needs_full_fetch=False):
+    """
+    Create or update mirrored courses from Discovery course payloads.
+
+    Arguments:
+        needs_full_fetch (bool): Whether the payloads are partial, and the courses must be fetched in full.
+
+    Returns:
+        list: The mirrored courses, in the order of the payloads.
+    """
+    existing = {
+        str(course.uuid): course
+        for course in MirroredCourse.objects.filter(partner=partner, uuid__in=[p['uuid'] for p in payloads])
+    }
+    courses = []
+    with transaction.atomic():
+        for payload in payloads:
+            course = existing.get(payload['uuid']) or MirroredCourse(partner=partner, uuid=payload['uuid'])
+            course.key = payload.get('key') or ''
+            course.title = payload.get('title') or ''
+            course.modified_in_discovery = _parse_datetime(payload.get('modified'))
+            course.data = payload
+            course.needs_full_fetch = needs_full_fetch
+            course.save()
+            courses.append(course)
+
+            course_run_keys = [course_run['key'] for course_run in payload.get('course_runs') or []]
+            if course_run_keys:
+                MirroredCourseRun.objects.filter(partner=partner, key__in=course_run_keys).update(course=course)
+    return courses
+
+
+def upsert_course_runs(partner, payloads, needs_full_fetch=False):
+    """
+    Create or update mirrored course runs, and replace their seats, from Discovery course run payloads.
+
+    Arguments:
+        needs_full_fetch (bool): Whether the payloads are partial, and the course runs must be fetched in full.
+
+    Returns:
+        list: The mirrored course runs, in the order of the payloads.
+    """
+    existing = {
+        course_run.key: course_run
+        for course_run in MirroredCourseRun.objects.filter(partner=partner, key__in=[p['key'] for p in payloads])
+    }
+    courses = dict(
+        MirroredCourse.objects.filter(
+            partner=partner, key__in={p['course'] for p in payloads if p.get('course')}
+        ).values_list('key', 'id')
+    )
+
+    course_runs = []
+    seats = []
+    with transaction.atomic():
+        for payload in payloads:
+            course_run = existing.get(payload['key']) or MirroredCourseRun(partner=partner, key=payload['key'])
+            course_run.course_id = courses.get(payload.get('course'), course_run.course_id)
+            course_run.title = payload.get('title') or ''
+            course_run.start = _parse_datetime(payload.get('start'))
+            course_run.end = _parse_datetime(payload.get('end'))
+            course_run.enrollment_start = _parse_datetime(payload.get('enrollment_start'))
+            course_run.enrollment_end = _parse_datetime(payload.get('enrollment_end'))
+            course_run.modified_in_discovery = _parse_datetime(payload.get('modified'))
+            course_run.data = payload
+            course_run.needs_full_fetch = needs_full_fetch
+            course_run.save()
+            course_runs.append(course_run)
+
+            # Seats are only replaced when the payload carries them, since partial payloads omit them.
+            if 'seats' in payload:
+                course_run.seats.all().delete()
+                seats.extend(
+                    MirroredSeat(
+                        course_run=course_run,
+                        type=seat.get('type') or '',
+                        price=seat.get('price'),
+                        currency=seat.get('currency') or '',
+                        sku=seat.get('sku') or '',
+                        credit_provider=seat.get('credit_provider') or '',
+                        upgrade_deadline=_parse_datetime(seat.get('upgrade_deadline')),
+                    )
+                    for seat in payload['seats']
+                )
+        MirroredSeat.objects.bulk_create(seats)
+    return course_runs
+
+
+def resolve_courses(partner, payloads):
+    """
+    Returns the mirrored courses of Discovery search results.
+
+    Search results are partial payloads. Courses missing from the mirror are created from them, and marked
+    to be fetched in full. Mirrored courses are left untouched.
+    """
+    existing = list(MirroredCourse.objects.filter(partner=partner, uuid__in=[p['uuid'] for p in payloads]))
+    existing_uuids = {str(course.uuid) for course in existing}
+    missing = [payload for payload in payloads if payload['uuid'] not in existing_uuids]
+    return existing + upsert_courses(partner, missing, needs_full_fetch=True)
+
+
+def resolve_course_runs(partner, payloads):
+    """
+    Returns the mirrored course runs of Discovery search results.
+
+    Search results are partial payloads. Course runs missing from the mirror are created from them, and marked
+    to be fetched in full. Mirrored course runs are left untouched.
+    """
+    existing = list(MirroredCourseRun.objects.filter(partner=partner, key__in=[p['key'] for p in payloads]))
+    existing_keys = {course_run.key for course_run in existing}
+    missing = [payload for payload in payloads if payload['key'] not in existing_keys]
+    return existing + upsert_course_runs(partner, missing, needs_full_fetch=True)
+
+
+class DiscoveryMirrorSynchronizer(object):
+    """ Synchronizes the mirror for the partner of a site. """
+
+    def __init__(self, site_configuration, page_size=PAGE_SIZE):
+        self.site_configuration = site_configuration
+        self.partner = site_configuration.partner
+        self.page_size = page_size
+
+    @property
+    def api(self):
+        return self.site_configuration.discovery_api_client
+
+    def _get_cursor(self, resource):
+        cursor, __ = MirrorSyncCursor.objects.get_or_create(partner=self.partner, resource=resource)
+        return cursor
+
+    def _sync_resource(self, resource, upsert, full):
+        cursor = self._get_cursor(resource)
+        # The cursor is advanced to the start of this run, rather than its end, so that objects modified
+        # while the run is in progress are picked up by the next one.
+        started = now()
+        params = {'partner': self.partner.short_code, 'limit': self.page_size}
+        if cursor.modified_since and not full:
+            params[MODIFIED_SINCE_PARAM] = cursor.modified_since.isoformat()
+
+        count = 0
+        for payloads in _chunks(iterate_results(getattr(self.api, resource), **params), self.page_size):
+            upsert(self.partner, payloads)
+            count += len(payloads)
+
+        cursor.modified_since = started
+        cursor.last_run = now()
+        cursor.save()
+        logger.info('Mirrored [%d] %s for partner [%s].', count, resource, self.partner.short_code)
+        return count
+
+    def sync_courses(self, full=False):
+        return self._sync_resource(COURSES_RESOURCE, upsert_courses, full)
+
+    def sync_course_runs(self, full=False):
+        return self._sync_resource(COURSE_RUNS_RESOURCE, upsert_course_runs, full)
+
+    def _discover_catalogs(self):
+        """ Create mirror entries for Discovery catalogs and for the catalog queries of offer ranges. """
+        catalogs = []
+        for payload in iterate_results(self.api.catalogs, limit=self.page_size):
+            catalog, __ = MirroredCatalog.objects.get_or_create(
+                partner=self.partner,
+                catalog_id=payload['id'],
+                defaults={'query': payload.get('query') or ''}
+            )
+            if catalog.query != (payload.get('query') or '') or catalog.name != payload.get('name', ''):
+                catalog.query = payload.get('query') or ''
+                catalog.name = payload.get('name', '')
+                # A changed query invalidates the current memberships.
+                catalog.last_synced = None
+                catalog.save()
+            catalogs.append(catalog)
+
+        range_queries = set(
+            Range.objects.exclude(catalog_query__isnull=True).exclude(catalog_query='').values_list(
+                'catalog_query', flat=True
+            )
+        )
+        for query in range_queries:
+            catalog, __ = MirroredCatalog.objects.get_or_create(
+                partner=self.partner,
+                catalog_id=None,
+                query_hash=MirroredCatalog.hash_query(query),
+                defaults={'query': query}
+            )
+            catalogs.append(catalog)
+        return catalogs
+
+    def sync_catalog_membership(self, catalog):
+        """ Re-evaluate the catalog query and replace the catalog memberships with its results. """
+        params = {'partner': self.partner.short_code, 'q': catalog.query, 'limit': self.page_size}
+        course_runs = []
+        for payloads in _chunks(iterate_results(self.api.course_runs, **params), self.page_size):
+            course_runs.extend(resolve_course_runs(self.partner, payloads))
+
+        courses = []
+        for payloads in _chunks(iterate_results(self.api.courses, **params), self.page_size):
+            courses.extend(resolve_courses(self.partner, payloads))
+
+        with transaction.atomic():
+            catalog.course_runs.set(course_runs)
+            catalog.courses.set(courses)
+            catalog.last_synced = now()
+            catalog.save()
+
+    def fetch_partial_content(self):
+        """ Fetch the full payloads of the courses and course runs created from search results. """
+        count = 0
+        partial_content = (
+            (MirroredCourseRun, self.api.course_runs, upsert_course_runs),
+            (MirroredCourse, self.api.courses, upsert_courses),
+        )
+        for model, endpoint, upsert in partial_content:
+            for key in model.objects.filter(partner=self.partner, needs_full_fetch=True).values_list('key', flat=True):
+                try:
+                    payload = endpoint(key).get()
+                except (ConnectionError, SlumberBaseException, Timeout):
+                    # The object is fetched again by the next sync.
+                    logger.exception('Failed to fetch [%s] from the Discovery Service.', key)
+                    continue
+                upsert(self.partner, [payload])
+                count += 1
+        return count
+
+    def sync_catalogs(self, full=False, content_changed=True):
+        cursor = self._get_cursor(CATALOGS_RESOURCE)
+        started = now()
+        count = 0
+        for catalog in self._discover_catalogs():
+            if full or content_changed or not catalog.last_synced:
+                self.sync_catalog_membership(catalog)
+                count += 1
+        self.fetch_partial_content()
+
+        cursor.modified_since = started
+        cursor.last_run = now()
+        cursor.save()
+        logger.info('Re-evaluated [%d] catalogs for partner [%s].', count, self.partner.short_code)
+        return count
+
+    def sync(self, full=False):
+        """ Synchronize courses, course runs and catalog memberships. """
+        changed = self.sync_courses(full=full)
+        changed += self.sync_course_runs(full=full)
+        self.sync_catalogs(full=full, content_changed=bool(changed))
@@ -0,0 +1,38 @@
+""" Celery tasks which keep the Discovery mirror up to date. """
+from __future__ import unicode_literals
+
+import logging
+
+from celery import shared_task
+
+from ecommerce.core.models import SiteConfiguration
+from ecommerce.discovery_mirror.sync import DiscoveryMirrorSynchronizer
+
+logger = logging.getLogger(__name__)
+
+
+def get_site_configurations_to_sync(site_domain=None):
+    """ Return one site configuration per partner that has a Discovery Service configured. """
+    site_configurations = SiteConfiguration.objects.select_related('partner', 'site').exclude(
+        discovery_api_url__isnull=True
+    ).exclude(discovery_api_url='').order_by('id')
+    if site_domain:
+        site_configurations = site_configurations.filter(site__domain=site_domain)
+
+    partners = set()
+    for site_configuration in site_configurations:
+        if site_configuration.partner_id and site_configuration.partner_id not in partners:
+            partners.add(site_configuration.partner_id)
+            yield site_configuration
+
+
+@shared_task(ignore_result=True)
+def sync_discovery_mirror(site_domain=None, full=False):
+    """ Synchronize the Discovery mirror for every partner, or for the partner of the given site. """
+    for site_configuration in get_site_configurations_to_sync(site_domain):
+        try:
+            DiscoveryMirrorSynchronizer(site_configuration).sync(full=full)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(
+                'Failed to synchronize the Discovery mirror for partner [%s].', site_configuration.partner.short_code
+            )
@@ -0,0 +1,165 @@
+from __future__ import unicode_literals
+
+import json
+import re
+import uuid
+
+import httpretty
+from django.core.management import call_command
+from oscar.test.factories import RangeFactory
+
+from ecommerce.discovery_mirror.constants import COURSE_RUNS_RESOURCE, MODIFIED_SINCE_PARAM
+from ecommerce.discovery_mirror.models import MirroredCatalog, MirroredCourse, MirroredCourseRun, MirrorSyncCursor
+from ecommerce.discovery_mirror.sync import DiscoveryMirrorSynchronizer
+from ecommerce.tests.testcases import TestCase
+
+COURSE_UUID = str(uuid.uuid4())
+COURSE_RUN_KEY = 'course-v1:edX+DemoX+Demo_Course'
+
+
+class DiscoveryMirrorTestMixin(object):
+    """ Mocks the Discovery endpoints used to synchronize the mirror. """
+    course_payload = {
+        'uuid': COURSE_UUID,
+        'key': 'edX+DemoX',
+        'title': 'Demo Course',
+        'modified': '2018-01-01T00:00:00Z',
+        'course_runs': [{'key': COURSE_RUN_KEY}],
+    }
+    course_run_payload = {
+        'key': COURSE_RUN_KEY,
+        'course': 'edX+DemoX',
+        'title': 'Demo Course',
+        'start': '2018-01-01T00:00:00Z',
+        'end': None,
+        'enrollment_start': None,
+        'enrollment_end': None,
+        'modified': '2018-01-01T00:00:00Z',
+        'seats': [
+            {'type': 'verified', 'price': '100.00', 'currency': 'USD', 'sku': 'ABC', 'upgrade_deadline': None},
+        ],
+    }
+
+    def mock_discovery_endpoint(self, resource, results):
+        url = '{root}{resource}/'.format(root=self.site_configuration.discovery_api_url, resource=resource)
+        body = {'count': len(results), 'next': None, 'previous': None, 'results': results}
+        httpretty.register_uri(httpretty.GET, url, body=json.dumps(body), content_type='application/json')
+
+    def mock_discovery_mirror_endpoints(self, catalogs=None, course_runs=None, courses=None):
+        self.mock_access_token_response()
+        self.mock_discovery_endpoint('courses', [self.course_payload] if courses is None else courses)
+        self.mock_discovery_endpoint('course_runs', [self.course_run_payload] if course_runs is None else course_runs)
+        self.mock_discovery_endpoint('catalogs', catalogs or [])
+
+
+@httpretty.activate
+class DiscoveryMirrorSynchronizerTests(DiscoveryMirrorTestMixin, TestCase):
+    def test_sync(self):
+        """ Verify courses, course runs, seats and catalog memberships are mirrored. """
+        self.mock_discovery_mirror_endpoints(catalogs=[{'id': 1, 'name': 'All', 'query': '*:*'}])
+        DiscoveryMirrorSynchronizer(self.site_configuration).sync()
+
+        course = MirroredCourse.objects.get(partner=self.partner)
+        course_run = MirroredCourseRun.objects.get(partner=self.partner)
+        self.assertEqual(str(course.uuid), COURSE_UUID)
+        self.assertEqual(course_run.key, COURSE_RUN_KEY)
+        self.assertEqual(course_run.course, course)
+        self.assertEqual(course_run.data, self.course_run_payload)
+        self.assertEqual(list(course_run.seats.values_list('type', 'sku')), [('verified', 'ABC')])
+
+        catalog = MirroredCatalog.objects.get(partner=self.partner, catalog_id=1)
+        self.assertIsNotNone(catalog.last_synced)
+        self.assertEqual(list(catalog.course_runs.all()), [course_run])
+        self.assertEqual(list(catalog.courses.all()), [course])
+
+    def test_sync_is_incremental(self):
+        """ Verify the modified-since cursor is sent on subsequent syncs, unless a full sync is requested. """
+        self.mock_discovery_mirror_endpoints()
+        synchronizer = DiscoveryMirrorSynchronizer(self.site_configuration)
+
+        synchronizer.sync_course_runs()
+        self.assertNotIn(MODIFIED_SINCE_PARAM, httpretty.last_request().querystring)
+        cursor = MirrorSyncCursor.objects.get(partner=self.partner, resource=COURSE_RUNS_RESOURCE)
+        self.assertIsNotNone(cursor.modified_since)
+
+        synchronizer.sync_course_runs()
+        self.assertIn(MODIFIED_SINCE_PARAM, httpretty.last_request().querystring)
+
+        synchronizer.sync_course_runs(full=True)
+        self.assertNotIn(MODIFIED_SINCE_PARAM, httpretty.last_request().querystring)
+
+    def test_sync_range_catalog_queries(self):
+        """ Verify the catalog queries of offer ranges are mirrored. """
+        RangeFactory(catalog_query='key:edX*', course_seat_types='verified')
+        self.mock_discovery_mirror_endpoints()
+        DiscoveryMirrorSynchronizer(self.site_configuration).sync()
+
+        catalog = MirroredCatalog.objects.get(partner=self.partner, catalog_id__isnull=True)
+        self.assertEqual(catalog.query, 'key:edX*')
+        self.assertEqual(catalog.course_runs.count(), 1)
+
+    def test_catalog_membership_only_reevaluated_on_change(self):
+        """ Verify catalog memberships are not re-evaluated when no mirrored content changed. """
+        self.mock_discovery_mirror_endpoints(catalogs=[{'id': 1, 'name': 'All', 'query': '*:*'}])
+        synchronizer = DiscoveryMirrorSynchronizer(self.site_configuration)
+        synchronizer.sync()
+        last_synced = MirroredCatalog.objects.get(catalog_id=1).last_synced
+
+        self.mock_discovery_mirror_endpoints(
+            catalogs=[{'id': 1, 'name': 'All', 'query': '*:*'}], courses=[], course_runs=[]
+        )
+        synchronizer.sync()
+        self.assertEqual(MirroredCatalog.objects.get(catalog_id=1).last_synced, last_synced)
+
+    def test_catalog_membership_keeps_mirrored_content(self):
+        """ Verify catalog search results only resolve the mirrored content, and do not replace its payloads. """
+        self.mock_discovery_mirror_endpoints()
+        synchronizer = DiscoveryMirrorSynchronizer(self.site_configuration)
+        synchronizer.sync_courses()
+        synchronizer.sync_course_runs()
+
+        search_result = {'key': COURSE_RUN_KEY, 'title': 'Demo Course'}
+        self.mock_discovery_mirror_endpoints(course_runs=[search_result], courses=[{'uuid': COURSE_UUID}])
+        catalog = MirroredCatalog.objects.create(partner=self.partner, query='*:*')
+        synchronizer.sync_catalog_membership(catalog)
+
+        course_run = MirroredCourseRun.objects.get(partner=self.partner, key=COURSE_RUN_KEY)
+        self.assertEqual(list(catalog.course_runs.all()), [course_run])
+        self.assertEqual(course_run.data, self.course_run_payload)
+        self.assertEqual(course_run.seats.count(), 1)
+        self.assertFalse(course_run.needs_full_fetch)
+        self.assertEqual(MirroredCourse.objects.get(partner=self.partner).data, self.course_payload)
+
+    def test_catalog_membership_fetches_missing_content(self):
+        """ Verify content missing from the mirror is created from search results, then fetched in full. """
+        search_result = {'key': COURSE_RUN_KEY, 'title': 'Demo Course'}
+        self.mock_discovery_mirror_endpoints(
+            catalogs=[{'id': 1, 'name': 'All', 'query': '*:*'}], course_runs=[search_result], courses=[]
+        )
+        synchronizer = DiscoveryMirrorSynchronizer(self.site_configuration)
+        catalog = synchronizer._discover_catalogs()[0]  # pylint: disable=protected-access
+        synchronizer.sync_catalog_membership(catalog)
+
+        course_run = MirroredCourseRun.objects.get(partner=self.partner, key=COURSE_RUN_KEY)
+        self.assertEqual(list(catalog.course_runs.all()), [course_run])
+        self.assertTrue(course_run.needs_full_fetch)
+        self.assertFalse(course_run.seats.exists())
+
+        httpretty.register_uri(
+            httpretty.GET,
+            re.compile(r'.*/course_runs/course-v1.*'),
+            body=json.dumps(self.course_run_payload),
+            content_type='application/json'
+        )
+        self.assertEqual(synchronizer.fetch_partial_content(), 1)
+
+        course_run.refresh_from_db()
+        self.assertFalse(course_run.needs_full_fetch)
+        self.assertEqual(course_run.data, self.course_run_payload)
+        self.assertEqual(course_run.seats.count(), 1)
+
+    def test_command(self):
+        """ Verify the management command synchronizes the mirror for the site's partner. """
+        self.mock_discovery_mirror_endpoints()
+        call_command('sync_discovery_mirror', site_domain=self.site.domain)
+        self.assertTrue(MirroredCourseRun.objects.filter(partner=self.partner, key=COURSE_RUN_KEY).exists())
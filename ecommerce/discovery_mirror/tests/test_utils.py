@@ -0,0 +1,86 @@
+from __future__ import unicode_literals
+
+import httpretty
+from django.utils.timezone import now
+from waffle.testutils import override_switch
+
+from ecommerce.coupons.utils import fetch_course_catalog, get_catalog_course_runs
+from ecommerce.discovery_mirror.constants import DISCOVERY_MIRROR_SWITCH
+from ecommerce.discovery_mirror.models import MirroredCatalog, MirroredCourse, MirroredCourseRun
+from ecommerce.discovery_mirror.utils import (
+    get_mirrored_catalog,
+    get_mirrored_course_run_data,
+    mirrored_catalog_contains
+)
+from ecommerce.tests.testcases import TestCase
+
+
+@override_switch(DISCOVERY_MIRROR_SWITCH, active=True)
+class DiscoveryMirrorUtilsTests(TestCase):
+    def setUp(self):
+        super(DiscoveryMirrorUtilsTests, self).setUp()
+        self.course = MirroredCourse.objects.create(
+            partner=self.partner, uuid='8724c585-acb1-4c5e-b9e6-b3a6dba4f6c9', key='edX+DemoX', data={}
+        )
+        self.course_runs = [
+            MirroredCourseRun.objects.create(
+                partner=self.partner, course=self.course, key='course-v1:edX+DemoX+{}'.format(i), data={'key': i}
+            )
+            for i in range(3)
+        ]
+        self.catalog = MirroredCatalog.objects.create(
+            partner=self.partner, catalog_id=7, name='Demo', query='key:edX*', last_synced=now()
+        )
+        self.catalog.course_runs.add(*self.course_runs[:2])
+        self.catalog.courses.add(self.course)
+
+    def test_get_mirrored_course_run_data(self):
+        self.assertEqual(get_mirrored_course_run_data(self.partner, self.course_runs[0].key), {'key': 0})
+        self.assertIsNone(get_mirrored_course_run_data(self.partner, 'course-v1:edX+Unknown+Run'))
+
+    def test_mirror_disabled(self):
+        """ Verify the mirror does not answer while the switch is off. """
+        with override_switch(DISCOVERY_MIRROR_SWITCH, active=False):
+            self.assertIsNone(get_mirrored_course_run_data(self.partner, self.course_runs[0].key))
+            self.assertIsNone(get_mirrored_catalog(self.partner, self.catalog.catalog_id))
+
+    def test_mirrored_catalog_contains(self):
+        course_run_ids = [course_run.key for course_run in self.course_runs]
+        expected = {
+            course_run_ids[0]: True, course_run_ids[1]: True, course_run_ids[2]: False, str(self.course.uuid): True
+        }
+        kwargs = {'course_run_ids': course_run_ids, 'course_uuids': [str(self.course.uuid)]}
+
+        self.assertEqual(mirrored_catalog_contains(self.partner, catalog_id=7, **kwargs), expected)
+        self.assertEqual(mirrored_catalog_contains(self.partner, query='key:edX*', **kwargs), expected)
+        self.assertIsNone(mirrored_catalog_contains(self.partner, query='*:*', **kwargs))
+
+    def test_mirrored_catalog_contains_unmirrored_ids(self):
+        """ Verify the mirror does not answer for course runs or courses which have not been mirrored. """
+        self.assertIsNone(mirrored_catalog_contains(
+            self.partner, catalog_id=7, course_run_ids=[self.course_runs[0].key, 'course-v1:edX+Unknown+Run']
+        ))
+        self.assertIsNone(mirrored_catalog_contains(
+            self.partner, catalog_id=7, course_uuids=['a0dbf1fc-5e8e-4c2c-9e8e-21bcef4e0f2d']
+        ))
+
+    def test_unsynced_catalog_is_not_used(self):
+        """ Verify catalogs whose memberships have not been evaluated yet do not answer. """
+        self.catalog.last_synced = None
+        self.catalog.save()
+        self.assertIsNone(get_mirrored_catalog(self.partner, self.catalog.catalog_id))
+
+    @httpretty.activate
+    def test_call_sites_read_from_mirror(self):
+        """ Verify the Discovery call sites are served by the mirror without contacting the Discovery Service. """
+        self.assertEqual(
+            fetch_course_catalog(self.site, self.catalog.catalog_id),
+            {'id': 7, 'name': 'Demo', 'query': 'key:edX*'}
+        )
+
+        response = get_catalog_course_runs(self.site, 'key:edX*', limit=1)
+        self.assertEqual(response['count'], 2)
+        self.assertEqual(response['results'], [{'key': 0}])
+        self.assertIn('offset=1', response['next'])
+        self.assertIsNone(response['previous'])
+        self.assertFalse(httpretty.httpretty.latest_requests)
@@ -0,0 +1,186 @@
+""" Read access to the local mirror of Discovery Service data.
+
+Every lookup returns ``None`` when the mirror is disabled or cannot answer the question, in which
+case callers are expected to fall back to the Discovery Service.
+"""
+from __future__ import unicode_literals
+
+import logging
+from urllib import urlencode
+
+import waffle
+
+from ecommerce.discovery_mirror.constants import DISCOVERY_MIRROR_SWITCH
+from ecommerce.discovery_mirror.models import MirroredCatalog, MirroredCourse, MirroredCourseRun
+
+logger = logging.getLogger(__name__)
+
+
+def is_mirror_enabled():
+    return waffle.switch_is_active(DISCOVERY_MIRROR_SWITCH)
+
+
+def get_mirrored_course_run_data(partner, course_run_key):
+    """
+    Get the Discovery payload of a course run from the mirror.
+
+    Arguments:
+        partner (Partner): Partner owning the course run.
+        course_run_key (str): Key of the course run.
+
+    Returns:
+        dict: Course run data, or None if the course run is not mirrored.
+    """
+    if not is_mirror_enabled():
+        return None
+
+    course_run = MirroredCourseRun.objects.filter(
+        partner=partner, key=course_run_key, needs_full_fetch=False
+    ).only('data').first()
+    return course_run.data if course_run else None
+
+
+def get_mirrored_course_data(partner, course_uuid):
+    """
+    Get the Discovery payload of a course from the mirror.
+
+    Arguments:
+        partner (Partner): Partner owning the course.
+        course_uuid (str): UUID of the course.
+
+    Returns:
+        dict: Course data, or None if the course is not mirrored.
+    """
+    if not is_mirror_enabled():
+        return None
+
+    course = MirroredCourse.objects.filter(
+        partner=partner, uuid=course_uuid, needs_full_fetch=False
+    ).only('data').first()
+    return course.data if course else None
+
+
+def _get_synced_catalog(partner, catalog_id=None, query=None):
+    catalogs = MirroredCatalog.objects.filter(partner=partner, last_synced__isnull=False)
+    if catalog_id:
+        catalogs = catalogs.filter(catalog_id=catalog_id)
+    else:
+        catalogs = catalogs.filter(query_hash=MirroredCatalog.hash_query(query))
+    return catalogs.order_by('-last_synced').first()
+
+
+def get_mirrored_catalog(partner, catalog_id):
+    """
+    Get the details of a Discovery catalog from the mirror.
+
+    Arguments:
+        partner (Partner): Partner whose catalogs are mirrored.
+        catalog_id (int): ID of the catalog in the Discovery Service.
+
+    Returns:
+        dict: Catalog ID, name and query, or None if the catalog has not been mirrored.
+    """
+    if not is_mirror_enabled():
+        return None
+
+    catalog = _get_synced_catalog(partner, catalog_id=catalog_id)
+    if not catalog:
+        return None
+    return {'id': catalog.catalog_id, 'name': catalog.name, 'query': catalog.query}
+
+
+def mirrored_catalog_contains(partner, course_run_ids=(), course_uuids=(), catalog_id=None, query=None):
+    """
+    Determine which course runs and courses belong to a catalog, using the mirror.
+
+    The catalog is identified either by its Discovery catalog ID or by its query.
+
+    Arguments:
+        partner (Partner): Partner whose catalogs are mirrored.
+        course_run_ids (iterable): Keys of the course runs to check.
+        course_uuids (iterable): UUIDs of the courses to check.
+        catalog_id (int): ID of the catalog in the Discovery Service.
+        query (str): Catalog query.
+
+    Returns:
+        dict: Membership flags keyed by course run key and course UUID, in the format of the
+            Discovery Service contains endpoints, or None if the catalog, or any of the course runs
+            and courses, has not been mirrored.
+    """
+    if not is_mirror_enabled():
+        return None
+
+    catalog = _get_synced_catalog(partner, catalog_id=catalog_id, query=query)
+    if not catalog:
+        return None
+
+    # Course runs and courses which are not mirrored yet may have been added to the catalog since it was synced.
+    course_run_ids = set(course_run_ids)
+    course_uuids = {str(course_uuid) for course_uuid in course_uuids}
+    mirrored_keys = MirroredCourseRun.objects.filter(partner=partner, key__in=course_run_ids).values_list(
+        'key', flat=True
+    )
+    if course_run_ids and len(set(mirrored_keys)) < len(course_run_ids):
+        return None
+    mirrored_uuids = MirroredCourse.objects.filter(partner=partner, uuid__in=course_uuids).values_list(
+        'uuid', flat=True
+    )
+    if course_uuids and len(set(mirrored_uuids)) < len(course_uuids):
+        return None
+
+    contained = {}
+    if course_run_ids:
+        member_keys = set(catalog.course_runs.filter(key__in=course_run_ids).values_list('key', flat=True))
+        contained.update({course_run_id: course_run_id in member_keys for course_run_id in course_run_ids})
+    if course_uuids:
+        member_uuids = {
+            str(uuid) for uuid in catalog.courses.filter(uuid__in=course_uuids).values_list('uuid', flat=True)
+        }
+        contained.update({course_uuid: course_uuid in member_uuids for course_uuid in course_uuids})
+    return contained
+
+
+def get_mirrored_catalog_course_runs(site, query, limit=None, offset=None):
+    """
+    Get a page of the course runs matching a catalog query from the mirror.
+
+    Arguments:
+        site (Site): Site object containing Site Configuration data.
+        query (str): Catalog query.
+        limit (int): Number of results per page.
+        offset (int): Page offset.
+
+    Returns:
+        dict: Page of course run data in the format of the Discovery course runs endpoint,
+            or None if the query has not been mirrored.
+    """
+    if not is_mirror_enabled():
+        return None
+
+    catalog = _get_synced_catalog(site.siteconfiguration.partner, query=query)
+    if not catalog:
+        return None
+
+    course_runs = catalog.course_runs.order_by('key')
+    count = course_runs.count()
+    offset = int(offset or 0)
+    limit = int(limit) if limit else count
+    results = [course_run.data for course_run in course_runs.only('data')[offset:offset + limit]]
+
+    def page_url(page_offset):
+        querystring = urlencode({
+            'limit': limit,
+            'offset': page_offset,
+            'partner': site.siteconfiguration.partner.short_code,
+            'q': query.encode('utf-8'),
+        })
+        return '{root}course_runs/?{querystring}'.format(
+            root=site.siteconfiguration.discovery_api_url, querystring=querystring
+        )
+
+    return {
+        'count': count,
+        'next': page_url(offset + limit) if offset + limit < count else None,
+        'previous': page_url(max(offset - limit, 0)) if offset else None,
+        'results': results,
+    }
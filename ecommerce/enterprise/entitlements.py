@@ -22,6 +22,7 @@ from slumber.exceptions import SlumberBaseException
 from ecommerce.core.constants import COUPON_PRODUCT_CLASS_NAME
 from ecommerce.core.utils import get_cache_key
 from ecommerce.coupons.views import voucher_is_valid
+from ecommerce.discovery_mirror.utils import mirrored_catalog_contains
 from ecommerce.enterprise import api as enterprise_api
 from ecommerce.enterprise.utils import CONSENT_FAILED_PARAM, is_enterprise_feature_enabled
 from ecommerce.extensions.api.serializers import retrieve_all_vouchers
@@ -164,6 +165,12 @@ def is_course_in_enterprise_catalog(site, course_id, enterprise_catalog_id):
         Boolean
 
     """
+    mirrored_response = mirrored_catalog_contains(
+        site.siteconfiguration.partner, course_run_ids=[course_id], catalog_id=enterprise_catalog_id
+    )
+    if mirrored_response is not None:
+        return mirrored_response[course_id]
+
     partner_code = site.siteconfiguration.partner.short_code
     cache_key = get_cache_key(
         site_domain=site.domain,
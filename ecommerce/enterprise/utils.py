@@ -12,7 +12,6 @@ from django.conf import settings
 from django.urls import reverse
 from django.utils.translation import ugettext as _
 from edx_django_utils.cache import TieredCache
-from edx_rest_api_client.client import EdxRestApiClient
 from oscar.core.loading import get_model
 from requests.exceptions import ConnectionError, Timeout
 from slumber.exceptions import SlumberHttpBaseException
@@ -49,10 +48,7 @@ def get_enterprise_api_client(site):
     """
     Constructs a REST client for to communicate with the Open edX Enterprise Service
     """
-    return EdxRestApiClient(
-        site.siteconfiguration.enterprise_api_url,
-        jwt=site.siteconfiguration.access_token
-    )
+    return site.siteconfiguration.enterprise_api_client
 
 
 def get_enterprise_customer(site, uuid):
@@ -7,9 +7,10 @@ from decimal import Decimal
 import waffle
 from dateutil.parser import parse
 from django.contrib.auth import get_user_model
-from django.db import transaction
+from django.db import models, transaction
 from django.db.models import Q
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 from oscar.core.loading import get_class, get_model
 from rest_framework import serializers
@@ -22,7 +23,10 @@ from ecommerce.core.constants import (
     SEAT_PRODUCT_CLASS_NAME
 )
 from ecommerce.core.url_utils import get_ecommerce_url
-from ecommerce.courses.models import Course
+from ecommerce.courses.constants import ASYNC_COURSE_PUBLICATION_SWITCH
+from ecommerce.courses.models import Course, CoursePublication, CourseSeatSummary
+from ecommerce.courses.publication import get_seats, is_seat_current
+from ecommerce.courses.tasks import publish_course_to_lms
 from ecommerce.entitlements.utils import create_or_update_course_entitlement
 from ecommerce.extensions.offer.constants import OFFER_ASSIGNMENT_REVOKED, OFFER_MAX_USES_DEFAULT
 from ecommerce.invoice.models import Invoice
@@ -134,6 +138,15 @@ def _flatten(attrs):
     return {attr['name']: attr['value'] for attr in attrs}
 
 
+class PurchaseInfoListSerializer(serializers.ListSerializer):
+    """ List serializer which fetches the purchase info of all listed products at once. """
+
+    def to_representation(self, data):
+        products = list(data.all() if isinstance(data, models.Manager) else data)
+        self.child.fetch_purchase_info(products)
+        return super(PurchaseInfoListSerializer, self).to_representation(products)
+
+
 class ProductPaymentInfoMixin(serializers.ModelSerializer):
     """ Mixin class used for retrieving price information from products. """
     price = serializers.SerializerMethodField()
@@ -144,10 +157,22 @@ class ProductPaymentInfoMixin(serializers.ModelSerializer):
             return serializers.DecimalField(max_digits=10, decimal_places=2).to_representation(info.price.excl_tax)
         return None
 
+    @cached_property
+    def _strategy(self):
+        return Selector().strategy(request=self.context.get('request'))
+
+    @cached_property
+    def _purchase_info(self):
+        return {}
+
+    def fetch_purchase_info(self, products):
+        """ Fetch and remember the purchase info of the given products with a single strategy call. """
+        self._purchase_info.update(self._strategy.fetch_for_products(products))
+
     def _get_info(self, product):
-        return Selector().strategy(
-            request=self.context.get('request')
-        ).fetch_for_product(product)
+        if product not in self._purchase_info:
+            self._purchase_info[product] = self._strategy.fetch_for_product(product)
+        return self._purchase_info[product]
 
 
 class BillingAddressSerializer(serializers.ModelSerializer):
@@ -238,6 +263,7 @@ class ProductSerializer(ProductPaymentInfoMixin, serializers.HyperlinkedModelSer
         model = Product
         fields = ('id', 'url', 'structure', 'product_class', 'title', 'price', 'expires', 'attribute_values',
                   'is_available_to_buy', 'stockrecords',)
+        list_serializer_class = PurchaseInfoListSerializer
         extra_kwargs = {
             'url': {'view_name': PRODUCT_DETAIL_VIEW},
         }
@@ -378,12 +404,22 @@ class RefundSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+class CourseSeatSummarySerializer(serializers.ModelSerializer):
+    seat_types = serializers.ReadOnlyField()
+
+    class Meta(object):
+        model = CourseSeatSummary
+        fields = ('seat_types', 'min_price', 'max_price')
+
+
 class CourseSerializer(serializers.HyperlinkedModelSerializer):
     id = serializers.RegexField(COURSE_ID_REGEX, max_length=255)
+    type = serializers.SerializerMethodField()
     products = ProductSerializer(many=True)
     products_url = serializers.SerializerMethodField()
     last_edited = serializers.SerializerMethodField()
     has_active_bulk_enrollment_code = serializers.SerializerMethodField()
+    seat_summary = serializers.SerializerMethodField()
 
     def __init__(self, *args, **kwargs):
         super(CourseSerializer, self).__init__(*args, **kwargs)
@@ -401,14 +437,27 @@ class CourseSerializer(serializers.HyperlinkedModelSerializer):
         return reverse('api:v2:course-product-list', kwargs={'parent_lookup_course_id': obj.id},
                        request=self.context['request'])
 
+    def _get_seat_summary(self, obj):
+        """ Returns the seat summary of the course, computing it for courses which do not have one yet. """
+        try:
+            return obj.seat_summary
+        except CourseSeatSummary.DoesNotExist:
+            return CourseSeatSummary.refresh(obj)
+
+    def get_type(self, obj):
+        return self._get_seat_summary(obj).course_type
+
     def get_has_active_bulk_enrollment_code(self, obj):
-        return True if obj.enrollment_code_product else False
+        return self._get_seat_summary(obj).has_active_enrollment_code
+
+    def get_seat_summary(self, obj):
+        return CourseSeatSummarySerializer(self._get_seat_summary(obj)).data
 
     class Meta(object):
         model = Course
         fields = (
             'id', 'url', 'name', 'verification_deadline', 'type',
-            'products_url', 'last_edited', 'products', 'has_active_bulk_enrollment_code')
+            'products_url', 'last_edited', 'products', 'has_active_bulk_enrollment_code', 'seat_summary')
         read_only_fields = ('type', 'products', 'site')
         extra_kwargs = {
             'url': {'view_name': COURSE_DETAIL_VIEW}
@@ -458,7 +507,12 @@ class SeatProductHelper(object):
             raise serializers.ValidationError(_(u"Products must have a price."))
 
     @staticmethod
-    def save(course, product, create_enrollment_code):
+    def save(course, product, create_enrollment_code, seats=None):
+        """
+        Create or update the seat described by the product data.
+
+        If the seats of the course are given, as returned by get_seats, the seat is only saved if it changed.
+        """
         attrs = _flatten(product['attribute_values'])
 
         # Extract arguments required for Seat creation, deserializing as necessary.
@@ -473,15 +527,19 @@ class SeatProductHelper(object):
         credit_hours = attrs.get('credit_hours')
         credit_hours = int(credit_hours) if credit_hours else None
 
-        course.create_or_update_seat(
-            certificate_type,
-            id_verification_required,
-            price,
-            expires=expires,
-            credit_provider=credit_provider,
-            credit_hours=credit_hours,
-            create_enrollment_code=create_enrollment_code
-        )
+        seat_arguments = {
+            'expires': expires,
+            'credit_provider': credit_provider,
+            'credit_hours': credit_hours,
+            'create_enrollment_code': create_enrollment_code,
+        }
+        if seats is not None and is_seat_current(
+                course, seats, certificate_type, id_verification_required, price, **seat_arguments
+        ):
+            logger.info('Course seat with certificate type [%s] for [%s] is unchanged.', certificate_type, course.id)
+            return
+
+        course.create_or_update_seat(certificate_type, id_verification_required, price, **seat_arguments)
 
 
 class AtomicPublicationSerializer(serializers.Serializer):  # pylint: disable=abstract-method
@@ -501,6 +559,8 @@ class AtomicPublicationSerializer(serializers.Serializer):  # pylint: disable=ab
     def __init__(self, *args, **kwargs):
         super(AtomicPublicationSerializer, self).__init__(*args, **kwargs)
         self.partner = kwargs['context'].pop('partner', None)
+        # Publication of the course to the LMS, if it is made in the background.
+        self.publication = None
 
     def validate_products(self, products):
         """Validate product data."""
@@ -529,6 +589,10 @@ class AtomicPublicationSerializer(serializers.Serializer):  # pylint: disable=ab
     def save(self):
         """Save and publish Course and associated products."
 
+        If the async course publication switch is active, only the products which changed are saved, and the
+        course is published to the LMS once they have been committed. The CoursePublication tracking the
+        publication is then available as the publication attribute of the serializer.
+
         Returns:
             tuple: A Boolean indicating whether the Course was created, an Exception,
                 if one was raised (else None), and a message for the user, if necessary (else None).
@@ -552,27 +616,40 @@ class AtomicPublicationSerializer(serializers.Serializer):  # pylint: disable=ab
 
                 raise Exception(message)
 
+            publish_in_background = waffle.switch_is_active(ASYNC_COURSE_PUBLICATION_SWITCH)
+
             # Explicitly delimit operations which will be rolled back if an exception is raised.
             with transaction.atomic():
                 site = self.context['request'].site
                 course, created = Course.objects.get_or_create(
                     id=course_id, partner=site.siteconfiguration.partner
                 )
-                course.name = course_name
-                course.verification_deadline = course_verification_deadline
-                course.save()
+                course_changed = (
+                    course.name != course_name or course.verification_deadline != course_verification_deadline
+                )
+                if created or course_changed or not publish_in_background:
+                    course.name = course_name
+                    course.verification_deadline = course_verification_deadline
+                    course.save()
 
+                seats = get_seats(course) if publish_in_background else None
                 for product in products:
                     product_class = product.get('product_class')
 
                     if product_class == COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME:
                         EntitlementProductHelper.save(partner, course, course_uuid, product)
                     elif product_class == SEAT_PRODUCT_CLASS_NAME:
-                        SeatProductHelper.save(course, product, create_or_activate_enrollment_code)
+                        SeatProductHelper.save(course, product, create_or_activate_enrollment_code, seats=seats)
 
                 if course.get_enrollment_code():
                     course.toggle_enrollment_code_status(is_active=create_or_activate_enrollment_code)
 
+                if publish_in_background:
+                    self.publication = CoursePublication.objects.create(course=course)
+                    publication_id = self.publication.id
+                    transaction.on_commit(lambda: publish_course_to_lms.delay(publication_id))
+                    return created, None, None
+
                 resp_message = course.publish_to_lms()
                 published = (resp_message is None)
 
@@ -586,6 +663,18 @@ class AtomicPublicationSerializer(serializers.Serializer):  # pylint: disable=ab
             return False, e, e.message
 
 
+class CoursePublicationSerializer(serializers.ModelSerializer):
+    """Serializer for the status of the publication of a course to the LMS."""
+    url = serializers.SerializerMethodField()
+
+    def get_url(self, obj):
+        return reverse('api:v2:publication:status', kwargs={'pk': obj.id}, request=self.context['request'])
+
+    class Meta(object):
+        model = CoursePublication
+        fields = ('id', 'url', 'course', 'status', 'attempts', 'message', 'created', 'modified')
+
+
 class PartnerSerializer(serializers.ModelSerializer):
     """Serializer for the Partner object"""
     catalogs = serializers.SerializerMethodField()
@@ -25,6 +25,7 @@ User = get_user_model()
 
 
 class CourseViewSetTests(ProductSerializerMixin, DiscoveryTestMixin, TestCase):
+    maxDiff = None
     list_path = reverse('api:v2:course-list')
 
     def setUp(self):
@@ -43,6 +44,10 @@ class CourseViewSetTests(ProductSerializerMixin, DiscoveryTestMixin, TestCase):
 
         last_edited = course.modified.strftime(ISO_8601_FORMAT)
         enrollment_code = course.enrollment_code_product
+        prices = [
+            unicode(stock_record.price_excl_tax)
+            for seat in course.seat_products for stock_record in seat.stockrecords.all()
+        ]
 
         data = {
             'id': course.id,
@@ -52,7 +57,12 @@ class CourseViewSetTests(ProductSerializerMixin, DiscoveryTestMixin, TestCase):
             'url': self.get_full_url(reverse('api:v2:course-detail', kwargs={'pk': course.id})),
             'products_url': products_url,
             'last_edited': last_edited,
-            'has_active_bulk_enrollment_code': True if enrollment_code else False
+            'has_active_bulk_enrollment_code': True if enrollment_code else False,
+            'seat_summary': {
+                'seat_types': sorted(set(getattr(seat.attr, 'certificate_type', '') for seat in course.seat_products)),
+                'min_price': min(prices) if prices else None,
+                'max_price': max(prices) if prices else None,
+            }
         }
 
         if include_products:
@@ -109,6 +119,23 @@ class CourseViewSetTests(ProductSerializerMixin, DiscoveryTestMixin, TestCase):
         response = self.client.get(self.list_path)
         self.assertDictEqual(json.loads(response.content), {'count': 0, 'next': None, 'previous': None, 'results': []})
 
+    def test_list_queries(self):
+        """ Verify the number of queries made to list courses does not depend on their number of seats. """
+        toggle_switch('create_enrollment_codes', True)
+        self.course.create_or_update_seat('verified', True, 100, create_enrollment_code=True)
+        self.course.create_or_update_seat('honor', False, 0)
+        course = CourseFactory(partner=self.partner)
+        course.create_or_update_seat('credit', True, 200, credit_provider='MIT')
+        self.run_commit_callbacks()
+
+        with self.assertNumQueries(11):
+            response = self.client.get(self.list_path)
+        self.assertEqual(response.status_code, 200)
+        self.assertListEqual(
+            json.loads(response.content)['results'],
+            [self.serialize_course(self.course), self.serialize_course(course)]
+        )
+
     def test_create(self):
         """ Verify the view can create a new Course."""
         Course.objects.all().delete()
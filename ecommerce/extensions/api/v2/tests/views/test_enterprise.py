@@ -54,7 +54,7 @@ class TestEnterpriseCustomerView(EnterpriseServiceMockMixin, TestCase):
         ]
     }
 
-    @mock.patch('ecommerce.enterprise.utils.EdxRestApiClient')
+    @mock.patch('ecommerce.enterprise.utils.get_enterprise_api_client')
     @httpretty.activate
     def test_get_customers(self, mock_client):
         self.mock_access_token_response()
@@ -3,6 +3,7 @@ from __future__ import unicode_literals
 import datetime
 import json
 
+import mock
 import pytz
 from django.test import RequestFactory
 from django.urls import reverse
@@ -14,6 +15,7 @@ from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.api.serializers import ProductSerializer
 from ecommerce.extensions.api.v2.tests.views import JSON_CONTENT_TYPE, ProductSerializerMixin
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
+from ecommerce.extensions.partner.strategy import DefaultStrategy
 from ecommerce.tests.factories import PartnerFactory, ProductFactory
 from ecommerce.tests.testcases import TestCase
 
@@ -57,6 +59,20 @@ class ProductViewSetTests(ProductViewSetBase):
         expected = {'count': 0, 'next': None, 'previous': None, 'results': []}
         self.assertDictEqual(json.loads(response.content), expected)
 
+    def test_list_fetches_purchase_info_in_bulk(self):
+        """ Verify the purchase info of listed products is fetched once per product, in a single bulk call. """
+        with mock.patch.object(
+            DefaultStrategy, 'fetch_for_products', autospec=True, side_effect=DefaultStrategy.fetch_for_products
+        ) as mock_fetch_for_products:
+            with mock.patch.object(
+                DefaultStrategy, 'fetch_for_product', autospec=True, side_effect=DefaultStrategy.fetch_for_product
+            ) as mock_fetch_for_product:
+                response = self.client.get(PRODUCT_LIST_PATH)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_fetch_for_products.call_count, 1)
+        self.assertEqual(mock_fetch_for_product.call_count, response.data['count'])
+
     def test_retrieve(self):
         """ Verify a single product is returned. """
         path = reverse('api:v2:product-detail', kwargs={'pk': 999})
@@ -15,7 +15,8 @@ from ecommerce.core.constants import (
     SEAT_PRODUCT_CLASS_NAME
 )
 from ecommerce.core.tests import toggle_switch
-from ecommerce.courses.models import Course
+from ecommerce.courses.constants import ASYNC_COURSE_PUBLICATION_SWITCH, CoursePublicationStatus
+from ecommerce.courses.models import Course, CoursePublication
 from ecommerce.courses.publishers import LMSPublisher
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.entitlements.utils import create_or_update_course_entitlement
@@ -337,6 +338,59 @@ class AtomicPublicationTests(DiscoveryTestMixin, TestCase):
             self.assertEqual(response.status_code, 200)
             self.assert_course_saved(self.course_id, expected=updated_data, enrollment_code_count=1)
 
+    def test_create_in_background(self):
+        """ Verify the course is published to the LMS once saved, if the async publication switch is active. """
+        toggle_switch(ASYNC_COURSE_PUBLICATION_SWITCH, True)
+
+        with mock.patch('ecommerce.extensions.api.serializers.transaction.on_commit') as mock_on_commit:
+            with mock.patch.object(LMSPublisher, 'publish') as mock_publish:
+                response = self.client.post(self.create_path, json.dumps(self.data), JSON_CONTENT_TYPE)
+                self.assertFalse(mock_publish.called)
+
+        self.assertEqual(response.status_code, 201)
+        self.assert_course_saved(self.course_id, expected=self.data, enrollment_code_count=1)
+
+        publication = CoursePublication.objects.get(course_id=self.course_id)
+        self.assertEqual(publication.status, CoursePublicationStatus.PENDING)
+        status_path = reverse('api:v2:publication:status', kwargs={'pk': publication.id})
+        self.assertEqual(response.data['publication']['status'], CoursePublicationStatus.PENDING)
+        self.assertTrue(response.data['publication']['url'].endswith(status_path))
+
+        # The publication task is queued once the transaction commits.
+        with mock.patch('ecommerce.courses.tasks.publish_course_to_lms.delay') as mock_delay:
+            mock_on_commit.call_args[0][0]()
+            mock_delay.assert_called_once_with(publication.id)
+
+        response = self.client.get(status_path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['course'], self.course_id)
+        self.assertEqual(response.data['status'], CoursePublicationStatus.PENDING)
+
+    def test_update_in_background_skips_unchanged_seats(self):
+        """ Verify only the seats which changed are saved, if the async publication switch is active. """
+        self.create_course_and_seats()
+        toggle_switch(ASYNC_COURSE_PUBLICATION_SWITCH, True)
+        updated_data = self.generate_update_payload()
+        updated_data['name'] = self.course_name
+
+        with mock.patch('ecommerce.extensions.api.serializers.transaction.on_commit'):
+            response = self.client.put(self.update_path, json.dumps(updated_data), JSON_CONTENT_TYPE)
+            self.assertEqual(response.status_code, 200)
+            self.assert_course_saved(self.course_id, expected=updated_data, enrollment_code_count=1)
+
+            with mock.patch.object(Course, 'create_or_update_seat') as mock_create_or_update_seat:
+                response = self.client.put(self.update_path, json.dumps(updated_data), JSON_CONTENT_TYPE)
+                self.assertEqual(response.status_code, 200)
+                self.assertFalse(mock_create_or_update_seat.called)
+
+                # Seats are saved when their price changes.
+                updated_data['products'][0]['price'] = 5.00
+                response = self.client.put(self.update_path, json.dumps(updated_data), JSON_CONTENT_TYPE)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(mock_create_or_update_seat.call_count, 1)
+
+        self.assertEqual(CoursePublication.objects.filter(course_id=self.course_id).count(), 3)
+
     def test_invalid_course_id(self):
         """Verify that attempting to save a course with a bad ID yields a 400."""
         self.data['id'] = 'Not an ID'
@@ -7,7 +7,9 @@ import ddt
 import httpretty
 import mock
 import pytz
+from django.db import connection
 from django.http import Http404
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.timezone import now
 from opaque_keys.edx.keys import CourseKey
@@ -211,6 +213,44 @@ class VoucherViewSetTests(DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockMixi
             self.assertTrue(offer['multiple_credit_providers'])
             self.assertIsNone(offer['credit_provider_price'])
 
+    @httpretty.activate
+    def test_credit_eligibility_requested_once_per_course(self):
+        """ Verify credit eligibility is requested once per course, regardless of the number of providers. """
+        course = CourseFactory(partner=self.partner)
+        seat1 = course.create_or_update_seat('credit', False, 100, credit_provider='test_provider_1')
+        seat2 = course.create_or_update_seat('credit', False, 100, credit_provider='test_provider_2')
+
+        self.mock_access_token_response()
+        __, request, voucher = self.prepare_get_offers_response(seats=[seat1, seat2], seat_type='credit')
+        self.mock_eligibility_api(request, self.user, course.id)
+        offers = VoucherViewSet().get_offers(request=request, voucher=voucher)['results']
+        self.assertEqual(len(offers), 2)
+
+        eligibility_requests = [
+            r for r in httpretty.httpretty.latest_requests if r.path.startswith('/api/credit/v1/eligibility/')
+        ]
+        self.assertEqual(len(eligibility_requests), 1)
+
+    @httpretty.activate
+    def test_offers_query_count_independent_of_page_size(self):
+        """ Verify the number of queries needed to build offers does not grow with the number of products. """
+        self.mock_access_token_response()
+        products, request, voucher = self.prepare_get_offers_response(quantity=5)
+        results = [
+            {'key': product.course_id, 'title': product.title, 'start': '2016-05-01T00:00:00Z'}
+            for product in products
+        ]
+        # Load the voucher offer outside of the measured block.
+        voucher.best_offer.benefit.range  # pylint: disable=pointless-statement
+
+        def count_queries(page):
+            with CaptureQueriesContext(connection) as context:
+                offers = VoucherViewSet().convert_catalog_response_to_offers(request, voucher, {'results': page})
+            self.assertEqual(len(offers), len(page))
+            return len(context.captured_queries)
+
+        self.assertEqual(count_queries(results[:1]), count_queries(results))
+
     def test_omitting_expired_courses(self):
         """Verify professional courses who's enrollment end datetime have passed are omitted."""
         no_enrollment_end_seat = CourseFactory(partner=self.partner).create_or_update_seat('professional', False, 100)
@@ -69,6 +69,7 @@ CHECKOUT_URLS = [
 
 ATOMIC_PUBLICATION_URLS = [
     url(r'^$', publication_views.AtomicPublicationView.as_view(), name='create'),
+    url(r'^status/(?P<pk>\d+)/$', publication_views.CoursePublicationView.as_view(), name='status'),
     url(
         r'^{course_id}$'.format(course_id=COURSE_ID_PATTERN),
         publication_views.AtomicPublicationView.as_view(),
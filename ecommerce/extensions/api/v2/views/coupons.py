@@ -17,6 +17,7 @@ from rest_framework.response import Response
 from ecommerce.core.constants import COUPON_PRODUCT_CLASS_NAME
 from ecommerce.core.models import BusinessClient
 from ecommerce.core.utils import log_message_and_raise_validation_error
+from ecommerce.core.views import ReadReplicaMixin
 from ecommerce.coupons.utils import prepare_course_seat_types
 from ecommerce.enterprise.constants import ENTERPRISE_OFFERS_FOR_COUPONS_SWITCH
 from ecommerce.extensions.api import data as data_api
@@ -51,7 +52,7 @@ Voucher = get_model('voucher', 'Voucher')
 DEPRECATED_COUPON_CATEGORIES = ['Bulk Enrollment']
 
 
-class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
+class CouponViewSet(ReadReplicaMixin, EdxOrderPlacementMixin, viewsets.ModelViewSet):
     """ Coupon resource. """
     permission_classes = (IsAuthenticated, IsAdminUser)
     filter_backends = (filters.DjangoFilterBackend,)
@@ -8,6 +8,7 @@ from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
 from ecommerce.core.constants import COURSE_ID_REGEX
+from ecommerce.core.views import ReadReplicaMixin
 from ecommerce.courses.models import Course
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.v2.views import NonDestroyableModelViewSet
@@ -16,7 +17,7 @@ Product = get_model('catalogue', 'Product')
 ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
 
 
-class CourseViewSet(NonDestroyableModelViewSet):
+class CourseViewSet(ReadReplicaMixin, NonDestroyableModelViewSet):
     product_attribute_value_prefetch = Prefetch(
         'products__attribute_values',
         queryset=ProductAttributeValue.objects.select_related('attribute').all()
@@ -31,9 +32,14 @@ class CourseViewSet(NonDestroyableModelViewSet):
 
     def get_queryset(self):
         site_configuration = self.request.site.siteconfiguration
-        return Course.objects.filter(partner=site_configuration.partner).prefetch_related(
-            self.products_prefetch, self.product_attribute_value_prefetch, 'products__stockrecords'
-        )
+        queryset = Course.objects.filter(partner=site_configuration.partner).select_related('seat_summary')
+
+        # The seat summaries hold everything else the serializer needs, so products are only loaded if included.
+        if self._include_products():
+            queryset = queryset.prefetch_related(
+                self.products_prefetch, self.product_attribute_value_prefetch, 'products__stockrecords'
+            )
+        return queryset
 
     def list(self, request, *args, **kwargs):
         """
@@ -73,9 +79,12 @@ class CourseViewSet(NonDestroyableModelViewSet):
         """
         return super(CourseViewSet, self).retrieve(request, *args, **kwargs)
 
+    def _include_products(self):
+        return bool(self.request.GET.get('include_products', False)) if self.request else False
+
     def get_serializer_context(self):
         context = super(CourseViewSet, self).get_serializer_context()
-        context['include_products'] = bool(self.request.GET.get('include_products', False)) if self.request else False
+        context['include_products'] = self._include_products()
         return context
 
     @detail_route(methods=['post'])
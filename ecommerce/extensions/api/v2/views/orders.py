@@ -8,6 +8,7 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import DjangoModelPermissions, IsAuthenticated
 from rest_framework.response import Response
 
+from ecommerce.core.views import ReadReplicaMixin
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.filters import OrderFilter
 from ecommerce.extensions.api.permissions import IsStaffOrOwner
@@ -19,7 +20,7 @@ Order = get_model('order', 'Order')
 post_checkout = get_class('checkout.signals', 'post_checkout')
 
 
-class OrderViewSet(viewsets.ReadOnlyModelViewSet):
+class OrderViewSet(ReadReplicaMixin, viewsets.ReadOnlyModelViewSet):
     lookup_field = 'number'
     permission_classes = (IsAuthenticated, IsStaffOrOwner, DjangoModelPermissions,)
     queryset = Order.objects.all()
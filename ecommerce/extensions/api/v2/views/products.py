@@ -5,6 +5,7 @@ from rest_framework import filters
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework_extensions.mixins import NestedViewSetMixin
 
+from ecommerce.core.views import ReadReplicaMixin
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.filters import ProductFilter
 from ecommerce.extensions.api.v2.views import NonDestroyableModelViewSet
@@ -12,7 +13,7 @@ from ecommerce.extensions.api.v2.views import NonDestroyableModelViewSet
 Product = get_model('catalogue', 'Product')
 
 
-class ProductViewSet(NestedViewSetMixin, NonDestroyableModelViewSet):
+class ProductViewSet(ReadReplicaMixin, NestedViewSetMixin, NonDestroyableModelViewSet):
     serializer_class = serializers.ProductSerializer
     filter_backends = (filters.DjangoFilterBackend,)
     filter_class = ProductFilter
@@ -3,6 +3,7 @@ from rest_framework import generics, status
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
+from ecommerce.courses.models import CoursePublication
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
 
@@ -41,4 +42,15 @@ class AtomicPublicationView(generics.CreateAPIView, generics.UpdateAPIView):
             else:
                 content = serializer.data
                 content['message'] = message if message else None
+                if serializer.publication:
+                    content['publication'] = serializers.CoursePublicationSerializer(
+                        serializer.publication, context={'request': self.request}
+                    ).data
                 return Response(content, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
+class CoursePublicationView(generics.RetrieveAPIView):
+    """Retrieve the status of the background publication of a course to the LMS."""
+    permission_classes = (IsAuthenticated, IsAdminUser,)
+    serializer_class = serializers.CoursePublicationSerializer
+    queryset = CoursePublication.objects.all()
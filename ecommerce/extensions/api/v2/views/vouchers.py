@@ -6,6 +6,7 @@ import django_filters
 import pytz
 from dateutil.parser import parse
 from dateutil.utils import default_tzinfo
+from django.db.models import Count, F
 from django.shortcuts import get_object_or_404
 from django.utils.timezone import now
 from opaque_keys.edx.keys import CourseKey
@@ -107,7 +108,8 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             course_seat_types(str): Comma-separated list of accepted seat types.
 
         Returns:
-            Querysets of products and stock records retrieved from results.
+            A list of products, a dictionary of their stock records keyed by product ID,
+            and the course run metadata keyed by course run key.
         """
         course_run_metadata = {}
 
@@ -141,16 +143,74 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             elif is_course_run_enrollable(result):
                 course_run_metadata[result['key']] = result
 
-        products = []
-        for seat_type in course_seat_types.split(','):
-            products.extend(Product.objects.filter(
+        seat_types = course_seat_types.split(',')
+        products = list(
+            Product.objects.filter(
                 course_id__in=course_run_metadata.keys(),
-                attributes__name='certificate_type',
-                attribute_values__value_text=seat_type
-            ))
-        stock_records = StockRecord.objects.filter(product__in=products)
+                attribute_values__attribute__name='certificate_type',
+                attribute_values__value_text__in=seat_types
+            ).annotate(
+                seat_type=F('attribute_values__value_text')
+            ).select_related('product_class', 'parent__product_class')
+        )
+        # Preserve the ordering of the requested seat types.
+        products.sort(key=lambda product: seat_types.index(product.seat_type))
+        stock_records = {
+            stock_record.product_id: stock_record
+            for stock_record in StockRecord.objects.filter(product__in=products)
+        }
         return products, stock_records, course_run_metadata
 
+    def get_credit_offer_context(self, request, products, stock_records):
+        """ Helper method to collect everything needed to decide on credit seat offers
+        for the given products in a constant number of queries.
+
+        Credit eligibility is requested from the LMS once per distinct course, no matter
+        how many credit providers offer a seat in that course.
+
+        Args:
+            request (WSGIRequest): Request data.
+            products (list): Credit seat products.
+            stock_records (dict): Stock records keyed by product ID.
+
+        Returns:
+            dict: Offer details keyed by product ID. Products which the user is not eligible
+                for, or has already purchased, are omitted.
+        """
+        eligibility = {}
+        for course_id in {product.course_id for product in products}:
+            eligibility[course_id] = bool(request.user.is_eligible_for_credit(course_id))
+
+        eligible_products = [product for product in products if eligibility[product.course_id]]
+        if not eligible_products:
+            return {}
+
+        purchased_product_ids = set(
+            Order.objects.filter(
+                user=request.user, lines__product__in=eligible_products
+            ).values_list('lines__product_id', flat=True)
+        )
+        provider_counts = dict(
+            Product.objects.filter(
+                parent_id__in={product.parent_id for product in eligible_products},
+                attributes__name='credit_provider'
+            ).order_by().values_list('parent_id').annotate(count=Count('id'))
+        )
+
+        credit_offers = {}
+        for product in eligible_products:
+            if product.id in purchased_product_ids:
+                continue
+            multiple_credit_providers = provider_counts.get(product.parent_id, 0) > 1
+            stock_record = stock_records.get(product.id)
+            credit_offers[product.id] = {
+                'credit_provider_price': (
+                    None if multiple_credit_providers or not stock_record else stock_record.price_excl_tax
+                ),
+                'multiple_credit_providers': multiple_credit_providers,
+            }
+        return credit_offers
+
     def convert_catalog_response_to_offers(self, request, voucher, response):
         offers = []
         benefit = voucher.best_offer.benefit
@@ -158,60 +218,53 @@ class VoucherViewSet(NonDestroyableModelViewSet):
         course_seat_types = 'verified,professional,credit'
         if benefit.range and benefit.range.course_seat_types:
             course_seat_types = benefit.range.course_seat_types
-        multiple_credit_providers = False
-        credit_provider_price = None
 
         products, stock_records, course_run_metadata = self.retrieve_course_objects(
             response['results'], course_seat_types
         )
-        contains_verified_course = ('verified' in course_seat_types)
+
+        # Omit unavailable seats from the offer results so that one seat does not cause an
+        # error message for every seat in the query result.
         for product in products:
-            # Omit unavailable seats from the offer results so that one seat does not cause an
-            # error message for every seat in the query result.
-            if not request.strategy.fetch_for_product(product).availability.is_available_to_buy:
+            if product.id not in stock_records:
+                logger.error('Stock Record for product %s not found.', product.id)
+        products = [product for product in products if product.id in stock_records]
+
+        available_products = []
+        purchase_info = request.strategy.fetch_for_products(products, stockrecords=stock_records)
+        for product in products:
+            if not purchase_info[product].availability.is_available_to_buy:
                 logger.info('%s is unavailable to buy. Omitting it from the results.', product)
                 continue
+            available_products.append(product)
 
-            course_id = product.course_id
-            course_catalog_data = course_run_metadata[course_id]
-            if course_seat_types == 'credit':
-                # Omit credit seats for which the user is not eligible or which the user already bought.
-                if request.user.is_eligible_for_credit(product.course_id):
-                    if Order.objects.filter(user=request.user, lines__product=product).exists():
-                        continue
-                else:
-                    continue
-                credit_seats = Product.objects.filter(parent=product.parent, attributes__name='credit_provider')
-
-                if credit_seats.count() > 1:
-                    multiple_credit_providers = True
-                    credit_provider_price = None
-                else:
-                    multiple_credit_providers = False
-                    credit_provider_price = StockRecord.objects.get(product=product).price_excl_tax
-
-            try:
-                stock_record = stock_records.get(product__id=product.id)
-            except StockRecord.DoesNotExist:
-                stock_record = None
-                logger.error('Stock Record for product %s not found.', product.id)
+        credit_offers = {}
+        if course_seat_types == 'credit':
+            # Omit credit seats for which the user is not eligible or which the user already bought.
+            credit_offers = self.get_credit_offer_context(request, available_products, stock_records)
+            available_products = [product for product in available_products if product.id in credit_offers]
 
-            try:
-                course = Course.objects.get(id=course_id)
-            except Course.DoesNotExist:  # pragma: no cover
-                course = None
+        courses = Course.objects.in_bulk({product.course_id for product in available_products})
+        contains_verified_course = ('verified' in course_seat_types)
+        for product in available_products:
+            course_id = product.course_id
+            course = courses.get(course_id)
+            if not course:  # pragma: no cover
                 logger.error('Course %s not found.', course_id)
+                continue
 
-            if course_catalog_data and course and stock_record:
+            course_catalog_data = course_run_metadata[course_id]
+            credit_offer = credit_offers.get(product.id, {})
+            if course_catalog_data:
                 offers.append(self.get_course_offer_data(
                     benefit=benefit,
                     course=course,
                     course_info=course_catalog_data,
-                    credit_provider_price=credit_provider_price,
-                    multiple_credit_providers=multiple_credit_providers,
+                    credit_provider_price=credit_offer.get('credit_provider_price'),
+                    multiple_credit_providers=credit_offer.get('multiple_credit_providers', False),
                     is_verified=contains_verified_course,
                     product=product,
-                    stock_record=stock_record,
+                    stock_record=stock_records[product.id],
                     voucher=voucher
                 ))
 
@@ -343,7 +396,7 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             'multiple_credit_providers': multiple_credit_providers,
             'organization': CourseKey.from_string(course.id).org,
             'credit_provider_price': credit_provider_price,
-            'seat_type': product.attr.certificate_type,
+            'seat_type': getattr(product, 'seat_type', None) or product.attr.certificate_type,
             'stockrecords': serializers.StockRecordSerializer(stock_record).data,
             'title': course_info.get('title', course.name),
             'voucher_end_date': voucher.end_datetime
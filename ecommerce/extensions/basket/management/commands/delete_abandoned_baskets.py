@@ -0,0 +1,170 @@
+"""
+Management command that deletes abandoned baskets.
+
+Open, merged and frozen baskets that were never submitted accumulate with every visit to the basket page,
+and slow down the queries that look up and merge the baskets of users. Baskets which have not been active
+for longer than the retention period are deleted in batches, ordered by ID, along with their lines, attributes
+and referrals. Baskets referenced by orders, invoices or payment processor responses, including archived ones,
+are kept.
+"""
+from __future__ import unicode_literals
+
+import datetime
+import time
+
+from django.core import serializers
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.payment.models import ArchivedPaymentProcessorResponse
+from ecommerce.referrals.models import Referral
+
+Basket = get_model('basket', 'Basket')
+BasketAttribute = get_model('basket', 'BasketAttribute')
+Line = get_model('basket', 'Line')
+LineAttribute = get_model('basket', 'LineAttribute')
+
+ABANDONED_STATUSES = (Basket.OPEN, Basket.MERGED, Basket.FROZEN)
+
+
+class Command(BaseCommand):
+    help = 'Delete abandoned baskets older than the retention period.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-d', '--days',
+                            action='store',
+                            dest='days',
+                            default=30,
+                            type=int,
+                            help='Number of days for which abandoned baskets are retained.')
+        parser.add_argument('--status',
+                            action='store',
+                            dest='statuses',
+                            nargs='+',
+                            default=list(ABANDONED_STATUSES),
+                            choices=ABANDONED_STATUSES,
+                            help='Statuses of the baskets to be deleted.')
+        # Batched deletion prevents the entire table from locking up as the command executes.
+        parser.add_argument('-b', '--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            default=1000,
+                            type=int,
+                            help='Size of each batch of baskets to be deleted.')
+        # Sleeping between each batch deletion gives MySQL time to process other connections.
+        parser.add_argument('-s', '--sleep-seconds',
+                            action='store',
+                            dest='sleep_seconds',
+                            default=3,
+                            type=int,
+                            help='Seconds to sleep between each batch deletion.')
+        # Baskets are deleted in order of ID, so an interrupted run can be resumed from the last ID it reported.
+        parser.add_argument('--start-id',
+                            action='store',
+                            dest='start_id',
+                            default=0,
+                            type=int,
+                            help='Only delete baskets with an ID greater than this one.')
+        parser.add_argument('--archive-file',
+                            action='store',
+                            dest='archive_file',
+                            default=None,
+                            help='Path of a file to which each batch of baskets is appended, as JSON, '
+                                 'before it is deleted.')
+        parser.add_argument('--commit',
+                            action='store_true',
+                            dest='commit',
+                            default=False,
+                            help='Actually delete the baskets.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('The batch size must be greater than zero.')
+
+        queryset = self.get_queryset(options['days'], options['statuses'])
+        queryset = queryset.filter(id__gt=options['start_id'])
+
+        if not options['commit']:
+            msg = 'This has been an example operation. If the --commit flag had been included, the command ' \
+                  'would have deleted [{}] baskets.'.format(queryset.count())
+            self.stderr.write(msg)
+            return
+
+        archive = open(options['archive_file'], 'a') if options['archive_file'] else None
+        try:
+            deleted = self.delete_baskets(queryset, options['batch_size'], options['sleep_seconds'], archive)
+        finally:
+            if archive:
+                archive.close()
+
+        if deleted:
+            self.stderr.write('All [{}] baskets deleted.'.format(deleted))
+        else:
+            self.stderr.write('No baskets to delete.')
+
+    def get_queryset(self, days, statuses):
+        """
+        Returns the baskets which have been abandoned for more than the given number of days.
+
+        The activity of a basket is measured by its creation, merge and submission dates, and by the creation
+        dates of its lines, so that long-lived baskets which are still in use are kept.
+        """
+        cutoff = timezone.now() - datetime.timedelta(days=days)
+        # Archived responses only keep the ID of their basket, so they are not joined to it.
+        archived_responses = ArchivedPaymentProcessorResponse.objects.filter(basket_id=OuterRef('pk'))
+        recent_lines = Line.objects.filter(basket_id=OuterRef('pk'), date_created__gte=cutoff)
+        return Basket.objects.annotate(
+            has_archived_responses=Exists(archived_responses),
+            has_recent_lines=Exists(recent_lines),
+        ).filter(
+            Q(date_merged__isnull=True) | Q(date_merged__lt=cutoff),
+            Q(date_submitted__isnull=True) | Q(date_submitted__lt=cutoff),
+            status__in=statuses,
+            date_created__lt=cutoff,
+            order__isnull=True,
+            invoice__isnull=True,
+            paymentprocessorresponse__isnull=True,
+            has_archived_responses=False,
+            has_recent_lines=False,
+        )
+
+    def delete_baskets(self, queryset, batch_size, sleep_seconds, archive=None):
+        deleted = 0
+        last_id = 0
+
+        while True:
+            ids = list(
+                queryset.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            last_id = ids[-1]
+
+            with transaction.atomic():
+                # The conditions are evaluated again, in case a basket was used since it was selected.
+                ids = list(queryset.filter(id__in=ids).values_list('id', flat=True))
+                batch = Basket.objects.filter(id__in=ids)
+                if archive:
+                    self.archive_baskets(batch, archive)
+
+                Referral.objects.filter(basket__in=batch, order__isnull=True).delete()
+                count = batch.delete()[1].get(Basket._meta.label, 0)  # pylint: disable=protected-access
+
+            deleted += count
+            self.stderr.write('Deleted [{count}] baskets through ID [{last_id}].'.format(count=count, last_id=last_id))
+            time.sleep(sleep_seconds)
+
+        return deleted
+
+    def archive_baskets(self, baskets, archive):
+        """ Append the baskets, along with their lines and attributes, to the archive as a line of JSON. """
+        baskets = list(baskets)
+        objects = baskets + list(BasketAttribute.objects.filter(basket__in=baskets))
+        lines = list(Line.objects.filter(basket__in=baskets))
+        objects += lines + list(LineAttribute.objects.filter(line__in=lines))
+
+        archive.write(serializers.serialize('json', objects) + '\n')
+        archive.flush()
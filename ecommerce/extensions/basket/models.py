@@ -2,12 +2,13 @@ from django.db import models
 from django.utils.translation import ugettext_lazy as _
 from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
 from oscar.apps.basket.abstract_models import AbstractBasket
-from oscar.core.loading import get_class
+from oscar.core.loading import get_class, get_model
 
 from ecommerce.extensions.analytics.utils import track_segment_event, translate_basket_line_for_segment
 from ecommerce.extensions.basket.constants import TEMPORARY_BASKET_CACHE_KEY
 
 OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
+ProductDescriptor = get_model('catalogue', 'ProductDescriptor')
 Selector = get_class('partner.strategy', 'Selector')
 
 
@@ -49,6 +50,12 @@ class Basket(AbstractBasket):
 
         return basket
 
+    def all_lines(self):
+        """ Return the cached lines of the basket, and load the descriptors of their products. """
+        lines = super(Basket, self).all_lines()  # pylint: disable=bad-super-call
+        ProductDescriptor.load([line.product for line in lines if line.product])
+        return lines
+
     def flush(self):
         """Remove all products in basket and fire Segment 'Product Removed' Analytic event for each"""
         cached_response = DEFAULT_REQUEST_CACHE.get_cached_response(TEMPORARY_BASKET_CACHE_KEY)
@@ -1,17 +1,28 @@
 from __future__ import unicode_literals
 
+import datetime
+import json
+import os
+import shutil
+import tempfile
 from StringIO import StringIO
 
 from django.contrib.sites.models import Site
 from django.core.management import CommandError, call_command
+from django.utils import timezone
 from oscar.core.loading import get_model
 from oscar.test import factories
 
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.payment.models import ArchivedPaymentProcessorResponse
 from ecommerce.extensions.test.factories import create_order
 from ecommerce.invoice.models import Invoice
+from ecommerce.referrals.models import Referral
 from ecommerce.tests.testcases import TestCase
 
 Basket = get_model('basket', 'Basket')
+Line = get_model('basket', 'Line')
+PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
 
 
 class DeleteOrderedBasketsCommandTests(TestCase):
@@ -78,6 +89,121 @@ class DeleteOrderedBasketsCommandTests(TestCase):
         self.assertEqual(out.getvalue().strip(), 'No baskets to delete.')
 
 
+class DeleteAbandonedBasketsCommandTests(TestCase):
+    command = 'delete_abandoned_baskets'
+
+    def setUp(self):
+        super(DeleteAbandonedBasketsCommandTests, self).setUp()
+        self.seat = CourseFactory(partner=self.partner).create_or_update_seat('verified', True, 100)
+        self.abandoned_baskets = [self.create_basket(status) for status in (Basket.OPEN, Basket.MERGED, Basket.FROZEN)]
+        self.saved_basket = self.create_basket(Basket.SAVED)
+        self.recent_basket = self.create_basket(Basket.OPEN, days=1)
+
+        # A long-lived basket to which a product was recently added is still in use.
+        self.active_basket = self.create_basket(Basket.OPEN)
+        Line.objects.filter(basket=self.active_basket).update(date_created=timezone.now() - datetime.timedelta(1))
+
+        self.recently_merged_basket = self.create_basket(Basket.MERGED)
+        Basket.objects.filter(id=self.recently_merged_basket.id).update(
+            date_merged=timezone.now() - datetime.timedelta(1)
+        )
+
+        self.paid_basket = self.create_basket(Basket.FROZEN)
+        PaymentProcessorResponse.objects.create(basket=self.paid_basket, transaction_id='abc', processor_name='paypal')
+
+        self.archived_paid_basket = self.create_basket(Basket.FROZEN)
+        ArchivedPaymentProcessorResponse.archive(PaymentProcessorResponse.objects.filter(
+            id=PaymentProcessorResponse.objects.create(
+                basket=self.archived_paid_basket, transaction_id='def', processor_name='paypal'
+            ).id
+        ))
+
+        self.invoiced_basket = self.create_basket(Basket.OPEN)
+        Invoice.objects.create(basket=self.invoiced_basket)
+
+        self.ordered_basket = create_order().basket
+        Basket.objects.filter(id=self.ordered_basket.id).update(date_created=timezone.now() - datetime.timedelta(60))
+
+        self.kept_baskets = [
+            self.saved_basket, self.recent_basket, self.active_basket, self.recently_merged_basket, self.paid_basket,
+            self.archived_paid_basket, self.invoiced_basket, self.ordered_basket,
+        ]
+
+    def create_basket(self, status, days=60):
+        """ Create a basket with a line and a referral, created the given number of days ago. """
+        basket = factories.BasketFactory()
+        basket.add_product(self.seat)
+        Referral.objects.create(basket=basket, affiliate_id='affiliate', site=self.site)
+        Basket.objects.filter(id=basket.id).update(
+            status=status, date_created=timezone.now() - datetime.timedelta(days)
+        )
+        Line.objects.filter(basket=basket).update(date_created=timezone.now() - datetime.timedelta(days))
+        return basket
+
+    def call_command(self, *args, **kwargs):
+        out = StringIO()
+        call_command(self.command, *args, sleep_seconds=0, stderr=out, **kwargs)
+        return out.getvalue().strip()
+
+    def assert_baskets_kept(self, baskets):
+        self.assertEqual(list(Basket.objects.order_by('id')), baskets)
+        self.assertEqual(Line.objects.filter(basket__in=self.abandoned_baskets).count(), 0)
+        self.assertEqual(Referral.objects.filter(basket__isnull=True).count(), 0)
+
+    def test_without_commit(self):
+        """ Verify the command does not delete baskets if the commit flag is not set. """
+        expected = Basket.objects.count()
+        actual = self.call_command()
+
+        self.assertEqual(Basket.objects.count(), expected)
+        expected = 'This has been an example operation. If the --commit flag had been included, the command ' \
+                   'would have deleted [{}] baskets.'.format(len(self.abandoned_baskets))
+        self.assertEqual(actual, expected)
+
+    def test_with_commit(self):
+        """ Verify the command deletes abandoned baskets, with their lines and referrals, in batches. """
+        actual = self.call_command(commit=True, batch_size=2)
+
+        self.assert_baskets_kept(sorted(self.kept_baskets, key=lambda basket: basket.id))
+        self.assertEqual(Referral.objects.count(), len(self.kept_baskets) - 1)
+        self.assertEqual(actual.splitlines(), [
+            'Deleted [2] baskets through ID [{}].'.format(self.abandoned_baskets[1].id),
+            'Deleted [1] baskets through ID [{}].'.format(self.abandoned_baskets[2].id),
+            'All [3] baskets deleted.',
+        ])
+
+    def test_with_statuses_and_start_id(self):
+        """ Verify the command only deletes baskets with the given statuses, after the given ID. """
+        self.call_command(
+            '--status', Basket.OPEN, Basket.FROZEN, commit=True, start_id=self.abandoned_baskets[0].id
+        )
+        self.assertEqual(
+            list(Basket.objects.filter(id__in=[basket.id for basket in self.abandoned_baskets]).order_by('id')),
+            self.abandoned_baskets[:2]
+        )
+
+    def test_with_archive_file(self):
+        """ Verify the command archives the baskets, lines and attributes it deletes. """
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        archive_file = os.path.join(path, 'baskets.json')
+
+        self.call_command(commit=True, batch_size=2, archive_file=archive_file)
+
+        with open(archive_file) as f:
+            batches = [json.loads(line) for line in f]
+        self.assertEqual(len(batches), 2)
+        archived = [(item['model'], item['pk']) for batch in batches for item in batch]
+        for basket in self.abandoned_baskets:
+            self.assertIn(('basket.basket', basket.id), archived)
+        self.assertEqual(len([item for item in archived if item[0] == 'basket.line']), len(self.abandoned_baskets))
+
+    def test_commit_without_baskets(self):
+        """ Verify the command does nothing if there are no abandoned baskets. """
+        self.assertEqual(self.call_command(commit=True, days=90), 'No baskets to delete.')
+        self.assertEqual(Basket.objects.count(), len(self.abandoned_baskets + self.kept_baskets))
+
+
 class AddSiteToBasketsBasketsCommandTests(TestCase):
     command = 'add_site_to_baskets'
 
@@ -23,6 +23,7 @@ from slumber.exceptions import SlumberBaseException
 from testfixtures import LogCapture
 from waffle.testutils import override_flag
 
+from ecommerce.core.constants import SHORT_TRANSACTIONS_SWITCH
 from ecommerce.core.exceptions import SiteConfigurationError
 from ecommerce.core.tests import toggle_switch
 from ecommerce.core.url_utils import get_lms_url
@@ -123,6 +124,21 @@ class BasketAddItemsViewTests(
         self.assertTrue(basket.contains_a_voucher)
         self.assertEqual(basket.lines.first().product, self.stock_record.product)
 
+    @mock.patch('ecommerce.extensions.basket.utils.embargo_check')
+    @mock.patch('ecommerce.extensions.basket.views.check_course_access', mock.Mock(return_value=False))
+    def test_embargo_check_with_short_transactions(self, mock_embargo_check):
+        """ Verify the embargo API is called before the basket is prepared, outside of its transaction. """
+        toggle_switch(SHORT_TRANSACTIONS_SWITCH, True)
+        self.site_configuration.enable_embargo_check = True
+        self.site_configuration.save()
+
+        response = self.client.get(self.path, data={'sku': self.stock_record.partner_sku})
+        self.assertEqual(response.status_code, 303)
+
+        basket = Basket.objects.get(owner=self.user, site=self.site)
+        self.assertEqual(basket.lines.count(), 0)
+        self.assertFalse(mock_embargo_check.called)
+
     def test_add_multiple_products_no_skus_provided(self):
         """ Verify the Bad request exception is thrown when no skus are provided. """
         response = self.client.get(self.path)
@@ -13,6 +13,7 @@ from django.utils.translation import ugettext_lazy as _
 from oscar.apps.basket.signals import voucher_addition
 from oscar.core.loading import get_class, get_model
 
+from ecommerce.core.eligibility import EMBARGO_CHECK, get_eligibility_result
 from ecommerce.courses.utils import mode_for_product
 from ecommerce.extensions.offer.constants import CUSTOM_APPLICATOR_USE_FLAG
 from ecommerce.extensions.order.exceptions import AlreadyPlacedOrderException
@@ -78,7 +79,7 @@ def prepare_basket(request, products, voucher=None):
     _set_basket_bundle_status(bundle, basket)
 
     if request.site.siteconfiguration.enable_embargo_check:
-        if not embargo_check(request.user, request.site, products):
+        if not get_eligibility_result(request, EMBARGO_CHECK, embargo_check, request.user, request.site, products):
             messages.error(
                 request,
                 _('Due to export controls, we cannot allow you to access this course at this time.')
@@ -8,6 +8,7 @@ from urllib import urlencode
 import dateutil.parser
 import newrelic.agent
 import waffle
+from django.db import transaction
 from django.http import HttpResponseBadRequest, HttpResponseRedirect
 from django.shortcuts import redirect, render
 from django.utils.html import escape
@@ -19,8 +20,10 @@ from oscar.apps.basket.views import *  # pylint: disable=wildcard-import, unused
 from requests.exceptions import ConnectionError, Timeout
 from slumber.exceptions import SlumberBaseException
 
+from ecommerce.core.eligibility import EMBARGO_CHECK, EligibilityGate
 from ecommerce.core.exceptions import SiteConfigurationError
 from ecommerce.core.url_utils import get_lms_course_about_url, get_lms_url
+from ecommerce.core.views import ShortTransactionMixin
 from ecommerce.courses.utils import get_certificate_type_display_value, get_course_info_from_catalog
 from ecommerce.enterprise.entitlements import get_enterprise_code_redemption_redirect
 from ecommerce.enterprise.utils import CONSENT_FAILED_PARAM, get_enterprise_customer_from_voucher, has_enterprise_offer
@@ -42,6 +45,7 @@ from ecommerce.extensions.order.exceptions import AlreadyPlacedOrderException
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
 from ecommerce.extensions.payment.constants import CLIENT_SIDE_CHECKOUT_FLAG_NAME
 from ecommerce.extensions.payment.forms import PaymentForm
+from ecommerce.extensions.payment.utils import check_course_access, get_embargo_course_ids
 
 BasketAttribute = get_model('basket', 'BasketAttribute')
 BasketAttributeType = get_model('basket', 'BasketAttributeType')
@@ -52,7 +56,7 @@ StockRecord = get_model('partner', 'StockRecord')
 Voucher = get_model('voucher', 'Voucher')
 
 
-class BasketAddItemsView(View):
+class BasketAddItemsView(ShortTransactionMixin, View):
     """
     View that adds multiple products to a user's basket.
     An additional coupon code can be supplied so the offer is applied to the basket.
@@ -90,8 +94,7 @@ class BasketAddItemsView(View):
 
         # check availability of products
         unavailable_product_ids = []
-        for product in products:
-            purchase_info = request.strategy.fetch_for_product(product)
+        for product, purchase_info in request.strategy.fetch_for_products(products).items():
             if not purchase_info.availability.is_available_to_buy:
                 logger.warning('Product [%s] is not available to buy.', product.title)
                 unavailable_product_ids.append(product.id)
@@ -101,23 +104,36 @@ class BasketAddItemsView(View):
             msg = _('No product is available to buy.')
             return HttpResponseBadRequest(msg)
 
-        # Associate the user's email opt in preferences with the basket in
-        # order to opt them in later as part of fulfillment
-        BasketAttribute.objects.update_or_create(
-            basket=request.basket,
-            attribute_type=BasketAttributeType.objects.get(name=EMAIL_OPT_IN_ATTRIBUTE),
-            defaults={'value_text': request.GET.get('email_opt_in') == 'true'},
-        )
+        if request.site.siteconfiguration.enable_embargo_check:
+            # Call the embargo API before the basket is modified, rather than from prepare_basket.
+            request.eligibility_gate = EligibilityGate()
+            request.eligibility_gate.add_check(
+                EMBARGO_CHECK,
+                check_course_access,
+                args=(request.user, request.site, get_embargo_course_ids(available_products)),
+                # Purchases are allowed if the embargo API is unavailable.
+                fallback=True
+            )
+            request.eligibility_gate.run()
+
+        with transaction.atomic():
+            # Associate the user's email opt in preferences with the basket in
+            # order to opt them in later as part of fulfillment
+            BasketAttribute.objects.update_or_create(
+                basket=request.basket,
+                attribute_type=BasketAttributeType.objects.get(name=EMAIL_OPT_IN_ATTRIBUTE),
+                defaults={'value_text': request.GET.get('email_opt_in') == 'true'},
+            )
 
-        try:
-            prepare_basket(request, available_products, voucher)
-        except AlreadyPlacedOrderException:
-            return render(request, 'edx/error.html', {'error': _('You have already purchased these products')})
+            try:
+                prepare_basket(request, available_products, voucher)
+            except AlreadyPlacedOrderException:
+                return render(request, 'edx/error.html', {'error': _('You have already purchased these products')})
         url = add_utm_params_to_url(reverse('basket:summary'), self.request.GET.items())
         return HttpResponseRedirect(url, status=303)
 
 
-class BasketSummaryView(BasketView):
+class BasketSummaryView(ShortTransactionMixin, BasketView):
     """
     Display basket contents and checkout/payment options.
     """
@@ -382,6 +398,10 @@ class BasketSummaryView(BasketView):
         else:
             return super(BasketSummaryView, self).get(request, *args, **kwargs)
 
+    def formset_valid(self, formset):
+        with transaction.atomic():
+            return super(BasketSummaryView, self).formset_valid(formset)
+
     @newrelic.agent.function_trace()
     def get_context_data(self, **kwargs):
         context = super(BasketSummaryView, self).get_context_data(**kwargs)
@@ -441,7 +461,7 @@ class BasketSummaryView(BasketView):
         return context
 
 
-class VoucherAddView(BaseVoucherAddView):  # pylint: disable=function-redefined
+class VoucherAddView(ShortTransactionMixin, BaseVoucherAddView):  # pylint: disable=function-redefined
     def apply_voucher_to_basket(self, voucher):
         """
         Validates and applies voucher on basket.
@@ -520,7 +540,8 @@ class VoucherAddView(BaseVoucherAddView):  # pylint: disable=function-redefined
                             params=params
                         )
                     )
-                self.apply_voucher_to_basket(voucher)
+                with transaction.atomic():
+                    self.apply_voucher_to_basket(voucher)
         return redirect_to_referrer(self.request, 'basket:summary')
 
 
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-19 12:35
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0036_coupon_notify_email_attribute'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductDescriptor',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='descriptor', serialize=False, to='catalogue.Product')),
+                ('product_class_name', models.CharField(db_index=True, max_length=128)),
+                ('sku', models.CharField(blank=True, db_index=True, max_length=128, null=True)),
+                ('course_key', models.CharField(blank=True, db_index=True, max_length=255, null=True)),
+                ('certificate_type', models.CharField(blank=True, max_length=255, null=True)),
+                ('seat_type', models.CharField(blank=True, max_length=255, null=True)),
+                ('id_verification_required', models.NullBooleanField()),
+                ('uuid', models.CharField(blank=True, db_index=True, max_length=255, null=True)),
+                ('credit_provider', models.CharField(blank=True, max_length=255, null=True)),
+            ],
+        ),
+        migrations.AlterIndexTogether(
+            name='productdescriptor',
+            index_together=set([('course_key', 'certificate_type')]),
+        ),
+    ]
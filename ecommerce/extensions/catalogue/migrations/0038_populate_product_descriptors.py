@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+from oscar.core.loading import get_model
+
+Product = get_model('catalogue', 'Product')
+ProductDescriptor = get_model('catalogue', 'ProductDescriptor')
+
+
+def populate_product_descriptors(apps, schema_editor):
+    """ Create the descriptors of existing products. """
+    products = Product.objects.select_related('parent__product_class', 'product_class').order_by('id')
+    for product in products.iterator():
+        ProductDescriptor.refresh(product)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0037_product_descriptor'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_product_descriptors, migrations.RunPython.noop),
+    ]
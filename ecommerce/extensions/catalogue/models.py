@@ -1,9 +1,10 @@
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from django.db import models
-from django.db.models.signals import post_init, post_save
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
 from oscar.apps.catalogue.abstract_models import AbstractProduct
 
 from ecommerce.core.constants import (
@@ -13,6 +14,7 @@ from ecommerce.core.constants import (
     SEAT_PRODUCT_CLASS_NAME
 )
 from ecommerce.core.utils import log_message_and_raise_validation_error
+from ecommerce.extensions.catalogue.signals import descriptor_refreshed
 from ecommerce.journals.constants import JOURNAL_PRODUCT_CLASS_NAME  # TODO: journals dependency
 
 
@@ -24,26 +26,34 @@ class Product(AbstractProduct):
                                    help_text=_('Last date/time on which this product can be purchased.'))
     original_expires = None
 
+    @property
+    def product_class_name(self):
+        """ Name of the product class, read from the descriptor of the product if it has been loaded. """
+        descriptor = ProductDescriptor.get_cached(self.id)
+        if descriptor:
+            return descriptor.product_class_name
+        return self.get_product_class().name
+
     @property
     def is_seat_product(self):
-        return self.get_product_class().name == SEAT_PRODUCT_CLASS_NAME
+        return self.product_class_name == SEAT_PRODUCT_CLASS_NAME
 
     @property
     def is_enrollment_code_product(self):
-        return self.get_product_class().name == ENROLLMENT_CODE_PRODUCT_CLASS_NAME
+        return self.product_class_name == ENROLLMENT_CODE_PRODUCT_CLASS_NAME
 
     @property
     def is_course_entitlement_product(self):
-        return self.get_product_class().name == COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME
+        return self.product_class_name == COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME
 
     # TODO: journals dependency
     @property
     def is_journal_product(self):
-        return self.get_product_class().name == JOURNAL_PRODUCT_CLASS_NAME
+        return self.product_class_name == JOURNAL_PRODUCT_CLASS_NAME
 
     @property
     def is_coupon_product(self):
-        return self.get_product_class().name == COUPON_PRODUCT_CLASS_NAME
+        return self.product_class_name == COUPON_PRODUCT_CLASS_NAME
 
     def save(self, *args, **kwargs):
         try:
@@ -65,6 +75,7 @@ class Product(AbstractProduct):
             pass
 
         super(Product, self).save(*args, **kwargs)  # pylint: disable=bad-super-call
+        ProductDescriptor.refresh(self)
 
 
 @receiver(post_init, sender=Product)
@@ -99,6 +110,134 @@ def update_enrollment_code(sender, **kwargs):  # pylint: disable=unused-argument
         instance.original_expires = instance.expires
 
 
+class ProductDescriptor(models.Model):
+    """
+    Denormalized copy of the product facts read on hot paths, with a typed and indexed column for each.
+
+    Oscar stores these facts as the product class and attribute values of the product, which take several
+    joins to read or filter on. Descriptors are kept in sync when products, attribute values and stock
+    records are saved.
+    """
+    # Maps the codes of the attributes copied to descriptors to their columns.
+    ATTRIBUTE_FIELDS = {
+        'course_key': 'course_key',
+        'certificate_type': 'certificate_type',
+        'seat_type': 'seat_type',
+        'id_verification_required': 'id_verification_required',
+        'UUID': 'uuid',
+        'credit_provider': 'credit_provider',
+    }
+    CACHE_KEY_PREFIX = 'product_descriptor'
+
+    product = models.OneToOneField(
+        'catalogue.Product', primary_key=True, related_name='descriptor', on_delete=models.CASCADE
+    )
+    product_class_name = models.CharField(max_length=128, db_index=True)
+    sku = models.CharField(max_length=128, null=True, blank=True, db_index=True)
+    course_key = models.CharField(max_length=255, null=True, blank=True, db_index=True)
+    certificate_type = models.CharField(max_length=255, null=True, blank=True)
+    seat_type = models.CharField(max_length=255, null=True, blank=True)
+    id_verification_required = models.NullBooleanField()
+    uuid = models.CharField(max_length=255, null=True, blank=True, db_index=True)
+    credit_provider = models.CharField(max_length=255, null=True, blank=True)
+
+    class Meta(object):
+        index_together = (('course_key', 'certificate_type'),)
+
+    @classmethod
+    def _clean(cls, field, value):
+        """ Returns the value of an attribute as stored in the column of the descriptor. """
+        if value is None or field == 'id_verification_required':
+            return value
+        return unicode(value)
+
+    @classmethod
+    def _cache_key(cls, product_id):
+        return '{}.{}'.format(cls.CACHE_KEY_PREFIX, product_id)
+
+    @classmethod
+    def get_cached(cls, product_id):
+        """ Returns the descriptor of the product loaded during this request, or None. """
+        if product_id is None:
+            return None
+        cached_response = DEFAULT_REQUEST_CACHE.get_cached_response(cls._cache_key(product_id))
+        return cached_response.value if cached_response.is_found else None
+
+    @classmethod
+    def load(cls, products):
+        """
+        Load the descriptors of the products, with one query for those not loaded yet during this request.
+
+        Returns:
+            dict: Descriptors keyed by product ID. Products without a descriptor are omitted.
+        """
+        descriptors = {}
+        missing = set()
+        for product in products:
+            descriptor = cls.get_cached(product.id)
+            if descriptor:
+                descriptors[product.id] = descriptor
+            else:
+                missing.add(product.id)
+
+        if missing:
+            for descriptor in cls.objects.filter(product_id__in=missing):
+                DEFAULT_REQUEST_CACHE.set(cls._cache_key(descriptor.product_id), descriptor)
+                descriptors[descriptor.product_id] = descriptor
+
+        return descriptors
+
+    @classmethod
+    def for_product(cls, product):
+        """ Returns the descriptor of the product, or None if it has none. """
+        return cls.load([product]).get(product.id)
+
+    @classmethod
+    def refresh(cls, product):
+        """ Create or update the descriptor of the product from its product class, attributes and stock record. """
+        values = {
+            field: cls._clean(field, getattr(product.attr, code, None)) for code, field in cls.ATTRIBUTE_FIELDS.items()
+        }
+        stockrecord = product.stockrecords.first()
+        values.update(
+            product_class_name=product.get_product_class().name,
+            sku=stockrecord.partner_sku if stockrecord else None,
+        )
+        descriptor, created = cls.objects.update_or_create(product=product, defaults=values)
+        DEFAULT_REQUEST_CACHE.set(cls._cache_key(product.id), descriptor)
+        descriptor_refreshed.send(sender=cls, product=product, created=created)
+        return descriptor
+
+    @classmethod
+    def update_fields(cls, product_id, **values):
+        """ Update columns of the descriptor of the product, if it has one. """
+        values = {field: cls._clean(field, value) for field, value in values.items()}
+        cls.objects.filter(product_id=product_id).update(**values)
+        descriptor = cls.get_cached(product_id)
+        if descriptor:
+            for field, value in values.items():
+                setattr(descriptor, field, value)
+
+
+@receiver(post_save, sender='catalogue.ProductAttributeValue')
+def update_descriptor_attribute(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    field = ProductDescriptor.ATTRIBUTE_FIELDS.get(instance.attribute.code)
+    if field:
+        ProductDescriptor.update_fields(instance.product_id, **{field: instance.value})
+
+
+@receiver(post_delete, sender='catalogue.ProductAttributeValue')
+def clear_descriptor_attribute(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    field = ProductDescriptor.ATTRIBUTE_FIELDS.get(instance.attribute.code)
+    if field:
+        ProductDescriptor.update_fields(instance.product_id, **{field: None})
+
+
+@receiver(post_save, sender='partner.StockRecord')
+def update_descriptor_sku(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    ProductDescriptor.update_fields(instance.product_id, sku=instance.partner_sku)
+
+
 class Catalog(models.Model):
     name = models.CharField(max_length=255)
     partner = models.ForeignKey('partner.Partner', related_name='catalogs', on_delete=models.CASCADE)
@@ -0,0 +1,4 @@
+from django.dispatch import Signal
+
+# Sent when the descriptor of a product is refreshed, once the product and its attribute values are saved.
+descriptor_refreshed = Signal(providing_args=['product', 'created'])
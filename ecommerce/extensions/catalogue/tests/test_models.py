@@ -1,9 +1,11 @@
 import ddt
 from django.core.exceptions import ValidationError
 from django.utils.timezone import now, timedelta
+from edx_django_utils.cache import TieredCache
 from oscar.core.loading import get_model
 from oscar.test import factories
 
+from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME, SEAT_PRODUCT_CLASS_NAME
 from ecommerce.coupons.tests.mixins import CouponMixin
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
 from ecommerce.extensions.voucher.models import CouponVouchers
@@ -11,6 +13,7 @@ from ecommerce.tests.testcases import TestCase
 
 Product = get_model('catalogue', 'Product')
 ProductClass = get_model('catalogue', 'ProductClass')
+ProductDescriptor = get_model('catalogue', 'ProductDescriptor')
 
 
 @ddt.ddt
@@ -109,3 +112,48 @@ class ProductTests(CouponMixin, DiscoveryTestMixin, TestCase):
 
         exception = ve.exception
         self.assertIn('Notification email must be a valid email address.', exception.message)
+
+
+class ProductDescriptorTests(DiscoveryTestMixin, TestCase):
+    def test_sync(self):
+        """ Verify descriptors are kept in sync with the product class, attributes and stock records of products. """
+        course, seat, enrollment_code = self.create_course_seat_and_enrollment_code(id_verification=True)
+
+        descriptor = ProductDescriptor.objects.get(product=seat)
+        self.assertEqual(descriptor.product_class_name, SEAT_PRODUCT_CLASS_NAME)
+        self.assertEqual(descriptor.course_key, course.id)
+        self.assertEqual(descriptor.certificate_type, 'verified')
+        self.assertTrue(descriptor.id_verification_required)
+        self.assertEqual(descriptor.sku, seat.stockrecords.first().partner_sku)
+
+        descriptor = ProductDescriptor.objects.get(product=enrollment_code)
+        self.assertEqual(descriptor.product_class_name, ENROLLMENT_CODE_PRODUCT_CLASS_NAME)
+        self.assertEqual(descriptor.seat_type, 'verified')
+
+        seat.attr.certificate_type = 'professional'
+        seat.save()
+        stockrecord = seat.stockrecords.first()
+        stockrecord.partner_sku = 'NEWSKU'
+        stockrecord.save()
+        seat.attribute_values.get(attribute__code='id_verification_required').delete()
+
+        descriptor = ProductDescriptor.objects.get(product=seat)
+        self.assertEqual(descriptor.certificate_type, 'professional')
+        self.assertEqual(descriptor.sku, 'NEWSKU')
+        self.assertIsNone(descriptor.id_verification_required)
+
+    def test_load(self):
+        """ Verify descriptors are loaded with one query, and read from the request cache afterwards. """
+        __, seat, enrollment_code = self.create_course_seat_and_enrollment_code()
+        TieredCache.dangerous_clear_all_tiers()
+        seat = Product.objects.get(id=seat.id)
+        enrollment_code = Product.objects.get(id=enrollment_code.id)
+
+        with self.assertNumQueries(1):
+            descriptors = ProductDescriptor.load([seat, enrollment_code])
+        self.assertEqual(set(descriptors), {seat.id, enrollment_code.id})
+
+        with self.assertNumQueries(0):
+            self.assertTrue(seat.is_seat_product)
+            self.assertTrue(enrollment_code.is_enrollment_code_product)
+            self.assertEqual(ProductDescriptor.for_product(seat), descriptors[seat.id])
@@ -16,9 +16,12 @@ from ecommerce.extensions.api import data as data_api
 from ecommerce.extensions.basket.constants import EMAIL_OPT_IN_ATTRIBUTE
 from ecommerce.extensions.basket.utils import ORGANIZATION_ATTRIBUTE_TYPE
 from ecommerce.extensions.checkout.exceptions import BasketNotFreeError
+from ecommerce.extensions.checkout.outbox import record_post_checkout_messages
+from ecommerce.extensions.checkout.tasks import dispatch_checkout_outbox
 from ecommerce.extensions.customer.utils import Dispatcher
 from ecommerce.extensions.offer.constants import OFFER_ASSIGNMENT_REVOKED, OFFER_REDEEMED
-from ecommerce.extensions.order.constants import PaymentEventTypeName
+from ecommerce.extensions.offer.exceptions import OfferUsageLimitExceeded
+from ecommerce.extensions.order.constants import CHECKOUT_OUTBOX_SWITCH, PaymentEventTypeName
 from ecommerce.invoice.models import Invoice
 
 CommunicationEventType = get_model('customer', 'CommunicationEventType')
@@ -128,26 +131,79 @@ class EdxOrderPlacementMixin(OrderPlacementMixin):
         and basket submission in a transaction. Should be used only in
         the context of an exception handler.
         """
-        with transaction.atomic():
-            order = self.place_order(
-                order_number=order_number,
-                user=user,
-                basket=basket,
-                shipping_address=shipping_address,
-                shipping_method=shipping_method,
-                shipping_charge=shipping_charge,
-                order_total=order_total,
-                billing_address=billing_address,
-                request=request,
-                **kwargs
+        use_outbox = waffle.switch_is_active(CHECKOUT_OUTBOX_SWITCH)
+        email_opt_in = self.get_email_opt_in(basket)
+        try:
+            with transaction.atomic():
+                order = self.place_order(
+                    order_number=order_number,
+                    user=user,
+                    basket=basket,
+                    shipping_address=shipping_address,
+                    shipping_method=shipping_method,
+                    shipping_charge=shipping_charge,
+                    order_total=order_total,
+                    billing_address=billing_address,
+                    request=request,
+                    **kwargs
+                )
+
+                basket.submit()
+
+                if use_outbox:
+                    # The post-checkout side effects are recorded in the outbox in the same transaction.
+                    record_post_checkout_messages(order, request=request, email_opt_in=email_opt_in)
+        except OfferUsageLimitExceeded:
+            # Baskets are refused offers which are used up before payment. This only guards against a concurrent
+            # redemption using up an offer after the basket was paid for. The order is not placed, so the payment
+            # is refunded and the basket made available again.
+            logger.exception(
+                'Order [%s] for basket [%d] could not be placed, because an offer applied to it has reached its '
+                'usage limit. Refunding the payment.', order_number, basket.id
             )
+            self.refund_payment(order_number, basket)
+            basket.thaw()
+            raise
+
+        return self.handle_successful_order(order, request, email_opt_in=email_opt_in, outbox_recorded=use_outbox)
+
+    def refund_payment(self, order_number, basket):
+        """ Issue credits for the payment sources recorded for an order which could not be placed. """
+        for source in self._payment_sources or []:
+            if not self.payment_processor or not source.amount_debited:
+                continue
+
+            try:
+                self.payment_processor.issue_credit(
+                    order_number, basket, source.reference, source.amount_debited, source.currency
+                )
+            except Exception:  # pylint: disable=broad-except
+                logger.exception(
+                    'Failed to refund transaction [%s] of basket [%d] for order [%s].',
+                    source.reference, basket.id, order_number
+                )
+
+    def get_email_opt_in(self, basket):
+        """ Return the user's email opt in preference, defaulting to false if it hasn't been set. """
+        try:
+            return BasketAttribute.objects.get(
+                basket=basket,
+                attribute_type=BasketAttributeType.objects.get(name=EMAIL_OPT_IN_ATTRIBUTE),
+            ).value_text == 'True'
+        except BasketAttribute.DoesNotExist:
+            return False
 
-            basket.submit()
-
-        return self.handle_successful_order(order, request)
+    def handle_successful_order(self, order, request=None, email_opt_in=None,  # pylint: disable=arguments-differ
+                                outbox_recorded=False):
+        """Send a signal so that receivers can perform relevant tasks (e.g., fulfill the order).
 
-    def handle_successful_order(self, order, request=None):  # pylint: disable=arguments-differ
-        """Send a signal so that receivers can perform relevant tasks (e.g., fulfill the order)."""
+        Arguments:
+            order (Order): The order which was placed.
+            request (Request): The checkout request.
+            email_opt_in (bool): Whether the user opted in to marketing emails. Looked up from the basket if None.
+            outbox_recorded (bool): Whether the post-checkout side effects were already recorded in the outbox,
+                in the order placement transaction.
+        """
         audit_log(
             'order_placed',
             amount=order.total_excl_tax,
@@ -158,19 +214,20 @@ class EdxOrderPlacementMixin(OrderPlacementMixin):
             contains_coupon=order.contains_coupon
         )
 
-        # Check for the user's email opt in preference, defaulting to false if it hasn't been set
-        try:
-            email_opt_in = BasketAttribute.objects.get(
-                basket=order.basket,
-                attribute_type=BasketAttributeType.objects.get(name=EMAIL_OPT_IN_ATTRIBUTE),
-            ).value_text == 'True'
-        except BasketAttribute.DoesNotExist:
-            email_opt_in = False
+        if email_opt_in is None:
+            email_opt_in = self.get_email_opt_in(order.basket)
 
         # update offer assignment with voucher application
         self.update_assigned_voucher_offer_assignment(order)
 
-        if waffle.sample_is_active('async_order_fulfillment'):
+        if waffle.switch_is_active(CHECKOUT_OUTBOX_SWITCH):
+            # The side effects are delivered by the outbox dispatcher once the transaction has committed.
+            if not outbox_recorded:
+                record_post_checkout_messages(order, request=request, email_opt_in=email_opt_in)
+            transaction.on_commit(dispatch_checkout_outbox.delay)
+            # Receivers whose side effects are recorded in the outbox ignore the signal. The others still run here.
+            post_checkout.send(sender=self, order=order, request=request, email_opt_in=email_opt_in, outbox=True)
+        elif waffle.sample_is_active('async_order_fulfillment'):
             # Always commit transactions before sending tasks depending on state from the current transaction!
             # There's potential for a race condition here if the task starts executing before the active
             # transaction has been committed; the necessary order doesn't exist in the database yet.
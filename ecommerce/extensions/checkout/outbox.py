@@ -0,0 +1,145 @@
+""" Transactional outbox for post-checkout side effects.
+
+Instead of running the `post_checkout` receivers inline, checkout records one outbox message per side effect
+in the order placement transaction. The messages are delivered by `dispatch_outbox_messages` once that
+transaction has committed, and failed deliveries are retried with an exponential backoff, so each side
+effect is delivered at least once.
+
+The `post_checkout` signal is still sent, with `outbox=True`. The receivers of the side effects below ignore it,
+and any other receiver runs inline as before.
+"""
+from __future__ import unicode_literals
+
+import datetime
+import logging
+from collections import OrderedDict
+
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.checkout.signals import send_course_purchase_notification, track_completed_order_event
+from ecommerce.extensions.fulfillment.exceptions import FulfillmentError
+from ecommerce.extensions.fulfillment.signals import post_checkout_callback
+from ecommerce.extensions.order.constants import OutboxMessageStatus
+from ecommerce.sailthru.signals import get_campaign_id, notify_checkout_complete
+
+logger = logging.getLogger(__name__)
+OutboxMessage = get_model('order', 'OutboxMessage')
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+RETRY_DELAY = datetime.timedelta(minutes=1)
+# Messages claimed by a dispatcher which died before recording the outcome become due again after this delay.
+CLAIM_TIMEOUT = datetime.timedelta(minutes=10)
+
+
+def fulfill_order(order, email_opt_in=False):
+    """ Fulfill an order, raising if any of its lines could not be fulfilled so that the message is retried. """
+    if not order.is_fulfillable:
+        # An earlier delivery fulfilled the order, but its outcome was not recorded.
+        return
+
+    post_checkout_callback(sender=None, order=order, email_opt_in=email_opt_in)
+
+    # Fulfillment failures are recorded in the order and line statuses, rather than raised.
+    if order.is_fulfillable:
+        raise FulfillmentError('Fulfillment of order [{number}] failed.'.format(number=order.number))
+
+
+# Handlers are keyed by the name stored on the outbox messages, and run in this order for each order.
+OUTBOX_HANDLERS = OrderedDict([
+    ('fulfill_order', fulfill_order),
+    ('track_completed_order', track_completed_order_event),
+    ('send_course_purchase_email', send_course_purchase_notification),
+    ('sailthru_checkout_complete', notify_checkout_complete),
+])
+
+
+def record_post_checkout_messages(order, request=None, email_opt_in=False):
+    """
+    Record the post-checkout side effects of an order in the outbox.
+
+    Should be called in the transaction which places the order. Anything the handlers need from the request
+    is captured in the message payloads, since the messages are delivered outside of it.
+
+    Arguments:
+        order (Order): The order which was placed.
+        request (Request): The checkout request.
+        email_opt_in (bool): Whether the user opted in to marketing emails.
+
+    Returns:
+        list: The recorded outbox messages.
+    """
+    payloads = {
+        'fulfill_order': {'email_opt_in': email_opt_in},
+        'sailthru_checkout_complete': {'message_id': get_campaign_id(request)},
+    }
+    return OutboxMessage.objects.bulk_create(
+        OutboxMessage(order=order, handler=handler, payload=payloads.get(handler, {})) for handler in OUTBOX_HANDLERS
+    )
+
+
+def _claim_due_messages(batch_size):
+    """ Claim a batch of due messages, so that concurrent dispatchers do not deliver them as well. """
+    started = now()
+    due = OutboxMessage.objects.filter(status=OutboxMessageStatus.PENDING, next_attempt__lte=started)
+    message_ids = list(due.order_by('next_attempt', 'id').values_list('id', flat=True)[:batch_size])
+    if not message_ids:
+        return []
+
+    claimed_until = started + CLAIM_TIMEOUT
+    due.filter(id__in=message_ids).update(next_attempt=claimed_until)
+    return list(
+        OutboxMessage.objects.filter(id__in=message_ids, next_attempt=claimed_until).select_related(
+            'order__site__siteconfiguration__partner', 'order__user', 'order__basket'
+        ).prefetch_related('order__lines__product').order_by('id')
+    )
+
+
+def deliver_message(message):
+    """
+    Run the handler of an outbox message, and record the outcome.
+
+    Returns:
+        bool: True if the message was delivered.
+    """
+    message.attempts += 1
+    try:
+        OUTBOX_HANDLERS[message.handler](message.order, **message.payload)
+    except Exception as exception:  # pylint: disable=broad-except
+        message.last_error = repr(exception)
+        if message.attempts >= MAX_ATTEMPTS:
+            message.status = OutboxMessageStatus.FAILED
+            logger.exception(
+                'Giving up on outbox message [%d] (%s) for order [%s] after [%d] attempts.',
+                message.id, message.handler, message.order.number, message.attempts
+            )
+        else:
+            message.next_attempt = now() + RETRY_DELAY * 2 ** (message.attempts - 1)
+            logger.warning(
+                'Failed to deliver outbox message [%d] (%s) for order [%s]. It will be retried at [%s].',
+                message.id, message.handler, message.order.number, message.next_attempt, exc_info=True
+            )
+        message.save()
+        return False
+
+    message.status = OutboxMessageStatus.DELIVERED
+    message.save()
+    return True
+
+
+def dispatch_outbox_messages(batch_size=BATCH_SIZE):
+    """
+    Deliver a batch of the outbox messages which are due.
+
+    Arguments:
+        batch_size (int): Maximum number of messages to deliver.
+
+    Returns:
+        int: Number of messages processed, whether or not their delivery succeeded.
+    """
+    messages = _claim_due_messages(batch_size)
+    delivered = sum(deliver_message(message) for message in messages)
+    if messages:
+        logger.info('Delivered [%d] of [%d] checkout outbox messages.', delivered, len(messages))
+    return len(messages)
@@ -5,8 +5,9 @@ from django.dispatch import receiver
 from oscar.core.loading import get_class, get_model
 
 from ecommerce.courses.utils import mode_for_product
+from ecommerce.credit.utils import get_credit_provider, invalidate_credit_eligibility
 from ecommerce.extensions.analytics.utils import silence_exceptions, track_segment_event
-from ecommerce.extensions.checkout.utils import get_credit_provider_details, get_receipt_page_url
+from ecommerce.extensions.checkout.utils import get_receipt_page_url
 from ecommerce.notifications.notifications import send_notification
 from ecommerce.programs.utils import get_program
 
@@ -22,7 +23,12 @@ ORDER_LINE_COUNT = 1
 
 @receiver(post_checkout, dispatch_uid='tracking.post_checkout_callback')
 @silence_exceptions('Failed to emit tracking event upon order completion.')
-def track_completed_order(sender, order=None, **kwargs):  # pylint: disable=unused-argument
+def track_completed_order(sender, order=None, outbox=False, **kwargs):  # pylint: disable=unused-argument
+    if not outbox:
+        track_completed_order_event(order)
+
+
+def track_completed_order_event(order):
     """
     Emit a tracking event when
     1. An order is placed OR
@@ -92,9 +98,23 @@ def track_completed_order(sender, order=None, **kwargs):  # pylint: disable=unus
     track_segment_event(order.site, order.user, 'Order Completed', properties)
 
 
+@receiver(post_checkout, dispatch_uid='invalidate_credit_eligibility')
+@silence_exceptions('Failed to invalidate credit eligibility upon order completion.')
+def invalidate_purchased_credit_eligibility(sender, order=None, **kwargs):  # pylint: disable=unused-argument
+    """ Discard the cached credit eligibility of learners once they have purchased credit. """
+    for line in order.lines.all():
+        if getattr(line.product.attr, 'credit_provider', None):
+            invalidate_credit_eligibility(order.user.username, line.product.attr.course_key)
+
+
 @receiver(post_checkout, dispatch_uid='send_completed_order_email')
 @silence_exceptions("Failed to send order completion email.")
-def send_course_purchase_email(sender, order=None, **kwargs):  # pylint: disable=unused-argument
+def send_course_purchase_email(sender, order=None, outbox=False, **kwargs):  # pylint: disable=unused-argument
+    if not outbox:
+        send_course_purchase_notification(order)
+
+
+def send_course_purchase_notification(order):
     """Send course purchase notification email when a course is purchased."""
     if waffle.switch_is_active('ENABLE_NOTIFICATIONS'):
         # We do not currently support email sending for orders with more than one item.
@@ -120,11 +140,7 @@ def send_course_purchase_email(sender, order=None, **kwargs):  # pylint: disable
                     )
                     return
             elif product.is_seat_product:
-                provider_data = get_credit_provider_details(
-                    access_token=order.site.siteconfiguration.access_token,
-                    credit_provider_id=credit_provider_id,
-                    site_configuration=order.site.siteconfiguration
-                )
+                provider_data = get_credit_provider(order.site.siteconfiguration, credit_provider_id)
 
                 receipt_page_url = get_receipt_page_url(
                     order_number=order.number,
@@ -0,0 +1,13 @@
+""" Celery tasks which deliver the checkout outbox. """
+from __future__ import unicode_literals
+
+from celery import shared_task
+
+from ecommerce.extensions.checkout.outbox import BATCH_SIZE, dispatch_outbox_messages
+
+
+@shared_task(ignore_result=True)
+def dispatch_checkout_outbox(batch_size=BATCH_SIZE):
+    """ Deliver the due checkout outbox messages, one batch at a time. """
+    while dispatch_outbox_messages(batch_size) == batch_size:
+        pass
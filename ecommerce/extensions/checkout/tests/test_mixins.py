@@ -23,7 +23,10 @@ from ecommerce.extensions.basket.constants import EMAIL_OPT_IN_ATTRIBUTE
 from ecommerce.extensions.basket.utils import basket_add_organization_attribute
 from ecommerce.extensions.checkout.exceptions import BasketNotFreeError
 from ecommerce.extensions.checkout.mixins import OFFER_REDEEMED, EdxOrderPlacementMixin
-from ecommerce.extensions.fulfillment.status import ORDER
+from ecommerce.extensions.checkout.outbox import OUTBOX_HANDLERS
+from ecommerce.extensions.fulfillment.status import LINE, ORDER
+from ecommerce.extensions.offer.exceptions import OfferUsageLimitExceeded
+from ecommerce.extensions.order.constants import CHECKOUT_OUTBOX_SWITCH
 from ecommerce.extensions.payment.tests.mixins import PaymentEventsMixin
 from ecommerce.extensions.payment.tests.processors import DummyProcessor
 from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
@@ -45,8 +48,10 @@ BasketAttribute = get_model('basket', 'BasketAttribute')
 BasketAttributeType = get_model('basket', 'BasketAttributeType')
 NoShippingRequired = get_class('shipping.methods', 'NoShippingRequired')
 OfferAssignment = get_model('offer', 'OfferAssignment')
+Order = get_model('order', 'Order')
 OrderTotalCalculator = get_class('checkout.calculators', 'OrderTotalCalculator')
 PaymentEventType = get_model('order', 'PaymentEventType')
+post_checkout = get_class('checkout.signals', 'post_checkout')
 SourceType = get_model('payment', 'SourceType')
 Product = get_model('catalogue', 'Product')
 VoucherApplication = get_model('voucher', 'VoucherApplication')
@@ -132,6 +137,36 @@ class EdxOrderPlacementMixinTests(BusinessIntelligenceMixin, PaymentEventsMixin,
                 order_total,
             )
 
+    def test_offer_usage_limit_exceeded(self, __):
+        """
+        Verify that the payment is refunded and the basket thawed when an offer applied to the basket reaches its
+        usage limit before the order is placed.
+        """
+        basket = create_basket(owner=self.user, site=self.site)
+        basket.freeze()
+
+        mixin = EdxOrderPlacementMixin()
+        mixin.payment_processor = DummyProcessor(self.site)
+        mixin.handle_payment({}, basket)
+
+        shipping_method = NoShippingRequired()
+        shipping_charge = shipping_method.calculate(basket)
+        order_total = OrderTotalCalculator().calculate(basket, shipping_charge)
+
+        with mock.patch.object(mixin, 'place_order', side_effect=OfferUsageLimitExceeded):
+            with mock.patch.object(DummyProcessor, 'issue_credit') as mock_issue_credit:
+                with self.assertRaises(OfferUsageLimitExceeded):
+                    mixin.handle_order_placement(
+                        basket.order_number, self.user, basket, None, shipping_method, shipping_charge, None,
+                        order_total
+                    )
+
+        mock_issue_credit.assert_called_once_with(
+            basket.order_number, basket, basket.id, basket.total_incl_tax, basket.currency
+        )
+        self.assertEqual(Basket.objects.get(id=basket.id).status, Basket.OPEN)
+        self.assertFalse(Order.objects.filter(number=basket.order_number).exists())
+
     def test_handle_successful_order(self, mock_track):
         """
         Ensure that tracking events are fired with correct content when order
@@ -297,6 +332,49 @@ class EdxOrderPlacementMixinTests(BusinessIntelligenceMixin, PaymentEventsMixin,
             send_arguments = {'sender': mixin, 'order': self.order, 'request': None, 'email_opt_in': False}
             mock_send.assert_called_once_with(**send_arguments)
 
+    def test_handle_successful_order_with_outbox(self, _):
+        """
+        Verify that the post checkout side effects are recorded in the outbox instead of being run inline.
+        """
+        toggle_switch(CHECKOUT_OUTBOX_SWITCH, True)
+        with mock.patch('ecommerce.extensions.checkout.mixins.post_checkout.send') as mock_send:
+            mixin = EdxOrderPlacementMixin()
+            mixin.handle_successful_order(self.order)
+            mock_send.assert_called_once_with(
+                sender=mixin, order=self.order, request=None, email_opt_in=False, outbox=True
+            )
+
+        messages = self.order.outbox_messages.order_by('id')
+        self.assertEqual([message.handler for message in messages], list(OUTBOX_HANDLERS))
+        self.assertEqual(messages[0].payload, {'email_opt_in': False})
+
+    def test_handle_order_placement_with_outbox(self, __):
+        """
+        Verify that placing an order records its side effects in the outbox once, without running them inline,
+        while the post checkout receivers which are not recorded in the outbox still run.
+        """
+        toggle_switch(CHECKOUT_OUTBOX_SWITCH, True)
+        basket = create_basket(owner=self.user, site=self.site)
+        shipping_method = NoShippingRequired()
+        shipping_charge = shipping_method.calculate(basket)
+        order_total = OrderTotalCalculator().calculate(basket, shipping_charge)
+
+        receiver = mock.Mock()
+        post_checkout.connect(receiver, dispatch_uid='test_handle_order_placement_with_outbox')
+        self.addCleanup(post_checkout.disconnect, dispatch_uid='test_handle_order_placement_with_outbox')
+
+        order = EdxOrderPlacementMixin().handle_order_placement(
+            basket.order_number, self.user, basket, None, shipping_method, shipping_charge, None, order_total
+        )
+
+        receiver.assert_called_once_with(
+            signal=post_checkout, sender=mock.ANY, order=order, request=None, email_opt_in=False, outbox=True
+        )
+        self.assertEqual(
+            [message.handler for message in order.outbox_messages.order_by('id')], list(OUTBOX_HANDLERS)
+        )
+        self.assertFalse(order.lines.filter(status=LINE.COMPLETE).exists())
+
     @ddt.data(True, False)
     def test_handle_successful_order_with_email_opt_in(self, expected_opt_in, _):
         """
@@ -0,0 +1,102 @@
+from __future__ import unicode_literals
+
+import datetime
+
+import mock
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+from oscar.test.factories import UserFactory
+
+from ecommerce.extensions.checkout import outbox
+from ecommerce.extensions.checkout.outbox import dispatch_outbox_messages, fulfill_order, record_post_checkout_messages
+from ecommerce.extensions.fulfillment.exceptions import FulfillmentError
+from ecommerce.extensions.fulfillment.status import ORDER
+from ecommerce.extensions.order.constants import OutboxMessageStatus
+from ecommerce.extensions.test.factories import create_order
+from ecommerce.tests.testcases import TestCase
+
+OutboxMessage = get_model('order', 'OutboxMessage')
+
+
+class CheckoutOutboxTests(TestCase):
+    def setUp(self):
+        super(CheckoutOutboxTests, self).setUp()
+        self.order = create_order(user=UserFactory(), site=self.site)
+        self.handler = mock.Mock()
+        patcher = mock.patch.dict(outbox.OUTBOX_HANDLERS, {'fulfill_order': self.handler}, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_record_post_checkout_messages(self):
+        """ Verify a message is recorded per handler, with the payload captured at checkout. """
+        messages = record_post_checkout_messages(self.order, email_opt_in=True)
+        self.assertEqual([message.handler for message in messages], ['fulfill_order'])
+        self.assertEqual(OutboxMessage.objects.get(order=self.order).payload, {'email_opt_in': True})
+
+    def test_dispatch(self):
+        """ Verify due messages are delivered with their payload, and not delivered again. """
+        record_post_checkout_messages(self.order, email_opt_in=True)
+        self.assertEqual(dispatch_outbox_messages(), 1)
+        self.handler.assert_called_once_with(self.order, email_opt_in=True)
+
+        message = OutboxMessage.objects.get(order=self.order)
+        self.assertEqual(message.status, OutboxMessageStatus.DELIVERED)
+        self.assertEqual(message.attempts, 1)
+        self.assertEqual(dispatch_outbox_messages(), 0)
+
+    def test_dispatch_retries_failures(self):
+        """ Verify failed deliveries are retried later, and abandoned after the maximum number of attempts. """
+        self.handler.side_effect = Exception('Service unavailable')
+        record_post_checkout_messages(self.order)
+
+        self.assertEqual(dispatch_outbox_messages(), 1)
+        message = OutboxMessage.objects.get(order=self.order)
+        self.assertEqual(message.status, OutboxMessageStatus.PENDING)
+        self.assertGreater(message.next_attempt, now())
+        self.assertIn('Service unavailable', message.last_error)
+
+        # The message is not due until its retry delay has passed.
+        self.assertEqual(dispatch_outbox_messages(), 0)
+
+        OutboxMessage.objects.filter(id=message.id).update(attempts=outbox.MAX_ATTEMPTS - 1, next_attempt=now())
+        dispatch_outbox_messages()
+        self.assertEqual(OutboxMessage.objects.get(id=message.id).status, OutboxMessageStatus.FAILED)
+
+    def test_dispatch_batches(self):
+        """ Verify at most a batch of messages is delivered per call, oldest first. """
+        for __ in range(3):
+            OutboxMessage.objects.create(
+                order=self.order, handler='fulfill_order', next_attempt=now() - datetime.timedelta(minutes=1)
+            )
+        oldest = OutboxMessage.objects.create(
+            order=self.order, handler='fulfill_order', next_attempt=now() - datetime.timedelta(hours=1)
+        )
+
+        self.assertEqual(dispatch_outbox_messages(batch_size=2), 2)
+        self.assertEqual(OutboxMessage.objects.get(id=oldest.id).status, OutboxMessageStatus.DELIVERED)
+        self.assertEqual(OutboxMessage.objects.filter(status=OutboxMessageStatus.PENDING).count(), 2)
+
+
+@mock.patch('ecommerce.extensions.checkout.outbox.post_checkout_callback')
+class FulfillOrderHandlerTests(TestCase):
+    def setUp(self):
+        super(FulfillOrderHandlerTests, self).setUp()
+        self.order = create_order(user=UserFactory(), site=self.site)
+
+    def test_fulfill_order(self, mock_callback):
+        """ Verify the order is fulfilled with the email opt in preference captured at checkout. """
+        mock_callback.side_effect = lambda **kwargs: kwargs['order'].set_status(ORDER.COMPLETE)
+        fulfill_order(self.order, email_opt_in=True)
+        mock_callback.assert_called_once_with(sender=None, order=self.order, email_opt_in=True)
+
+    def test_fulfill_order_failure(self, mock_callback):
+        """ Verify a fulfillment failure recorded in the order status is raised, so that the message is retried. """
+        mock_callback.side_effect = lambda **kwargs: kwargs['order'].set_status(ORDER.FULFILLMENT_ERROR)
+        with self.assertRaises(FulfillmentError):
+            fulfill_order(self.order)
+
+    def test_fulfill_fulfilled_order(self, mock_callback):
+        """ Verify an order which was already fulfilled is not fulfilled again. """
+        self.order.set_status(ORDER.COMPLETE)
+        fulfill_order(self.order)
+        self.assertFalse(mock_callback.called)
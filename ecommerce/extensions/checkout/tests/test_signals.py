@@ -70,12 +70,10 @@ class SignalTests(ProgramTestMixin, CouponMixin, TestCase):
         """
         credit_provider_id = 'HGW'
         credit_provider_name = 'Hogwarts'
-        body = {'display_name': credit_provider_name}
+        body = [{'id': credit_provider_id, 'display_name': credit_provider_name}]
         httpretty.register_uri(
             httpretty.GET,
-            self.site.siteconfiguration.build_lms_url(
-                'api/credit/v1/providers/{credit_provider_id}/'.format(credit_provider_id=credit_provider_id)
-            ),
+            self.site.siteconfiguration.build_lms_url('api/credit/v1/providers/'),
             body=json.dumps(body),
             content_type='application/json'
         )
@@ -5,10 +5,11 @@ from babel.numbers import format_currency as default_format_currency
 from django.conf import settings
 from django.urls import reverse
 from django.utils.translation import get_language, to_locale
-from edx_rest_api_client.client import EdxRestApiClient
 from requests.exceptions import ConnectionError, Timeout
 from slumber.exceptions import SlumberHttpBaseException
 
+from ecommerce.core.service_clients import get_user_service_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,9 +24,8 @@ def get_credit_provider_details(access_token, credit_provider_id, site_configura
     Returns: dict
     """
     try:
-        return EdxRestApiClient(
-            site_configuration.build_lms_url('api/credit/v1/'),
-            oauth_access_token=access_token
+        return get_user_service_client(
+            'lms', site_configuration.build_lms_url('api/credit/v1/'), access_token
         ).providers(credit_provider_id).get()
     except (ConnectionError, SlumberHttpBaseException, Timeout):
         logger.exception('Failed to retrieve credit provider details for provider [%s].', credit_provider_id)
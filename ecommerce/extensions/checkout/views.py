@@ -18,6 +18,7 @@ from ecommerce.core.url_utils import (
     get_lms_explore_courses_url,
     get_lms_program_dashboard_url
 )
+from ecommerce.core.views import ReadReplicaMixin
 from ecommerce.enterprise.utils import has_enterprise_offer
 from ecommerce.extensions.checkout.exceptions import BasketNotFreeError
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
@@ -159,7 +160,7 @@ class CheckoutErrorView(TemplateView):
         return context
 
 
-class ReceiptResponseView(ThankYouView):
+class ReceiptResponseView(ReadReplicaMixin, ThankYouView):
     """ Handles behavior needed to display an order receipt. """
     template_name = 'edx/checkout/receipt.html'
 
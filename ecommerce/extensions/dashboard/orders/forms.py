@@ -1,7 +1,9 @@
+from django import forms
+from django.utils.translation import ugettext_lazy as _
 from oscar.apps.dashboard.orders.forms import OrderSearchForm as CoreOrderSearchForm
 
 from ecommerce.extensions.dashboard.forms import UserFormMixin
 
 
 class OrderSearchForm(UserFormMixin, CoreOrderSearchForm):
-    pass
+    course_id = forms.CharField(required=False, label=_('Course ID'))
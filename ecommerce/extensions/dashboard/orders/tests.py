@@ -1,6 +1,7 @@
 import os
 from unittest import skipIf
 
+import mock
 from django.contrib.messages import constants as MSG
 from django.test import override_settings
 from django.urls import reverse
@@ -11,12 +12,15 @@ from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.firefox.webdriver import WebDriver
 from selenium.webdriver.support.wait import WebDriverWait
 
-from ecommerce.extensions.dashboard.orders.views import queryset_orders_for_user
+from ecommerce.core.tests import toggle_switch
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.dashboard.orders.views import OrderListView, queryset_orders_for_user
 from ecommerce.extensions.dashboard.tests import DashboardViewTestMixin
 from ecommerce.extensions.fulfillment.signals import SHIPPING_EVENT_NAME
 from ecommerce.extensions.fulfillment.status import LINE, ORDER
+from ecommerce.extensions.order.constants import ORDER_SEARCH_INDEX_SWITCH
 from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
-from ecommerce.extensions.test.factories import create_order
+from ecommerce.extensions.test.factories import create_basket, create_order
 from ecommerce.tests.testcases import LiveServerTestCase, TestCase
 
 Order = get_model('order', 'Order')
@@ -174,6 +178,84 @@ class OrderListViewBrowserTests(OrderViewTestsMixin, RefundTestMixin, OrderViewB
         self.assertNotIn('address', response.content)
 
 
+class OrderListViewTests(OrderViewTestsMixin, TestCase):
+    path = reverse('dashboard:order-list')
+
+    def setUp(self):
+        super(OrderListViewTests, self).setUp()
+        self.client.login(username=self.user.username, password=self.password)
+
+        self.learner = self.create_user(username='learner', email='learner@example.com')
+        self.course = CourseFactory(id='course-v1:TestX+Test100+2018', partner=self.partner)
+        seat = self.course.create_or_update_seat('verified', True, 100)
+        basket = create_basket(owner=self.learner, empty=True)
+        basket.add_product(seat)
+        self.course_order = create_order(basket=basket, user=self.learner)
+        self.orders = [create_order(user=self.learner) for __ in range(2)]
+        self.other_order = create_order(user=self.create_user(first_name='Other'))
+
+    def test_filtering(self):
+        """ Verify orders are filtered by course, with or without the order search index. """
+        data = {'course_id': self.course.id}
+        self.assert_successful_response(self.client.get(self.path, data), [self.course_order])
+
+        toggle_switch(ORDER_SEARCH_INDEX_SWITCH, True)
+        self.assert_successful_response(self.client.get(self.path, data), [self.course_order])
+
+    def test_indexed_search(self):
+        """ Verify orders are searched through the order search index when it is enabled. """
+        toggle_switch(ORDER_SEARCH_INDEX_SWITCH, True)
+        learner_orders = list(reversed(self.orders)) + [self.course_order]
+
+        response = self.client.get('{path}?username=LEARN'.format(path=self.path))
+        self.assert_successful_response(response, learner_orders)
+        self.assertIsNone(response.context['next_page_key'])
+
+        response = self.client.get('{path}?email=learner@&status={status}'.format(
+            path=self.path, status=self.course_order.status
+        ))
+        self.assert_successful_response(response, learner_orders)
+
+        response = self.client.get('{path}?order_number={number}'.format(
+            path=self.path, number=self.other_order.number[:-1].lower()
+        ))
+        self.assert_successful_response(response, [self.other_order])
+
+        response = self.client.get('{path}?name=other'.format(path=self.path))
+        self.assert_successful_response(response, [self.other_order])
+
+        response = self.client.get('{path}?username=learner&name=other'.format(path=self.path))
+        self.assert_successful_response(response)
+        self.assertFalse(response.context['orders'])
+
+    def test_keyset_pagination(self):
+        """ Verify orders are paginated by ID when the order search index is enabled. """
+        toggle_switch(ORDER_SEARCH_INDEX_SWITCH, True)
+        path = '{path}?username=learner'.format(path=self.path)
+
+        with mock.patch.object(OrderListView, 'paginate_by', 2):
+            response = self.client.get(path)
+            self.assert_successful_response(response, list(reversed(self.orders)))
+            self.assertEqual(response.context['next_page_key'], self.orders[0].id)
+            self.assertContains(response, 'before={}'.format(self.orders[0].id))
+
+            response = self.client.get('{path}&before={key}'.format(path=path, key=self.orders[0].id))
+            self.assert_successful_response(response, [self.course_order])
+            self.assertIsNone(response.context['next_page_key'])
+
+    def test_sorted_search(self):
+        """ Verify sorted orders are paginated by page number when the order search index is enabled. """
+        toggle_switch(ORDER_SEARCH_INDEX_SWITCH, True)
+        learner_orders = sorted(self.orders + [self.course_order], key=lambda order: order.number)
+
+        response = self.client.get(self.path, {'username': 'learner', 'sort': 'number', 'dir': 'asc'})
+        self.assert_successful_response(response, learner_orders)
+        self.assertFalse(response.context['keyset_paginated'])
+
+        response = self.client.get(self.path, {'username': 'learner', 'sort': 'number', 'dir': 'desc'})
+        self.assert_successful_response(response, list(reversed(learner_orders)))
+
+
 class OrderDetailViewTests(DashboardViewTestMixin, OrderViewTestsMixin, RefundTestMixin, TestCase):
     def _request_refund(self, order):
         """POST to the view."""
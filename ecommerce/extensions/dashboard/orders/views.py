@@ -1,14 +1,23 @@
+import datetime
+
+import waffle
 from django.contrib import messages
+from django.db.models import Q
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.utils.translation import ugettext_lazy as _
 from oscar.apps.dashboard.orders.views import OrderDetailView as CoreOrderDetailView
 from oscar.apps.dashboard.orders.views import OrderListView as CoreOrderListView
 from oscar.core.loading import get_model
+from oscar.core.utils import datetime_combine
+from oscar.views import sort_queryset
 
-from ecommerce.extensions.dashboard.views import FilterFieldsMixin
+from ecommerce.core.views import ReadReplicaMixin
+from ecommerce.extensions.dashboard.views import FilterFieldsMixin, KeysetPaginationMixin
+from ecommerce.extensions.order.constants import ORDER_SEARCH_INDEX_SWITCH
 
 Order = get_model('order', 'Order')
+OrderSearchDocument = get_model('order', 'OrderSearchDocument')
 Partner = get_model('partner', 'Partner')
 Refund = get_model('refund', 'Refund')
 
@@ -26,9 +35,16 @@ def queryset_orders_for_user(user):  # pylint: disable=unused-argument
     return Order._default_manager.select_related('user').prefetch_related('lines')  # pylint: disable=protected-access
 
 
-class OrderListView(FilterFieldsMixin, CoreOrderListView):
+class OrderListView(ReadReplicaMixin, KeysetPaginationMixin, FilterFieldsMixin, CoreOrderListView):
     base_queryset = None
     form = None
+    # Filters which are not covered by the order search index, applied to the orders themselves.
+    unindexed_query_filters = {
+        'product_title': 'lines__title__istartswith',
+        'upc': 'lines__upc',
+        'voucher': 'discounts__voucher_code',
+        'payment_method': 'sources__source_type__code',
+    }
 
     def dispatch(self, request, *args, **kwargs):
         # NOTE: This method is overridden so that we can use our override of `queryset_orders_for_user`.
@@ -39,7 +55,23 @@ class OrderListView(FilterFieldsMixin, CoreOrderListView):
         # Bypass the CoreOrderListView.dispatch()
         return super(CoreOrderListView, self).dispatch(request, *args, **kwargs)  # pylint: disable=bad-super-call
 
+    def is_keyset_pagination_enabled(self):
+        return waffle.switch_is_active(ORDER_SEARCH_INDEX_SWITCH)
+
+    def get_filter_fields(self):
+        fields = super(OrderListView, self).get_filter_fields()
+        fields.update({
+            'course_id': {
+                'query_filter': 'lines__product__course_id',
+                'exposed': False,
+            }
+        })
+        return fields
+
     def get_queryset(self):
+        if self.is_keyset_pagination_enabled():
+            return self.search_index()
+
         queryset = super(OrderListView, self).get_queryset()
 
         # Note (CCB): We set self.form here because the super method does not always pass request.GET
@@ -55,6 +87,47 @@ class OrderListView(FilterFieldsMixin, CoreOrderListView):
 
         return queryset
 
+    def search_index(self):
+        """ Filter the orders through their search documents, rather than by joining their related tables. """
+        queryset = sort_queryset(self.base_queryset, self.request, ['number', 'total_incl_tax'])
+
+        self.form = self.form_class(self.request.GET)
+        if not self.form.is_valid():
+            return queryset
+
+        data = self.form.cleaned_data
+        criteria = {
+            'number': data['order_number'],
+            'username': data['username'],
+            'email': data['email'],
+            'status': data['status'],
+            'course_id': data['course_id'],
+            'sku': data['partner_sku'],
+        }
+        if data['date_from']:
+            criteria['date_from'] = datetime_combine(data['date_from'], datetime.time.min)
+        if data['date_to']:
+            criteria['date_to'] = datetime_combine(data['date_to'] + datetime.timedelta(days=1), datetime.time.min)
+
+        if any(criteria.values()):
+            queryset = queryset.filter(search_document__in=OrderSearchDocument.search(**criteria))
+
+        if data['name']:
+            # As in Oscar, a single word matches either name, and two words the first and last name.
+            parts = data['name'].split(None, 1)
+            first_name, last_name = parts if len(parts) == 2 else (parts[0], parts[0])
+            queryset = queryset.filter(
+                Q(user__first_name__istartswith=first_name) | Q(user__last_name__istartswith=last_name)
+            )
+
+        unindexed = False
+        for field, query_filter in self.unindexed_query_filters.items():
+            if data[field]:
+                queryset = queryset.filter(**{query_filter: data[field]})
+                unindexed = True
+
+        return queryset.distinct() if unindexed else queryset
+
 
 class OrderDetailView(CoreOrderDetailView):
     line_actions = ('change_line_statuses', 'create_shipping_event', 'create_payment_event', 'create_refund')
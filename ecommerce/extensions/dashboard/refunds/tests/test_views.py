@@ -1,5 +1,9 @@
+import mock
 from django.urls import reverse
 
+from ecommerce.core.tests import toggle_switch
+from ecommerce.extensions.dashboard.refunds.views import RefundListView
+from ecommerce.extensions.order.constants import ORDER_SEARCH_INDEX_SWITCH
 from ecommerce.extensions.refund.status import REFUND
 from ecommerce.extensions.refund.tests.factories import RefundFactory
 from ecommerce.tests.testcases import TestCase
@@ -103,6 +107,32 @@ class RefundListViewTests(RefundViewTestMixin, TestCase):
         response = self.client.get('{path}?sort=id&dir=desc'.format(path=self.path))
         self.assert_successful_response(response, list(reversed(refunds)))
 
+    def test_indexed_search(self):
+        """ The view should search users through the order search index, and paginate by ID, when enabled. """
+        toggle_switch(ORDER_SEARCH_INDEX_SWITCH, True)
+        new_user = self.create_user(username=self.username)
+        refunds = [RefundFactory(user=new_user) for __ in range(3)]
+        other_refund = RefundFactory()
+        self.client.login(username=self.user.username, password=self.password)
+
+        response = self.client.get('{path}?username={username}'.format(path=self.path, username='HACKER'))
+        self.assert_successful_response(response, list(reversed(refunds)))
+        self.assertIsNone(response.context['next_page_key'])
+
+        response = self.client.get('{path}?email={email}'.format(path=self.path, email=other_refund.user.email))
+        self.assert_successful_response(response, [other_refund])
+
+        with mock.patch.object(RefundListView, 'paginate_by', 2):
+            path = '{path}?username={username}'.format(path=self.path, username=self.username)
+            response = self.client.get(path)
+            self.assert_successful_response(response, [refunds[2], refunds[1]])
+            self.assertEqual(response.context['next_page_key'], refunds[1].id)
+            self.assertContains(response, 'before={}'.format(refunds[1].id))
+
+            response = self.client.get('{path}&before={key}'.format(path=path, key=refunds[1].id))
+            self.assert_successful_response(response, [refunds[0]])
+            self.assertIsNone(response.context['next_page_key'])
+
 
 class RefundDetailViewTests(RefundViewTestMixin, TestCase):
     def setUp(self):
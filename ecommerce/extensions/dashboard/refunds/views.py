@@ -1,14 +1,18 @@
+import waffle
 from django.views.generic import DetailView, ListView
 from oscar.core.loading import get_class, get_model
 from oscar.views import sort_queryset
 
-from ecommerce.extensions.dashboard.views import FilterFieldsMixin
+from ecommerce.core.views import ReadReplicaMixin
+from ecommerce.extensions.dashboard.views import FilterFieldsMixin, KeysetPaginationMixin
+from ecommerce.extensions.order.constants import ORDER_SEARCH_INDEX_SWITCH
 
+OrderSearchDocument = get_model('order', 'OrderSearchDocument')
 Refund = get_model('refund', 'Refund')
 RefundSearchForm = get_class('dashboard.refunds.forms', 'RefundSearchForm')
 
 
-class RefundListView(FilterFieldsMixin, ListView):
+class RefundListView(ReadReplicaMixin, KeysetPaginationMixin, FilterFieldsMixin, ListView):
     """ Dashboard view to list refunds. """
     model = Refund
     context_object_name = 'refunds'
@@ -27,6 +31,9 @@ class RefundListView(FilterFieldsMixin, ListView):
         })
         return fields
 
+    def is_keyset_pagination_enabled(self):
+        return waffle.switch_is_active(ORDER_SEARCH_INDEX_SWITCH)
+
     def get_queryset(self):
         queryset = super(RefundListView, self).get_queryset()
         queryset = queryset.prefetch_related('lines')
@@ -34,7 +41,16 @@ class RefundListView(FilterFieldsMixin, ListView):
 
         self.form = self.form_class(self.request.GET)
         if self.form.is_valid():
-            for field, value in self.form.cleaned_data.iteritems():
+            data = dict(self.form.cleaned_data)
+
+            if self.is_keyset_pagination_enabled():
+                # Users are searched through the search documents of the refunded orders.
+                username, email = data.pop('username'), data.pop('email')
+                if username or email:
+                    documents = OrderSearchDocument.search(username=username, email=email)
+                    queryset = queryset.filter(order__search_document__in=documents)
+
+            for field, value in data.iteritems():
                 if value:
                     # Check if the field has a custom query filter setup.
                     # If not, use a standard Django equals/match filter.
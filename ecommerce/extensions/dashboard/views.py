@@ -67,3 +67,47 @@ class FilterFieldsMixin(object):
         context['exposed_field_ids'] = ['id_{}'.format(field) for field in self.exposed_fields().keys()]
 
         return context
+
+
+class KeysetPaginationMixin(object):
+    """
+    Paginates object lists by primary key, in descending order, instead of by page number.
+
+    Page numbers require counting all of the matching rows, and skipping those of the previous pages. Each page
+    is instead requested with the ID of the last object of the previous one, which the index seeks to directly.
+    Lists sorted by another field, with the `sort` parameter, are still paginated by page number.
+    """
+    def is_keyset_pagination_enabled(self):
+        """ Returns True if lists which are not sorted by the user may be paginated by key. """
+        return False
+
+    def use_keyset_pagination(self):
+        """ Returns True if the list should be paginated by key. """
+        return self.is_keyset_pagination_enabled() and not self.request.GET.get('sort')
+
+    def get_page_key(self):
+        try:
+            return int(self.request.GET.get('before', ''))
+        except ValueError:
+            return None
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_keyset_pagination():
+            return super(KeysetPaginationMixin, self).paginate_queryset(queryset, page_size)
+
+        queryset = queryset.order_by('-pk')
+        page_key = self.get_page_key()
+        if page_key:
+            queryset = queryset.filter(pk__lt=page_key)
+
+        # One more object than the page size is read to find out whether there is a next page.
+        objects = list(queryset[:page_size + 1])
+        return None, None, objects[:page_size], len(objects) > page_size
+
+    def get_context_data(self, **kwargs):
+        context = super(KeysetPaginationMixin, self).get_context_data(**kwargs)
+        context['keyset_paginated'] = self.use_keyset_pagination()
+        if context['keyset_paginated']:
+            context['next_page_key'] = context['object_list'][-1].pk if context['is_paginated'] else None
+            context['is_first_page'] = self.get_page_key() is None
+        return context
@@ -10,8 +10,8 @@ import logging
 
 import requests
 from django.conf import settings
+from django.db import transaction
 from django.urls import reverse
-from edx_rest_api_client.client import EdxRestApiClient
 from oscar.core.loading import get_model
 from requests.exceptions import ConnectionError, Timeout  # pylint: disable=ungrouped-imports
 from rest_framework import status
@@ -20,6 +20,7 @@ from ecommerce.core.constants import (
     DONATIONS_FROM_CHECKOUT_TESTS_PRODUCT_TYPE_NAME,
     ENROLLMENT_CODE_PRODUCT_CLASS_NAME
 )
+from ecommerce.core.service_clients import get_service_client
 from ecommerce.core.url_utils import get_lms_enrollment_api_url, get_lms_entitlement_api_url
 from ecommerce.courses.models import Course
 from ecommerce.courses.utils import mode_for_product
@@ -35,9 +36,14 @@ from ecommerce.notifications.notifications import send_notification
 Benefit = get_model('offer', 'Benefit')
 Option = get_model('catalogue', 'Option')
 Product = get_model('catalogue', 'Product')
+ProductDescriptor = get_model('catalogue', 'ProductDescriptor')
 Range = get_model('offer', 'Range')
 Voucher = get_model('voucher', 'Voucher')
 StockRecord = get_model('partner', 'StockRecord')
+
+# Number of enrollment code vouchers created per transaction.
+ENROLLMENT_CODE_CHUNK_SIZE = 500
+
 logger = logging.getLogger(__name__)
 
 
@@ -506,14 +512,13 @@ class EnrollmentCodeFulfillmentModule(BaseFulfillmentModule):
         )
         logger.info(msg)
 
+        descriptors = ProductDescriptor.load([line.product for line in lines])
         for line in lines:
-            name = 'Enrollment Code Range for {}'.format(line.product.attr.course_key)
-            seat = Product.objects.filter(
-                attributes__name='course_key',
-                attribute_values__value_text=line.product.attr.course_key
-            ).get(
-                attributes__name='certificate_type',
-                attribute_values__value_text=line.product.attr.seat_type
+            descriptor = descriptors[line.product.id]
+            name = 'Enrollment Code Range for {}'.format(descriptor.course_key)
+            seat = Product.objects.get(
+                descriptor__course_key=descriptor.course_key,
+                descriptor__certificate_type=descriptor.seat_type
             )
             _range, created = Range.objects.get_or_create(name=name)
             if created:
@@ -524,31 +529,54 @@ class EnrollmentCodeFulfillmentModule(BaseFulfillmentModule):
             _range.catalog = coupon_catalog
             _range.save()
 
-            vouchers = create_vouchers(
-                name=unicode('Enrollment code voucher [{}]').format(line.product.title),
-                benefit_type=Benefit.PERCENTAGE,
-                benefit_value=100,
-                catalog=coupon_catalog,
-                coupon=seat,
-                end_datetime=settings.ENROLLMENT_CODE_EXIPRATION_DATE,
-                enterprise_customer=None,
-                enterprise_customer_catalog=None,
-                quantity=line.quantity,
-                start_datetime=datetime.datetime.now(),
-                voucher_type=Voucher.SINGLE_USE,
-                _range=_range
-            )
-
-            line_vouchers = OrderLineVouchers.objects.create(line=line)
-            for voucher in vouchers:
-                line_vouchers.vouchers.add(voucher)
-
+            self.create_line_vouchers(line, seat, _range, coupon_catalog)
             line.set_status(LINE.COMPLETE)
 
         self.send_email(order)
         logger.info("Finished fulfilling 'Enrollment code' product types for order [%s]", order.number)
         return order, lines
 
+    def create_line_vouchers(self, line, seat, _range, catalog):
+        """ Creates the enrollment code vouchers of a line, in chunks of ENROLLMENT_CODE_CHUNK_SIZE.
+
+        Each chunk is committed together with its association to the line, so that when fulfillment is
+        interrupted, a later attempt only creates the vouchers which are still missing.
+
+        Args:
+            line (Line): Order Line containing the Enrollment code product.
+            seat (Product): The seat the enrollment codes can be redeemed for.
+            _range (Range): The enrollment code range.
+            catalog (Catalog): The catalog of the enrollment code range.
+        """
+        line_vouchers = OrderLineVouchers.objects.filter(line=line).first()
+        if line_vouchers is None:
+            line_vouchers = OrderLineVouchers.objects.create(line=line)
+
+        remaining = line.quantity - line_vouchers.vouchers.count()
+        while remaining > 0:
+            with transaction.atomic():
+                vouchers = create_vouchers(
+                    name=unicode('Enrollment code voucher [{}]').format(line.product.title),
+                    benefit_type=Benefit.PERCENTAGE,
+                    benefit_value=100,
+                    catalog=catalog,
+                    coupon=seat,
+                    end_datetime=settings.ENROLLMENT_CODE_EXIPRATION_DATE,
+                    enterprise_customer=None,
+                    enterprise_customer_catalog=None,
+                    quantity=min(remaining, ENROLLMENT_CODE_CHUNK_SIZE),
+                    start_datetime=datetime.datetime.now(),
+                    voucher_type=Voucher.SINGLE_USE,
+                    _range=_range
+                )
+                line_vouchers.vouchers.add(*vouchers)
+
+            remaining -= len(vouchers)
+            logger.info(
+                'Created [%d] of [%d] enrollment codes for line [%d] of order [%s].',
+                line.quantity - remaining, line.quantity, line.id, line.order.number
+            )
+
     def revoke_line(self, line):
         """ Revokes the specified line.
 
@@ -561,7 +589,10 @@ class EnrollmentCodeFulfillmentModule(BaseFulfillmentModule):
         raise NotImplementedError("Revoke method not implemented!")
 
     def send_email(self, order):
-        """ Sends an email with enrollment code order information. """
+        """ Sends an email with enrollment code order information.
+
+        The codes themselves are not part of the email, which links to the enrollment code CSV of the order.
+        """
         # Note (multi-courses): Change from a course_name to a list of course names.
         product = order.lines.first().product
         course = Course.objects.get(id=product.attr.course_key)
@@ -649,9 +680,8 @@ class CourseEntitlementFulfillmentModule(BaseFulfillmentModule):
             try:
                 entitlement_option = Option.objects.get(code='course_entitlement')
 
-                entitlement_api_client = EdxRestApiClient(
-                    get_lms_entitlement_api_url(),
-                    jwt=order.site.siteconfiguration.access_token
+                entitlement_api_client = get_service_client(
+                    order.site.siteconfiguration, 'lms', get_lms_entitlement_api_url()
                 )
 
                 # POST to the Entitlement API.
@@ -692,9 +722,8 @@ class CourseEntitlementFulfillmentModule(BaseFulfillmentModule):
             entitlement_option = Option.objects.get(code='course_entitlement')
             course_entitlement_uuid = line.attributes.get(option=entitlement_option).value
 
-            entitlement_api_client = EdxRestApiClient(
-                get_lms_entitlement_api_url(),
-                jwt=line.order.site.siteconfiguration.access_token
+            entitlement_api_client = get_service_client(
+                line.order.site.siteconfiguration, 'lms', get_lms_entitlement_api_url()
             )
 
             # DELETE to the Entitlement API.
@@ -8,7 +8,11 @@ SHIPPING_EVENT_NAME = 'Shipped'
 
 
 @receiver(post_checkout, dispatch_uid='fulfillment.post_checkout_callback')
-def post_checkout_callback(sender, order=None, **kwargs):  # pylint: disable=unused-argument
+def post_checkout_callback(sender, order=None, outbox=False, **kwargs):  # pylint: disable=unused-argument
+    if outbox:
+        # The order is fulfilled by the checkout outbox.
+        return
+
     order_lines = order.lines.all()
     line_quantities = [line.quantity for line in order_lines]
 
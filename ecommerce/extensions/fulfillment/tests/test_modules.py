@@ -6,7 +6,9 @@ import uuid
 import ddt
 import httpretty
 import mock
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from oscar.core.loading import get_class, get_model
 from oscar.test import factories
 from requests.exceptions import ConnectionError, Timeout
@@ -526,11 +528,14 @@ class EnrollmentCodeFulfillmentModuleTests(DiscoveryTestMixin, TestCase):
         super(EnrollmentCodeFulfillmentModuleTests, self).setUp()
         course = CourseFactory(partner=self.partner)
         course.create_or_update_seat('verified', True, 50, create_enrollment_code=True)
+        self.order = self._create_enrollment_code_order(number=1, quantity=self.QUANTITY)
+
+    def _create_enrollment_code_order(self, number, quantity):
         enrollment_code = Product.objects.get(product_class__name=ENROLLMENT_CODE_PRODUCT_CLASS_NAME)
         user = factories.UserFactory()
         basket = factories.BasketFactory(owner=user, site=self.site)
-        basket.add_product(enrollment_code, self.QUANTITY)
-        self.order = create_order(number=1, basket=basket, user=user)
+        basket.add_product(enrollment_code, quantity)
+        return create_order(number=number, basket=basket, user=user)
 
     def test_supports_line(self):
         """Test that support_line returns True for Enrollment code lines."""
@@ -559,6 +564,39 @@ class EnrollmentCodeFulfillmentModuleTests(DiscoveryTestMixin, TestCase):
         self.assertEqual(OrderLineVouchers.objects.first().vouchers.count(), self.QUANTITY)
         self.assertIsNotNone(OrderLineVouchers.objects.first().vouchers.first().benefit.range.catalog)
 
+    @mock.patch('ecommerce.extensions.fulfillment.modules.ENROLLMENT_CODE_CHUNK_SIZE', 2)
+    def test_fulfill_product_resumes(self):
+        """Test that fulfillment creates vouchers in chunks, and only creates the missing ones when retried."""
+        lines = self.order.lines.all()
+
+        def create_first_chunk_only(**kwargs):
+            if mock_create.call_count > 1:
+                raise Exception('Worker lost')
+            return create_vouchers(**kwargs)
+
+        with mock.patch('ecommerce.extensions.fulfillment.modules.create_vouchers') as mock_create:
+            mock_create.side_effect = create_first_chunk_only
+            with self.assertRaises(Exception):
+                EnrollmentCodeFulfillmentModule().fulfill_product(self.order, lines)
+
+        line_vouchers = OrderLineVouchers.objects.get(line=lines[0])
+        self.assertEqual(line_vouchers.vouchers.count(), 2)
+
+        EnrollmentCodeFulfillmentModule().fulfill_product(self.order, lines)
+        self.assertEqual(OrderLineVouchers.objects.get().vouchers.count(), self.QUANTITY)
+
+    def test_fulfill_product_query_count(self):
+        """Test that the number of queries does not depend on the number of enrollment codes."""
+        EnrollmentCodeFulfillmentModule().fulfill_product(self.order, self.order.lines.all())
+
+        order = self._create_enrollment_code_order(number=2, quantity=1)
+        with CaptureQueriesContext(connection) as context:
+            EnrollmentCodeFulfillmentModule().fulfill_product(order, order.lines.all())
+
+        order = self._create_enrollment_code_order(number=3, quantity=self.QUANTITY * 10)
+        with self.assertNumQueries(len(context)):
+            EnrollmentCodeFulfillmentModule().fulfill_product(order, order.lines.all())
+
     def test_revoke_line(self):
         line = self.order.lines.first()
         with self.assertRaises(NotImplementedError):
@@ -713,8 +751,8 @@ class EntitlementFulfillmentModuleTests(FulfillmentTestMixin, TestCase):
         logger_name = 'ecommerce.extensions.fulfillment.modules'
 
         line = self.order.lines.first()
-        with mock.patch('edx_rest_api_client.client.EdxRestApiClient',
-                        side_effect=ConnectionError):
+        with mock.patch('ecommerce.extensions.fulfillment.modules.get_service_client') as mock_client:
+            mock_client.return_value.entitlements.post.side_effect = ConnectionError
             with LogCapture(logger_name) as l:
                 CourseEntitlementFulfillmentModule().fulfill_product(self.order, list(self.order.lines.all()))
                 self.assertEqual(LINE.FULFILLMENT_NETWORK_ERROR, self.order.lines.all()[0].status)
@@ -0,0 +1,3 @@
+class OfferUsageLimitExceeded(Exception):
+    """ Error for when recording the usage of an offer would exceed its usage cap. """
+    pass
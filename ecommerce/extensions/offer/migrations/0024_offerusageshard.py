@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-19 10:35
+from __future__ import unicode_literals
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offer', '0023_offerassignmentemailattempt'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferUsageShard',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('num_applications', models.PositiveIntegerField(default=0)),
+                ('num_orders', models.PositiveIntegerField(default=0)),
+                ('total_discount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage_shards', to='offer.ConditionalOffer')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='offerusageshard',
+            unique_together=set([('offer', 'shard')]),
+        ),
+    ]
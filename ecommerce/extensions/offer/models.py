@@ -1,11 +1,14 @@
 from __future__ import unicode_literals
 
 import logging
+import random
 import re
+from decimal import Decimal
 
 import waffle
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Q
 from django.utils.translation import ugettext_lazy as _
 from django_extensions.db.models import TimeStampedModel
 from edx_django_utils.cache import TieredCache
@@ -21,6 +24,7 @@ from slumber.exceptions import SlumberBaseException
 from threadlocals.threadlocals import get_current_request
 
 from ecommerce.core.utils import get_cache_key, log_message_and_raise_validation_error
+from ecommerce.discovery_mirror.utils import mirrored_catalog_contains
 from ecommerce.enterprise.constants import ENTERPRISE_OFFERS_FOR_COUPONS_SWITCH
 from ecommerce.extensions.offer.constants import (
     OFFER_ASSIGNED,
@@ -29,12 +33,15 @@ from ecommerce.extensions.offer.constants import (
     OFFER_ASSIGNMENT_REVOKED,
     OFFER_REDEEMED
 )
+from ecommerce.extensions.offer.exceptions import OfferUsageLimitExceeded
+from ecommerce.extensions.offer.signals import usage_recorded
 
 OFFER_PRIORITY_ENTERPRISE = 10
 OFFER_PRIORITY_VOUCHER = 20
 
 logger = logging.getLogger(__name__)
 
+ProductDescriptor = get_model('catalogue', 'ProductDescriptor')
 Voucher = get_model('voucher', 'Voucher')
 
 
@@ -61,12 +68,21 @@ class Benefit(AbstractBenefit):
 
     def _filter_for_paid_course_products(self, lines, applicable_range):
         """" Filters out products that aren't seats or entitlements or that don't have a paid certificate type. """
-        return [
-            line for line in lines
-            if (line.product.is_seat_product or line.product.is_course_entitlement_product) and
-            hasattr(line.product.attr, 'certificate_type') and
-            line.product.attr.certificate_type.lower() in applicable_range.course_seat_types
-        ]
+        descriptors = ProductDescriptor.load([line.product for line in lines])
+        paid_lines = []
+        for line in lines:
+            if not (line.product.is_seat_product or line.product.is_course_entitlement_product):
+                continue
+
+            descriptor = descriptors.get(line.product.id)
+            if descriptor:
+                certificate_type = descriptor.certificate_type
+            else:
+                certificate_type = getattr(line.product.attr, 'certificate_type', None)
+
+            if certificate_type and certificate_type.lower() in applicable_range.course_seat_types:
+                paid_lines.append(line)
+        return paid_lines
 
     def _identify_uncached_product_identifiers(self, lines, domain, partner_code, query):
         """
@@ -77,11 +93,13 @@ class Benefit(AbstractBenefit):
         uncached_course_uuids = []
 
         applicable_lines = lines
+        descriptors = ProductDescriptor.load([line.product for line in applicable_lines])
         for line in applicable_lines:
             if line.product.is_seat_product:
-                product_id = line.product.course.id
+                product_id = line.product.course_id
             else:  # All lines passed to this method should either have a seat or an entitlement product
-                product_id = line.product.attr.UUID
+                descriptor = descriptors.get(line.product.id)
+                product_id = descriptor.uuid if descriptor else line.product.attr.UUID
 
             cache_key = get_cache_key(
                 site_domain=domain,
@@ -120,19 +138,27 @@ class Benefit(AbstractBenefit):
             )
 
             if course_run_ids or course_uuids:
-                # Hit Discovery Service to determine if remaining courses and runs are in the range.
-                try:
-                    response = site.siteconfiguration.discovery_api_client.catalog.query_contains.get(
-                        course_run_ids=','.join([metadata['id'] for metadata in course_run_ids]),
-                        course_uuids=','.join([metadata['id'] for metadata in course_uuids]),
-                        query=query,
-                        partner=partner_code
-                    )
-                except Exception as err:  # pylint: disable=bare-except
-                    logger.warning(
-                        '%s raised while attempting to contact Discovery Service for offer catalog_range data.', err
-                    )
-                    raise Exception('Failed to contact Discovery Service to retrieve offer catalog_range data.')
+                response = mirrored_catalog_contains(
+                    site.siteconfiguration.partner,
+                    course_run_ids=[metadata['id'] for metadata in course_run_ids],
+                    course_uuids=[metadata['id'] for metadata in course_uuids],
+                    query=query
+                )
+                if response is None:
+                    # Hit Discovery Service to determine if remaining courses and runs are in the range.
+                    try:
+                        response = site.siteconfiguration.discovery_api_client.catalog.query_contains.get(
+                            course_run_ids=','.join([metadata['id'] for metadata in course_run_ids]),
+                            course_uuids=','.join([metadata['id'] for metadata in course_uuids]),
+                            query=query,
+                            partner=partner_code
+                        )
+                    except Exception as err:  # pylint: disable=bare-except
+                        logger.warning(
+                            '%s raised while attempting to contact Discovery Service for offer catalog_range data.',
+                            err
+                        )
+                        raise Exception('Failed to contact Discovery Service to retrieve offer catalog_range data.')
 
                 # Cache range-state individually for each course or run identifier and remove lines not in the range.
                 for metadata in course_run_ids + course_uuids:
@@ -218,6 +244,44 @@ class ConditionalOffer(AbstractConditionalOffer):
                     'Failed to create ConditionalOffer. max_global_applications field must be a positive number.'
                 )
 
+    def record_usage(self, discount):
+        """
+        Record a usage of this offer.
+
+        The counters are incremented by a single conditional UPDATE, rather than saved from this instance,
+        so that concurrent redemptions are all counted and the usage cap cannot be exceeded. When
+        OFFER_USAGE_COUNTER_SHARDS is set, the usage of uncapped offers is recorded on counter shards
+        instead, so that concurrent redemptions do not wait on the offer's row.
+
+        Raises:
+            OfferUsageLimitExceeded: If the usage cap of the offer leaves no room for the applications.
+        """
+        frequency = discount['freq']
+        amount = discount['discount']
+
+        if self.max_global_applications is None and settings.OFFER_USAGE_COUNTER_SHARDS:
+            OfferUsageShard.record_usage(self, frequency, amount)
+            return
+
+        offers = ConditionalOffer.objects.filter(
+            Q(max_global_applications__isnull=True) |
+            Q(num_applications__lte=F('max_global_applications') - frequency),
+            pk=self.pk
+        )
+        updated = offers.update(
+            num_applications=F('num_applications') + frequency,
+            total_discount=F('total_discount') + amount,
+            num_orders=F('num_orders') + 1
+        )
+        if not updated:
+            raise OfferUsageLimitExceeded(
+                'Offer [{}] has no room left for [{}] applications.'.format(self.id, frequency)
+            )
+
+        self.refresh_from_db(fields=['num_applications', 'total_discount', 'num_orders'])
+        usage_recorded.send(sender=ConditionalOffer, instance=self)
+    record_usage.alters_data = True
+
     def is_email_valid(self, email):
         """
         Check if the email is within the email_domains if email_domains are set,
@@ -283,6 +347,46 @@ class ConditionalOffer(AbstractConditionalOffer):
         return super(ConditionalOffer, self).is_condition_satisfied(basket)  # pylint: disable=bad-super-call
 
 
+class OfferUsageShard(models.Model):
+    """
+    Usage of an uncapped offer which has not yet been folded into the offer's counters.
+
+    Each offer has up to OFFER_USAGE_COUNTER_SHARDS shards. Redemptions increment a random shard,
+    and the shards are periodically folded into the offer by fold_offer_usage_shards.
+    """
+    offer = models.ForeignKey('offer.ConditionalOffer', related_name='usage_shards', on_delete=models.CASCADE)
+    shard = models.PositiveSmallIntegerField()
+    num_applications = models.PositiveIntegerField(default=0)
+    num_orders = models.PositiveIntegerField(default=0)
+    total_discount = models.DecimalField(decimal_places=2, max_digits=12, default=Decimal('0.00'))
+
+    class Meta(object):
+        unique_together = ('offer', 'shard',)
+
+    @classmethod
+    def record_usage(cls, offer, frequency, amount):
+        """ Record a usage of the offer on one of its shards. """
+        shard = random.randrange(settings.OFFER_USAGE_COUNTER_SHARDS)
+        shards = cls.objects.filter(offer=offer, shard=shard)
+        increments = {
+            'num_applications': F('num_applications') + frequency,
+            'num_orders': F('num_orders') + 1,
+            'total_discount': F('total_discount') + amount,
+        }
+
+        if shards.update(**increments):
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    offer=offer, shard=shard, num_applications=frequency, num_orders=1, total_discount=amount
+                )
+        except IntegrityError:
+            # The shard was created by a concurrent redemption.
+            shards.update(**increments)
+
+
 def validate_credit_seat_type(course_seat_types):
     if not isinstance(course_seat_types, basestring):
         log_message_and_raise_validation_error('Failed to create Range. Credit seat types must be of type string.')
@@ -367,6 +471,12 @@ class Range(AbstractRange):
         catalog service for the catalog id contained in field "course_catalog".
         """
         request = get_current_request()
+        mirrored_response = mirrored_catalog_contains(
+            request.site.siteconfiguration.partner, course_run_ids=[product.course_id], catalog_id=self.course_catalog
+        )
+        if mirrored_response is not None:
+            return {'courses': mirrored_response}
+
         partner_code = request.site.siteconfiguration.partner.short_code
         cache_key = get_cache_key(
             site_domain=request.site.domain,
@@ -0,0 +1,4 @@
+from django.dispatch import Signal
+
+# Sent when the usage counters of an offer or voucher are updated in the database, without saving the instance.
+usage_recorded = Signal(providing_args=['instance'])
@@ -0,0 +1,12 @@
+""" Celery tasks which maintain offer usage counters. """
+from __future__ import unicode_literals
+
+from celery import shared_task
+
+from ecommerce.extensions.offer.utils import fold_offer_usage_shards
+
+
+@shared_task(ignore_result=True)
+def fold_offer_usage_counters():
+    """ Fold the usage recorded on offer counter shards into the counters of their offers. """
+    fold_offer_usage_shards()
@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+from decimal import Decimal
 from uuid import uuid4
 
 import ddt
 import httpretty
 from django.core.exceptions import ValidationError
+from django.test import override_settings
 from edx_django_utils.cache import TieredCache
 from mock import patch
 from oscar.core.loading import get_model
@@ -17,10 +19,13 @@ from waffle.models import Switch
 from ecommerce.coupons.tests.mixins import CouponMixin, DiscoveryMockMixin
 from ecommerce.enterprise.constants import ENTERPRISE_OFFERS_FOR_COUPONS_SWITCH
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
+from ecommerce.extensions.offer.exceptions import OfferUsageLimitExceeded
+from ecommerce.extensions.offer.utils import fold_offer_usage_shards
 from ecommerce.tests.testcases import TestCase
 
 Catalog = get_model('catalogue', 'Catalog')
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
+OfferUsageShard = get_model('offer', 'OfferUsageShard')
 Range = get_model('offer', 'Range')
 
 
@@ -544,6 +549,46 @@ class ConditionalOfferTests(DiscoveryTestMixin, DiscoveryMockMixin, TestCase):
         offer = factories.ConditionalOfferFactory()
         self.assertEqual(offer.partner, None)
 
+    def test_record_usage(self):
+        """ Verify usage is added to the counters stored in the database, rather than to the instance's. """
+        stale_offer = ConditionalOffer.objects.get(id=self.offer.id)
+        self.offer.record_usage({'freq': 2, 'discount': Decimal('10.00')})
+        stale_offer.record_usage({'freq': 1, 'discount': Decimal('5.00')})
+
+        offer = ConditionalOffer.objects.get(id=self.offer.id)
+        self.assertEqual((offer.num_applications, offer.num_orders, offer.total_discount), (3, 2, Decimal('15.00')))
+        self.assertEqual(stale_offer.num_applications, 3)
+
+    def test_record_usage_cap(self):
+        """ Verify usage which would exceed the usage cap is refused, even from an instance unaware of other usage. """
+        self.offer.max_global_applications = 2
+        self.offer.save()
+        stale_offer = ConditionalOffer.objects.get(id=self.offer.id)
+        self.offer.record_usage({'freq': 1, 'discount': Decimal('10.00')})
+
+        with self.assertRaises(OfferUsageLimitExceeded):
+            stale_offer.record_usage({'freq': 2, 'discount': Decimal('20.00')})
+
+        stale_offer.record_usage({'freq': 1, 'discount': Decimal('10.00')})
+        with self.assertRaises(OfferUsageLimitExceeded):
+            self.offer.record_usage({'freq': 1, 'discount': Decimal('10.00')})
+        self.assertEqual(ConditionalOffer.objects.get(id=self.offer.id).num_applications, 2)
+
+    @override_settings(OFFER_USAGE_COUNTER_SHARDS=4)
+    def test_record_usage_on_shards(self):
+        """ Verify usage of uncapped offers is recorded on shards, and folded into the offer's counters. """
+        for __ in range(10):
+            self.offer.record_usage({'freq': 1, 'discount': Decimal('1.50')})
+
+        self.assertEqual(ConditionalOffer.objects.get(id=self.offer.id).num_applications, 0)
+        self.assertLessEqual(OfferUsageShard.objects.filter(offer=self.offer).count(), 4)
+
+        self.assertGreater(fold_offer_usage_shards(), 0)
+        offer = ConditionalOffer.objects.get(id=self.offer.id)
+        self.assertEqual((offer.num_applications, offer.num_orders, offer.total_discount), (10, 10, Decimal('15.00')))
+        self.assertFalse(OfferUsageShard.objects.filter(num_orders__gt=0).exists())
+        self.assertEqual(fold_offer_usage_shards(), 0)
+
 
 class BenefitTests(DiscoveryTestMixin, DiscoveryMockMixin, TestCase):
     def setUp(self):
@@ -6,6 +6,8 @@ import logging
 from decimal import Decimal
 
 from django.conf import settings
+from django.db import transaction
+from django.db.models import F
 from django.shortcuts import render
 from django.utils.translation import ugettext_lazy as _
 from ecommerce_worker.sailthru.v1.tasks import send_offer_assignment_email
@@ -15,6 +17,8 @@ from ecommerce.extensions.checkout.utils import add_currency
 
 logger = logging.getLogger(__name__)
 Benefit = get_model('offer', 'Benefit')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+OfferUsageShard = get_model('offer', 'OfferUsageShard')
 
 
 def _remove_exponent_and_trailing_zeros(decimal):
@@ -157,3 +161,30 @@ def send_assigned_offer_email(
             '[Offer Assignment] send_offer_assignment_email celery task raised: %r', exc)
         return False
     return True
+
+
+def fold_offer_usage_shards():
+    """
+    Fold the usage recorded on offer counter shards into the counters of their offers.
+
+    Each shard is locked while it is folded, so that redemptions recorded meanwhile are kept for the next fold.
+
+    Returns:
+        int: Number of shards folded.
+    """
+    folded = 0
+    shard_ids = list(OfferUsageShard.objects.filter(num_orders__gt=0).values_list('id', flat=True))
+    for shard_id in shard_ids:
+        with transaction.atomic():
+            shard = OfferUsageShard.objects.select_for_update().get(id=shard_id)
+            ConditionalOffer.objects.filter(id=shard.offer_id).update(
+                num_applications=F('num_applications') + shard.num_applications,
+                num_orders=F('num_orders') + shard.num_orders,
+                total_discount=F('total_discount') + shard.total_discount
+            )
+            OfferUsageShard.objects.filter(id=shard_id).update(
+                num_applications=0, num_orders=0, total_discount=Decimal('0.00')
+            )
+        folded += 1
+
+    return folded
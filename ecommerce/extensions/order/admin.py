@@ -2,9 +2,12 @@ import waffle
 from django.contrib import messages
 from django.utils.translation import ugettext_lazy as _
 from oscar.apps.order.admin import *  # noqa pylint: disable=wildcard-import,unused-wildcard-import
+from oscar.core.loading import get_model
 
 from ecommerce.extensions.order.constants import ORDER_LIST_VIEW_SWITCH
 
+OutboxMessage = get_model('order', 'OutboxMessage')
+
 admin.site.unregister((Order, Line, LinePrice, PaymentEvent, OrderDiscount,))
 
 
@@ -57,3 +60,11 @@ class PaymentEventAdminExtended(PaymentEventAdmin):
 @admin.register(OrderDiscount)
 class OrderDiscountAdminExtended(OrderDiscountAdmin):
     show_full_result_count = False
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('order', 'handler', 'status', 'attempts', 'next_attempt', 'modified',)
+    list_filter = ('status', 'handler',)
+    raw_id_fields = ('order',)
+    show_full_result_count = False
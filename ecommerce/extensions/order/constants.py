@@ -3,6 +3,21 @@ class PaymentEventTypeName(object):
     REFUNDED = 'Refunded'
 
 
+class OutboxMessageStatus(object):
+    PENDING = 'Pending'
+    DELIVERED = 'Delivered'
+    FAILED = 'Failed'
+
+
+class OrderSearchTokenKind(object):
+    COURSE_KEY = 'course_key'
+    SKU = 'sku'
+
+
 # switch is used to disable/enable ORDER table list/change view in django admin
 ORDER_LIST_VIEW_SWITCH = 'enable_order_list_view'
 DISABLE_REPEAT_ORDER_CHECK_SWITCH_NAME = 'disable_repeat_order_check'
+# switch is used to deliver post-checkout side effects through the checkout outbox
+CHECKOUT_OUTBOX_SWITCH = 'enable_checkout_outbox'
+# switch is used to search orders and refunds in the dashboard through the order search index
+ORDER_SEARCH_INDEX_SWITCH = 'enable_order_search_index'
@@ -0,0 +1,78 @@
+"""
+Management command that rebuilds the order search index.
+
+Search documents are refreshed as orders, their lines and their users are saved. This command creates the
+documents of orders placed before the index existed, and repairs those of orders, or users, changed outside
+of the ORM. Orders are indexed in batches, ordered by ID.
+"""
+from __future__ import unicode_literals
+
+import time
+
+from django.core.management import BaseCommand, CommandError
+from oscar.core.loading import get_model
+
+Order = get_model('order', 'Order')
+OrderSearchDocument = get_model('order', 'OrderSearchDocument')
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search documents of orders.'
+
+    def add_arguments(self, parser):
+        # Batched indexing prevents the entire table from locking up as the command executes.
+        parser.add_argument('-b', '--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            default=1000,
+                            type=int,
+                            help='Size of each batch of orders to be indexed.')
+        # Sleeping between each batch gives MySQL time to process other connections.
+        parser.add_argument('-s', '--sleep-seconds',
+                            action='store',
+                            dest='sleep_seconds',
+                            default=3,
+                            type=int,
+                            help='Seconds to sleep between each batch.')
+        # Orders are indexed in order of ID, so an interrupted run can be resumed from the last ID it reported.
+        parser.add_argument('--start-id',
+                            action='store',
+                            dest='start_id',
+                            default=0,
+                            type=int,
+                            help='Only index orders with an ID greater than this one.')
+        parser.add_argument('--missing-only',
+                            action='store_true',
+                            dest='missing_only',
+                            default=False,
+                            help='Only index orders which do not have a search document.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('The batch size must be greater than zero.')
+
+        queryset = Order.objects.filter(id__gt=options['start_id'])
+        if options['missing_only']:
+            queryset = queryset.filter(search_document__isnull=True)
+
+        indexed = 0
+        last_id = 0
+        while True:
+            orders = list(
+                queryset.filter(id__gt=last_id).order_by('id').select_related('user').prefetch_related(
+                    'lines__product'
+                )[:batch_size]
+            )
+            if not orders:
+                break
+            last_id = orders[-1].id
+
+            indexed += OrderSearchDocument.rebuild(orders)
+            self.stderr.write('Indexed orders through ID [{}].'.format(last_id))
+            time.sleep(options['sleep_seconds'])
+
+        if indexed:
+            self.stderr.write('All [{}] orders indexed.'.format(indexed))
+        else:
+            self.stderr.write('No orders to index.')
@@ -0,0 +1,55 @@
+from __future__ import unicode_literals
+
+from StringIO import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.test.factories import create_order
+from ecommerce.tests.testcases import TestCase
+
+OrderSearchDocument = get_model('order', 'OrderSearchDocument')
+
+
+class RebuildOrderSearchIndexTests(TestCase):
+    def setUp(self):
+        super(RebuildOrderSearchIndexTests, self).setUp()
+        self.orders = [create_order() for __ in range(3)]
+        OrderSearchDocument.objects.all().delete()
+
+    def call_command(self, **kwargs):
+        kwargs.setdefault('sleep_seconds', 0)
+        err_out = StringIO()
+        call_command('rebuild_order_search_index', stderr=err_out, **kwargs)
+        return err_out.getvalue()
+
+    def test_invalid_batch_size(self):
+        """ Verify the command refuses a batch size smaller than one. """
+        with self.assertRaises(CommandError):
+            self.call_command(batch_size=0)
+
+    def test_rebuild(self):
+        """ Verify the command indexes all orders, in batches. """
+        output = self.call_command(batch_size=2)
+        self.assertIn('Indexed orders through ID [{}].'.format(self.orders[1].id), output)
+        self.assertIn('All [3] orders indexed.', output)
+        self.assertEqual(
+            set(OrderSearchDocument.objects.values_list('order_id', flat=True)),
+            {order.id for order in self.orders}
+        )
+
+    def test_start_id(self):
+        """ Verify the command only indexes orders after the given ID. """
+        self.call_command(start_id=self.orders[0].id)
+        self.assertFalse(OrderSearchDocument.objects.filter(order=self.orders[0]).exists())
+        self.assertEqual(OrderSearchDocument.objects.count(), 2)
+
+    def test_missing_only(self):
+        """ Verify the command can skip orders which are already indexed. """
+        OrderSearchDocument.refresh(self.orders[0])
+        output = self.call_command(missing_only=True)
+        self.assertIn('All [2] orders indexed.', output)
+
+        output = self.call_command(missing_only=True)
+        self.assertIn('No orders to index.', output)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-19 10:02
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+import django.utils.timezone
+import django_extensions.db.fields
+import jsonfield.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0017_order_partner'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('handler', models.CharField(max_length=64)),
+                ('payload', jsonfield.fields.JSONField(default={})),
+                ('status', models.CharField(choices=[(b'Pending', b'Pending'), (b'Delivered', b'Delivered'), (b'Failed', b'Failed')], default=b'Pending', max_length=16)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('next_attempt', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbox_messages', to='order.Order')),
+            ],
+        ),
+        migrations.AlterIndexTogether(
+            name='outboxmessage',
+            index_together=set([('status', 'next_attempt')]),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-19 14:15
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0019_create_checkout_outbox_switch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderSearchDocument',
+            fields=[
+                ('order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='order.Order')),
+                ('number', models.CharField(db_index=True, max_length=128)),
+                ('username', models.CharField(blank=True, db_index=True, max_length=150)),
+                ('email', models.CharField(blank=True, db_index=True, max_length=254)),
+                ('status', models.CharField(blank=True, db_index=True, max_length=100)),
+                ('date_placed', models.DateTimeField(db_index=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='OrderSearchToken',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[(b'course_key', b'course_key'), (b'sku', b'sku')], max_length=16)),
+                ('value', models.CharField(max_length=255)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens', to='order.OrderSearchDocument')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='ordersearchtoken',
+            unique_together=set([('kind', 'value', 'document')]),
+        ),
+    ]
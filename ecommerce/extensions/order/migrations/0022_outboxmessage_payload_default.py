@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-19 16:14
+from __future__ import unicode_literals
+
+import jsonfield.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0021_create_order_search_index_switch'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='outboxmessage',
+            name='payload',
+            field=jsonfield.fields.JSONField(default=dict),
+        ),
+    ]
@@ -1,8 +1,17 @@
-from django.db import models
+import six
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import models, transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
+from django_extensions.db.models import TimeStampedModel
+from jsonfield import JSONField
 from oscar.apps.order.abstract_models import AbstractOrder, AbstractPaymentEvent
 
 from ecommerce.extensions.fulfillment.status import ORDER
+from ecommerce.extensions.order.constants import OrderSearchTokenKind, OutboxMessageStatus
 
 
 class Order(AbstractOrder):
@@ -23,6 +32,226 @@ class PaymentEvent(AbstractPaymentEvent):
     processor_name = models.CharField(_('Payment Processor'), max_length=32, blank=True, null=True)
 
 
+class OutboxMessage(TimeStampedModel):
+    """ A post-checkout side effect of an order, recorded in the order placement transaction
+    and delivered afterwards by the checkout outbox dispatcher. """
+    STATUS_CHOICES = (
+        (OutboxMessageStatus.PENDING, OutboxMessageStatus.PENDING),
+        (OutboxMessageStatus.DELIVERED, OutboxMessageStatus.DELIVERED),
+        (OutboxMessageStatus.FAILED, OutboxMessageStatus.FAILED),
+    )
+
+    order = models.ForeignKey('order.Order', related_name='outbox_messages', on_delete=models.CASCADE)
+    handler = models.CharField(max_length=64)
+    payload = JSONField(default=dict)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=OutboxMessageStatus.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt = models.DateTimeField(default=now)
+    last_error = models.TextField(blank=True)
+
+    class Meta(object):
+        index_together = ('status', 'next_attempt')
+
+    def __unicode__(self):
+        return '{handler} for order [{number}]'.format(handler=self.handler, number=self.order.number)
+
+
+class OrderSearchDocument(models.Model):
+    """
+    Denormalized, indexed copy of the fields by which the dashboard searches orders.
+
+    Text fields are stored in lower case, so that case-insensitive prefix searches can use their indexes.
+    Documents are refreshed whenever an order, or one of its lines, is saved, and whenever the user of the order
+    is saved with a new username or email. Changes made with QuerySet.update() are not picked up.
+    """
+    order = models.OneToOneField(
+        'order.Order', primary_key=True, related_name='search_document', on_delete=models.CASCADE
+    )
+    number = models.CharField(max_length=128, db_index=True)
+    username = models.CharField(max_length=150, db_index=True, blank=True)
+    email = models.CharField(max_length=254, db_index=True, blank=True)
+    status = models.CharField(max_length=100, db_index=True, blank=True)
+    date_placed = models.DateTimeField(db_index=True)
+
+    def __unicode__(self):
+        return 'Search document for order [{number}]'.format(number=self.number)
+
+    @classmethod
+    def normalize(cls, value):
+        return six.text_type(value or '').strip().lower()
+
+    @classmethod
+    def get_values(cls, order, user=None):
+        """
+        Returns the values of the fields of the search document of an order.
+
+        Unless it is given, the user of the order is read without caching it on the order, which other receivers
+        of its signals may expect to load afresh.
+        """
+        if user is None and order.user_id:
+            user = get_user_model().objects.filter(id=order.user_id).only('username', 'email').first()
+
+        return {
+            'number': cls.normalize(order.number),
+            'username': cls.normalize(user.username if user else ''),
+            'email': cls.normalize(user.email if user else order.guest_email),
+            'status': order.status or '',
+            'date_placed': order.date_placed or now(),
+        }
+
+    @classmethod
+    def get_tokens(cls, lines):
+        """ Returns the set of (kind, value) tokens of the given order lines. """
+        tokens = set()
+        for line in lines:
+            if line.partner_sku:
+                tokens.add((OrderSearchTokenKind.SKU, cls.normalize(line.partner_sku)))
+            if line.product and line.product.course_id:
+                tokens.add((OrderSearchTokenKind.COURSE_KEY, cls.normalize(line.product.course_id)))
+        return tokens
+
+    @classmethod
+    def refresh(cls, order):
+        """
+        Save the search document of an order.
+
+        The tokens of the lines of the order are indexed when its document is created. Afterwards, they are
+        indexed as each line is saved.
+
+        Returns:
+            OrderSearchDocument
+        """
+        document, created = cls.objects.update_or_create(order=order, defaults=cls.get_values(order))
+        if created:
+            document.add_tokens(order.lines.select_related('product'))
+        return document
+
+    @classmethod
+    def refresh_user(cls, user):
+        """
+        Update the username and email of the search documents of the orders of a user.
+
+        Returns:
+            int: Number of documents updated.
+        """
+        username, email = cls.normalize(user.username), cls.normalize(user.email)
+        documents = cls.objects.filter(order__user_id=user.id).exclude(username=username, email=email)
+        return documents.update(username=username, email=email)
+
+    @classmethod
+    def refresh_line(cls, line):
+        """ Index the tokens of an order line, creating the document of its order if necessary. """
+        document = cls.objects.filter(order_id=line.order_id).first()
+        if document:
+            document.add_tokens([line])
+        else:
+            cls.refresh(line.order)
+
+    @classmethod
+    def rebuild(cls, orders):
+        """
+        Replace the search documents of the given orders, in bulk.
+
+        The users of the orders, and the products of their lines, should be prefetched.
+
+        Returns:
+            int: Number of documents created.
+        """
+        orders = list(orders)
+        with transaction.atomic():
+            cls.objects.filter(order__in=orders).delete()
+            cls.objects.bulk_create([cls(order=order, **cls.get_values(order, order.user)) for order in orders])
+            OrderSearchToken.objects.bulk_create([
+                OrderSearchToken(document_id=order.id, kind=kind, value=value)
+                for order in orders for kind, value in cls.get_tokens(order.lines.all())
+            ])
+        return len(orders)
+
+    def add_tokens(self, lines):
+        """ Index the course keys and SKUs of the given lines, skipping those already indexed. """
+        tokens = self.get_tokens(lines)
+        if tokens:
+            tokens -= set(self.tokens.values_list('kind', 'value'))
+            OrderSearchToken.objects.bulk_create(
+                [OrderSearchToken(document=self, kind=kind, value=value) for kind, value in tokens]
+            )
+
+    @classmethod
+    def search(cls, number=None, username=None, email=None, status=None, course_id=None, sku=None,
+               date_from=None, date_to=None):
+        """
+        Returns the documents matching all of the given criteria.
+
+        The number, username and email are matched by prefix, and the other criteria exactly. Text criteria
+        are case-insensitive.
+        """
+        queryset = cls.objects.all()
+
+        for field, value in (('number', number), ('username', username), ('email', email)):
+            if value:
+                queryset = queryset.filter(**{field + '__startswith': cls.normalize(value)})
+
+        if status:
+            if isinstance(status, (list, tuple)):
+                queryset = queryset.filter(status__in=status)
+            else:
+                queryset = queryset.filter(status=status)
+
+        for kind, value in ((OrderSearchTokenKind.COURSE_KEY, course_id), (OrderSearchTokenKind.SKU, sku)):
+            if value:
+                queryset = queryset.filter(
+                    order_id__in=OrderSearchToken.objects.filter(
+                        kind=kind, value=cls.normalize(value)
+                    ).values('document_id')
+                )
+
+        if date_from:
+            queryset = queryset.filter(date_placed__gte=date_from)
+        if date_to:
+            queryset = queryset.filter(date_placed__lt=date_to)
+
+        return queryset
+
+
+class OrderSearchToken(models.Model):
+    """ A course key or SKU of the lines of an order, indexed for the search of its orders. """
+    KIND_CHOICES = (
+        (OrderSearchTokenKind.COURSE_KEY, OrderSearchTokenKind.COURSE_KEY),
+        (OrderSearchTokenKind.SKU, OrderSearchTokenKind.SKU),
+    )
+
+    document = models.ForeignKey(OrderSearchDocument, related_name='tokens', on_delete=models.CASCADE)
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES)
+    value = models.CharField(max_length=255)
+
+    class Meta(object):
+        unique_together = ('kind', 'value', 'document')
+
+    def __unicode__(self):
+        return '{kind} [{value}]'.format(kind=self.kind, value=self.value)
+
+
+@receiver(post_save, sender='order.Order')
+def refresh_order_search_document(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    OrderSearchDocument.refresh(instance)
+
+
+@receiver(post_save, sender='order.Line')
+def refresh_order_search_tokens(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    OrderSearchDocument.refresh_line(instance)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def refresh_user_order_search_documents(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    # New users have no orders. The documents are left alone unless the username or email changed, which also
+    # keeps the data migrations saving users from reading them before their table exists.
+    # Changes made with QuerySet.update() do not send post_save, and leave the documents stale. Code changing
+    # usernames or emails that way must call OrderSearchDocument.refresh_user() for each user, or the documents
+    # must be rebuilt with the rebuild_order_search_index command.
+    if not created and instance.has_changed('username', 'email'):
+        OrderSearchDocument.refresh_user(instance)
+
+
 # If two models with the same name are declared within an app, Django will only use the first one.
 # noinspection PyUnresolvedReferences
 from oscar.apps.order.models import *  # noqa isort:skip pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-position,wrong-import-order,ungrouped-imports
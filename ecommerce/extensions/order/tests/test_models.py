@@ -1,11 +1,18 @@
 import ddt
+from django.contrib.auth import get_user_model
+from oscar.core.loading import get_model
 from oscar.test import factories
 
 from ecommerce.core.constants import COUPON_PRODUCT_CLASS_NAME
+from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.fulfillment.status import ORDER
+from ecommerce.extensions.order.constants import OrderSearchTokenKind
 from ecommerce.extensions.test.factories import create_basket, create_order
 from ecommerce.tests.testcases import TestCase
 
+OrderSearchDocument = get_model('order', 'OrderSearchDocument')
+User = get_user_model()
+
 
 @ddt.ddt
 class OrderTests(TestCase):
@@ -39,3 +46,77 @@ class OrderTests(TestCase):
         basket.add_product(product)
         order = create_order(basket=basket)
         self.assertTrue(order.contains_coupon)
+
+
+class OrderSearchDocumentTests(TestCase):
+    def setUp(self):
+        super(OrderSearchDocumentTests, self).setUp()
+        self.user = self.create_user(username='Learner', email='Learner@Example.com')
+        self.course = CourseFactory(id='course-v1:TestX+Test100+2018', partner=self.partner)
+        self.seat = self.course.create_or_update_seat('verified', True, 100)
+        basket = create_basket(owner=self.user, empty=True)
+        basket.add_product(self.seat)
+        self.order = create_order(basket=basket, user=self.user)
+
+    def assert_search_results(self, expected, **criteria):
+        documents = OrderSearchDocument.search(**criteria)
+        self.assertEqual([document.order for document in documents], expected)
+
+    def test_created_with_order(self):
+        """ Verify placing an order indexes it, along with the course keys and SKUs of its lines. """
+        document = self.order.search_document
+        self.assertEqual(document.number, self.order.number.lower())
+        self.assertEqual(document.username, 'learner')
+        self.assertEqual(document.email, 'learner@example.com')
+        self.assertEqual(document.status, self.order.status)
+        self.assertEqual(document.date_placed, self.order.date_placed)
+        self.assertEqual(set(document.tokens.values_list('kind', 'value')), {
+            (OrderSearchTokenKind.COURSE_KEY, self.course.id.lower()),
+            (OrderSearchTokenKind.SKU, self.seat.stockrecords.first().partner_sku.lower()),
+        })
+
+    def test_refreshed_with_order(self):
+        """ Verify saving an order refreshes its document, without duplicating its tokens. """
+        self.order.set_status(ORDER.COMPLETE)
+        document = OrderSearchDocument.objects.get(order=self.order)
+        self.assertEqual(document.status, ORDER.COMPLETE)
+        self.assertEqual(document.tokens.count(), 2)
+
+        self.order.lines.first().save()
+        self.assertEqual(document.tokens.count(), 2)
+
+    def test_refreshed_with_user(self):
+        """ Verify changing the username or email of a user refreshes the documents of their orders. """
+        self.user.email = 'Learner@Example.org'
+        self.user.save()
+        self.assertEqual(OrderSearchDocument.objects.get(order=self.order).email, 'learner@example.org')
+
+        user = User.objects.get(id=self.user.id)
+        user.username = 'Renamed'
+        user.save()
+        self.assertEqual(OrderSearchDocument.objects.get(order=self.order).username, 'renamed')
+
+        # Saving a user without changing their username or email does not touch the documents.
+        with self.assertNumQueries(1):
+            user.save(update_fields=['last_login'])
+
+    def test_search(self):
+        """ Verify documents are searched by prefix, or exact token, regardless of case. """
+        other_order = create_order()
+        self.assert_search_results([self.order], number=self.order.number[:-1].lower())
+        self.assert_search_results([self.order], username='LEARN')
+        self.assert_search_results([self.order], email='learner@')
+        self.assert_search_results([self.order], course_id=self.course.id.upper())
+        self.assert_search_results([self.order], sku=self.seat.stockrecords.first().partner_sku)
+        self.assert_search_results([other_order], number=other_order.number, status=other_order.status)
+        self.assert_search_results([], course_id='course-v1:TestX+Test100')
+        self.assert_search_results([], username='learner', status=ORDER.COMPLETE)
+
+    def test_rebuild(self):
+        """ Verify rebuilding replaces the documents of orders, along with their tokens. """
+        OrderSearchDocument.objects.filter(order=self.order).update(status='')
+        self.assertEqual(OrderSearchDocument.rebuild([self.order]), 1)
+
+        document = OrderSearchDocument.objects.get(order=self.order)
+        self.assertEqual(document.status, self.order.status)
+        self.assertEqual(document.tokens.count(), 2)
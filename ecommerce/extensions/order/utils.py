@@ -6,13 +6,13 @@ import logging
 import waffle
 from django.conf import settings
 from edx_django_utils.cache import TieredCache
-from edx_rest_api_client.client import EdxRestApiClient
 from edx_rest_api_client.exceptions import HttpNotFoundError
 from oscar.apps.order.utils import OrderCreator as OscarOrderCreator
 from oscar.core.loading import get_model
 from requests.exceptions import ConnectionError, ConnectTimeout  # pylint: disable=ungrouped-imports
 from threadlocals.threadlocals import get_current_request
 
+from ecommerce.core.service_clients import get_service_client
 from ecommerce.core.url_utils import get_lms_entitlement_api_url
 from ecommerce.extensions.order.constants import DISABLE_REPEAT_ORDER_CHECK_SWITCH_NAME
 from ecommerce.extensions.refund.status import REFUND_LINE
@@ -146,8 +146,7 @@ class UserAlreadyPlacedOrder(object):
             bool: True if the entitlement is expired
 
         """
-        entitlement_api_client = EdxRestApiClient(get_lms_entitlement_api_url(),
-                                                  jwt=site.siteconfiguration.access_token)
+        entitlement_api_client = get_service_client(site.siteconfiguration, 'lms', get_lms_entitlement_api_url())
         partner_short_code = site.siteconfiguration.partner.short_code
         key = 'course_entitlement_detail_{}{}'.format(entitlement_uuid, partner_short_code)
         entitlement_cached_response = TieredCache.get_cached_response(key)
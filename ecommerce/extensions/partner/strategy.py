@@ -1,4 +1,6 @@
+from django.db.models import prefetch_related_objects
 from django.utils import timezone
+from django.utils.functional import cached_property
 from oscar.apps.partner import availability, strategy
 from oscar.core.loading import get_model
 
@@ -13,7 +15,7 @@ class CourseSeatAvailabilityPolicyMixin(strategy.StockRequired):
     Parent seats are never available.
     """
 
-    @property
+    @cached_property
     def seat_class(self):
         ProductClass = get_model('catalogue', 'ProductClass')
         return ProductClass.objects.get(name=SEAT_PRODUCT_CLASS_NAME)
@@ -31,7 +33,39 @@ class CourseSeatAvailabilityPolicyMixin(strategy.StockRequired):
             return availability.Unavailable()
 
 
-class DefaultStrategy(strategy.UseFirstStockRecord, CourseSeatAvailabilityPolicyMixin,
+class BulkPurchaseInfoMixin(object):
+    """
+    Fetches purchase info for collections of products.
+
+    The stock records and product classes needed by the pricing and availability policies are
+    loaded for the whole collection at once, instead of once per product.
+    """
+
+    def fetch_for_products(self, products, stockrecords=None):
+        """
+        Return the purchase info of each product.
+
+        Arguments:
+            products (iterable): Products, or a queryset of products.
+            stockrecords (dict): Stock records keyed by product ID, for callers which have already loaded them.
+                When omitted, the stock records of all products are loaded at once.
+
+        Returns:
+            dict: PurchaseInfo keyed by product.
+        """
+        products = list(products)
+        if stockrecords is None:
+            prefetch_related_objects(products, 'stockrecords', 'product_class', 'parent__product_class')
+            return {product: self.fetch_for_product(product) for product in products}
+
+        prefetch_related_objects(products, 'product_class', 'parent__product_class')
+        return {
+            product: self.fetch_for_product(product, stockrecord=stockrecords.get(product.id))
+            for product in products
+        }
+
+
+class DefaultStrategy(BulkPurchaseInfoMixin, strategy.UseFirstStockRecord, CourseSeatAvailabilityPolicyMixin,
                       strategy.NoTax, strategy.Structured):
     pass
 
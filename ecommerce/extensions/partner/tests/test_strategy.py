@@ -2,14 +2,19 @@ import datetime
 
 import ddt
 import pytz
+from django.db import connection
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from oscar.apps.partner import availability
+from oscar.core.loading import get_model
 
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
 from ecommerce.extensions.partner.strategy import DefaultStrategy, Selector
 from ecommerce.tests.testcases import TestCase
 
+Product = get_model('catalogue', 'Product')
+
 
 @ddt.ddt
 class DefaultStrategyTests(DiscoveryTestMixin, TestCase):
@@ -23,6 +28,29 @@ class DefaultStrategyTests(DiscoveryTestMixin, TestCase):
         """ Verify the property returns the course seat Product Class. """
         self.assertEqual(self.strategy.seat_class, self.seat_product_class)
 
+    def test_seat_class_is_cached(self):
+        """ Verify the course seat Product Class is only loaded once per strategy. """
+        with self.assertNumQueries(1):
+            self.assertEqual(self.strategy.seat_class, self.strategy.seat_class)
+
+    def test_fetch_for_products(self):
+        """ Verify purchase info is returned for each product, in a number of queries independent of their count. """
+        seats = [self.honor_seat]
+        for seat_type in ('verified', 'professional'):
+            seats.append(CourseFactory(partner=self.partner).create_or_update_seat(seat_type, False, 100))
+
+        def count_queries(product_ids):
+            products = Product.objects.filter(id__in=product_ids)
+            with CaptureQueriesContext(connection) as context:
+                purchase_info = self.strategy.fetch_for_products(products)
+            self.assertEqual(set(purchase_info), set(products))
+            for product, info in purchase_info.items():
+                self.assertEqual(info.stockrecord, product.stockrecords.first())
+                self.assertTrue(info.availability.is_available_to_buy)
+            return len(context.captured_queries)
+
+        self.assertEqual(count_queries([seats[0].id]), count_queries([seat.id for seat in seats]))
+
     def test_availability_policy_not_expired(self):
         """ If the course seat's expiration date has not passed, the seat should be available for purchase. """
         product = self.honor_seat
@@ -0,0 +1,77 @@
+"""
+Management command that archives old payment processor responses.
+
+Responses are recorded for every call made to a payment processor, and are rarely read once the order is
+placed. Responses older than the retention period are moved, in batches ordered by ID, to the
+ArchivedPaymentProcessorResponse table, which stores them compressed.
+"""
+from __future__ import unicode_literals
+
+import datetime
+import time
+
+from django.core.management import BaseCommand, CommandError
+from django.utils import timezone
+
+from ecommerce.extensions.payment.models import ArchivedPaymentProcessorResponse, PaymentProcessorResponse
+
+
+class Command(BaseCommand):
+    help = 'Archive payment processor responses older than the retention period.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-d', '--days',
+                            action='store',
+                            dest='days',
+                            default=365,
+                            type=int,
+                            help='Number of days for which payment processor responses are not archived.')
+        # Batched archival prevents the entire table from locking up as the command executes.
+        parser.add_argument('-b', '--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            default=1000,
+                            type=int,
+                            help='Size of each batch of responses to be archived.')
+        # Sleeping between each batch gives MySQL time to process other connections.
+        parser.add_argument('-s', '--sleep-seconds',
+                            action='store',
+                            dest='sleep_seconds',
+                            default=3,
+                            type=int,
+                            help='Seconds to sleep between each batch.')
+        parser.add_argument('--commit',
+                            action='store_true',
+                            dest='commit',
+                            default=False,
+                            help='Actually archive the responses.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('The batch size must be greater than zero.')
+
+        cutoff = timezone.now() - datetime.timedelta(days=options['days'])
+        queryset = PaymentProcessorResponse.objects.filter(created__lt=cutoff)
+
+        if not options['commit']:
+            msg = 'This has been an example operation. If the --commit flag had been included, the command ' \
+                  'would have archived [{}] payment processor responses.'.format(queryset.count())
+            self.stderr.write(msg)
+            return
+
+        # Archived responses are removed from the queryset, so an interrupted run simply resumes where it stopped.
+        archived = 0
+        while True:
+            ids = list(queryset.order_by('id').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+
+            archived += ArchivedPaymentProcessorResponse.archive(PaymentProcessorResponse.objects.filter(id__in=ids))
+            self.stderr.write('Archived payment processor responses through ID [{}].'.format(ids[-1]))
+            time.sleep(options['sleep_seconds'])
+
+        if archived:
+            self.stderr.write('All [{}] payment processor responses archived.'.format(archived))
+        else:
+            self.stderr.write('No payment processor responses to archive.')
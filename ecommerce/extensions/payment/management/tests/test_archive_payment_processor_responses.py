@@ -0,0 +1,70 @@
+from __future__ import unicode_literals
+
+import datetime
+from StringIO import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from ecommerce.extensions.payment.models import ArchivedPaymentProcessorResponse, PaymentProcessorResponse
+from ecommerce.extensions.test.factories import create_basket
+from ecommerce.tests.testcases import TestCase
+
+
+class ArchivePaymentProcessorResponsesCommandTests(TestCase):
+    command = 'archive_payment_processor_responses'
+
+    def setUp(self):
+        super(ArchivePaymentProcessorResponsesCommandTests, self).setUp()
+        self.basket = create_basket(site=self.site)
+        self.old_responses = [self.create_response(days) for days in (400, 500, 600)]
+        self.recent_response = self.create_response(10)
+
+    def create_response(self, days):
+        response = PaymentProcessorResponse.objects.create(
+            basket=self.basket, transaction_id='PAY-{}'.format(days), processor_name='paypal',
+            response={'state': 'approved', 'days': days}
+        )
+        PaymentProcessorResponse.objects.filter(id=response.id).update(
+            created=timezone.now() - datetime.timedelta(days=days)
+        )
+        return PaymentProcessorResponse.objects.get(id=response.id)
+
+    def call_command(self, **kwargs):
+        out = StringIO()
+        call_command(self.command, sleep_seconds=0, stderr=out, **kwargs)
+        return out.getvalue().strip()
+
+    def test_without_commit(self):
+        """ Verify the command does not archive responses if the commit flag is not set. """
+        actual = self.call_command()
+
+        self.assertEqual(PaymentProcessorResponse.objects.count(), 4)
+        self.assertFalse(ArchivedPaymentProcessorResponse.objects.exists())
+        expected = 'This has been an example operation. If the --commit flag had been included, the command ' \
+                   'would have archived [3] payment processor responses.'
+        self.assertEqual(actual, expected)
+
+    def test_with_commit(self):
+        """ Verify the command moves old responses to the archive, in batches. """
+        actual = self.call_command(commit=True, batch_size=2)
+
+        self.assertEqual(list(PaymentProcessorResponse.objects.all()), [self.recent_response])
+        for response in self.old_responses:
+            archived = ArchivedPaymentProcessorResponse.objects.get(id=response.id)
+            self.assertEqual(archived.processor_name, response.processor_name)
+            self.assertEqual(archived.transaction_id, response.transaction_id)
+            self.assertEqual(archived.basket_id, self.basket.id)
+            self.assertEqual(archived.created, response.created)
+            self.assertEqual(archived.response, response.response)
+
+        self.assertEqual(actual.splitlines(), [
+            'Archived payment processor responses through ID [{}].'.format(self.old_responses[1].id),
+            'Archived payment processor responses through ID [{}].'.format(self.old_responses[2].id),
+            'All [3] payment processor responses archived.',
+        ])
+
+    def test_commit_without_responses(self):
+        """ Verify the command does nothing if no response is older than the retention period. """
+        self.assertEqual(self.call_command(commit=True, days=700), 'No payment processor responses to archive.')
+        self.assertEqual(PaymentProcessorResponse.objects.count(), 4)
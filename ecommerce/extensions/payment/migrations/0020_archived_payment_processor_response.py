@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-19 13:43
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0019_auto_20180628_2011'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPaymentProcessorResponse',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('processor_name', models.CharField(max_length=255, verbose_name='Payment Processor')),
+                ('transaction_id', models.CharField(blank=True, max_length=255, null=True, verbose_name='Transaction ID')),
+                ('basket_id', models.IntegerField(blank=True, db_index=True, null=True, verbose_name='Basket ID')),
+                ('compressed_response', models.BinaryField()),
+                ('created', models.DateTimeField(db_index=True)),
+                ('archived', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'get_latest_by': 'created',
+                'verbose_name': 'Archived Payment Processor Response',
+                'verbose_name_plural': 'Archived Payment Processor Responses',
+            },
+        ),
+        migrations.AlterIndexTogether(
+            name='archivedpaymentprocessorresponse',
+            index_together=set([('processor_name', 'transaction_id')]),
+        ),
+    ]
@@ -1,6 +1,9 @@
 from __future__ import unicode_literals
 
-from django.db import models
+import json
+import zlib
+
+from django.db import models, transaction
 from django.utils.translation import ugettext_lazy as _
 from django_extensions.db.models import TimeStampedModel
 from jsonfield import JSONField
@@ -27,6 +30,60 @@ class PaymentProcessorResponse(models.Model):
         verbose_name_plural = _('Payment Processor Responses')
 
 
+class ArchivedPaymentProcessorResponse(models.Model):
+    """
+    Compressed copy of a payment processor response, moved out of the PaymentProcessorResponse table once it
+    is older than the retention period. Archived responses keep the IDs of the original responses.
+    """
+
+    id = models.IntegerField(primary_key=True)
+    processor_name = models.CharField(max_length=255, verbose_name=_('Payment Processor'))
+    transaction_id = models.CharField(max_length=255, verbose_name=_('Transaction ID'), null=True, blank=True)
+    # Baskets may be deleted once their responses are archived, so the ID of the basket is kept as-is.
+    basket_id = models.IntegerField(verbose_name=_('Basket ID'), null=True, blank=True, db_index=True)
+    compressed_response = models.BinaryField()
+    created = models.DateTimeField(db_index=True)
+    archived = models.DateTimeField(auto_now_add=True)
+
+    class Meta(object):
+        get_latest_by = 'created'
+        index_together = ('processor_name', 'transaction_id')
+        verbose_name = _('Archived Payment Processor Response')
+        verbose_name_plural = _('Archived Payment Processor Responses')
+
+    @property
+    def response(self):
+        return json.loads(zlib.decompress(bytes(self.compressed_response)))
+
+    @classmethod
+    def archive(cls, responses):
+        """
+        Move the given payment processor responses to the archive.
+
+        Arguments:
+            responses (QuerySet): PaymentProcessorResponse objects to archive.
+
+        Returns:
+            int: Number of responses archived.
+        """
+        with transaction.atomic():
+            responses = list(responses)
+            cls.objects.bulk_create([
+                cls(
+                    id=response.id,
+                    processor_name=response.processor_name,
+                    transaction_id=response.transaction_id,
+                    basket_id=response.basket_id,
+                    compressed_response=zlib.compress(json.dumps(response.response)),
+                    created=response.created
+                )
+                for response in responses
+            ])
+            PaymentProcessorResponse.objects.filter(id__in=[response.id for response in responses]).delete()
+
+        return len(responses)
+
+
 class Source(AbstractSource):
     card_type = models.CharField(max_length=255, choices=CARD_TYPE_CHOICES, null=True, blank=True)
 
@@ -96,19 +96,33 @@ def embargo_check(user, site, products):
     Returns:
         Bool
     """
-    courses = []
-    _, _, ip = parse_tracking_context(user)
+    return check_course_access(user, site, get_embargo_course_ids(products))
+
 
+def get_embargo_course_ids(products):
+    """ Returns the IDs of the courses of the products which are subject to the embargo check. """
+    courses = []
     for product in products:
         # We only are checking Seats
         if product.get_product_class().name == SEAT_PRODUCT_CLASS_NAME:
             courses.append(product.course.id)
 
-    if courses:
+    return courses
+
+
+def check_course_access(user, site, course_ids):
+    """ Checks if the user has access to the given courses by calling the LMS embargo API.
+
+    Returns:
+        Bool
+    """
+    _, _, ip = parse_tracking_context(user)
+
+    if course_ids:
         params = {
             'user': user,
             'ip_address': ip,
-            'course_ids': courses
+            'course_ids': course_ids
         }
 
         try:
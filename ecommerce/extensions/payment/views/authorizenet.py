@@ -223,7 +223,8 @@ class AuthorizeNetNotificationView(EdxOrderPlacementMixin, APIView):
             else:
                 with transaction.atomic():
                     self.handle_payment(transaction_details, basket)
-                    self.call_handle_order_placement(basket, request, transaction_details)
+                # Orders are placed in their own transaction, so that fulfillment does not run in this one.
+                self.call_handle_order_placement(basket, request, transaction_details)
 
         except Exception:  # pylint: disable=broad-except
             logger.exception(
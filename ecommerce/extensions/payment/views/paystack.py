@@ -121,7 +121,8 @@ class PaystackExecutionView(EdxOrderPlacementMixin, View):
             try:
                 with transaction.atomic():
                     self.handle_payment(data, basket)
-                    self.call_handle_order_placement(basket, request)
+                # Orders are placed in their own transaction, so that fulfillment does not run in this one.
+                self.call_handle_order_placement(basket, request)
 
             except Exception:  # pylint: disable=broad-except
                 logger.exception("Attempts to handle payment for basket [%d] failed.", basket.id)
@@ -2,6 +2,7 @@ from oscar.core.loading import get_model
 
 from ecommerce.extensions.fulfillment.status import ORDER
 
+Line = get_model('order', 'Line')
 Option = get_model('catalogue', 'Option')
 Refund = get_model('refund', 'Refund')
 RefundLine = get_model('refund', 'RefundLine')
@@ -30,9 +31,7 @@ def find_orders_associated_with_course(user, course_id):
         return []
 
     # Find all complete orders associated with the course.
-    orders = user.orders.filter(status=ORDER.COMPLETE,
-                                lines__product__attribute_values__attribute__code='course_key',
-                                lines__product__attribute_values__value_text=course_id)
+    orders = user.orders.filter(status=ORDER.COMPLETE, lines__product__descriptor__course_key=course_id)
 
     return list(orders)
 
@@ -63,6 +62,34 @@ def create_refunds_for_entitlement(order, entitlement_uuid):
     return refunds
 
 
+def find_unrefunded_lines(course_ids, users=None, orders=None):
+    """
+    Returns the order lines associated with the given courses which have not been refunded.
+
+    The lines of all orders are found with a single query. Unless orders are given, only the lines of
+    completed orders are returned.
+
+    Arguments:
+        course_ids (list): Identifiers of the courses associated with the order lines
+        users (list): If given, only the lines of orders placed by these users are returned
+        orders (list): If given, only the lines of these orders are returned
+
+    Returns:
+        QuerySet: order lines, with their order and its user, ordered by order
+    """
+    lines = Line.objects.filter(refund_lines__id__isnull=True, product__descriptor__course_key__in=course_ids)
+
+    if orders is None:
+        lines = lines.filter(order__status=ORDER.COMPLETE)
+    else:
+        lines = lines.filter(order__in=orders)
+
+    if users is not None:
+        lines = lines.filter(order__user__in=users)
+
+    return lines.select_related('order__user').order_by('order_id', 'id')
+
+
 def create_refunds(orders, course_id):
     """
     Creates refunds for the given list of orders.
@@ -74,16 +101,27 @@ def create_refunds(orders, course_id):
     Returns:
         list: refunds created
     """
-    refunds = []
+    if not orders:
+        return []
 
-    for order in orders:
-        # Find lines associated with the course and not refunded.
-        lines = order.lines.filter(refund_lines__id__isnull=True,
-                                   product__attribute_values__attribute__code='course_key',
-                                   product__attribute_values__value_text=course_id)
+    orders_by_id = {order.id: order for order in orders}
+    lines = list(find_unrefunded_lines([course_id], orders=orders))
+    for line in lines:
+        # Refund the instances of the orders given by the caller.
+        line.order = orders_by_id[line.order_id]
 
-        refund = Refund.create_with_lines(order, lines)
-        if refund is not None:
-            refunds.append(refund)
+    return Refund.create_in_bulk(lines)
 
-    return refunds
+
+def create_refunds_for_courses(course_ids, users=None):
+    """
+    Creates refunds for the completed orders associated with the given courses, e.g. after the courses are cancelled.
+
+    Arguments:
+        course_ids (list): Identifiers of the courses to refund
+        users (list): If given, only the orders placed by these users are refunded
+
+    Returns:
+        list: refunds created
+    """
+    return Refund.create_in_bulk(find_unrefunded_lines(course_ids, users=users))
@@ -0,0 +1,47 @@
+"""
+This command creates refunds for the orders of cancelled courses.
+"""
+from __future__ import unicode_literals
+
+import logging
+
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand
+
+from ecommerce.extensions.refund.api import create_refunds_for_courses
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Creates refunds for the completed orders of the given courses which have not been refunded.
+
+    Example:
+
+        ./manage.py create_course_refunds --course-ids course-v1:edX+DemoX+Demo_Course course-v1:edX+Other+2018
+    """
+
+    help = 'Create refunds for the completed orders of the given courses.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course-ids',
+                            action='store',
+                            dest='course_ids',
+                            nargs='+',
+                            required=True,
+                            help='IDs of the courses to refund.')
+        parser.add_argument('--usernames',
+                            action='store',
+                            dest='usernames',
+                            nargs='+',
+                            help='If given, only the orders placed by these users are refunded.')
+
+    def handle(self, *args, **options):
+        course_ids = options['course_ids']
+        usernames = options['usernames']
+        users = User.objects.filter(username__in=usernames) if usernames else None
+
+        refunds = create_refunds_for_courses(course_ids, users=users)
+        logger.info('Created [%d] refunds for courses [%s].', len(refunds), ', '.join(course_ids))
@@ -0,0 +1,24 @@
+from django.core.management import call_command
+from oscar.core.loading import get_model
+from oscar.test.factories import UserFactory
+from testfixtures import LogCapture
+
+from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
+from ecommerce.tests.testcases import TestCase
+
+LOGGER_NAME = 'ecommerce.extensions.refund.management.commands.create_course_refunds'
+Refund = get_model('refund', 'Refund')
+
+
+class CreateCourseRefundsTests(RefundTestMixin, TestCase):
+    def test_create_course_refunds(self):
+        """ Verify the command refunds the orders of the given courses, placed by the given users. """
+        user = UserFactory()
+        order = self.create_order(user=user)
+        self.create_order(user=UserFactory())
+
+        with LogCapture(LOGGER_NAME) as logger:
+            call_command('create_course_refunds', '--course-ids', self.course.id, '--usernames', user.username)
+            logger.check((LOGGER_NAME, 'INFO', 'Created [1] refunds for courses [{}].'.format(self.course.id)))
+
+        self.assertEqual(list(Refund.objects.values_list('order', flat=True)), [order.id])
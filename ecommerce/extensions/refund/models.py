@@ -1,9 +1,10 @@
 from __future__ import unicode_literals
 
 import logging
+from collections import OrderedDict
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import ugettext_lazy as _
 from django_extensions.db.models import TimeStampedModel
 from ecommerce_worker.sailthru.v1.tasks import send_course_refund_email
@@ -107,39 +108,83 @@ class Refund(StatusMixin, TimeStampedModel):
         unrefunded_lines = [line for line in lines if not line.refund_lines.exclude(status=REFUND_LINE.DENIED).exists()]
 
         if unrefunded_lines:
-            status = getattr(settings, 'OSCAR_INITIAL_REFUND_STATUS', REFUND.OPEN)
-            total_credit_excl_tax = sum([line.line_price_excl_tax for line in unrefunded_lines])
-            refund = cls.objects.create(
-                order=order,
-                user=order.user,
-                status=status,
-                total_credit_excl_tax=total_credit_excl_tax
-            )
+            refund, refund_lines = cls._create_for_order(order, unrefunded_lines)
+            RefundLine.objects.bulk_create(refund_lines)
 
-            audit_log(
-                'refund_created',
-                amount=total_credit_excl_tax,
-                currency=refund.currency,
-                order_number=order.number,
-                refund_id=refund.id,
-                user_id=refund.user.id
-            )
-
-            status = getattr(settings, 'OSCAR_INITIAL_REFUND_LINE_STATUS', REFUND_LINE.OPEN)
-            for line in unrefunded_lines:
-                RefundLine.objects.create(
-                    refund=refund,
-                    order_line=line,
-                    line_credit_excl_tax=line.line_price_excl_tax,
-                    quantity=line.quantity,
-                    status=status
-                )
-
-            if total_credit_excl_tax == 0:
+            if refund.total_credit_excl_tax == 0:
                 refund.approve(notify_purchaser=False)
 
             return refund
 
+    @classmethod
+    def create_in_bulk(cls, lines):
+        """Given unrefunded order lines of any number of orders, creates a Refund for each order.
+
+        Unlike create_with_lines, the lines are not checked for existing RefundLines: they should be
+        selected with a single query, such as the one made by find_unrefunded_lines. The RefundLines
+        of all orders are created with a single query. Refunds corresponding to a total credit of $0
+        are approved upon creation.
+
+        Arguments:
+            lines (iterable of order.Line): Unrefunded order lines, with their order and its user selected.
+
+        Returns:
+            list of Refund: The refunds created, in the order in which their orders were first seen.
+        """
+        lines_by_order = OrderedDict()
+        for line in lines:
+            lines_by_order.setdefault(line.order, []).append(line)
+
+        refunds = []
+        refund_lines = []
+        with transaction.atomic():
+            for order, order_lines in lines_by_order.items():
+                refund, order_refund_lines = cls._create_for_order(order, order_lines)
+                refunds.append(refund)
+                refund_lines.extend(order_refund_lines)
+
+            RefundLine.objects.bulk_create(refund_lines)
+
+        for refund in refunds:
+            if refund.total_credit_excl_tax == 0:
+                refund.approve(notify_purchaser=False)
+
+        return refunds
+
+    @classmethod
+    def _create_for_order(cls, order, lines):
+        """ Creates the Refund of an order, and returns it with its unsaved RefundLines. """
+        status = getattr(settings, 'OSCAR_INITIAL_REFUND_STATUS', REFUND.OPEN)
+        total_credit_excl_tax = sum([line.line_price_excl_tax for line in lines])
+        refund = cls.objects.create(
+            order=order,
+            user=order.user,
+            status=status,
+            total_credit_excl_tax=total_credit_excl_tax
+        )
+
+        audit_log(
+            'refund_created',
+            amount=total_credit_excl_tax,
+            currency=refund.currency,
+            order_number=order.number,
+            refund_id=refund.id,
+            user_id=refund.user.id
+        )
+
+        status = getattr(settings, 'OSCAR_INITIAL_REFUND_LINE_STATUS', REFUND_LINE.OPEN)
+        refund_lines = [
+            RefundLine(
+                refund=refund,
+                order_line=line,
+                line_credit_excl_tax=line.line_price_excl_tax,
+                quantity=line.quantity,
+                status=status
+            )
+            for line in lines
+        ]
+        return refund, refund_lines
+
     @property
     def num_items(self):
         """Returns the number of items in this refund."""
@@ -4,7 +4,12 @@ from oscar.core.loading import get_model
 from oscar.test.factories import UserFactory
 
 from ecommerce.extensions.fulfillment.status import ORDER
-from ecommerce.extensions.refund.api import create_refunds, find_orders_associated_with_course
+from ecommerce.extensions.refund.api import (
+    create_refunds,
+    create_refunds_for_courses,
+    find_orders_associated_with_course,
+    find_unrefunded_lines
+)
 from ecommerce.extensions.refund.tests.factories import RefundLineFactory
 from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
 from ecommerce.tests.testcases import TestCase
@@ -77,3 +82,22 @@ class ApiTests(RefundTestMixin, TestCase):
 
         actual = create_refunds([order], self.course.id)
         self.assertEqual(actual, [])
+
+    def test_create_refunds_for_courses(self):
+        """ The method should refund the unrefunded lines of the completed orders of all given courses at once. """
+        other_user = UserFactory()
+        orders = [self.create_order(), self.create_order(user=other_user), self.create_order(multiple_lines=True)]
+        self.create_order(status=ORDER.OPEN)
+        RefundLineFactory(order_line=self.create_order().lines.first())
+
+        with self.assertNumQueries(1):
+            lines = list(find_unrefunded_lines([self.course.id, 'course-v1:edX+Other+2018']))
+        self.assertEqual([line.order for line in lines], [orders[0], orders[1], orders[2], orders[2]])
+
+        refunds = create_refunds_for_courses([self.course.id], users=[self.user])
+        self.assertEqual([refund.order for refund in refunds], [orders[0], orders[2]])
+        self.assertEqual(refunds[1].lines.count(), 2)
+
+        refunds = create_refunds_for_courses([self.course.id])
+        self.assertEqual([refund.order for refund in refunds], [orders[1]])
+        self.assert_refund_matches_order(refunds[0], orders[1])
@@ -4,12 +4,15 @@ import logging
 import waffle
 from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
 from django.db import models
+from django.db.models import F
 from django.utils.translation import ugettext_lazy as _
 from oscar.apps.voucher.abstract_models import AbstractVoucher  # pylint: disable=ungrouped-imports
+from oscar.core.compat import user_is_authenticated
 
 from ecommerce.core.utils import log_message_and_raise_validation_error
 from ecommerce.enterprise.constants import ENTERPRISE_OFFERS_FOR_COUPONS_SWITCH
 from ecommerce.extensions.offer.constants import OFFER_ASSIGNMENT_REVOKED, OFFER_MAX_USES_DEFAULT, OFFER_REDEEMED
+from ecommerce.extensions.offer.signals import usage_recorded
 
 logger = logging.getLogger(__name__)
 
@@ -83,6 +86,32 @@ class Voucher(AbstractVoucher):
                 'Failed to create Voucher. Voucher start and end datetime fields must be type datetime.'
             )
 
+    def record_usage(self, order, user):
+        """
+        Records a usage of this voucher in an order.
+
+        The order count is incremented in the database, rather than saved from this instance,
+        so that concurrent redemptions are all counted.
+        """
+        if user_is_authenticated(user):
+            self.applications.create(voucher=self, order=order, user=user)
+        else:
+            self.applications.create(voucher=self, order=order)
+        self._increment_usage(num_orders=F('num_orders') + 1)
+    record_usage.alters_data = True
+
+    def record_discount(self, discount):
+        """
+        Record a discount that this voucher has given.
+        """
+        self._increment_usage(total_discount=F('total_discount') + discount['discount'])
+    record_discount.alters_data = True
+
+    def _increment_usage(self, **increments):
+        Voucher.objects.filter(pk=self.pk).update(**increments)
+        self.refresh_from_db(fields=increments.keys())
+        usage_recorded.send(sender=Voucher, instance=self)
+
     @classmethod
     def does_exist(cls, code):
         try:
@@ -110,12 +139,45 @@ class Voucher(AbstractVoucher):
 
     @property
     def best_offer(self):
+        # An offer resolved by resolve_best_offer() is used as is.
+        resolved_offer = getattr(self, '_resolved_best_offer', None)
+        if resolved_offer is not None:
+            return resolved_offer
+
         # If the ENTERPRISE_OFFERS_FOR_COUPONS_SWITCH is inactive, return offer containing a range
         if not waffle.switch_is_active(ENTERPRISE_OFFERS_FOR_COUPONS_SWITCH):
             return self.original_offer
         # If the switch is enabled, return the enterprise offer if it exists.
         return self.enterprise_offer or self.original_offer
 
+    def resolve_best_offer(self):
+        """
+        Resolve the best offer of this voucher, with its condition, benefit and range, using a single query.
+
+        The offer is kept on this instance, and returned by `best_offer` from then on. It is selected
+        the same way as `best_offer` does.
+
+        Returns:
+            ConditionalOffer, or None if the voucher has no offers.
+        """
+        offers = list(self.offers.select_related('condition__range', 'benefit__range', 'partner'))
+        if not offers:
+            return None
+
+        best_offer = None
+        if waffle.switch_is_active(ENTERPRISE_OFFERS_FOR_COUPONS_SWITCH):
+            enterprise_offers = [offer for offer in offers if offer.condition.enterprise_customer_uuid]
+            if len(enterprise_offers) > 1:
+                logger.error('There is more than one enterprise offer associated with voucher %s!', self.id)
+            best_offer = enterprise_offers[0] if enterprise_offers else None
+
+        if best_offer is None:
+            range_offers = [offer for offer in offers if offer.condition.range_id]
+            best_offer = range_offers[0] if range_offers else min(offers, key=lambda offer: offer.date_created)
+
+        self._resolved_best_offer = best_offer  # pylint: disable=attribute-defined-outside-init
+        return best_offer
+
     @property
     def slots_available_for_assignment(self):
         """
@@ -0,0 +1,55 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from oscar.core.loading import get_model
+from waffle.models import Switch
+
+from ecommerce.extensions.offer.signals import usage_recorded
+from ecommerce.extensions.voucher.utils import (
+    invalidate_offer_voucher_snapshots,
+    invalidate_voucher_snapshot,
+    invalidate_voucher_snapshots
+)
+
+Benefit = get_model('offer', 'Benefit')
+Condition = get_model('offer', 'Condition')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+Range = get_model('offer', 'Range')
+Voucher = get_model('voucher', 'Voucher')
+
+# Changes to these models may change the best offer of any voucher. The products of the offers' ranges are not
+# part of the snapshots.
+SNAPSHOT_DEPENDENCIES = (Benefit, Condition, ConditionalOffer, Range, Switch)
+
+
+@receiver(post_save, sender=Voucher, dispatch_uid='voucher.invalidate_voucher_snapshot.save')
+@receiver(post_delete, sender=Voucher, dispatch_uid='voucher.invalidate_voucher_snapshot.delete')
+def invalidate_snapshot_of_voucher(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    invalidate_voucher_snapshot(instance.code)
+
+
+@receiver(usage_recorded, sender=Voucher, dispatch_uid='voucher.invalidate_voucher_snapshot.usage')
+def invalidate_snapshot_on_usage(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    invalidate_voucher_snapshot(instance.code)
+
+
+@receiver(usage_recorded, sender=ConditionalOffer, dispatch_uid='voucher.invalidate_voucher_snapshots.offer_usage')
+def invalidate_snapshots_on_offer_usage(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    # The usage of an offer only changes its availability when the offer is capped. The snapshots of all of its
+    # vouchers are invalidated, so that no voucher of a sold out offer is seen as available.
+    if instance.max_global_applications is not None or instance.max_discount:
+        invalidate_offer_voucher_snapshots(instance)
+
+
+@receiver(m2m_changed, sender=Voucher.offers.through, dispatch_uid='voucher.invalidate_voucher_snapshots.offers')
+def invalidate_snapshots_on_m2m_change(sender, action, **kwargs):  # pylint: disable=unused-argument
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_voucher_snapshots()
+
+
+def invalidate_snapshots(sender, **kwargs):  # pylint: disable=unused-argument
+    invalidate_voucher_snapshots()
+
+
+for model in SNAPSHOT_DEPENDENCIES:
+    post_save.connect(invalidate_snapshots, sender=model, dispatch_uid='voucher.snapshots.save.' + model.__name__)
+    post_delete.connect(invalidate_snapshots, sender=model, dispatch_uid='voucher.snapshots.delete.' + model.__name__)
@@ -1,4 +1,5 @@
 import datetime
+from decimal import Decimal
 
 import ddt
 from django.core.exceptions import ValidationError
@@ -134,6 +135,22 @@ class VoucherTests(TestCase):
         is_available, message = voucher.is_available_to_user(user2)
         assert (is_available, message) == (False, 'This voucher is only available to another user')
 
+    def test_record_usage(self):
+        """ Verify usage is added to the counters stored in the database, rather than to the instance's. """
+        voucher = Voucher.objects.create(**self.data)
+        stale_voucher = Voucher.objects.get(id=voucher.id)
+        user = UserFactory()
+
+        voucher.record_usage(factories.OrderFactory(), user)
+        voucher.record_discount({'discount': Decimal('10.00')})
+        stale_voucher.record_usage(factories.OrderFactory(), user)
+        stale_voucher.record_discount({'discount': Decimal('5.00')})
+
+        voucher = Voucher.objects.get(id=voucher.id)
+        self.assertEqual((voucher.num_orders, voucher.total_discount), (2, Decimal('15.00')))
+        self.assertEqual(stale_voucher.num_orders, 2)
+        self.assertEqual(voucher.applications.count(), 2)
+
     def test_slots_available_for_assignment_no_enterprise_offer(self):
         """ Verify that a voucher with no enterprise offer returns none for slots_available_for_assignment. """
         voucher = Voucher.objects.create(**self.data)
@@ -12,10 +12,12 @@ from django.utils.translation import ugettext_lazy as _
 from factory.fuzzy import FuzzyText
 from oscar.templatetags.currency_filters import currency
 from oscar.test.factories import *  # pylint:disable=wildcard-import,unused-wildcard-import
+from waffle.testutils import override_switch
 
 from ecommerce.core.url_utils import get_ecommerce_url
 from ecommerce.coupons.tests.mixins import CouponMixin, DiscoveryMockMixin
 from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.enterprise.constants import ENTERPRISE_OFFERS_FOR_COUPONS_SWITCH
 from ecommerce.extensions.api import exceptions
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
 from ecommerce.extensions.fulfillment.modules import CouponFulfillmentModule
@@ -25,8 +27,10 @@ from ecommerce.extensions.test.factories import create_order, prepare_voucher
 from ecommerce.extensions.voucher.utils import (
     create_vouchers,
     generate_coupon_report,
+    get_cached_voucher,
     get_voucher_and_products_from_code,
     get_voucher_discount_info,
+    get_voucher_snapshot_version,
     update_voucher_offer
 )
 from ecommerce.tests.mixins import LmsApiMockMixin
@@ -655,6 +659,70 @@ class UtilTests(CouponMixin, DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockM
         self.assertEqual(len(products), 1)
         self.assertEqual(products[0], original_product)
 
+    def test_get_voucher_and_products_from_code_cached(self):
+        """ Verify that the voucher snapshot is cached, and invalidated when the voucher's offer changes. """
+        prepare_voucher(code=VOUCHER_CODE)
+        voucher, __ = get_voucher_and_products_from_code(code=VOUCHER_CODE)
+
+        with self.assertNumQueries(0):
+            voucher = get_cached_voucher(VOUCHER_CODE)
+            offer = voucher.best_offer
+            self.assertIsNone(offer.condition.enterprise_customer_uuid)
+
+        # Products added to the range are returned, while the snapshot remains cached.
+        product = ProductFactory(categories=[], stockrecords__partner=self.partner)
+        offer.benefit.range.add_product(product)
+        __, products = get_voucher_and_products_from_code(code=VOUCHER_CODE)
+        self.assertIn(product, products)
+
+        offer.max_global_applications = 5
+        offer.save()
+        voucher, __ = get_voucher_and_products_from_code(code=VOUCHER_CODE)
+        self.assertEqual(voucher.best_offer.max_global_applications, 5)
+
+    def test_voucher_snapshot_invalidated_on_usage(self):
+        """ Verify that recording a usage of a voucher only invalidates the snapshot of that voucher. """
+        voucher, product = prepare_voucher(code=VOUCHER_CODE)
+        prepare_voucher(code='OTHERCODE', _range=voucher.best_offer.benefit.range)
+        get_voucher_and_products_from_code(code=VOUCHER_CODE)
+        get_voucher_and_products_from_code(code='OTHERCODE')
+        version = get_voucher_snapshot_version()
+
+        basket = BasketFactory(owner=self.user, site=self.site)
+        basket.add_product(product)
+        order = create_order(basket=basket, user=self.user)
+        voucher.best_offer.record_usage({'freq': 1, 'discount': 0})
+        voucher.record_usage(order, order.user)
+
+        self.assertEqual(get_voucher_snapshot_version(), version)
+        with self.assertNumQueries(0):
+            get_cached_voucher('OTHERCODE')
+        cached_voucher, __ = get_voucher_and_products_from_code(code=VOUCHER_CODE)
+        self.assertEqual(cached_voucher.num_orders, 1)
+
+    def test_voucher_snapshots_invalidated_on_capped_offer_usage(self):
+        """ Verify that recording a usage of a capped offer invalidates the snapshots of all of its vouchers. """
+        voucher, __ = prepare_voucher(code=VOUCHER_CODE, max_usage=1)
+        offer = voucher.best_offer
+        other_voucher = VoucherFactory(code='OTHERCODE')
+        other_voucher.offers.add(offer)
+        self.assertTrue(get_cached_voucher('OTHERCODE').best_offer.is_available())
+
+        offer.record_usage({'freq': 1, 'discount': 0})
+        self.assertFalse(get_cached_voucher('OTHERCODE').best_offer.is_available())
+
+    def test_resolve_best_offer(self):
+        """ Verify that the resolved best offer is the offer selected by best_offer. """
+        voucher, __ = prepare_voucher(code=VOUCHER_CODE)
+        voucher.offers.add(ConditionalOfferFactory(condition__enterprise_customer_uuid=uuid.uuid4()))
+        for switch_active in (True, False):
+            with override_switch(ENTERPRISE_OFFERS_FOR_COUPONS_SWITCH, active=switch_active):
+                voucher = Voucher.objects.get(id=voucher.id)
+                expected = voucher.best_offer
+                with self.assertNumQueries(1):
+                    self.assertEqual(voucher.resolve_best_offer(), expected)
+                    self.assertEqual(voucher.best_offer, expected)
+
     def test_no_product(self):
         """ Verify that an exception is raised if there is no product. """
         voucher = VoucherFactory()
@@ -5,21 +5,23 @@ import base64
 import datetime
 import hashlib
 import logging
+import time
 import uuid
 from decimal import Decimal, DecimalException
 
 import dateutil.parser
 import pytz
 from django.conf import settings
+from django.core.cache import cache
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
-from edx_django_utils.cache import TieredCache
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE, TieredCache
 from opaque_keys.edx.keys import CourseKey
 from oscar.core.loading import get_model
 from oscar.templatetags.currency_filters import currency
 
 from ecommerce.core.url_utils import get_ecommerce_url
-from ecommerce.core.utils import log_message_and_raise_validation_error
+from ecommerce.core.utils import get_cache_key, log_message_and_raise_validation_error
 from ecommerce.enterprise.benefits import BENEFIT_MAP as ENTERPRISE_BENEFIT_MAP
 from ecommerce.enterprise.conditions import AssignableEnterpriseCustomerCondition
 from ecommerce.enterprise.utils import get_enterprise_customer
@@ -47,6 +49,8 @@ StockRecord = get_model('partner', 'StockRecord')
 Voucher = get_model('voucher', 'Voucher')
 VoucherApplication = get_model('voucher', 'VoucherApplication')
 
+VOUCHER_SNAPSHOT_VERSION_KEY = 'voucher_snapshot_version'
+
 
 def _add_redemption_course_ids(new_row_to_append, header_row, redemption_course_ids):
     if any(row in [_('Catalog Query'), _('Program UUID')] for row in header_row):
@@ -508,6 +512,78 @@ def create_new_voucher(code, end_datetime, name, start_datetime, voucher_type):
     return voucher
 
 
+def _generate_code_strings(length, count):
+    """
+    Create a number of distinct, unused strings of random characters of specified length.
+
+    Unlike `_generate_code_string`, uniqueness is verified with one query per batch of codes.
+
+    Args:
+        length (int): Defines the length of randomly generated strings.
+        count (int): Number of strings to generate.
+
+    Raises:
+        ValueError raised if length is less than one.
+
+    Returns:
+        list
+    """
+    if length < 1:
+        raise ValueError("Voucher code length must be a positive number.")
+
+    codes = set()
+    while len(codes) < count:
+        candidates = set()
+        while len(candidates) < count - len(codes):
+            h = hashlib.sha256()
+            h.update(uuid.uuid4().get_bytes())
+            candidates.add(base64.b32encode(h.digest())[0:length])
+        candidates -= codes
+        candidates -= set(Voucher.objects.filter(code__in=candidates).values_list('code', flat=True))
+        codes |= candidates
+    return list(codes)
+
+
+def bulk_create_new_vouchers(quantity, end_datetime, name, start_datetime, voucher_type):
+    """
+    Creates vouchers with randomly generated codes, using a constant number of queries.
+
+    Args:
+        quantity (int): Number of vouchers to create.
+        end_datetime (datetime): Voucher end date.
+        name (str): Voucher name.
+        start_datetime (datetime): Voucher start date.
+        voucher_type (str): Voucher usage.
+
+    Returns:
+        List[Voucher], in the order of creation.
+    """
+    if not isinstance(start_datetime, datetime.datetime):
+        start_datetime = dateutil.parser.parse(start_datetime)
+
+    if not isinstance(end_datetime, datetime.datetime):
+        end_datetime = dateutil.parser.parse(end_datetime)
+
+    codes = _generate_code_strings(settings.VOUCHER_CODE_LENGTH, quantity)
+    vouchers = [
+        Voucher(name=name[:128], code=code, usage=voucher_type, start_datetime=start_datetime,
+                end_datetime=end_datetime)
+        for code in codes
+    ]
+    # bulk_create() bypasses Voucher.save(), which validates the vouchers.
+    for voucher in vouchers:
+        voucher.clean()
+    Voucher.objects.bulk_create(vouchers)
+
+    # Primary keys are not set by bulk_create() on MySQL, so they are loaded separately.
+    ids = dict(Voucher.objects.filter(code__in=codes).values_list('code', 'id'))
+    for voucher in vouchers:
+        voucher.id = ids[voucher.code]
+        voucher._state.adding = False  # pylint: disable=protected-access
+        voucher._state.db = Voucher.objects.db  # pylint: disable=protected-access
+    return vouchers
+
+
 def validate_voucher_fields(
         max_uses,
         voucher_type,
@@ -668,7 +744,6 @@ def create_vouchers(
         List[Voucher]
     """
     logger.info("Creating [%d] vouchers product [%s]", quantity, coupon.id)
-    vouchers = []
     offers = []
     enterprise_offers = []
 
@@ -744,18 +819,35 @@ def create_vouchers(
             )
             enterprise_offers.append(enterprise_offer)
 
-    for i in range(quantity):
-        voucher = create_new_voucher(
+    if code:
+        vouchers = [
+            create_new_voucher(
+                end_datetime=end_datetime,
+                start_datetime=start_datetime,
+                voucher_type=voucher_type,
+                code=code,
+                name=name
+            )
+            for __ in range(quantity)
+        ]
+    else:
+        vouchers = bulk_create_new_vouchers(
+            quantity=quantity,
             end_datetime=end_datetime,
             start_datetime=start_datetime,
             voucher_type=voucher_type,
-            code=code,
             name=name
         )
-        voucher.offers.add(offers[i] if len(offers) > 1 else offers[0])
+
+    VoucherOffer = Voucher.offers.through
+    voucher_offers = []
+    for i, voucher in enumerate(vouchers):
+        offer = offers[i] if len(offers) > 1 else offers[0]
+        voucher_offers.append(VoucherOffer(voucher=voucher, conditionaloffer=offer))
         if enterprise_customer:
-            voucher.offers.add(enterprise_offers[i] if len(enterprise_offers) > 1 else enterprise_offers[0])
-        vouchers.append(voucher)
+            enterprise_offer = enterprise_offers[i] if len(enterprise_offers) > 1 else enterprise_offers[0]
+            voucher_offers.append(VoucherOffer(voucher=voucher, conditionaloffer=enterprise_offer))
+    VoucherOffer.objects.bulk_create(voucher_offers)
 
     return vouchers
 
@@ -873,32 +965,87 @@ def update_voucher_offer(offer, benefit_value, benefit_type=None, max_uses=None,
     )
 
 
-def get_cached_voucher(code):
+def get_voucher_snapshot_version():
+    """ Returns the current version of the voucher snapshots. """
+    # The initial version is time based, so that versions are not reused if the cache is cleared.
+    return cache.get_or_set(VOUCHER_SNAPSHOT_VERSION_KEY, lambda: int(time.time() * 1000), None)
+
+
+def invalidate_voucher_snapshots():
+    """ Invalidates the snapshots of all vouchers, by moving to a new snapshot version. """
+    try:
+        cache.incr(VOUCHER_SNAPSHOT_VERSION_KEY)
+    except ValueError:
+        cache.set(VOUCHER_SNAPSHOT_VERSION_KEY, int(time.time() * 1000), None)
+
+
+def _get_voucher_snapshot_cache_key(code):
+    return get_cache_key(voucher_snapshot=code, version=get_voucher_snapshot_version())
+
+
+def invalidate_voucher_snapshot(code):
+    """ Invalidates the snapshot of a single voucher. """
+    TieredCache.delete_all_tiers(_get_voucher_snapshot_cache_key(code))
+
+
+def invalidate_offer_voucher_snapshots(offer):
+    """ Invalidates the snapshots of the vouchers of an offer. """
+    version = get_voucher_snapshot_version()
+    cache_keys = [
+        get_cache_key(voucher_snapshot=code, version=version)
+        for code in offer.vouchers.values_list('code', flat=True)
+    ]
+    for cache_key in cache_keys:
+        DEFAULT_REQUEST_CACHE.delete(cache_key)
+    cache.delete_many(cache_keys)
+
+
+def get_voucher_snapshot(code):
     """
-    Returns a voucher from cache if one is stored to cache, if not the voucher
-    is retrieved from database and stored to cache.
+    Returns a snapshot of a voucher, with its best offer, and the offer's condition, benefit and range resolved.
+
+    Snapshots are cached across processes. They are invalidated whenever the voucher changes, and whenever
+    an offer, condition, benefit, range or waffle switch changes. The products of the range are not part of
+    the snapshot, since those of class based, catalog query and all products ranges change without notice.
 
     Arguments:
         code (str): The code of a coupon voucher.
 
     Returns:
-        voucher (Voucher): The Voucher for the passed code.
+        Voucher: The Voucher for the passed code, whose `best_offer` is resolved.
 
     Raises:
         Voucher.DoesNotExist: When no vouchers with provided code exist.
     """
-    voucher_code = 'voucher_{code}'.format(code=code)
-    cache_key = hashlib.md5(voucher_code).hexdigest()
-    voucher_cached_response = TieredCache.get_cached_response(cache_key)
-    if voucher_cached_response.is_found:
-        return voucher_cached_response.value
+    cache_key = _get_voucher_snapshot_cache_key(code)
+    snapshot_cached_response = TieredCache.get_cached_response(cache_key)
+    if snapshot_cached_response.is_found:
+        return snapshot_cached_response.value
 
     voucher = Voucher.objects.get(code=code)
+    voucher.resolve_best_offer()
 
     TieredCache.set_all_tiers(cache_key, voucher, settings.VOUCHER_CACHE_TIMEOUT)
     return voucher
 
 
+def get_cached_voucher(code):
+    """
+    Returns a voucher from cache if one is stored to cache, if not the voucher
+    is retrieved from database and stored to cache.
+
+    Arguments:
+        code (str): The code of a coupon voucher.
+
+    Returns:
+        voucher (Voucher): The Voucher for the passed code.
+
+    Raises:
+        Voucher.DoesNotExist: When no vouchers with provided code exist.
+    """
+    return get_voucher_snapshot(code)
+
+
 def get_voucher_and_products_from_code(code):
     """
     Returns a voucher and product for a given code.
@@ -919,7 +1066,11 @@ def get_voucher_and_products_from_code(code):
     has_catalog_configuration = voucher_range and (voucher_range.catalog_query or voucher_range.course_catalog)
     is_enterprise = ((voucher_range and voucher_range.enterprise_customer) or
                      voucher.best_offer.condition.enterprise_customer_uuid)
-    products = voucher_range.all_products() if voucher_range else []
+    products = []
+    if voucher_range:
+        # The IDs of the range's products may have been cached on the range of a snapshot held in the request cache.
+        voucher_range.invalidate_cached_ids()
+        products = voucher_range.all_products()
 
     if products or has_catalog_configuration or is_enterprise:
         # List of products is empty in case of Multi-course coupon
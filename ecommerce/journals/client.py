@@ -4,8 +4,8 @@ Utility Functions to Access the Discovery Journal API and the Journals Service A
 import logging
 
 from edx_django_utils.cache import TieredCache
-from edx_rest_api_client.client import EdxRestApiClient
 
+from ecommerce.core.service_clients import get_service_client
 from ecommerce.core.utils import get_cache_key
 from ecommerce.journals.constants import JOURNAL_BUNDLE_CACHE_TIMEOUT
 
@@ -16,10 +16,7 @@ def get_journals_service_client(site_configuration):
     """
     Returns Journals Service client
     """
-    return EdxRestApiClient(
-        site_configuration.journals_api_url,
-        jwt=site_configuration.access_token
-    )
+    return get_service_client(site_configuration, 'journals', site_configuration.journals_api_url)
 
 
 # TODO: WL-1680: All calls from ecommerce to other services should be async
@@ -65,6 +62,62 @@ def revoke_journal_access(site_configuration, order_number):
     return client.journalaccess.post(data)
 
 
+class JournalBundleIndex(object):
+    """
+    SKUs of a journal bundle, compiled from the bundle document.
+
+    Attributes:
+        course_skus (tuple): (course key, frozenset of the SKUs of its applicable seats) for each course of the bundle.
+        journal_skus (frozenset): SKUs of the journals of the bundle.
+        skus (frozenset): All of the course and journal SKUs.
+    """
+
+    def __init__(self, journal_bundle):
+        applicable_seat_types = journal_bundle['applicable_seat_types']
+        skus_by_course = {}
+        for course in journal_bundle['courses']:
+            skus_by_course[course['key']] = frozenset(
+                seat['sku']
+                for course_run in course['course_runs']
+                for seat in course_run['seats']
+                if seat['type'] in applicable_seat_types
+            )
+
+        self.course_skus = tuple((course['key'], skus_by_course[course['key']]) for course in journal_bundle['courses'])
+        self.journal_skus = frozenset(journal['sku'] for journal in journal_bundle['journals'])
+        self.skus = self.journal_skus.union(*skus_by_course.values())
+
+    @property
+    def all_course_skus(self):
+        return frozenset().union(*[skus for __, skus in self.course_skus])
+
+    def contains_all_courses(self, basket_skus):
+        """
+        Returns True if the basket SKUs contain a SKU for every course of the bundle.
+
+        The SKUs of each course are removed from those left to check once the course is found, so that a
+        single SKU cannot stand for two courses.
+        """
+        remaining = frozenset(basket_skus)
+        for __, skus in self.course_skus:
+            if remaining.isdisjoint(skus):
+                return False
+            remaining = remaining.difference(skus)
+        return True
+
+    def contains_all_journals(self, basket_skus):
+        """ Returns True if the basket SKUs contain the SKU of every journal of the bundle. """
+        return self.journal_skus.issubset(basket_skus)
+
+
+def _get_journal_bundle_cache_key(site, journal_bundle_uuid, resource='journal_bundle'):
+    return get_cache_key(
+        site_domain=site.domain,
+        resource=resource,
+        journal_bundle_uuid=journal_bundle_uuid
+    )
+
+
 # TODO: WL-1680: All calls from ecommerce to other services should be async
 def fetch_journal_bundle(site, journal_bundle_uuid):
     """
@@ -85,13 +138,7 @@ def fetch_journal_bundle(site, journal_bundle_uuid):
         Timeout: request is raised if API is taking too long to respond
     """
 
-    api_resource = 'journal_bundle'
-    cache_key = get_cache_key(
-        site_domain=site.domain,
-        resource=api_resource,
-        journal_bundle_uuid=journal_bundle_uuid
-    )
-
+    cache_key = _get_journal_bundle_cache_key(site, journal_bundle_uuid)
     journal_bundle_cached_response = TieredCache.get_cached_response(cache_key)
     if journal_bundle_cached_response.is_found:
         return journal_bundle_cached_response.value
@@ -100,4 +147,28 @@ def fetch_journal_bundle(site, journal_bundle_uuid):
     journal_bundle = client.journal_bundles(journal_bundle_uuid).get()
     TieredCache.set_all_tiers(cache_key, journal_bundle, JOURNAL_BUNDLE_CACHE_TIMEOUT)
 
+    # The index of the bundle is replaced along with the bundle, so that it is never compiled from an older document.
+    index_cache_key = _get_journal_bundle_cache_key(site, journal_bundle_uuid, resource='journal_bundle_index')
+    if journal_bundle:
+        TieredCache.set_all_tiers(index_cache_key, JournalBundleIndex(journal_bundle), JOURNAL_BUNDLE_CACHE_TIMEOUT)
+    else:
+        TieredCache.delete_all_tiers(index_cache_key)
+
     return journal_bundle
+
+
+def get_journal_bundle_index(site, journal_bundle):
+    """
+    Returns the compiled index of a journal bundle fetched by fetch_journal_bundle.
+
+    Indexes are cached with the bundle document, under the same site and TTL. An index is only compiled here
+    if its cache entry was evicted before that of the bundle.
+    """
+    cache_key = _get_journal_bundle_cache_key(site, journal_bundle['uuid'], resource='journal_bundle_index')
+    cached_response = TieredCache.get_cached_response(cache_key)
+    if cached_response.is_found:
+        return cached_response.value
+
+    index = JournalBundleIndex(journal_bundle)
+    TieredCache.set_all_tiers(cache_key, index, JOURNAL_BUNDLE_CACHE_TIMEOUT)
+    return index
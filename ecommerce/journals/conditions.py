@@ -10,7 +10,7 @@ from slumber.exceptions import HttpNotFoundError, SlumberBaseException
 
 from ecommerce.extensions.offer.decorators import check_condition_applicability
 from ecommerce.extensions.offer.mixins import SingleItemConsumptionConditionMixin
-from ecommerce.journals.client import fetch_journal_bundle
+from ecommerce.journals.client import fetch_journal_bundle, get_journal_bundle_index
 
 Condition = get_model('offer', 'Condition')
 
@@ -30,41 +30,38 @@ class JournalBundleCondition(SingleItemConsumptionConditionMixin, Condition):
     def name(self):
         return 'Basket contains every product in bundle {}'.format(self.journal_bundle_uuid)
 
+    _index = None
+    _indexed_bundle = None
+    _journal_bundle_site = None
+
+    @property
+    def journal_bundle_index(self):
+        """ Compiled index of the journal bundle, or None if the bundle has not been fetched. """
+        if not self.journal_bundle:
+            return None
+
+        if self._indexed_bundle is not self.journal_bundle:
+            self._index = get_journal_bundle_index(self._journal_bundle_site, self.journal_bundle)
+            self._indexed_bundle = self.journal_bundle
+
+        return self._index
+
     def get_applicable_course_skus(self, return_set=False):
         """
         Returns a dict of applicable SKUs for each course,
         unless return_set flag is set, then all skus are returned as one set
 
         """
-        course_skus = {}
-        if self.journal_bundle:
-            applicable_seat_types = self.journal_bundle['applicable_seat_types']
-
-            for course in self.journal_bundle['courses']:
-                course_skus[course['key']] = set()
-                for course_run in course['course_runs']:
-                    course_skus[course['key']].update(
-                        set([seat['sku'] for seat in course_run['seats'] if seat['type'] in applicable_seat_types])
-                    )
-
+        index = self.journal_bundle_index
         if return_set:
-            sku_set = set()
-            for course_sku_set in course_skus.values():
-                sku_set.update(course_sku_set)
+            return index.all_course_skus if index else frozenset()
 
-            course_skus = sku_set   # pylint: disable=redefined-variable-type
-
-        return course_skus
+        return dict(index.course_skus) if index else {}
 
     def get_applicable_journal_skus(self):
         """ Returns set of journal SKUs to which this condition applies. """
-        journal_skus = set()
-
-        if self.journal_bundle:
-            for journal in self.journal_bundle['journals']:
-                journal_skus.update([journal['sku']])
-
-        return journal_skus
+        index = self.journal_bundle_index
+        return index.journal_skus if index else frozenset()
 
     def _basket_contains_all_required_courses(self):
         """
@@ -75,30 +72,7 @@ class JournalBundleCondition(SingleItemConsumptionConditionMixin, Condition):
         Usage Note: This function assumes self.basket_skus has already been set, this function should only be called
             from 'is_satisfied'
         """
-        applicable_skus = self.get_applicable_course_skus()
-        for course in self.journal_bundle['courses']:
-            # If the basket has no SKUs left, but we still have courses over which to iterate,
-            # the user cannot meet the condition that all courses be represented.
-            if not self.basket_skus:
-                return False
-
-            # Get all of the SKUs that can satisfy this course
-            skus = applicable_skus[course['key']]
-
-            # The lack of a difference in the set of SKUs in the basket and the course indicates that
-            # there is no intersection.  Therefore, the basket contains no SKUs for the current course.
-            # It follows that the journal bundle condition is not met.
-            diff = self.basket_skus.difference(skus)
-            if diff == self.basket_skus:
-                return False
-
-            # If there is a difference between the basket SKUs and the course SKUs and course SKUs,
-            # it represents the basket SKUs minus the SKUs for the current course.  Since we have already
-            # verified the course is represented, its SKUs can be safely removed from the set of SKUs
-            # in the basket being checked. (It does not affect the actual basket, just our copy)
-            self.basket_skus = diff
-
-        return True
+        return self.journal_bundle_index.contains_all_courses(self.basket_skus)
 
     def _basket_contains_all_journals(self):
         """
@@ -107,14 +81,7 @@ class JournalBundleCondition(SingleItemConsumptionConditionMixin, Condition):
         Usage Note: This function assumes self.basket_skus has already been set, this function should only be called
             from 'is_satisfied'
         """
-        applicable_journal_skus = self.get_applicable_journal_skus()
-
-        # In order for this condition to be applied all applicable journal skus must be present in the basket
-        # in other words, the applicable skus must be a subset of the basket skus
-        if applicable_journal_skus.issubset(self.basket_skus):
-            return True
-
-        return False
+        return self.journal_bundle_index.contains_all_journals(self.basket_skus)
 
     @check_condition_applicability()
     def is_satisfied(self, offer, basket):  # pylint: disable=unused-argument
@@ -134,6 +101,7 @@ class JournalBundleCondition(SingleItemConsumptionConditionMixin, Condition):
                 site=basket.site,
                 journal_bundle_uuid=self.journal_bundle_uuid
             )
+            self._journal_bundle_site = basket.site
         except (HttpNotFoundError, SlumberBaseException, Timeout):
             return False
 
@@ -142,7 +110,7 @@ class JournalBundleCondition(SingleItemConsumptionConditionMixin, Condition):
 
         # self._basket_contains_all_required_courses and self._basket_contains_all_journals require self.basket_skus to
         # be set before they are called.
-        self.basket_skus = set([line.stockrecord.partner_sku for line in basket.all_lines()])
+        self.basket_skus = frozenset(line.stockrecord.partner_sku for line in basket.all_lines())
 
         if not self._basket_contains_all_required_courses():
             return False
@@ -154,16 +122,15 @@ class JournalBundleCondition(SingleItemConsumptionConditionMixin, Condition):
 
     def get_applicable_skus(self, site):
         """ Returns set of SKUs to which this condition applies. """
-        journal_bundle_skus = set()
         # TODO: WL-1680: All calls from ecommerce to other services should be async
         self.journal_bundle = fetch_journal_bundle(
             site=site,
             journal_bundle_uuid=self.journal_bundle_uuid
         )
+        self._journal_bundle_site = site
 
-        journal_bundle_skus.update(self.get_applicable_course_skus(return_set=True))
-        journal_bundle_skus.update(self.get_applicable_journal_skus())
-        return journal_bundle_skus
+        index = self.journal_bundle_index
+        return index.skus if index else frozenset()
 
     def can_apply_condition(self, line):
         """ Determines whether the condition can be applied to a given basket line. """
@@ -14,6 +14,7 @@ from edx_rest_api_client.client import EdxRestApiClient
 from ecommerce.core.utils import get_cache_key
 from ecommerce.journals.client import (
     fetch_journal_bundle,
+    get_journal_bundle_index,
     get_journals_service_client,
     post_journal_access,
     revoke_journal_access
@@ -252,3 +253,36 @@ class JournalClientTests(JournalTestCase):
 
         self.assertEqual(len(responses.calls), 2, "Should have hit cache, not called API")
         self.assertEqual(journal_bundle_response, test_bundle)
+
+    @responses.activate
+    def test_fetch_journal_bundle_index(self):
+        """ Test the index of a journal bundle is cached with the bundle, and replaced when the bundle is fetched. """
+        journal_bundle_uuid = '4786e7be-2390-4332-a20e-e24895c38109'
+        test_url = urljoin(self.journal_discovery_url, 'journal_bundles/{}/'.format(journal_bundle_uuid))
+
+        def mock_bundle(journal_sku):
+            responses.reset()
+            self.mock_access_token_response()
+            bundle = {
+                'uuid': journal_bundle_uuid,
+                'journals': [{'sku': journal_sku}],
+                'courses': [],
+                'applicable_seat_types': ['verified'],
+            }
+            responses.add(responses.GET, test_url, json=bundle, status=200)
+
+        mock_bundle('SKU1')
+        journal_bundle = fetch_journal_bundle(site=self.site, journal_bundle_uuid=journal_bundle_uuid)
+        index = get_journal_bundle_index(self.site, journal_bundle)
+        self.assertEqual(index.skus, frozenset(['SKU1']))
+        self.assertIs(get_journal_bundle_index(self.site, journal_bundle), index)
+
+        # Once the bundle is fetched again, its index is compiled from the new document.
+        mock_bundle('SKU2')
+        TieredCache.delete_all_tiers(get_cache_key(
+            site_domain=self.site.domain,
+            resource='journal_bundle',
+            journal_bundle_uuid=journal_bundle_uuid
+        ))
+        journal_bundle = fetch_journal_bundle(site=self.site, journal_bundle_uuid=journal_bundle_uuid)
+        self.assertEqual(get_journal_bundle_index(self.site, journal_bundle).skus, frozenset(['SKU2']))
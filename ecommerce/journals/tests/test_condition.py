@@ -1,9 +1,12 @@
+import copy
+
 import mock
 from oscar.core.loading import get_model
 from requests.exceptions import Timeout
 from slumber.exceptions import HttpNotFoundError, SlumberBaseException
 
 from ecommerce.extensions.test import factories
+from ecommerce.journals.client import get_journal_bundle_index
 from ecommerce.journals.tests.mixins import JournalMixin  # pylint: disable=no-name-in-module
 from ecommerce.tests.testcases import TestCase
 
@@ -135,3 +138,31 @@ class JournalBundleConditionTests(TestCase, JournalMixin):
         """ Test 'get_applicable_lines' where the journal bundle is None """
         mock_journal_api_response.return_value = None
         self.assertEqual(self.condition.get_applicable_lines(self.offer, self.basket), [])
+
+    def test_journal_bundle_index(self, mocked_journal_api_response):
+        """ Test the SKUs of the journal bundle are compiled into an index, which is cached for the site. """
+        journal_bundle = self.get_mocked_discovery_journal_bundle(
+            multiple_courses=True, applicable_seat_types=['honor']
+        )
+        mocked_journal_api_response.return_value = journal_bundle
+
+        index = get_journal_bundle_index(self.site, journal_bundle)
+        self.assertEqual(
+            index.course_skus, (('ABC+ABC101', frozenset(['unit02'])), ('DEF+DEF101', frozenset(['sku02'])))
+        )
+        self.assertEqual(index.journal_skus, frozenset(['4F0B1GZ', '3FPB1GZ']))
+        self.assertEqual(
+            self.condition.get_applicable_skus(self.site), frozenset(['unit02', 'sku02', '4F0B1GZ', '3FPB1GZ'])
+        )
+
+        self.assertIs(get_journal_bundle_index(self.site, copy.deepcopy(journal_bundle)), index)
+
+    def test_journal_bundle_index_courses(self, mocked_journal_api_response):  # pylint: disable=unused-argument
+        """ Test a SKU of the basket cannot stand for more than one course of the bundle. """
+        journal_bundle = copy.deepcopy(self.get_mocked_discovery_journal_bundle(multiple_courses=True))
+        journal_bundle['courses'][1]['course_runs'][0]['seats'][0]['sku'] = 'unit01'
+        index = get_journal_bundle_index(self.site, journal_bundle)
+
+        self.assertFalse(index.contains_all_courses({'unit01'}))
+        self.assertTrue(index.contains_all_courses({'unit01', 'sku02'}))
+        self.assertFalse(index.contains_all_courses(set()))
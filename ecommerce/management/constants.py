@@ -0,0 +1,14 @@
+class ManagementJobAction(object):
+    REFUND_BASKET_TRANSACTIONS = 'refund_basket_transactions'
+    FULFILL = 'fulfill'
+
+
+class ManagementJobItemStatus(object):
+    PENDING = 'Pending'
+    RUNNING = 'Running'
+    SUCCEEDED = 'Succeeded'
+    FAILED = 'Failed'
+
+
+# switch is used to run the actions of the management view as background jobs
+MANAGEMENT_BACKGROUND_JOBS_SWITCH = 'enable_management_background_jobs'
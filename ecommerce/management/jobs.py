@@ -0,0 +1,210 @@
+""" Background jobs for the bulk actions of the management view.
+
+A job records one item per basket. Items are processed by Celery tasks, with at most
+MANAGEMENT_JOB_CONCURRENCY tasks working on the baskets of each payment processor at a time.
+The outcome of each basket is recorded on its item, so that a failed job can be resumed
+without processing the baskets which succeeded again. Refunds also record each transaction
+they refund, so that a resumed refund does not issue credit for those transactions again.
+"""
+from __future__ import unicode_literals
+
+import datetime
+import logging
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+
+from ecommerce.management.constants import ManagementJobAction, ManagementJobItemStatus
+from ecommerce.management.models import ManagementJob, ManagementJobItem, ManagementJobLane
+from ecommerce.management.utils import FulfillFrozenBaskets, refund_basket
+
+logger = logging.getLogger(__name__)
+Basket = get_model('basket', 'Basket')
+PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
+
+# Running items and lanes which have not been updated for this long belong to a task which died. The items are
+# retried on resume, and the lanes no longer count towards the concurrency of their processor.
+RUNNING_ITEM_TIMEOUT = datetime.timedelta(minutes=30)
+
+
+def _refund_basket(item):
+    try:
+        basket = Basket.objects.get(site=item.job.site, id=item.basket_id)
+    except Basket.DoesNotExist:
+        return False, 'Basket does not exist.'
+
+    def record_refund(processor_name, transaction_id):
+        item.refunded_transactions.append([processor_name, transaction_id])
+        item.save(update_fields=['refunded_transactions', 'modified'])
+
+    already_refunded = len(item.refunded_transactions)
+    success_count, failure_count = refund_basket(
+        item.job.site, basket, exclude_transactions=list(item.refunded_transactions), on_refund=record_refund
+    )
+    message = '[{}] transactions were successfully refunded. [{}] attempts failed.'.format(
+        success_count, failure_count
+    )
+    if already_refunded:
+        message += ' [{}] transactions had already been refunded.'.format(already_refunded)
+    return failure_count == 0, message
+
+
+def _fulfill_basket(item):
+    if FulfillFrozenBaskets().fulfill_basket(basket_id=item.basket_id, site=item.job.site):
+        return True, 'Fulfilled basket.'
+    return False, 'Unable to fulfill basket.'
+
+
+# Handlers are called with the item of a basket. They return whether the basket was processed successfully,
+# and a message describing the outcome.
+JOB_HANDLERS = {
+    ManagementJobAction.REFUND_BASKET_TRANSACTIONS: _refund_basket,
+    ManagementJobAction.FULFILL: _fulfill_basket,
+}
+
+
+def get_processor_concurrency(processor_name):
+    """ Returns the number of tasks which may process the baskets of a payment processor at a time. """
+    concurrency = settings.MANAGEMENT_JOB_CONCURRENCY
+    return concurrency.get(processor_name, concurrency['default'])
+
+
+def submit_job(site, user, action, basket_ids):
+    """
+    Create a job processing the given baskets. The job is run by the start_management_job task.
+
+    Returns:
+        ManagementJob
+    """
+    job = ManagementJob.objects.create(site=site, user=user, action=action)
+
+    processor_names = dict(
+        # The latest response of each basket is written last.
+        PaymentProcessorResponse.objects.filter(basket_id__in=basket_ids).order_by('id').values_list(
+            'basket_id', 'processor_name'
+        )
+    )
+    ManagementJobItem.objects.bulk_create(
+        ManagementJobItem(job=job, basket_id=basket_id, processor_name=processor_names.get(basket_id, ''))
+        for basket_id in sorted(set(basket_ids))
+    )
+
+    logger.info('User [%s] submitted [%s] job [%d] for [%d] baskets.', user, action, job.id, len(basket_ids))
+    return job
+
+
+def start_job_lanes(job_id):
+    """
+    Record a lane for each task to be started on the pending items of a job. Each payment processor of the
+    pending items gets as many lanes as it may have tasks at a time, less the lanes of the job which are
+    still running.
+
+    Returns:
+        list: The new ManagementJobLane objects.
+    """
+    with transaction.atomic():
+        # Locking the job keeps concurrent starts of the job from exceeding the concurrency of its processors.
+        ManagementJob.objects.select_for_update().get(id=job_id)
+
+        lanes = ManagementJobLane.objects.filter(job_id=job_id)
+        lanes.filter(modified__lt=now() - RUNNING_ITEM_TIMEOUT).delete()
+        active_lanes = Counter(lanes.values_list('processor_name', flat=True))
+
+        processor_names = set(
+            ManagementJobItem.objects.filter(job_id=job_id, status=ManagementJobItemStatus.PENDING).values_list(
+                'processor_name', flat=True
+            )
+        )
+        return [
+            ManagementJobLane.objects.create(job_id=job_id, processor_name=processor_name)
+            for processor_name in sorted(processor_names)
+            for __ in range(get_processor_concurrency(processor_name) - active_lanes[processor_name])
+        ]
+
+
+def resume_job(job):
+    """
+    Retry the items of a job which failed, or whose task died. The job is run again by the start_management_job task.
+
+    Returns:
+        int: Number of items which will be retried.
+    """
+    items = job.items.filter(status=ManagementJobItemStatus.FAILED) | job.items.filter(
+        status=ManagementJobItemStatus.RUNNING, modified__lt=now() - RUNNING_ITEM_TIMEOUT
+    )
+    count = items.update(status=ManagementJobItemStatus.PENDING, modified=now())
+    logger.info('Resuming [%d] items of management job [%d].', count, job.id)
+    return count
+
+
+def _claim_next_item(job_id, processor_name):
+    """ Claim the next pending item, so that the other tasks of the job do not process it as well. """
+    pending = ManagementJobItem.objects.filter(
+        job_id=job_id, processor_name=processor_name, status=ManagementJobItemStatus.PENDING
+    )
+    # Each concurrent task may claim one of the candidates before this one does.
+    candidates = get_processor_concurrency(processor_name) + 1
+    for item_id in pending.values_list('id', flat=True)[:candidates]:
+        claimed = pending.filter(id=item_id).update(
+            status=ManagementJobItemStatus.RUNNING, attempts=F('attempts') + 1, modified=now()
+        )
+        if claimed:
+            return ManagementJobItem.objects.select_related('job__site').get(id=item_id)
+    return None
+
+
+def process_lane(lane_id):
+    """
+    Process the pending items of a lane, and remove the lane once none are left.
+
+    Returns:
+        int: Number of items processed.
+    """
+    try:
+        lane = ManagementJobLane.objects.get(id=lane_id)
+    except ManagementJobLane.DoesNotExist:
+        logger.warning('Management job lane [%d] does not exist.', lane_id)
+        return 0
+
+    try:
+        return process_items(lane.job_id, lane.processor_name, lane=lane)
+    finally:
+        lane.delete()
+
+
+def process_items(job_id, processor_name, lane=None):
+    """
+    Process the pending items of a job for a payment processor, one at a time, until none are left.
+
+    Arguments:
+        job_id (int): ID of the job.
+        processor_name (str): Name of the payment processor of the items.
+        lane (ManagementJobLane): Lane of the task processing the items, which is kept alive as items are processed.
+
+    Returns:
+        int: Number of items processed.
+    """
+    processed = 0
+    item = _claim_next_item(job_id, processor_name)
+    while item is not None:
+        if lane:
+            ManagementJobLane.objects.filter(id=lane.id).update(modified=now())
+
+        handler = JOB_HANDLERS[item.job.action]
+        try:
+            succeeded, message = handler(item)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.exception('Management job [%d] failed to process basket [%d].', job_id, item.basket_id)
+            succeeded, message = False, '{}: {}'.format(e.__class__.__name__, e)
+
+        item.status = ManagementJobItemStatus.SUCCEEDED if succeeded else ManagementJobItemStatus.FAILED
+        item.message = message
+        item.save(update_fields=['status', 'message', 'modified'])
+        processed += 1
+        item = _claim_next_item(job_id, processor_name)
+
+    return processed
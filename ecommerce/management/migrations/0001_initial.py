@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-19 11:39
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+import django_extensions.db.fields
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('sites', '0002_alter_domain_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ManagementJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('action', models.CharField(choices=[(b'refund_basket_transactions', b'refund_basket_transactions'), (b'fulfill', b'fulfill')], max_length=64)),
+                ('site', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='sites.Site')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('-created',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ManagementJobItem',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('basket_id', models.PositiveIntegerField()),
+                ('processor_name', models.CharField(blank=True, max_length=255)),
+                ('status', models.CharField(choices=[(b'Pending', b'Pending'), (b'Running', b'Running'), (b'Succeeded', b'Succeeded'), (b'Failed', b'Failed')], default=b'Pending', max_length=16)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('message', models.TextField(blank=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='management.ManagementJob')),
+            ],
+            options={
+                'ordering': ('id',),
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='managementjobitem',
+            unique_together=set([('job', 'basket_id')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='managementjobitem',
+            index_together=set([('job', 'status', 'processor_name')]),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from ecommerce.management.constants import MANAGEMENT_BACKGROUND_JOBS_SWITCH
+
+
+def create_switch(apps, schema_editor):
+    Switch = apps.get_model('waffle', 'Switch')
+    Switch.objects.get_or_create(name=MANAGEMENT_BACKGROUND_JOBS_SWITCH, defaults={'active': False})
+
+
+def delete_switch(apps, schema_editor):
+    Switch = apps.get_model('waffle', 'Switch')
+    Switch.objects.filter(name=MANAGEMENT_BACKGROUND_JOBS_SWITCH).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('management', '0001_initial'),
+        ('waffle', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_switch, reverse_code=delete_switch),
+    ]
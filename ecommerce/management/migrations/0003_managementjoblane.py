@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-19 15:31
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django_extensions.db.fields
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('management', '0002_create_management_background_jobs_switch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ManagementJobLane',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('processor_name', models.CharField(blank=True, max_length=255)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lanes', to='management.ManagementJob')),
+            ],
+            options={
+                'ordering': ('-modified', '-created'),
+                'abstract': False,
+                'get_latest_by': 'modified',
+            },
+        ),
+        migrations.AddField(
+            model_name='managementjobitem',
+            name='refunded_transactions',
+            field=jsonfield.fields.JSONField(default=list),
+        ),
+    ]
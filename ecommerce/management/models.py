@@ -0,0 +1,73 @@
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import models
+from django_extensions.db.models import TimeStampedModel
+from jsonfield import JSONField
+
+from ecommerce.management.constants import ManagementJobAction, ManagementJobItemStatus
+
+
+class ManagementJob(TimeStampedModel):
+    """ A bulk action of the management view, run in the background one basket at a time. """
+    ACTION_CHOICES = (
+        (ManagementJobAction.REFUND_BASKET_TRANSACTIONS, ManagementJobAction.REFUND_BASKET_TRANSACTIONS),
+        (ManagementJobAction.FULFILL, ManagementJobAction.FULFILL),
+    )
+
+    site = models.ForeignKey('sites.Site', on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, on_delete=models.SET_NULL)
+    action = models.CharField(max_length=64, choices=ACTION_CHOICES)
+
+    class Meta(object):
+        ordering = ('-created',)
+
+    def __unicode__(self):
+        return '{action} job [{id}]'.format(action=self.action, id=self.id)
+
+    @property
+    def status_counts(self):
+        """ Returns the number of items of the job in each status. """
+        counts = {status: 0 for status, __ in ManagementJobItem.STATUS_CHOICES}
+        counts.update(self.items.values_list('status').annotate(count=models.Count('id')).order_by())
+        return counts
+
+    @property
+    def is_finished(self):
+        return not self.items.filter(
+            status__in=(ManagementJobItemStatus.PENDING, ManagementJobItemStatus.RUNNING)
+        ).exists()
+
+
+class ManagementJobItem(TimeStampedModel):
+    """ The processing of a single basket by a management job. """
+    STATUS_CHOICES = (
+        (ManagementJobItemStatus.PENDING, ManagementJobItemStatus.PENDING),
+        (ManagementJobItemStatus.RUNNING, ManagementJobItemStatus.RUNNING),
+        (ManagementJobItemStatus.SUCCEEDED, ManagementJobItemStatus.SUCCEEDED),
+        (ManagementJobItemStatus.FAILED, ManagementJobItemStatus.FAILED),
+    )
+
+    job = models.ForeignKey(ManagementJob, related_name='items', on_delete=models.CASCADE)
+    basket_id = models.PositiveIntegerField()
+    # Name of the payment processor of the basket. Items are processed with bounded parallelism per processor.
+    processor_name = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=ManagementJobItemStatus.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    message = models.TextField(blank=True)
+    # Processor names and IDs of the transactions refunded so far, so that a resumed job does not refund them again.
+    refunded_transactions = JSONField(default=list)
+
+    class Meta(object):
+        index_together = ('job', 'status', 'processor_name')
+        ordering = ('id',)
+        unique_together = ('job', 'basket_id')
+
+
+class ManagementJobLane(TimeStampedModel):
+    """
+    A task processing the items of a job paid with a payment processor. Lanes are recorded while their task runs,
+    so that starting or resuming a job does not exceed the concurrency of the processor.
+    """
+    job = models.ForeignKey(ManagementJob, related_name='lanes', on_delete=models.CASCADE)
+    processor_name = models.CharField(max_length=255, blank=True)
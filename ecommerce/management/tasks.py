@@ -0,0 +1,19 @@
+""" Celery tasks which run the background jobs of the management view. """
+from __future__ import unicode_literals
+
+from celery import shared_task
+
+from ecommerce.management.jobs import process_lane, start_job_lanes
+
+
+@shared_task(ignore_result=True)
+def start_management_job(job_id):
+    """ Start the tasks processing the pending baskets of a management job, with bounded parallelism per processor. """
+    for lane in start_job_lanes(job_id):
+        process_management_job_items.delay(lane.id)
+
+
+@shared_task(ignore_result=True)
+def process_management_job_items(lane_id):
+    """ Process the pending baskets of a management job paid with the payment processor of a lane. """
+    process_lane(lane_id)
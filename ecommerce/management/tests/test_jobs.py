@@ -0,0 +1,149 @@
+import datetime
+
+import mock
+from django.test import override_settings
+from django.utils.timezone import now
+
+from ecommerce.extensions.payment.models import PaymentProcessorResponse
+from ecommerce.extensions.payment.processors.paypal import Paypal
+from ecommerce.extensions.test.factories import create_basket
+from ecommerce.management.constants import ManagementJobAction, ManagementJobItemStatus
+from ecommerce.management.jobs import RUNNING_ITEM_TIMEOUT, process_items, resume_job, submit_job
+from ecommerce.management.models import ManagementJobItem
+from ecommerce.management.tasks import start_management_job
+from ecommerce.management.utils import FulfillFrozenBaskets
+from ecommerce.tests.testcases import TestCase
+
+
+class ManagementJobTests(TestCase):
+    def setUp(self):
+        super(ManagementJobTests, self).setUp()
+        self.user = self.create_user(is_superuser=True)
+
+    def submit_job(self, action, basket_ids):
+        return submit_job(self.site, self.user, action, basket_ids)
+
+    @override_settings(MANAGEMENT_JOB_CONCURRENCY={'default': 2, 'paypal': 1})
+    def test_submit_job(self):
+        """ Verify an item is created for each basket, and a task started per lane of each payment processor. """
+        paypal_basket = create_basket(site=self.site)
+        PaymentProcessorResponse.objects.create(basket=paypal_basket, processor_name='cybersource')
+        PaymentProcessorResponse.objects.create(basket=paypal_basket, processor_name='paypal')
+        cybersource_basket = create_basket(site=self.site)
+        PaymentProcessorResponse.objects.create(basket=cybersource_basket, processor_name='cybersource')
+
+        job = self.submit_job(ManagementJobAction.FULFILL, [paypal_basket.id, cybersource_basket.id])
+        with mock.patch('ecommerce.management.tasks.process_management_job_items.delay') as mock_delay:
+            start_management_job(job.id)
+
+        self.assertEqual(
+            list(job.items.values_list('basket_id', 'processor_name', 'status')),
+            [
+                (paypal_basket.id, 'paypal', ManagementJobItemStatus.PENDING),
+                (cybersource_basket.id, 'cybersource', ManagementJobItemStatus.PENDING),
+            ]
+        )
+        lanes = job.lanes.order_by('id')
+        self.assertEqual(
+            sorted(lanes.values_list('processor_name', flat=True)), ['cybersource', 'cybersource', 'paypal']
+        )
+        mock_delay.assert_has_calls([mock.call(lane.id) for lane in lanes], any_order=True)
+        self.assertEqual(mock_delay.call_count, 3)
+
+    @override_settings(MANAGEMENT_JOB_CONCURRENCY={'default': 2})
+    def test_start_with_running_lanes(self):
+        """ Verify starting a job again only starts the lanes which are not running, or whose task died. """
+        job = self.submit_job(ManagementJobAction.FULFILL, [1, 2])
+        with mock.patch('ecommerce.management.tasks.process_management_job_items.delay') as mock_delay:
+            start_management_job(job.id)
+            self.assertEqual(mock_delay.call_count, 2)
+
+            start_management_job(job.id)
+            self.assertEqual(mock_delay.call_count, 2)
+
+            job.lanes.filter(id=job.lanes.first().id).update(
+                modified=now() - RUNNING_ITEM_TIMEOUT - datetime.timedelta(1)
+            )
+            start_management_job(job.id)
+            self.assertEqual(mock_delay.call_count, 3)
+        self.assertEqual(job.lanes.count(), 2)
+
+    def test_process_and_resume(self):
+        """ Verify the outcome of each basket is recorded, and that resuming a job retries its failed baskets only. """
+        job = self.submit_job(ManagementJobAction.FULFILL, [1, 2])
+
+        with mock.patch.object(FulfillFrozenBaskets, 'fulfill_basket', side_effect=[True, False]):
+            self.assertEqual(process_items(job.id, ''), 2)
+
+        self.assertEqual(job.status_counts[ManagementJobItemStatus.SUCCEEDED], 1)
+        self.assertEqual(job.status_counts[ManagementJobItemStatus.FAILED], 1)
+        self.assertTrue(job.is_finished)
+
+        self.assertEqual(resume_job(job), 1)
+        with mock.patch.object(FulfillFrozenBaskets, 'fulfill_basket', return_value=True) as mock_fulfill:
+            start_management_job.delay(job.id)
+            mock_fulfill.assert_called_once_with(basket_id=2, site=self.site)
+
+        self.assertEqual(job.status_counts[ManagementJobItemStatus.SUCCEEDED], 2)
+        self.assertEqual(job.items.get(basket_id=2).attempts, 2)
+        self.assertFalse(job.lanes.exists())
+
+    def test_resume_refund(self):
+        """ Verify resuming a refund does not refund the transactions which were refunded before again. """
+        basket = create_basket(site=self.site)
+        for transaction_id in ('abc', 'def'):
+            PaymentProcessorResponse.objects.create(
+                basket=basket, transaction_id=transaction_id, processor_name='paypal'
+            )
+        job = self.submit_job(ManagementJobAction.REFUND_BASKET_TRANSACTIONS, [basket.id])
+
+        with mock.patch.object(Paypal, 'issue_credit', side_effect=[None, ValueError('boom')]):
+            process_items(job.id, 'paypal')
+        item = job.items.get()
+        self.assertEqual(item.status, ManagementJobItemStatus.FAILED)
+        self.assertEqual(len(item.refunded_transactions), 1)
+        refunded_transaction_id = item.refunded_transactions[0][1]
+
+        resume_job(job)
+        with mock.patch.object(Paypal, 'issue_credit') as mock_issue_credit:
+            process_items(job.id, 'paypal')
+
+        self.assertEqual(mock_issue_credit.call_count, 1)
+        self.assertNotEqual(mock_issue_credit.call_args[0][2], refunded_transaction_id)
+        item = job.items.get()
+        self.assertEqual(item.status, ManagementJobItemStatus.SUCCEEDED)
+        self.assertEqual(
+            item.message,
+            '[1] transactions were successfully refunded. [0] attempts failed. '
+            '[1] transactions had already been refunded.'
+        )
+
+    def test_exception_and_stale_items(self):
+        """ Verify exceptions fail their item only, and that items of dead tasks are retried on resume. """
+        job = self.submit_job(ManagementJobAction.REFUND_BASKET_TRANSACTIONS, [1, 2, 3])
+
+        # Basket 3 is running, with a task which died before recording its outcome.
+        job.items.filter(basket_id=3).update(
+            status=ManagementJobItemStatus.RUNNING, modified=now() - RUNNING_ITEM_TIMEOUT - datetime.timedelta(1)
+        )
+        with mock.patch('ecommerce.management.jobs.refund_basket', side_effect=[(1, 0), ValueError('boom')]):
+            with mock.patch('ecommerce.management.jobs.Basket.objects.get'):
+                process_items(job.id, '')
+
+        failed = job.items.get(basket_id=2)
+        self.assertEqual(failed.status, ManagementJobItemStatus.FAILED)
+        self.assertEqual(failed.message, 'ValueError: boom')
+        self.assertFalse(job.is_finished)
+
+        self.assertEqual(resume_job(job), 2)
+        self.assertEqual(
+            set(job.items.filter(status=ManagementJobItemStatus.PENDING).values_list('basket_id', flat=True)),
+            {2, 3}
+        )
+
+    def test_missing_basket(self):
+        """ Verify refunds of baskets which do not exist fail. """
+        job = self.submit_job(ManagementJobAction.REFUND_BASKET_TRANSACTIONS, [0])
+        process_items(job.id, '')
+        item = ManagementJobItem.objects.get(job=job)
+        self.assertEqual((item.status, item.message), (ManagementJobItemStatus.FAILED, 'Basket does not exist.'))
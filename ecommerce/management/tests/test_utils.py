@@ -8,7 +8,7 @@ from ecommerce.extensions.basket.utils import prepare_basket
 from ecommerce.extensions.fulfillment.status import ORDER
 from ecommerce.extensions.order.constants import PaymentEventTypeName
 from ecommerce.extensions.payment.constants import CARD_TYPES
-from ecommerce.extensions.payment.models import PaymentProcessorResponse
+from ecommerce.extensions.payment.models import ArchivedPaymentProcessorResponse, PaymentProcessorResponse
 from ecommerce.extensions.payment.processors.cybersource import Cybersource
 from ecommerce.extensions.payment.processors.paypal import Paypal
 from ecommerce.extensions.test.factories import UserFactory, create_basket, prepare_voucher
@@ -47,6 +47,17 @@ class RefundBasketTransactionsTests(TestCase):
                 basket.order_number, basket, ppr.transaction_id, total, basket.currency
             )
 
+    def test_archived_transactions(self):
+        """ Verify the transactions of archived payment processor responses are refunded. """
+        basket = create_basket(site=self.site)
+        ArchivedPaymentProcessorResponse.archive(PaymentProcessorResponse.objects.filter(
+            id=PaymentProcessorResponse.objects.create(basket=basket, transaction_id='abc', processor_name='paypal').id
+        ))
+
+        with mock.patch.object(Paypal, 'issue_credit') as mock_issue_credit:
+            assert refund_basket_transactions(self.site, [basket.id]) == (1, 0,)
+            self.assertEqual(mock_issue_credit.call_args[0][2], 'abc')
+
     def test_failure(self):
         basket = create_basket(site=self.site)
         PaymentProcessorResponse.objects.create(basket=basket)
@@ -122,6 +133,14 @@ class FulfillFrozenBasketsTests(TestCase):
         PaymentEvent.objects.get(event_type__name=PaymentEventTypeName.PAID, amount=total,
                                  processor_name=Paypal.NAME)
 
+    def test_success_with_archived_response(self):
+        """ Test basket whose payment processor responses have been archived. """
+        basket = self._dummy_basket_data()
+        ArchivedPaymentProcessorResponse.archive(basket.paymentprocessorresponse_set.all())
+
+        assert FulfillFrozenBaskets().fulfill_basket(basket.id, self.site)
+        assert Order.objects.get(number=basket.order_number).status == 'Complete'
+
     def test_multiple_transactions(self):
         """ Test utility against multiple payment processor responses."""
         basket = self._dummy_basket_data()
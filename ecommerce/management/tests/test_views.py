@@ -1,7 +1,10 @@
 import mock
 from django.contrib import messages
 from django.urls import reverse
+from waffle.testutils import override_switch
 
+from ecommerce.management.constants import MANAGEMENT_BACKGROUND_JOBS_SWITCH, ManagementJobItemStatus
+from ecommerce.management.models import ManagementJob
 from ecommerce.management.utils import FulfillFrozenBaskets
 from ecommerce.tests.testcases import TestCase
 
@@ -62,3 +65,28 @@ class ManagementViewTests(TestCase):
             ], any_order=True)
 
         assert response.status_code == 200
+
+    @override_switch(MANAGEMENT_BACKGROUND_JOBS_SWITCH, active=True)
+    def test_background_job(self):
+        """ Verify actions are run as background jobs when the switch is active, and their progress shown. """
+        with mock.patch('ecommerce.management.views.transaction.on_commit') as mock_on_commit:
+            response = self.client.post(self.path, {'action': 'fulfill', 'basket_ids': '1,2,3'})
+            self.assertTrue(mock_on_commit.called)
+
+        job = ManagementJob.objects.get()
+        job_path = reverse('management:job', kwargs={'pk': job.pk})
+        self.assertRedirects(response, job_path)
+        self.assertEqual(job.user, self.user)
+        self.assertEqual(list(job.items.values_list('basket_id', flat=True)), [1, 2, 3])
+
+        response = self.client.get(job_path)
+        self.assertEqual(response.context['job'], job)
+        self.assertContains(response, 'http-equiv="refresh"')
+        self.assertContains(self.client.get(self.path), job_path)
+
+        job.items.update(status=ManagementJobItemStatus.FAILED)
+        with mock.patch('ecommerce.management.views.resume_job', return_value=3) as mock_resume:
+            response = self.client.post(job_path, follow=True)
+            mock_resume.assert_called_once_with(job)
+        self.assert_first_message(response, messages.INFO, 'Retrying 3 baskets.')
+        self.assertNotContains(response, 'http-equiv="refresh"')
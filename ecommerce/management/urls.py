@@ -4,4 +4,5 @@ from ecommerce.management import views
 
 urlpatterns = [
     url(r'^$', views.ManagementView.as_view(), name='index'),
+    url(r'^jobs/(?P<pk>\d+)/$', views.ManagementJobView.as_view(), name='job'),
 ]
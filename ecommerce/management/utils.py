@@ -7,6 +7,7 @@ from oscar.core.loading import get_class, get_model
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.payment.constants import CYBERSOURCE_CARD_TYPE_MAP
 from ecommerce.extensions.payment.helpers import get_processor_class_by_name
+from ecommerce.extensions.payment.models import ArchivedPaymentProcessorResponse
 from ecommerce.extensions.payment.processors import HandledProcessorResponse
 
 logger = logging.getLogger(__name__)
@@ -42,28 +43,9 @@ def refund_basket_transactions(site, basket_ids):
     failure_count = 0
 
     for basket in baskets:
-        basket.strategy = strategy.Default()
-        Applicator().apply(basket, basket.owner, None)
-
-        logger.info('Refunding transactions for basket [%d]...', basket.id)
-        transactions = set(
-            list(basket.paymentprocessorresponse_set.values_list('processor_name', 'transaction_id')))
-
-        for processor_name, transaction_id in transactions:
-            try:
-                logger.info('Issuing credit for [%s] transaction [%s] made against basket [%d]...', processor_name,
-                            transaction_id, basket.id)
-                payment_processor = _get_payment_processor(site, processor_name)
-                payment_processor.issue_credit(basket.order_number, basket, transaction_id, basket.total_excl_tax,
-                                               basket.currency)
-                success_count += 1
-                logger.info('Successfully issued credit for [%s] transaction [%s] made against basket [%d].',
-                            processor_name, transaction_id, basket.id)
-            except Exception:  # pylint: disable=broad-except
-                failure_count += 1
-                logger.exception('Failed to issue credit for [%s] transaction [%s] made against basket [%d].',
-                                 processor_name, transaction_id, basket.id)
-        logger.info('Finished processing refunds for basket [%d].', basket.id)
+        basket_success_count, basket_failure_count = refund_basket(site, basket)
+        success_count += basket_success_count
+        failure_count += basket_failure_count
 
     msg = 'Finished refunding basket transactions. [{success_count}] transactions were successfully refunded. ' \
           '[{failure_count}] attempts failed.'.format(success_count=success_count, failure_count=failure_count)
@@ -72,6 +54,64 @@ def refund_basket_transactions(site, basket_ids):
     return success_count, failure_count
 
 
+def refund_basket(site, basket, exclude_transactions=(), on_refund=None):
+    """
+    Issue credit for the transactions made against a basket.
+
+    Arguments:
+        site (Site): Site of the basket.
+        basket (Basket): Basket whose transactions are refunded.
+        exclude_transactions (iterable): Processor name and transaction ID pairs which have already been refunded.
+        on_refund (callable): Called with the processor name and ID of each transaction once it is refunded.
+
+    Returns:
+        tuple: Numbers of transactions which were, and were not, successfully refunded.
+    """
+    success_count = 0
+    failure_count = 0
+
+    basket.strategy = strategy.Default()
+    Applicator().apply(basket, basket.owner, None)
+
+    logger.info('Refunding transactions for basket [%d]...', basket.id)
+    transactions = set(
+        list(basket.paymentprocessorresponse_set.values_list('processor_name', 'transaction_id')))
+    if not transactions:
+        # The responses of old baskets may have been archived.
+        transactions = set(
+            ArchivedPaymentProcessorResponse.objects.filter(basket_id=basket.id).values_list(
+                'processor_name', 'transaction_id'
+            )
+        )
+    transactions -= {tuple(refunded) for refunded in exclude_transactions}
+
+    for processor_name, transaction_id in transactions:
+        try:
+            logger.info('Issuing credit for [%s] transaction [%s] made against basket [%d]...', processor_name,
+                        transaction_id, basket.id)
+            payment_processor = _get_payment_processor(site, processor_name)
+            payment_processor.issue_credit(basket.order_number, basket, transaction_id, basket.total_excl_tax,
+                                           basket.currency)
+        except Exception:  # pylint: disable=broad-except
+            failure_count += 1
+            logger.exception('Failed to issue credit for [%s] transaction [%s] made against basket [%d].',
+                             processor_name, transaction_id, basket.id)
+        else:
+            success_count += 1
+            logger.info('Successfully issued credit for [%s] transaction [%s] made against basket [%d].',
+                        processor_name, transaction_id, basket.id)
+            if on_refund:
+                on_refund(processor_name, transaction_id)
+    logger.info('Finished processing refunds for basket [%d].', basket.id)
+
+    return success_count, failure_count
+
+
+def _is_successful_response(response):
+    response = response or {}
+    return response.get('decision') == 'ACCEPT' or response.get('state') == 'approved'
+
+
 class FulfillFrozenBaskets(EdxOrderPlacementMixin):
 
     @staticmethod
@@ -108,6 +148,13 @@ class FulfillFrozenBaskets(EdxOrderPlacementMixin):
         successful_transaction = basket.paymentprocessorresponse_set.filter(
             Q(response__contains='ACCEPT') | Q(response__contains='approved')
         )
+        if not successful_transaction:
+            # The responses of old baskets may have been archived. Archived responses are compressed, so they
+            # are filtered once they have been loaded.
+            successful_transaction = [
+                archived for archived in ArchivedPaymentProcessorResponse.objects.filter(basket_id=basket.id)
+                if _is_successful_response(archived.response)
+            ]
 
         # In case of no successful transactions log and return none.
         if not successful_transaction:
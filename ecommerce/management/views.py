@@ -1,21 +1,35 @@
 import logging
 
+import waffle
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.db import transaction
+from django.shortcuts import redirect
 from django.utils.translation import ugettext as _
-from django.views.generic import TemplateView
+from django.views.generic import DetailView, TemplateView
 
+from ecommerce.management.constants import MANAGEMENT_BACKGROUND_JOBS_SWITCH, ManagementJobAction
+from ecommerce.management.jobs import resume_job, submit_job
+from ecommerce.management.models import ManagementJob
+from ecommerce.management.tasks import start_management_job
 from ecommerce.management.utils import FulfillFrozenBaskets, refund_basket_transactions
 
 logger = logging.getLogger(__name__)
 
 
-class ManagementView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
-    template_name = 'management/index.html'
-
+class SuperuserRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
     def test_func(self):
         return self.request.user.is_superuser
 
+
+class ManagementView(SuperuserRequiredMixin, TemplateView):
+    template_name = 'management/index.html'
+
+    def get_context_data(self, **kwargs):
+        context = super(ManagementView, self).get_context_data(**kwargs)
+        context['jobs'] = ManagementJob.objects.filter(site=self.request.site).select_related('user')[:10]
+        return context
+
     def _parse_basket_ids(self, s):
         basket_ids = []
 
@@ -31,6 +45,13 @@ class ManagementView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
         if action:
             logger.info('User [%s] executed action [%s] on the management view.', request.user, action)
 
+        if action in (ManagementJobAction.REFUND_BASKET_TRANSACTIONS, ManagementJobAction.FULFILL) and \
+                waffle.switch_is_active(MANAGEMENT_BACKGROUND_JOBS_SWITCH):
+            basket_ids = self._parse_basket_ids(request.POST.get('basket_ids'))
+            job = submit_job(request.site, request.user, action, basket_ids)
+            transaction.on_commit(lambda: start_management_job.delay(job.id))
+            return redirect('management:job', pk=job.pk)
+
         if action == 'refund_basket_transactions':
             basket_ids = self._parse_basket_ids(request.POST.get('basket_ids'))
             success_count, failure_count = refund_basket_transactions(request.site, basket_ids)
@@ -51,3 +72,21 @@ class ManagementView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
                                  _('{action} is not a valid action.').format(action=action))
 
         return self.get(request)
+
+
+class ManagementJobView(SuperuserRequiredMixin, DetailView):
+    """ Shows the progress of a management job, and resumes jobs whose baskets could not all be processed. """
+    template_name = 'management/job.html'
+    context_object_name = 'job'
+
+    def get_queryset(self):
+        return ManagementJob.objects.filter(site=self.request.site)
+
+    def post(self, request, *args, **kwargs):  # pylint: disable=unused-argument
+        job = self.get_object()
+        count = resume_job(job)
+        transaction.on_commit(lambda: start_management_job.delay(job.id))
+        logger.info('User [%s] resumed management job [%d].', request.user, job.id)
+        messages.add_message(request, messages.INFO,
+                             _('Retrying {count} baskets.').format(count=count))
+        return redirect('management:job', pk=job.pk)
@@ -20,13 +20,29 @@ SAILTHRU_CAMPAIGN = 'sailthru_bid'
 @receiver(post_checkout)
 @silence_exceptions("Failed to call Sailthru upon order completion.")
 def process_checkout_complete(sender, order=None, user=None, request=None,  # pylint: disable=unused-argument
-                              response=None, **kwargs):  # pylint: disable=unused-argument
+                              response=None, outbox=False, **kwargs):  # pylint: disable=unused-argument
     """Tell Sailthru when payment done.
 
     Arguments:
             Parameters described at http://django-oscar.readthedocs.io/en/releases-1.1/ref/signals.html
+            outbox (bool): Whether the notification was recorded in the checkout outbox instead.
     """
+    if not outbox:
+        notify_checkout_complete(order, message_id=get_campaign_id(request))
 
+
+def get_campaign_id(request):
+    """ Returns the Sailthru campaign ID stored in the request cookies, if any. """
+    return request.COOKIES.get(SAILTHRU_CAMPAIGN) if request else None
+
+
+def notify_checkout_complete(order, message_id=None):
+    """Tell Sailthru when payment done.
+
+    Arguments:
+        order (Order): The completed order.
+        message_id (str): Sailthru campaign ID. Defaults to the value saved in the order's basket.
+    """
     if not waffle.switch_is_active('sailthru_enable'):
         return
 
@@ -35,10 +51,6 @@ def process_checkout_complete(sender, order=None, user=None, request=None,  # py
         return
 
     # get campaign id from cookies, or saved value in basket
-    message_id = None
-    if request:
-        message_id = request.COOKIES.get('sailthru_bid')
-
     if not message_id:
         saved_id = BasketAttribute.objects.filter(
             basket=order.basket,
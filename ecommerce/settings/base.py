@@ -60,6 +60,13 @@ DATABASES = {
         'ATOMIC_REQUESTS': True,
     }
 }
+
+# Safe requests of views using ReadReplicaMixin read from the database named 'read_replica', if one is configured.
+DATABASE_ROUTERS = ['ecommerce.core.db_routers.ReadReplicaRouter']
+
+# Seconds during which the reads of a client are sent to the primary database after it writes. This should
+# exceed the replication lag of the read replica.
+READ_REPLICA_MAX_LAG = 10
 # END DATABASE CONFIGURATION
 
 
@@ -211,6 +218,9 @@ TEMPLATES = [
 # MIDDLEWARE CONFIGURATION
 # See: https://docs.djangoproject.com/en/dev/ref/settings/#middleware-classes
 MIDDLEWARE_CLASSES = (
+    'ecommerce.core.middleware.PerformanceMiddleware',
+    'ecommerce.core.middleware.ReadReplicaMiddleware',
+    'ecommerce.core.middleware.TransactionGuardMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'edx_django_utils.cache.middleware.RequestCacheMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -240,6 +250,25 @@ MIDDLEWARE_CLASSES = (
 )
 # END MIDDLEWARE CONFIGURATION
 
+# Whether PerformanceMiddleware records the SQL queries, cache lookups and outbound HTTP calls of each request.
+PERFORMANCE_INSTRUMENTATION_ENABLED = False
+
+# How TransactionGuardMiddleware handles outbound HTTP calls made while the request holds a database
+# transaction open: 'log' logs a warning, 'raise' raises OutboundCallInTransactionError, None disables the guard.
+OUTBOUND_CALL_IN_TRANSACTION_GUARD = None
+
+# Limits of the counters recorded by PerformanceMiddleware, keyed by view name (e.g. 'basket:summary').
+# Requests exceeding the budget of their view log a warning. Views without a budget use the default budget.
+# Durations are in milliseconds.
+PERFORMANCE_BUDGETS = {
+    'default': {
+        'queries': 100,
+        'cache_misses': 50,
+        'outbound_calls': 5,
+        'duration': 2000,
+    },
+}
+
 
 # URL CONFIGURATION
 # See: https://docs.djangoproject.com/en/dev/ref/settings/#root-urlconf
@@ -262,6 +291,13 @@ ENTERPRISE_CUSTOMER_RESULTS_CACHE_TIMEOUT = 3600  # Value is in seconds
 PROVIDER_DATA_PROCESSING_TIMEOUT = 15  # Value is in seconds.
 CREDIT_PROVIDER_CACHE_TIMEOUT = 600
 
+# Cache timeout of the credit provider directories, which are refreshed every hour by a periodic task.
+# The directories outlive several refreshes, so that checkout keeps working while the LMS is unavailable.
+CREDIT_PROVIDER_DIRECTORY_TIMEOUT = 24 * 60 * 60  # Value is in seconds.
+
+# Cache timeout of the credit eligibility of learners, which is invalidated once they purchase credit.
+CREDIT_ELIGIBILITY_CACHE_TIMEOUT = 300  # Value is in seconds.
+
 # Anonymous User Calculate Cache timeout
 ANONYMOUS_BASKET_CALCULATE_CACHE_TIMEOUT = 3600  # Value is in seconds.
 
@@ -269,10 +305,35 @@ ANONYMOUS_BASKET_CALCULATE_CACHE_TIMEOUT = 3600  # Value is in seconds.
 LMS_API_CACHE_TIMEOUT = 30  # Value is in seconds.
 # END URL CONFIGURATION
 
-VOUCHER_CACHE_TIMEOUT = 10  # Value is in seconds.
+# Voucher snapshots are invalidated when vouchers, offers or ranges change.
+VOUCHER_CACHE_TIMEOUT = 60 * 60  # Value is in seconds.
 
 SDN_CHECK_REQUEST_TIMEOUT = 5  # Value is in seconds.
 
+# Connection pool size, and timeout in seconds, of the clients of other services, keyed by service name.
+# Services without their own configuration use the default configuration.
+SERVICE_CLIENTS = {
+    'default': {
+        'POOL_SIZE': 10,
+        'TIMEOUT': 5,
+    },
+}
+
+# Number of tasks which may process the baskets of a management job at a time, keyed by payment processor name.
+# Processors without their own limit use the default limit.
+MANAGEMENT_JOB_CONCURRENCY = {
+    'default': 2,
+}
+
+# Time to wait for each concurrent eligibility check of a coupon redemption, before its fallback is used.
+ELIGIBILITY_CHECK_TIMEOUT = 5  # Value is in seconds.
+
+# Access tokens of the sites' service users are renewed when they expire within this window. The window should
+# be longer than the interval of the refresh-service-access-tokens task, and shorter than the token lifetime.
+SERVICE_TOKEN_REFRESH_WINDOW = 300  # Value is in seconds.
+# Time after which a worker which failed to release the lock renewing a token is considered gone.
+SERVICE_TOKEN_LOCK_TIMEOUT = 30  # Value is in seconds.
+
 CORS_ORIGIN_ALLOW_ALL = True
 
 # APP CONFIGURATION
@@ -312,6 +373,7 @@ LOCAL_APPS = [
     'ecommerce.enterprise',
     'ecommerce.management',
     'ecommerce.journals',  # TODO: journals dependency
+    'ecommerce.discovery_mirror',
 ]
 
 # See: https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
@@ -523,6 +585,13 @@ BROKER_HEARTBEAT_CHECKRATE = 2
 # See http://celery.readthedocs.io/en/latest/userguide/configuration.html#imports.
 CELERY_IMPORTS = (
     'ecommerce_worker.fulfillment.v1.tasks',
+    'ecommerce.core.tasks',
+    'ecommerce.courses.tasks',
+    'ecommerce.credit.tasks',
+    'ecommerce.discovery_mirror.tasks',
+    'ecommerce.extensions.checkout.tasks',
+    'ecommerce.extensions.offer.tasks',
+    'ecommerce.management.tasks',
 )
 
 CELERY_ROUTES = {
@@ -532,6 +601,31 @@ CELERY_ROUTES = {
     'ecommerce_worker.sailthru.v1.tasks.send_offer_assignment_email': {'queue': 'email_marketing'},
 }
 
+# Periodic tasks run by Celery beat.
+# See http://docs.celeryproject.org/en/3.1/userguide/periodic-tasks.html.
+CELERYBEAT_SCHEDULE = {
+    'sync-discovery-mirror': {
+        'task': 'ecommerce.discovery_mirror.tasks.sync_discovery_mirror',
+        'schedule': datetime.timedelta(minutes=15),
+    },
+    'dispatch-checkout-outbox': {
+        'task': 'ecommerce.extensions.checkout.tasks.dispatch_checkout_outbox',
+        'schedule': datetime.timedelta(minutes=1),
+    },
+    'fold-offer-usage-counters': {
+        'task': 'ecommerce.extensions.offer.tasks.fold_offer_usage_counters',
+        'schedule': datetime.timedelta(minutes=1),
+    },
+    'refresh-service-access-tokens': {
+        'task': 'ecommerce.core.tasks.refresh_service_access_tokens',
+        'schedule': datetime.timedelta(minutes=1),
+    },
+    'refresh-credit-provider-directories': {
+        'task': 'ecommerce.credit.tasks.refresh_credit_provider_directories',
+        'schedule': datetime.timedelta(hours=1),
+    },
+}
+
 # Prevent Celery from removing handlers on the root logger. Allows setting custom logging handlers.
 # See http://celery.readthedocs.io/en/latest/userguide/configuration.html#worker-hijack-root-logger.
 CELERYD_HIJACK_ROOT_LOGGER = False
@@ -653,6 +747,10 @@ OFFER_ASSIGNMENT_EMAIL_DEFAULT_TEMPLATE = '''
 '''
 OFFER_ASSIGNMENT_EMAIL_DEFAULT_SUBJECT = 'New edX course assignment'
 
+# Number of counter shards on which the usage of offers without a usage cap is recorded,
+# so that concurrent redemptions do not wait on the offer's row. Set to 0 to disable sharding.
+OFFER_USAGE_COUNTER_SHARDS = 0
+
 #SAILTHRU settings
 SAILTHRU_KEY = None
 SAILTHRU_SECRET = None
@@ -20,6 +20,7 @@ from oscar.test.utils import RequestFactory
 from social_django.models import UserSocialAuth
 from threadlocals.threadlocals import set_thread_variable
 
+from ecommerce.core.service_clients import clear_service_clients
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.models import Course
 from ecommerce.courses.utils import mode_for_product
@@ -268,6 +269,7 @@ class SiteMixin(object):
         Course.objects.all().delete()
         Partner.objects.all().delete()
         Site.objects.all().delete()
+        clear_service_clients()
         self.site_configuration = SiteConfigurationFactory(
             from_email='from@example.com',
             oauth_settings={
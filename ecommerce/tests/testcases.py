@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.db import connection
 from django.test import LiveServerTestCase as DjangoLiveServerTestCase
 from django.test import TestCase as DjangoTestCase
 from django.test import TransactionTestCase as DjangoTransactionTestCase
@@ -60,6 +61,12 @@ class TestCase(TestServerUrlMixin, UserMixin, SiteMixin, TieredCacheMixin, Djang
     This class guarantees that tests have a Site and Partner available.
     """
 
+    def run_commit_callbacks(self):
+        """ Run the callbacks registered with transaction.on_commit, since the transactions of tests never commit. """
+        callbacks, connection.run_on_commit = connection.run_on_commit, []
+        for __, callback in callbacks:
+            callback()
+
 
 class LiveServerTestCase(TestServerUrlMixin, UserMixin, SiteMixin, TieredCacheMixin, DjangoLiveServerTestCase):
     """
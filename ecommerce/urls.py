@@ -59,6 +59,7 @@ urlpatterns = AUTH_URLS + WELL_KNOWN_URLS + [
     url(r'^credit/', include('ecommerce.credit.urls', namespace='credit')),
     url(r'^coupons/', include('ecommerce.coupons.urls', namespace='coupons')),
     url(r'^health/$', core_views.health, name='health'),
+    url(r'^performance/metrics/$', core_views.performance_metrics, name='performance_metrics'),
     url(r'^i18n/', include('django.conf.urls.i18n')),
     url(r'^jsi18n/$', JavaScriptCatalog.as_view(packages=['courses']), name='javascript-catalog'),
     url(r'^management/', include('ecommerce.management.urls', namespace='management')),